@@ -16,6 +16,11 @@ class BaseAnalyzer(object):
     NAME = 'base_analyzer'
     DESCRIPTION = ''
 
+    # Database tables written and read by the module. The engine orders the
+    # modules by these, see engine/module_graph.py.
+    PRODUCED_TABLES = []
+    CONSUMED_TABLES = []
+
     _plugin_classes = None
 
     def __init__(self):
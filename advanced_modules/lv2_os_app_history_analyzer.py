@@ -11,6 +11,14 @@ from advanced_modules import logger
 class LV2OSAPPHISTORYAnalyzer(interface.AdvancedModuleAnalyzer):
     NAME = 'lv2_os_app_history_analyzer'
     DESCRIPTION = 'Moudle for LV2 OS APP History'
+    PRODUCED_TABLES = ['lv2_os_app_history']
+    CONSUMED_TABLES = [
+        'lv1_os_win_reg_user_assist',
+        'lv1_os_win_reg_amcache_file',
+        'lv1_os_win_prefetch',
+        'lv1_os_win_windows_timeline',
+        'lv1_os_win_event_logs_applications',
+        'lv1_os_win_jumplist_automatics']
 
     _plugin_classes = {}
 
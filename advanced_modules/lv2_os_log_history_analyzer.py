@@ -9,6 +9,10 @@ import os
 class Lv2OSLogHistoryAnalyzer(interface.AdvancedModuleAnalyzer):
     NAME = 'lv2_os_log_history_analyzer'
     DESCRIPTION = 'Module for LV2 OS Log History'
+    PRODUCED_TABLES = ['lv2_os_log_history']
+    CONSUMED_TABLES = [
+        'lv1_fs_ntfs_mft',
+        'lv1_fs_ntfs_usnjrnl']
 
     _plugin_classes = {}
 
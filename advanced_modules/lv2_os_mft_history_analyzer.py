@@ -11,6 +11,7 @@ class LV2OSMFTHISTORYAnalyzer(interface.AdvancedModuleAnalyzer):
 
     NAME = 'lv2_os_mft_history_analyzer'
     DESCRIPTION = 'Moudle for LV2 OS MFT History'
+    PRODUCED_TABLES = ['lv2_os_mft_history']
 
     _plugin_classes = {}
 
@@ -14,6 +14,30 @@ class LV2OSUSAGEHISTORYAnalyzer(interface.AdvancedModuleAnalyzer):
 
     NAME = 'lv2_os_usage_history_analyzer'
     DESCRIPTION = 'Module for LV2 OS Win Usage History Analyzer'
+    PRODUCED_TABLES = [
+        'usage_day_detail',
+        'usage_year',
+        'usage_day_stat',
+        'timeline_month']
+    CONSUMED_TABLES = [
+        'lv1_os_win_event_logs_logonoff',
+        'lv1_os_win_event_logs_pconoff',
+        'lv1_os_win_event_logs_usb_devices',
+        'lv1_os_win_event_logs_applications',
+        'lv1_os_win_reg_usb_device',
+        'lv1_os_win_reg_amcache_program',
+        'lv1_os_win_reg_installed_program',
+        'lv1_os_win_esedb_ie_content',
+        'lv1_os_win_esedb_ie_cookies',
+        'lv1_os_win_esedb_ie_download',
+        'lv1_os_win_esedb_ie_history',
+        'lv1_app_web_chrome_cookies',
+        'lv1_app_web_chrome_download',
+        'lv1_app_web_chrome_favicons',
+        'lv1_app_web_chrome_search_terms',
+        'lv1_app_web_chrome_shortcuts',
+        'lv1_app_web_chrome_visit_urls',
+        'lv2_os_app_history']
 
     _plugin_classes = {}
 
@@ -34,6 +34,15 @@ class AdvancedModulesManager(object):
 
 
 
+    @classmethod
+    def GetModuleClasses(cls):
+        """Retrieves the registered module classes.
+
+        Returns:
+          dict[str, type]: module classes per lower case name.
+        """
+        return dict(cls._module_classes)
+
     @classmethod
     def RegisterModule(cls, module_class):
         """Registers a module class.
@@ -5,6 +5,7 @@
 from __future__ import print_function
 from __future__ import unicode_literals
 
+import argparse
 import logging
 import os
 import sys
@@ -13,10 +14,43 @@ import dependencies
 
 from tools import carpe_tool
 from utility import errors
+from utility import rds_index
+
+
+def RDSIndexMain(arguments):
+  """The rds-index command, which builds the RDS index used by --rds-check.
+
+  Args:
+    arguments (list[str]): command line arguments after "rds-index".
+
+  Returns:
+    bool: True if the index was built.
+  """
+  argument_parser = argparse.ArgumentParser(
+      prog='carpe.py rds-index', description=(
+          'Builds a memory-mapped SHA-1 index from a NSRL RDS NSRLFile.txt '
+          'file. Set rds_index_path in config/carpe.conf to the index file.'))
+  argument_parser.add_argument(
+      'nsrl_file', metavar='NSRLFILE', type=str, help='Path to NSRLFile.txt.')
+  argument_parser.add_argument(
+      'index_file', metavar='INDEX', type=str, help='Path of the index file to create.')
+  options = argument_parser.parse_args(arguments)
+
+  if not os.path.isfile(options.nsrl_file):
+    print('No such file: {0:s}'.format(options.nsrl_file))
+    return False
+
+  number_of_hashes = rds_index.BuildIndex(options.nsrl_file, options.index_file)
+  print('{0:d} unique SHA-1 hashes written to: {1:s}'.format(
+      number_of_hashes, options.index_file))
+  return True
 
 
 def Main():
   """The main function."""
+  if sys.argv[1:2] == ['rds-index']:
+    return RDSIndexMain(sys.argv[2:])
+
   tool = carpe_tool.CarpeTool()
 
   if not tool.ParseArguments(sys.argv[1:]):
@@ -45,6 +45,7 @@ class CarpeFile(object):
         self._ads = 0
         self._sig_type = ""
         self._rds_existed = ""
+        self._normalized_path = ""
 
     def toTuple(self):
         if self._file_id == 0:
@@ -20,4 +20,5 @@ class Configuration(object):
         self.cursor = None
         self.partition_list = {}
         self.operating_systems = []
-        self.standalone_check = None
\ No newline at end of file
+        self.standalone_check = None
+        self.number_of_workers = 0
\ No newline at end of file
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""File-like access to dfVFS file objects without extracting them."""
+
+import io
+import os
+
+
+# Default number of bytes read ahead by the buffered file object.
+DEFAULT_READ_AHEAD_SIZE = 1024 * 1024
+
+
+class FileObjectIO(io.RawIOBase):
+    """Raw, seekable I/O over a dfVFS file-like object."""
+
+    def __init__(self, file_object):
+        """Initializes the raw I/O.
+
+        Args:
+            file_object (dfvfs.FileIO): dfVFS file-like object, which is closed
+                together with the raw I/O.
+        """
+        super(FileObjectIO, self).__init__()
+        self._file_object = file_object
+
+    def close(self):
+        """Closes the raw I/O and the dfVFS file-like object."""
+        if not self.closed:
+            self._file_object.close()
+        super(FileObjectIO, self).close()
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._file_object.read(len(buffer))
+        size = len(data)
+        buffer[:size] = data
+        return size
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        self._file_object.seek(offset, whence)
+        return self._file_object.get_offset()
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._file_object.get_offset()
+
+
+def OpenFileObject(file_object, read_ahead_size=DEFAULT_READ_AHEAD_SIZE):
+    """Opens a buffered, seekable file object over a dfVFS file-like object.
+
+    Reads are served from a read-ahead buffer of read_ahead_size bytes, seeks
+    within the buffer do not read from the image again.
+
+    Args:
+        file_object (dfvfs.FileIO): dfVFS file-like object.
+        read_ahead_size (Optional[int]): size of the read-ahead buffer.
+
+    Returns:
+        io.BufferedReader: buffered file object.
+    """
+    return io.BufferedReader(FileObjectIO(file_object), buffer_size=read_ahead_size)
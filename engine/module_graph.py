@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""The module dependency graph.
+
+Module connectors and advanced module analyzers declare the database tables
+they produce (PRODUCED_TABLES) and consume (CONSUMED_TABLES). A module depends
+on every other module that produces one of the tables it consumes.
+"""
+
+import fnmatch
+
+from utility import errors
+
+
+class ModuleGraph(object):
+    """Dependency graph of module connectors and advanced module analyzers."""
+
+    def __init__(self, module_classes, analyzer_classes):
+        """Initializes a module graph.
+
+        Args:
+            module_classes (dict[str, type]): module connector classes per
+                lower case name.
+            analyzer_classes (dict[str, type]): advanced module analyzer
+                classes per lower case name.
+        """
+        super(ModuleGraph, self).__init__()
+        self._analyzer_names = set(analyzer_classes.keys())
+        self._module_classes = dict(module_classes)
+        self._module_classes.update(analyzer_classes)
+        self._dependencies = {}
+
+        for module_name in self._module_classes:
+            self._dependencies[module_name] = self._FindProducers(module_name)
+
+        # Fail early instead of deadlocking the scheduler.
+        self.SortModuleNames(self._module_classes.keys())
+
+    def _FindProducers(self, module_name):
+        """Finds the modules that produce the tables consumed by a module.
+
+        Produced table names can contain shell-style wildcards, such as
+        "lv1_os_and_basic_app_*", for modules that create tables dynamically.
+
+        Args:
+            module_name (str): name of the module.
+
+        Returns:
+            set[str]: names of the producing modules.
+        """
+        consumed_tables = getattr(self._module_classes[module_name], 'CONSUMED_TABLES', [])
+
+        producers = set()
+        for producer_name, producer_class in self._module_classes.items():
+            if producer_name == module_name:
+                continue
+
+            for produced_table in getattr(producer_class, 'PRODUCED_TABLES', []):
+                if any(fnmatch.fnmatchcase(table, produced_table) for table in consumed_tables):
+                    producers.add(producer_name)
+                    break
+
+        return producers
+
+    def GetDependencies(self, module_name):
+        """Retrieves the direct dependencies of a module.
+
+        Args:
+            module_name (str): name of the module.
+
+        Returns:
+            set[str]: names of the modules the module depends on.
+        """
+        return self._dependencies.get(module_name, set())
+
+    def GetUpstreamModuleNames(self, module_names):
+        """Retrieves all modules that the given modules depend on, directly or
+        indirectly.
+
+        Args:
+            module_names (iterable[str]): names of the modules.
+
+        Returns:
+            set[str]: names of the upstream modules, without the given modules.
+        """
+        module_names = set(module_names)
+        upstream_module_names = set()
+
+        stack = list(module_names)
+        while stack:
+            for dependency in self.GetDependencies(stack.pop()):
+                if dependency in upstream_module_names or dependency in module_names:
+                    continue
+                upstream_module_names.add(dependency)
+                stack.append(dependency)
+
+        return upstream_module_names
+
+    def SortModuleNames(self, module_names):
+        """Sorts modules so that every module comes after its dependencies.
+
+        Args:
+            module_names (iterable[str]): names of the modules.
+
+        Returns:
+            list[str]: names of the modules in dependency order.
+
+        Raises:
+            BadConfigOption: if the module dependencies contain a cycle.
+        """
+        module_names = list(module_names)
+        remaining = {
+            module_name: self.GetDependencies(module_name).intersection(module_names)
+            for module_name in module_names}
+
+        sorted_module_names = []
+        while remaining:
+            ready = [module_name for module_name, dependencies in remaining.items() if not dependencies]
+            if not ready:
+                raise errors.BadConfigOption(
+                    'Module dependency cycle between: {0:s}'.format(', '.join(sorted(remaining))))
+
+            for module_name in ready:
+                del remaining[module_name]
+                sorted_module_names.append(module_name)
+
+            for dependencies in remaining.values():
+                dependencies.difference_update(ready)
+
+        return sorted_module_names
+
+    def ExpandFilterExpressions(self, module_filter_expression, advanced_module_filter_expression):
+        """Adds the upstream modules of explicitly included modules to the
+        filter expressions.
+
+        The module filter expression can name advanced module analyzers as
+        well, in which case only the modules they need are processed.
+        Modules that are explicitly excluded are never added.
+
+        Args:
+            module_filter_expression (str): module filter expression.
+            advanced_module_filter_expression (str): advanced module filter
+                expression.
+
+        Returns:
+            tuple[str, str]: expanded module and advanced module filter
+                expressions.
+        """
+        module_includes, module_excludes = self._SplitExpression(module_filter_expression)
+        advanced_includes, advanced_excludes = self._SplitExpression(advanced_module_filter_expression)
+
+        named_analyzers = [
+            module_name for module_name in module_includes
+            if self._IsAnalyzer(module_name)]
+
+        upstream_module_names = self.GetUpstreamModuleNames(
+            module_includes + advanced_includes)
+        upstream_module_names.difference_update(module_excludes + advanced_excludes)
+
+        module_elements = []
+        advanced_elements = []
+        for module_name in sorted(upstream_module_names):
+            if self._IsAnalyzer(module_name):
+                advanced_elements.append(module_name)
+            else:
+                module_elements.append(module_name)
+
+        if module_includes and module_elements:
+            module_filter_expression = ','.join([module_filter_expression] + module_elements)
+
+        if named_analyzers or advanced_includes:
+            advanced_module_filter_expression = ','.join(
+                [advanced_module_filter_expression or ''] + named_analyzers + advanced_elements).strip(',')
+
+        return module_filter_expression, advanced_module_filter_expression
+
+    def _IsAnalyzer(self, module_name):
+        """Determines if a module is an advanced module analyzer.
+
+        Args:
+            module_name (str): name of the module.
+
+        Returns:
+            bool: True if the module is an advanced module analyzer.
+        """
+        return module_name in self._analyzer_names
+
+    def _SplitExpression(self, expression):
+        """Splits a filter expression into included and excluded module names.
+
+        Args:
+            expression (str): filter expression.
+
+        Returns:
+            tuple[list[str], list[str]]: included and excluded module names.
+        """
+        includes = []
+        excludes = []
+        for expression_element in (expression or '').split(','):
+            expression_element = expression_element.strip().lower()
+            if not expression_element:
+                continue
+
+            module_name, _, _ = expression_element.lstrip('!').partition('/')
+            if expression_element.startswith('!'):
+                excludes.append(module_name)
+            else:
+                includes.append(module_name)
+
+        return includes, excludes
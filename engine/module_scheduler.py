@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""The module scheduler.
+
+Every (module, partition) pair is a unit of work. The scheduler runs these
+units in a pool of worker processes, where each worker owns its own dfVFS
+resolver context and database connection. A unit is started as soon as the
+modules it depends on, see engine/module_graph.py, have finished. A unit
+that fails is logged and does not stop the other units.
+"""
+
+import collections
+import copy
+import os
+import time
+
+from concurrent import futures
+from multiprocessing import util as multiprocessing_util
+
+from dfvfs.resolver import context as dfvfs_context
+
+from engine import logger
+from modules import manager as modules_manager
+from modules import interface as modules_interface
+from advanced_modules import manager as advanced_modules_manager
+from advanced_modules import interface as advanced_modules_interface
+
+from utility import database
+from utility import database_sqlite
+
+
+# State of the current worker process, set by _InitializeWorker.
+_worker_configuration = None
+_worker_knowledge_base = None
+_worker_modules = None
+
+
+def OpenDatabase(configuration):
+    """Opens a new database connection for a configuration.
+
+    Args:
+        configuration (Configuration): configuration values.
+
+    Returns:
+        Database: database connection.
+    """
+    if configuration.standalone_check:
+        cursor = database_sqlite.Database(
+            configuration.case_id, configuration.evidence_id,
+            configuration.source_path, configuration.output_file_path)
+    else:
+        cursor = database.Database()
+    cursor.open()
+
+    return cursor
+
+
+def _GetPartitionName(source_path_spec):
+    """Retrieves the partition name of a source path specification.
+
+    Args:
+        source_path_spec (dfvfs.PathSpec): path specification of the source.
+
+    Returns:
+        str: partition name, such as "p1".
+    """
+    location = getattr(source_path_spec.parent, 'location', None)
+    if not location:
+        return 'p1'
+    return location[1:]
+
+
+def _InitializeWorker(configuration, knowledge_base, module_filter_expression,
+                      advanced_module_filter_expression):
+    """Initializes a worker process.
+
+    Args:
+        configuration (Configuration): configuration values without a cursor
+            and resolver context.
+        knowledge_base (KnowledgeBase): knowledge base.
+        module_filter_expression (str): module filter expression.
+        advanced_module_filter_expression (str): advanced module filter
+            expression.
+    """
+    global _worker_configuration
+    global _worker_knowledge_base
+    global _worker_modules
+
+    configuration.resolver_context = dfvfs_context.Context()
+    configuration.cursor = OpenDatabase(configuration)
+
+    # Worker processes exit without running atexit handlers.
+    multiprocessing_util.Finalize(None, configuration.cursor.close, exitpriority=10)
+
+    _worker_configuration = configuration
+    _worker_knowledge_base = knowledge_base
+    _worker_modules = modules_manager.ModulesManager.GetModuleObjects(
+        module_filter_expression=module_filter_expression)
+    _worker_modules.update(advanced_modules_manager.AdvancedModulesManager.GetModuleObjects(
+        advanced_module_filter_expression=advanced_module_filter_expression))
+
+
+def _RunModule(module, configuration, source_path_spec, knowledge_base):
+    """Runs a module connector or advanced module analyzer on a partition.
+
+    Args:
+        module (ModuleConnector|AdvancedModuleAnalyzer): module.
+        configuration (Configuration): configuration values.
+        source_path_spec (dfvfs.PathSpec): path specification of the partition.
+        knowledge_base (KnowledgeBase): knowledge base.
+    """
+    if isinstance(module, modules_interface.ModuleConnector):
+        module.Connect(configuration=configuration, source_path_spec=source_path_spec,
+                       knowledge_base=knowledge_base)
+    elif isinstance(module, advanced_modules_interface.AdvancedModuleAnalyzer):
+        module.Analyze(configuration=configuration, source_path_spec=source_path_spec)
+
+
+def _ProcessModuleTask(module_name, source_path_spec):
+    """Runs a module on a partition inside a worker process.
+
+    Args:
+        module_name (str): name of the module.
+        source_path_spec (dfvfs.PathSpec): path specification of the partition.
+
+    Returns:
+        float: processing time in seconds.
+    """
+    start_time = time.time()
+    _RunModule(_worker_modules.get(module_name, None), _worker_configuration,
+               source_path_spec, _worker_knowledge_base)
+    return time.time() - start_time
+
+
+class ModuleScheduler(object):
+    """Runs modules per partition in a pool of worker processes."""
+
+    def __init__(self, module_graph, number_of_workers=0):
+        """Initializes a module scheduler.
+
+        Args:
+            module_graph (ModuleGraph): module dependency graph.
+            number_of_workers (Optional[int]): number of worker processes,
+                where 0 represents one worker per CPU.
+        """
+        super(ModuleScheduler, self).__init__()
+        if not number_of_workers:
+            number_of_workers = os.cpu_count() or 1
+        self._module_graph = module_graph
+        self._number_of_workers = number_of_workers
+
+    def _BuildTasks(self, modules, source_path_specs):
+        """Builds the (module, partition) tasks.
+
+        Args:
+            modules (dict[str, ModuleConnector|AdvancedModuleAnalyzer]): modules
+                per name.
+            source_path_specs (list[dfvfs.PathSpec]): path specifications of
+                the sources.
+
+        Returns:
+            list[tuple[str, dfvfs.PathSpec]]: module name and partition path
+                specification per task, in dependency order.
+        """
+        tasks = []
+        and_flag = False
+        for module_name in self._module_graph.SortModuleNames(modules.keys()):
+            for source_path_spec in source_path_specs:
+                if source_path_spec.parent and source_path_spec.parent.TYPE_INDICATOR == 'VSHADOW':
+                    continue
+                if not source_path_spec.IsFileSystem():
+                    continue
+
+                # andForensics processes the whole image at once.
+                if module_name == 'andforensics_connector':
+                    if and_flag:
+                        continue
+                    and_flag = True
+
+                tasks.append((module_name, source_path_spec))
+
+        return tasks
+
+    def _BuildDependencies(self, tasks):
+        """Determines the tasks every task has to wait for.
+
+        The database tables are shared by all partitions, so a task waits for
+        the tasks of its upstream modules on every partition.
+
+        Args:
+            tasks (list[tuple[str, dfvfs.PathSpec]]): tasks.
+
+        Returns:
+            dict[int, set[int]]: indexes of the tasks to wait for per task index.
+        """
+        task_indexes = {}
+        for task_index, (module_name, _) in enumerate(tasks):
+            task_indexes.setdefault(module_name, []).append(task_index)
+
+        dependencies = {}
+        for task_index, (module_name, _) in enumerate(tasks):
+            dependencies[task_index] = set()
+            for dependency in self._module_graph.GetDependencies(module_name):
+                dependencies[task_index].update(task_indexes.get(dependency, []))
+
+        return dependencies
+
+    def _RunSequential(self, modules, tasks, configuration, knowledge_base):
+        """Runs the tasks one after another in the current process.
+
+        Args:
+            modules (dict[str, ModuleConnector|AdvancedModuleAnalyzer]): modules
+                per name.
+            tasks (list[tuple[str, dfvfs.PathSpec]]): tasks in dependency order.
+            configuration (Configuration): configuration values.
+            knowledge_base (KnowledgeBase): knowledge base.
+
+        Returns:
+            int: number of tasks that failed.
+        """
+        number_of_failed_tasks = 0
+        for module_name, source_path_spec in tasks:
+            start_time = time.time()
+            try:
+                _RunModule(modules[module_name], configuration, source_path_spec, knowledge_base)
+            except Exception as exception:  # pylint: disable=broad-except
+                self._LogFailedTask(module_name, source_path_spec, exception)
+                number_of_failed_tasks += 1
+                continue
+
+            logger.info('{0:s} on {1:s} finished in {2:.2f} seconds'.format(
+                module_name, _GetPartitionName(source_path_spec), time.time() - start_time))
+
+        return number_of_failed_tasks
+
+    def _LogFailedTask(self, module_name, source_path_spec, exception):
+        """Logs a task that failed.
+
+        Args:
+            module_name (str): name of the module.
+            source_path_spec (dfvfs.PathSpec): path specification of the partition.
+            exception (Exception): exception raised by the task.
+        """
+        logger.error('{0:s} on {1:s} failed with error: {2!s}'.format(
+            module_name, _GetPartitionName(source_path_spec), exception))
+
+    def _RunParallel(self, tasks, configuration, knowledge_base, module_filter_expression,
+                     advanced_module_filter_expression):
+        """Runs the tasks in a pool of worker processes.
+
+        The dependents of a failed task still run, on the tables it has written
+        so far.
+
+        Args:
+            tasks (list[tuple[str, dfvfs.PathSpec]]): tasks in dependency order.
+            configuration (Configuration): configuration values.
+            knowledge_base (KnowledgeBase): knowledge base.
+            module_filter_expression (str): module filter expression.
+            advanced_module_filter_expression (str): advanced module filter
+                expression.
+
+        Returns:
+            int: number of tasks that failed.
+        """
+        dependencies = self._BuildDependencies(tasks)
+        dependents = {task_index: [] for task_index in dependencies}
+        for task_index, task_dependencies in dependencies.items():
+            for dependency in task_dependencies:
+                dependents[dependency].append(task_index)
+
+        # The cursor and resolver context cannot be shared between processes,
+        # every worker opens its own.
+        worker_configuration = copy.copy(configuration)
+        worker_configuration.cursor = None
+        worker_configuration.resolver_context = None
+
+        number_of_workers = min(self._number_of_workers, len(tasks))
+
+        # The tasks run at the same time, so every task gets its share of the
+        # workers for the process pools of its module, see
+        # ModuleConnector._GetNumberOfWorkers.
+        worker_configuration.number_of_workers = max(1, self._number_of_workers // number_of_workers)
+        logger.info('Running {0:d} module tasks with {1:d} workers'.format(
+            len(tasks), number_of_workers))
+
+        number_of_failed_tasks = 0
+        with futures.ProcessPoolExecutor(
+                max_workers=number_of_workers, initializer=_InitializeWorker,
+                initargs=(worker_configuration, knowledge_base, module_filter_expression,
+                          advanced_module_filter_expression)) as executor:
+            pending = {}
+            ready = collections.deque(
+                task_index for task_index, task_dependencies in dependencies.items()
+                if not task_dependencies)
+
+            def _Finish(task_index):
+                for dependent in dependents[task_index]:
+                    dependencies[dependent].discard(task_index)
+                    if not dependencies[dependent]:
+                        ready.append(dependent)
+
+            try:
+                while ready or pending:
+                    while ready:
+                        task_index = ready.popleft()
+                        module_name, source_path_spec = tasks[task_index]
+                        try:
+                            future = executor.submit(_ProcessModuleTask, module_name, source_path_spec)
+                        except futures.BrokenExecutor as exception:
+                            # A worker process was killed, no more tasks can run.
+                            self._LogFailedTask(module_name, source_path_spec, exception)
+                            number_of_failed_tasks += 1
+                            _Finish(task_index)
+                            continue
+
+                        pending[future] = task_index
+
+                    if not pending:
+                        break
+
+                    done, _ = futures.wait(pending, return_when=futures.FIRST_COMPLETED)
+                    for future in done:
+                        task_index = pending.pop(future)
+                        module_name, source_path_spec = tasks[task_index]
+                        try:
+                            elapsed_time = future.result()
+                        except Exception as exception:  # pylint: disable=broad-except
+                            self._LogFailedTask(module_name, source_path_spec, exception)
+                            number_of_failed_tasks += 1
+                        else:
+                            logger.info('{0:s} on {1:s} finished in {2:.2f} seconds'.format(
+                                module_name, _GetPartitionName(source_path_spec), elapsed_time))
+
+                        _Finish(task_index)
+
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+
+        return number_of_failed_tasks
+
+    def Run(self, modules, configuration, knowledge_base, module_filter_expression=None,
+            advanced_module_filter_expression=None):
+        """Runs the modules on every file system partition of the source.
+
+        Args:
+            modules (dict[str, ModuleConnector|AdvancedModuleAnalyzer]): module
+                connectors and advanced module analyzers per name.
+            configuration (Configuration): configuration values.
+            knowledge_base (KnowledgeBase): knowledge base.
+            module_filter_expression (Optional[str]): module filter expression
+                used by the worker processes to create their modules.
+            advanced_module_filter_expression (Optional[str]): advanced module
+                filter expression used by the worker processes to create their
+                advanced modules.
+        """
+        tasks = self._BuildTasks(modules, configuration.source_path_specs)
+        if not tasks:
+            return
+
+        if self._number_of_workers <= 1 or len(tasks) <= 1:
+            number_of_failed_tasks = self._RunSequential(modules, tasks, configuration, knowledge_base)
+        else:
+            number_of_failed_tasks = self._RunParallel(
+                tasks, configuration, knowledge_base, module_filter_expression,
+                advanced_module_filter_expression)
+
+        if number_of_failed_tasks:
+            logger.warning('{0:d} of {1:d} module tasks failed'.format(number_of_failed_tasks, len(tasks)))
@@ -327,6 +327,29 @@ class PathHelper(object):
 
     return '{0:s}:{1:s}'.format(path_spec.type_indicator, relative_path)
 
+  @classmethod
+  def GetNormalizedPath(cls, parent_path, name=None):
+    """Retrieves the normalized path stored in the file_info catalog.
+
+    The normalized path is the lower case full path of a file relative to the
+    "root" prefix used by the parent_path column, such as
+    "root/windows/system32/config/system".
+
+    Args:
+      parent_path (str): parent path, such as "root/Windows/System32/config",
+          or a full path starting with a "/" if name is not set.
+      name (Optional[str]): name of the file.
+
+    Returns:
+      str: normalized path.
+    """
+    if name is None:
+      if parent_path.startswith('/'):
+        parent_path = 'root' + parent_path
+      return parent_path.lower()
+
+    return '{0:s}/{1:s}'.format(parent_path.rstrip('/'), name).lower()
+
   @classmethod
   def GetRelativePathForPathSpec(cls, path_spec, mount_path=None):
     """Retrieves the relative path of a path specification.
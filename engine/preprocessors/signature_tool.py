@@ -110,6 +110,43 @@ class SignatureTool(object):
         return scan_state.scan_results
 
 
+    def StartScan(self, data_size):
+        """Starts a buffer based scan of data that is read in chunks.
+
+        Args:
+            data_size (int): total size of the data, needed for signatures
+                relative to the end of the data.
+
+        Returns:
+            pysigscan.scan_state: scan state.
+        """
+        scan_state = pysigscan.scan_state()
+        scan_state.set_data_size(data_size)
+        self._scanner.scan_start(scan_state)
+        return scan_state
+
+    def ScanBuffer(self, scan_state, data):
+        """Scans the next chunk of data.
+
+        Args:
+            scan_state (pysigscan.scan_state): scan state.
+            data (bytes): chunk of data.
+        """
+        self._scanner.scan_buffer(scan_state, data)
+
+    def StopScan(self, scan_state):
+        """Stops a buffer based scan.
+
+        Args:
+            scan_state (pysigscan.scan_state): scan state.
+
+        Returns:
+            list[pysigscan.scan_result]: scan results.
+        """
+        self._scanner.scan_stop(scan_state)
+        return scan_state.scan_results
+
+
 class Signature(object):
   """The format specification signature.
 
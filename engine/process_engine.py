@@ -11,11 +11,11 @@ from dfvfs.helpers import file_system_searcher
 from dfvfs.resolver import resolver as path_spec_resolver
 
 from engine import logger, knowledge_base
+from engine import module_graph
+from engine import module_scheduler
 from engine.preprocessors import manager as preprocess_manager
 from modules import manager as modules_manager
-from modules import interface as modules_interface
 from advanced_modules import manager as advanced_modules_manager
-from advanced_modules import interface as advanced_modules_interface
 
 from utility import definitions
 from utility import errors
@@ -27,20 +27,30 @@ class ProcessEngine(object):
         self._current_display_name = ''
         self._pid = os.getpid()
         self._modules = None
+        self._advanced_modules = {}
+        self._module_filter_expression = None
+        self._advanced_module_filter_expression = None
+        self._module_graph = None
         self.knowledge_base = knowledge_base.KnowledgeBase()
 
-    def SetProcessModules(self, module_filter_expression):
-        self._modules = modules_manager.ModulesManager.GetModuleObjects(
-            module_filter_expression=module_filter_expression)
+    def SetProcessModules(self, module_filter_expression, advanced_module_filter_expression=None):
+        self._module_graph = module_graph.ModuleGraph(
+            modules_manager.ModulesManager.GetModuleClasses(),
+            advanced_modules_manager.AdvancedModulesManager.GetModuleClasses())
 
-        if not self._modules:
-            raise errors.BadConfigOption
+        # Add the modules that produce the tables the selected modules consume.
+        module_filter_expression, advanced_module_filter_expression = \
+            self._module_graph.ExpandFilterExpressions(
+                module_filter_expression, advanced_module_filter_expression)
+        self._module_filter_expression = module_filter_expression
+        self._advanced_module_filter_expression = advanced_module_filter_expression
 
-    def SetProcessAdvancedModules(self, advanced_module_filter_expression):
+        self._modules = modules_manager.ModulesManager.GetModuleObjects(
+            module_filter_expression=module_filter_expression)
         self._advanced_modules = advanced_modules_manager.AdvancedModulesManager.GetModuleObjects(
             advanced_module_filter_expression=advanced_module_filter_expression)
 
-        if not self._advanced_modules:
+        if not self._modules and not self._advanced_modules:
             raise errors.BadConfigOption
 
     def Preprocess(self, artifacts_registry_object, source_path_specs, resolver_context=None):
@@ -77,39 +87,23 @@ class ProcessEngine(object):
                 'operating_system', detected_operating_systems)
 
     def Process(self, configuration):
-        and_flag = False
-        for source_path_spec in configuration.source_path_specs:
-            if source_path_spec.parent.TYPE_INDICATOR == 'VSHADOW':
-                continue
-            if source_path_spec.IsFileSystem():
-                try:
-                    for module_name in self._modules:
-                        module = self._modules.get(module_name, None)
-                        if isinstance(module, modules_interface.ModuleConnector):
-                            if module_name == 'andforensics_connector':
-                                if not and_flag:
-                                    module.Connect(configuration=configuration, source_path_spec=source_path_spec,
-                                                   knowledge_base=self.knowledge_base)
-                                    and_flag = True
-                            else:
-                                module.Connect(configuration=configuration, source_path_spec=source_path_spec,
-                                           knowledge_base=self.knowledge_base)
-
-                except RuntimeError as exception:
-                    raise errors.BackEndError(('The module cannot be connected: {0!s}').format(exception))
-
-    def ProcessAdvancedModules(self, configuration):
-        for source_path_spec in configuration.source_path_specs:
-            if source_path_spec.parent.TYPE_INDICATOR == 'VSHADOW':
-                continue
-            if source_path_spec.IsFileSystem():
-                try:
-                    for advanced_module_name in self._advanced_modules:
-                        advanced_module = self._advanced_modules.get(advanced_module_name, None)
-                        if isinstance(advanced_module, advanced_modules_interface.AdvancedModuleAnalyzer):
-                            advanced_module.Analyze(configuration=configuration, source_path_spec=source_path_spec)
-                except RuntimeError as exception:
-                    raise errors.BackEndError(('The module cannot be connected: {0!s}').format(exception))
+        """Runs the module connectors and advanced module analyzers.
+
+        Every analyzer starts as soon as the modules producing its input
+        tables have finished.
+
+        Args:
+            configuration (Configuration): configuration values.
+        """
+        modules = dict(self._modules)
+        modules.update(self._advanced_modules)
+
+        scheduler = module_scheduler.ModuleScheduler(
+            self._module_graph, number_of_workers=configuration.number_of_workers)
+        scheduler.Run(
+            modules, configuration, self.knowledge_base,
+            module_filter_expression=self._module_filter_expression,
+            advanced_module_filter_expression=self._advanced_module_filter_expression)
 
     def AnalyzeArtifacts(self, configuration):
 
@@ -1,5 +1,6 @@
 # carpe_doc.py
 import os
+import re
 import struct
 import sys
 import zlib
@@ -7,16 +8,70 @@ import zlib
 import compoundfiles
 import olefile
 
+# XLS and PPT are imported where embedded workbooks and presentations are
+# parsed, the directory is added to the path for carpe_compound as well.
 try:
-    from carpe_xls import XLS
+    from carpe_ppt import decode_utf16, get_utf16_units
 except ModuleNotFoundError:
     sys.path.append(os.path.dirname(__file__))
-    from carpe_xls import XLS
-try:
-    from carpe_ppt import PPT
-except ModuleNotFoundError:
-    sys.path.append(os.path.dirname(__file__))
-    from carpe_ppt import PPT
+    from carpe_ppt import decode_utf16, get_utf16_units
+
+
+# Removed characters: field begin (0x13) and section characters.
+DOC_REMOVED_CHARACTER = re.compile(r'[\x13\x01\x14\x15]')
+DOC_LEADING_BLANKS = re.compile(r'[\x20\xa0\x0a\x0d\x04\x03]*')
+# Field code after a field begin and an optional blank.
+DOC_FIELD_CODE = re.compile(r'SEQ|HYPERLINK|TO|PAGEREF|INDEX|EMBED|SHAPE|PAGE|DOC|STYLEREF|TITLE|IF DATE')
+# Field separator or field end, which ends a field code.
+DOC_FIELD_END = re.compile(r'\x20\x01\x14|\x20[\x14\x15]|\x14')
+
+
+def filter_doc_text(text):
+    """Removes the leading blanks, the field codes and the section characters.
+
+    A field begin (0x13) and an optional blank are removed. If at least 8 code
+    units follow and they start with a field code, the field code is removed up
+    to its field separator or field end with 3 code units left. The end of a
+    field code is searched again only after the previous end was passed, so
+    field begins without an end do not scan the rest of the text every time.
+
+    Args:
+        text (str): text, one character per UTF-16 code unit.
+
+    Returns:
+        str: filtered text.
+    """
+    parts = []
+    position = 0
+    field_end = None
+    field_end_searched = False
+    while position < len(text):
+        if not parts:
+            position = DOC_LEADING_BLANKS.match(text, position).end()
+
+        match = DOC_REMOVED_CHARACTER.search(text, position)
+        if not match:
+            parts.append(text[position:])
+            break
+
+        if match.start() > position:
+            parts.append(text[position:match.start()])
+        position = match.end()
+        if match.group() != '\x13':
+            continue
+
+        if text.startswith('\x20', position):
+            position += 1
+        if len(text) - position < 8 or not DOC_FIELD_CODE.match(text, position):
+            continue
+
+        if not field_end_searched or (field_end is not None and field_end.start() < position):
+            field_end = DOC_FIELD_END.search(text, position)
+            field_end_searched = True
+        if field_end is not None and field_end.start() <= len(text) - 3:
+            position = field_end.end()
+
+    return ''.join(parts)
 
 
 class DOC:
@@ -37,144 +92,20 @@ class DOC:
             self.__parse_doc_damaged__()
 
     def __doc_extra_filter__(self, string, uFilteredTextLen):
-        i = 0
-        j = 0
-        k = 0
-        textLen = uFilteredTextLen
-        # 1. 첫 부분의        공백        문자        모두        제거
-        # 2. 공백        문자가        2        개        이상인        경우에        1        개로        만들자
-        # 3.        개행        문자가        2        개        이상인        경우에        1        개로        만들자
-        # 4.        Filtering
-
-        uBlank = b'\x20\x00'   # ASCII Blank
-        uBlank2 = b'\xA0\x00'   # Unicode Blank
-        uNewline = b'\x0A\x00'   # Line Feed
-        uNewline2 = b'\x0D\x00'
-        uNewline3 = b'\x04\x00'
-        uNewline4 = b'\x03\x00'
-        uSection = b'\x01\x00'
-        uSection2 = b'\x02\x00'
-        uSection3 = b'\x05\x00'
-        uSection4 = b'\x07\x00'
-        uSection5 = b'\x08\x00'
-        uSection6 = b'\x15\x00'
-        uSection7 = b'\x0C\x00'
-        uSection8 = b'\x0B\x00'
-        uSection9 = b'\x14\x00'
-        uTrash = b'\x00\x00'
-        uCaption = b'\x53\x00\x45\x00\x51\x00'
-        uCaption2 = b'\x41\x00\x52\x00\x41\x00\x43\x00\x49\x00\x43\x00\x20\x00\x14\x00'
-        uHyperlink = b'\x48\x00\x59\x00\x50\x00\x45\x00\x52\x00\x4C\x00\x49\x00\x4E\x00\x4B\x00'
-        uToc = b'\x54\x00\x4F\x00'
-        uPageref = b'\x50\x00\x41\x00\x47\x00\x45\x00\x52\x00\x45\x00\x46\x00'
-        uIndex = b'\x49\x00\x4E\x00\x44\x00\x45\x00\x58\x00'
-        uEnd = b'\x20\x00\x01\x00\x14\x00'
-        uEnd2 = b'\x20\x00\x14\x00'
-        uEnd3 = b'\x20\x00\x15\x00'
-        uEnd4 = b'\x14\x00'
-        uEnd5 = b'\x01\x00\x14\x00'
-        uEnd6 = b'\x15\x00'
-        uHeader = b'\x13\x00'
-        uChart = b'\x45\x00\x4D\x00\x42\x00\x45\x00\x44\x00'
-        uShape = b'\x53\x00\x48\x00\x41\x00\x50\x00\x45\x00'
-        uPage = b'\x50\x00\x41\x00\x47\x00\x45\x00'
-        uDoc = b'\x44\x00\x4F\x00\x43\x00'
-        uStyleref = b'\x53\x00\x54\x00\x59\x00\x4C\x00\x45\x00\x52\x00\x45\x00\x46\x00'
-        uTitle = b'\x54\x00\x49\x00\x54\x00\x4C\x00\x45\x00'
-        uDate = b'\x49\x00\x46\x00\x20\x00\x44\x00\x41\x00\x54\x00\x45\x00'
-        filteredText = string
-        while i < textLen :
-            if i == 0:
-                k = 0
-                while (filteredText[0:2] == uBlank or filteredText[0:2] == uBlank2 or filteredText
-                                                                                      [0:2] == uNewline or filteredText
-                                                                                                          [0:2] == uNewline2 or
-                       filteredText[0:2] == uNewline3 or filteredText[0:2] == uNewline4) :
-                    filteredText = filteredText[:k] + filteredText[k + 2:]
-                    textLen -= 2
-
-                    if (len(filteredText) == 0):
-                        break
-
-            if len(filteredText) == 0:
-                break
-
-
-            if (len(filteredText) >= 2 + i) and filteredText[i : i + 2] == uHeader:
-                filteredText = filteredText[:i] + filteredText[i + 2:]
-                textLen -= 2
-
-                if (len(filteredText) >= 2 + i) and filteredText[i : i + 2] == uBlank:
-                    filteredText = filteredText[:i] + filteredText[i + 2:]
-                    textLen -= 2
-
-                charSize = 0
-                temp = True
-                j = i
-
-                if (len(filteredText) >= 16 + i) and \
-                        (filteredText[i: i + 6] == uCaption or filteredText[i: i + 18] == uHyperlink or
-                        filteredText[i: i + 4] == uToc or filteredText[i: i + 14] == uPageref or filteredText[
-                                                                                                 i: i + 10] == uIndex or
-                        filteredText[i: i + 10] == uChart or filteredText[i: i + 10] == uShape or filteredText[
-                                                                                                  i: i + 8] == uPage or
-                        filteredText[i: i + 6] == uDoc or filteredText[i: i + 16] == uStyleref or filteredText[
-                                                                                                  i: i + 10] == uTitle or filteredText[
-                                                                                                                          i: i + 14] == uDate):
-                    pass
-                else:
-                    temp = False
-
-                while temp == True:
-                    if (len(filteredText) >= 6 + j) and (filteredText[j: j + 6] == uEnd):
-                        charSize += 6
-                        j += 6
-                        break
-
-                    elif (len(filteredText) >= 4 + j) and (
-                            filteredText[j: j + 4] == uEnd2 or filteredText[j: j + 4] == uEnd3):
-                        charSize += 4
-                        j += 4
-                        break
-                    elif (len(filteredText) >= 2 + j) and (filteredText[j: j + 2] == uEnd4):
-                        charSize += 2
-                        j += 2
-                        break
-
-                    charSize += 2
-                    j += 2
-
-                    if (len(filteredText) < 6 + j):
-                        temp = False
-                        break
-
-                if temp == True:
-                    filteredText = filteredText[:i] + filteredText[i + charSize:]
-                    textLen -= charSize
-
-                i -= 2
-                continue
-
-            if (len(filteredText) >= 2 + i) and (
-                    filteredText[i: i + 2] == uSection or filteredText[i: i + 2] == uSection6 or
-                    filteredText[i: i + 2] == uSection9):
-                filteredText = filteredText[:i] + filteredText[i + 2:]
-                textLen -= 2
-
-                i -= 2
-                continue
-
-            if (len(filteredText) >= 4 + i) and (filteredText[i: i + 4] == uHeader):
-                filteredText = filteredText[:i] + filteredText[i + 4:]
-                textLen -= 4
-
-                i -= 4
-                continue
-
-            i += 2
+        # 1. 첫 부분의 공백 문자와 제거되는 문자 모두 제거
+        # 2. 필드 시작 문자(0x13)와 필드 코드 제거
+        # 3. 구역 문자(0x01, 0x14, 0x15) 제거
+        # The text is filtered in one pass over its code units, instead of
+        # rebuilding the text for every removed character.
+        length = uFilteredTextLen - uFilteredTextLen % 2
+        text = filter_doc_text(get_utf16_units(string[:length]))
+
+        filteredText = bytearray(text.encode('utf-16-le', 'surrogatepass'))
+        removedLen = length - len(filteredText)
+        filteredText += string[length:]
         dict = {}
         dict['string'] = filteredText
-        dict['length'] = textLen
+        dict['length'] = uFilteredTextLen - removedLen
         return dict
 
     def __parse_doc_normal__(self):
@@ -210,7 +141,7 @@ class DOC:
         fcClxSize = 0
         lcbClxSize = 0
         ClxSize = 0
-        string = b''
+        string = bytearray()
         CONST_FCFLAG = 1073741824  # 0x40000000
         CONST_FCINDEXFLAG = 1073741823  # 0x3FFFFFFF
         i = 0
@@ -549,11 +480,7 @@ class DOC:
                     filteredText += b'\x0A\x00\x0A\x00\x00\x00'
 
         #######
-        for i in range(0, len(filteredText), 2):
-            try:
-                self.compound.content += filteredText[i:i+2].decode('utf-16')
-            except UnicodeDecodeError:
-                continue
+        self.compound.content += decode_utf16(filteredText)
 
 
         ##### Image #####
@@ -856,7 +783,7 @@ class DOC:
         fcClxSize = 0
         lcbClxSize = 0
         ClxSize = 0
-        string = b''
+        string = bytearray()
         CONST_FCFLAG = 1073741824  # 0x40000000
         CONST_FCINDEXFLAG = 1073741823  # 0x3FFFFFFF
         i = 0
@@ -1186,13 +1113,8 @@ class DOC:
                 else:
                     filteredText += b'\x0A\x00\x0A\x00\x00\x00'
 
-        result = ""
         #######
-        for i in range(0, len(filteredText), 2):
-            try:
-                result += filteredText[i:i+2].decode('utf-16')
-            except UnicodeDecodeError:
-                continue
+        result = decode_utf16(filteredText)
 
         return result
 
@@ -1292,7 +1214,7 @@ class DOC:
         one_table = b''
         zero_table = b''
     
-        string = b''
+        string = bytearray()
         CONST_FCFLAG = 1073741824		# 0x40000000
         CONST_FCINDEXFLAG = 1073741823	# 0x3FFFFFFF
     
@@ -1678,11 +1600,7 @@ class DOC:
                     filteredText += b'\x0A\x00\x0A\x00\x00\x00'
 
         #######
-        for i in range(0, len(filteredText), 2):
-            try:
-                self.compound.content += filteredText[i:i + 2].decode('utf-16')
-            except UnicodeDecodeError:
-                continue
+        self.compound.content += decode_utf16(filteredText)
         """
         ##### Image #####
         try:
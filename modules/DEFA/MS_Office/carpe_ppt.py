@@ -1,4 +1,5 @@
 # carpe_ppt.py
+import re
 import struct
 import zipfile
 import zlib
@@ -6,6 +7,53 @@ import os
 import shutil
 from compoundfiles import *
 
+
+# Supplementary characters, which are decoded from a surrogate pair.
+UTF16_SUPPLEMENTARY_CHARACTER = re.compile('[\U00010000-\U0010ffff]')
+# Code units that do not decode on their own: byte order marks and surrogates.
+UTF16_SKIPPED_CHARACTERS = re.compile('[\ufeff\ufffe\ud800-\udfff]')
+
+# Whitespace of the text filter, after tabs and vertical tabs became blanks and
+# carriage returns line feeds.
+PPT_WHITESPACE_TRANSLATION = {0x09: ' ', 0x0B: ' ', 0x0D: '\n'}
+PPT_NEWLINE_BLANKS = re.compile(r'\n[\n\x20\xa0]+')
+PPT_UNICODE_BLANKS = re.compile(r'\xa0[\x20\xa0]+')
+PPT_BLANKS = re.compile(r'\x20[\x20\xa0]+')
+
+
+def _split_surrogate_pair(match):
+    code = ord(match.group()) - 0x10000
+    return chr(0xD800 + (code >> 10)) + chr(0xDC00 + (code & 0x3FF))
+
+
+def get_utf16_units(data):
+    """Decodes UTF-16 little-endian text with one character per code unit.
+
+    Surrogate pairs are kept as two surrogate characters, which encode back to
+    the same bytes with the surrogatepass error handler.
+
+    Args:
+        data (bytes): UTF-16 little-endian text, a trailing odd byte is ignored.
+
+    Returns:
+        str: code units.
+    """
+    text = bytes(data[:len(data) - len(data) % 2]).decode('utf-16-le', 'surrogatepass')
+    return UTF16_SUPPLEMENTARY_CHARACTER.sub(_split_surrogate_pair, text)
+
+
+def decode_utf16(data):
+    """Decodes UTF-16 little-endian text as the characters decoded one by one.
+
+    Args:
+        data (bytes): UTF-16 little-endian text.
+
+    Returns:
+        str: text, without the code units that do not decode on their own.
+    """
+    return UTF16_SKIPPED_CHARACTERS.sub('', get_utf16_units(data))
+
+
 class PPT :
     RT_CurrentUserAtom = b'\xF6\x0F'
     RT_UserEditAtom = b'\xF5\x0F'
@@ -302,83 +350,23 @@ class PPT :
         return self.compound.CONST_SUCCESS
 
     def __ppt_extra_filter__(self, tempLen):
-        i = 0
-        j = 0
-        k = 0
-
-        uBlank = b'\x20\x00'    # ASCII Blank
-        uBlank2 = b'\xA0\x00'   # Unicode Blank
-        uBlank3 = b'\x0B\x00'
-        uNewline = b'\x0A\x00'  # Line Feed
-        uTab = b'\x09\x00'      # Horizontal Tab
-        uCR = b'\x0D\x00'       # Carriage Return
-        uFilteredTextLen = tempLen
-        while i < len(self.filteredText):
-            if i == 0:
-                k = 0
-                while self.filteredText[0 : 2] == uBlank or self.filteredText[0 : 2] == uBlank2 or self.filteredText[0 : 2] == uNewline :
-                    self.filteredText = self.filteredText[: k] + self.filteredText[k + 2 :]
-                    uFilteredTextLen -= 1
-
-                    if len(self.filteredText) <= 0:
-                        break
-
-            if len(self.filteredText) <= 0:
-                break
-
-            if self.filteredText[i : i + 2] == uNewline:
-                j = i
-                while True :
-                    j += 2
-                    if j >= len(self.filteredText):
-                        break
-
-                    if self.filteredText[j : j + 2] == uNewline or self.filteredText[j : j + 2] == uBlank or self.filteredText[j : j + 2] == uBlank2:
-                        self.filteredText = self.filteredText[: j] + self.filteredText[j + 2:]
-                        uFilteredTextLen -= 1
-                        j -= 2
-                    elif self.filteredText[j : j + 2] == uTab or self.filteredText[j : j + 2] == uBlank3 or self.filteredText[j : j + 2] == uCR :
-                        self.filteredText = self.filteredText[: j] + self.filteredText[j + 2:]
-                        uFilteredTextLen -= 1
-                        j -= 2
-                    else :
-                        break
-
-
-            elif self.filteredText[i : i + 2] == uBlank or self.filteredText[i : i + 2] == uBlank2:
-                j = i
-                while True :
-                    j += 2
-                    if j >= len(self.filteredText):
-                        break
-
-                    if self.filteredText[j: j + 2] == uBlank or self.filteredText[j : j + 2] == uBlank2:
-                        self.filteredText = self.filteredText[: j] + self.filteredText[j + 2:]
-                        uFilteredTextLen -= 1
-                        j -= 2
-                    elif self.filteredText[j: j + 2] == uTab:
-                        self.filteredText = self.filteredText[: j] + self.filteredText[j + 2:]
-                        uFilteredTextLen -= 1
-                        j -= 2
-                    elif self.filteredText[j: j + 2] == uBlank3:
-                        self.filteredText = self.filteredText[: j] + self.filteredText[j + 2:]
-                        uFilteredTextLen -= 1
-                        j -= 2
-                    else:
-                        break
-
-            elif self.filteredText[i : i + 2] == uBlank3:
-                self.filteredText[i] = 0x20
-                i -= 2
-            elif self.filteredText[i : i + 2] == uCR:
-                self.filteredText[i] = 0x0A
-                i -= 2
-            elif self.filteredText[i : i + 2] == uTab:
-                self.filteredText[i] = 0x20
-                i -= 2
-
-            i += 2
-
+        # 1. 첫 부분의 공백 문자 모두 제거
+        # 2. 개행 문자 뒤의 공백, 개행 문자 제거
+        # 3. 공백 문자 뒤의 공백 문자 제거
+        # The text is filtered with regular expressions over its code units,
+        # instead of rebuilding the text for every removed character.
+        length = len(self.filteredText) - len(self.filteredText) % 2
+        text = get_utf16_units(self.filteredText).translate(PPT_WHITESPACE_TRANSLATION)
+        text = text.lstrip('\n\x20\xa0')
+        text = PPT_NEWLINE_BLANKS.sub('\n', text)
+        # A run of blanks is replaced by its first blank.
+        text = PPT_UNICODE_BLANKS.sub('\xa0', text)
+        text = PPT_BLANKS.sub('\x20', text)
+
+        filteredText = bytearray(text.encode('utf-16-le', 'surrogatepass'))
+        filteredText += self.filteredText[length:]
+        uFilteredTextLen = tempLen - (len(self.filteredText) - len(filteredText)) // 2
+        self.filteredText = filteredText
         return uFilteredTextLen
 
     def __parse_ppt_normal__(self):
@@ -641,11 +629,7 @@ class PPT :
             except UnicodeDecodeError:
                 continue
        """
-        for i in range(0, len(self.filteredText), 2):
-            try:
-                self.compound.content += self.filteredText[i:i+2].decode('utf-16')
-            except UnicodeDecodeError:
-                continue
+        self.compound.content += decode_utf16(self.filteredText)
         #self.compound.content = self.filteredText.decode('utf-16')
 
 
@@ -1141,12 +1125,7 @@ class PPT :
             except UnicodeDecodeError:
                 continue
         """
-        result = ""
-        for i in range(0, len(self.filteredText), 2):
-            try:
-                result += self.filteredText[i:i+2].decode('utf-16')
-            except UnicodeDecodeError:
-                continue
+        result = decode_utf16(self.filteredText)
         #self.compound.content = self.filteredText.decode('utf-16')
 
         return result
@@ -1460,11 +1439,7 @@ class PPT :
 
         uFilteredTextLen = self.__ppt_extra_filter__(uFilteredTextLen)
 
-        for i in range(0, len(self.filteredText), 2):
-            try:
-                self.compound.content += self.filteredText[i:i+2].decode('utf-16')
-            except UnicodeDecodeError:
-                continue
+        self.compound.content += decode_utf16(self.filteredText)
 
         #self.compound.content = self.filteredText.decode('utf-16')
 
@@ -181,7 +181,7 @@ class XLS :
 
         arrStXFType = []
         b_drawing = False
-        drawing_data = b''
+        drawing_data = bytearray()
         for record in records:
             if record['type'] == 0xE0:      # GlobalStream XF Type
                 stGlobalStreamXF = {}
@@ -733,7 +733,7 @@ class XLS :
 
         arrStXFType = []
         b_drawing = False
-        drawing_data = b''
+        drawing_data = bytearray()
         for record in records:
             if record['type'] == 0xE0:  # GlobalStream XF Type
                 stGlobalStreamXF = {}
@@ -1035,7 +1035,7 @@ class XLS :
 
         arrStXFType = []
         b_drawing = False
-        drawing_data = b''
+        drawing_data = bytearray()
         for record in records:
             if record['type'] == 0xE0:  # GlobalStream XF Type
                 stGlobalStreamXF = {}
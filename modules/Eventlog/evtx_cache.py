@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""Cache of parsed EVTX records.
+
+The records of an event log are cached per chunk of 64 KiB. A log file is
+identified by its SHA-1 and every chunk index of the file refers to the SHA-1
+of the chunk content, so a log that was seen before is not parsed again and of
+a log with appended records only the changed and new chunks are parsed.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import zlib
+
+
+FILE_HEADER_SIZE = 0x1000
+CHUNK_SIZE = 0x10000
+
+# Maximum number of chunk SHA-1s per query, below the variable limit of SQLite.
+MAXIMUM_QUERY_CHUNKS = 500
+
+# Increase when the cached record values change, which drops the cache.
+CACHE_FORMAT_VERSION = 2
+
+
+def HashEvtxFile(path):
+    """Calculates the SHA-1 of an EVTX file and of each of its chunks.
+
+    Args:
+        path (str): path of the EVTX file.
+
+    Returns:
+        tuple[str, list[str]]: SHA-1 of the file and SHA-1 per chunk, in the
+            order of the chunks.
+    """
+    file_hash = hashlib.sha1()
+    chunk_hashes = []
+    with open(path, 'rb') as file_object:
+        data = file_object.read(FILE_HEADER_SIZE)
+        file_hash.update(data)
+        while True:
+            data = file_object.read(CHUNK_SIZE)
+            if not data:
+                break
+            file_hash.update(data)
+            # A trailing partial chunk is not parsed by python-evtx.
+            if len(data) == CHUNK_SIZE:
+                chunk_hashes.append(hashlib.sha1(data).hexdigest())
+
+    return file_hash.hexdigest(), chunk_hashes
+
+
+class EvtxCache(object):
+    """SQLite database with the parsed records per EVTX chunk."""
+
+    def __init__(self, path):
+        """Initializes an EVTX cache.
+
+        Args:
+            path (str): path of the cache database, which is created if it does
+                not exist.
+        """
+        super(EvtxCache, self).__init__()
+        self._connection = None
+        self._path = path
+
+    def Open(self):
+        """Opens the cache database."""
+        directory = os.path.dirname(self._path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        # Several partitions can be processed at the same time.
+        self._connection = sqlite3.connect(self._path, timeout=60)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)')
+
+        row = self._connection.execute('SELECT value FROM metadata WHERE key = \'format_version\'').fetchone()
+        if row is None or row[0] != str(CACHE_FORMAT_VERSION):
+            self._connection.execute('DROP TABLE IF EXISTS evtx_file')
+            self._connection.execute('DROP TABLE IF EXISTS evtx_file_chunk')
+            self._connection.execute('DROP TABLE IF EXISTS evtx_chunk')
+            self._connection.execute(
+                'INSERT OR REPLACE INTO metadata VALUES (\'format_version\', ?)', (str(CACHE_FORMAT_VERSION),))
+
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS evtx_file (file_sha1 TEXT PRIMARY KEY, number_of_chunks INTEGER)')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS evtx_file_chunk (file_sha1 TEXT, chunk_index INTEGER, chunk_sha1 TEXT, '
+            'PRIMARY KEY (file_sha1, chunk_index))')
+        self._connection.execute(
+            'CREATE TABLE IF NOT EXISTS evtx_chunk (chunk_sha1 TEXT PRIMARY KEY, records BLOB)')
+        self._connection.commit()
+
+    def Close(self):
+        """Closes the cache database."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def GetFileChunks(self, file_sha1):
+        """Retrieves the chunks of a cached EVTX file.
+
+        Args:
+            file_sha1 (str): SHA-1 of the file.
+
+        Returns:
+            list[str]: SHA-1 per chunk index or None if the file is not cached.
+        """
+        row = self._connection.execute(
+            'SELECT number_of_chunks FROM evtx_file WHERE file_sha1 = ?', (file_sha1,)).fetchone()
+        if row is None:
+            return None
+
+        chunk_hashes = [chunk_sha1 for chunk_sha1, in self._connection.execute(
+            'SELECT chunk_sha1 FROM evtx_file_chunk WHERE file_sha1 = ? ORDER BY chunk_index', (file_sha1,))]
+        if len(chunk_hashes) != row[0]:
+            return None
+        return chunk_hashes
+
+    def GetCachedChunks(self, chunk_hashes):
+        """Determines which chunks are cached, without reading their records.
+
+        Args:
+            chunk_hashes (list[str]): SHA-1 per chunk.
+
+        Returns:
+            set[str]: SHA-1 of the cached chunks.
+        """
+        cached_chunks = set()
+        for index in range(0, len(chunk_hashes), MAXIMUM_QUERY_CHUNKS):
+            query_chunks = chunk_hashes[index:index + MAXIMUM_QUERY_CHUNKS]
+            cached_chunks.update(chunk_sha1 for chunk_sha1, in self._connection.execute(
+                'SELECT chunk_sha1 FROM evtx_chunk WHERE chunk_sha1 IN ({0:s})'.format(
+                    ', '.join(['?'] * len(query_chunks))), query_chunks))
+        return cached_chunks
+
+    def GetChunkRecords(self, chunk_sha1):
+        """Retrieves the records of a cached chunk.
+
+        Args:
+            chunk_sha1 (str): SHA-1 of the chunk content.
+
+        Returns:
+            list[list[object]]: values per record or None if the chunk is not cached.
+        """
+        row = self._connection.execute(
+            'SELECT records FROM evtx_chunk WHERE chunk_sha1 = ?', (chunk_sha1,)).fetchone()
+        if row is None:
+            return None
+        return json.loads(zlib.decompress(row[0]).decode('utf-8'))
+
+    def AddChunkRecords(self, chunk_sha1, records):
+        """Adds the records of a parsed chunk.
+
+        Every chunk is committed, so the write lock of the database, which the
+        tasks of other partitions wait for, is not held while parsing.
+
+        Args:
+            chunk_sha1 (str): SHA-1 of the chunk content.
+            records (list[list[object]]): values per record.
+        """
+        data = zlib.compress(json.dumps(records).encode('utf-8'))
+        self._connection.execute(
+            'INSERT OR REPLACE INTO evtx_chunk VALUES (?, ?)', (chunk_sha1, sqlite3.Binary(data)))
+        self._connection.commit()
+
+    def AddFile(self, file_sha1, chunk_hashes):
+        """Adds a parsed file, after the records of all its chunks were added.
+
+        Args:
+            file_sha1 (str): SHA-1 of the file.
+            chunk_hashes (list[str]): SHA-1 per chunk index.
+        """
+        self._connection.executemany(
+            'INSERT OR REPLACE INTO evtx_file_chunk VALUES (?, ?, ?)',
+            [(file_sha1, chunk_index, chunk_sha1) for chunk_index, chunk_sha1 in enumerate(chunk_hashes)])
+        self._connection.execute(
+            'INSERT OR REPLACE INTO evtx_file VALUES (?, ?)', (file_sha1, len(chunk_hashes)))
+        self._connection.commit()
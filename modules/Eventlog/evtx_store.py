@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Indexed store of the parsed event log records.
+
+lv1_os_win_evt_total holds the event identifier as an integer and the channel
+of every record, which are indexed per partition, and lv1_os_win_evt_data the
+name and value pairs of the EventData of the records.
+
+Every lv1_os_win_event_logs_* classifier declares the channels and event
+identifiers of the events it handles in EVENTS. DispatchEvents reads the
+events of a partition in one query and routes every event to the classifiers
+of its channel and event identifier, instead of a scan of the table per
+classifier.
+"""
+
+import collections
+
+
+def GetChannel(source):
+    """Determines the channel of an event log from its file name.
+
+    Args:
+        source (str): file name, such as
+            'Microsoft-Windows-DNS Client Events%4Operational.evtx'.
+
+    Returns:
+        str: channel, such as 'Microsoft-Windows-DNS Client Events/Operational'.
+    """
+    if source.lower().endswith('.evtx'):
+        source = source[:-5]
+    return source.replace('%4', '/')
+
+
+def GetEventId(event_id):
+    """Converts an event identifier to the integer stored in the table.
+
+    Args:
+        event_id (str): event identifier of a record.
+
+    Returns:
+        int: event identifier or None if not a number.
+    """
+    if event_id is None or not event_id.isdigit():
+        return None
+    return int(event_id)
+
+
+def GetEvents(configuration, events, par_id=None):
+    """Retrieves the events of a classifier.
+
+    Args:
+        configuration (Configuration): configuration with the database cursor.
+        events (list[tuple[str, int]]): channel and event identifier per event,
+            a channel of None matches every channel.
+        par_id (Optional[str]): partition identifier, None for every partition.
+
+    Returns:
+        list[tuple[str, str, str, str, str]]: data, event identifier, creation
+            time, source and user SID per event.
+    """
+    return DispatchEvents(configuration, par_id, {None: events})[None]
+
+
+def DispatchEvents(configuration, par_id, classifiers):
+    """Routes the events of a partition to the classifiers in one query.
+
+    Args:
+        configuration (Configuration): configuration with the database cursor.
+        par_id (str): partition identifier, None for every partition.
+        classifiers (dict[object, list[tuple[str, int]]]): channel and event
+            identifier per event per classifier, a channel of None matches every
+            channel.
+
+    Returns:
+        dict[object, list[tuple[str, str, str, str, str]]]: data, event
+            identifier, creation time, source and user SID per event per
+            classifier.
+    """
+    dispatch_table = collections.defaultdict(list)
+    for classifier, events in classifiers.items():
+        for channel, event_id in events:
+            dispatch_table[(channel, event_id)].append(classifier)
+
+    events_per_classifier = {classifier: [] for classifier in classifiers}
+    event_ids = sorted(set(event_id for _, event_id in dispatch_table))
+    if not event_ids:
+        return events_per_classifier
+
+    query = "SELECT data, event_id, time_created, source, user_sid, channel FROM lv1_os_win_evt_total " \
+            "WHERE event_id IN ({0:s})".format(', '.join(['%s'] * len(event_ids)))
+    values = list(event_ids)
+    if par_id is not None:
+        query += " AND par_id = %s"
+        values.append(par_id)
+
+    result_query = configuration.cursor.execute_query_mul(query, values)
+    if result_query == -1:
+        return events_per_classifier
+
+    for data, event_id, time_created, source, user_sid, channel in result_query:
+        # A classifier gets an event once, even if it matches more than one entry.
+        matches = dict.fromkeys(dispatch_table.get((channel, event_id), []) + dispatch_table.get((None, event_id), []))
+        if not matches:
+            continue
+        # The classifiers compare the event identifier as text.
+        result_data = (data, str(event_id), time_created, source, user_sid)
+        for classifier in matches:
+            events_per_classifier[classifier].append(result_data)
+
+    return events_per_classifier
@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class Antiforensics_Information:
     par_id = ''
@@ -17,16 +18,21 @@ class Antiforensics_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGANTIFORENSICS(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('System', 1100), ('System', 1102), ('System', 104),
+    ('Security', 1100), ('Security', 1102), ('Security', 104),
+]
+
+def EVENTLOGANTIFORENSICS(configuration, result_query=None):
 
     #db = database.Database()
     #db.open()
 
     antiforensics_list = []
     antiforensics_list_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where (event_id like '1100' or event_id like '1102' or event_id like '104') and (source like '%System%' or source like '%Security%')"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         antiforensics_information = Antiforensics_Information()
         try:
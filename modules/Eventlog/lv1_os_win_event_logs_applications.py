@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class Applications_Information:
     par_id = ''
@@ -20,16 +21,20 @@ class Applications_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGAPPLICATIONS(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('Microsoft-Windows-Application-Experience/Program-Compatibility-Assistant', 17),
+]
+
+def EVENTLOGAPPLICATIONS(configuration, result_query=None):
 
     #db = database.Database()
     #db.open()
 
     applications_list = []
     applications_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where (event_id like '17' and source like '%Program-Compatibility%')"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         applications_information = Applications_Information()
         try:
@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class DNS_Information:
     par_id = ''
@@ -18,16 +19,25 @@ class DNS_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGDNS(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('Microsoft-Windows-DNS Client Events/Operational', 1001),
+    ('Microsoft-Windows-DNS Client Events/Operational', 3006),
+    ('Microsoft-Windows-DNS Client Events/Operational', 3008),
+    ('Microsoft-Windows-DNS Client Events/Operational', 3010),
+    ('Microsoft-Windows-DNS Client Events/Operational', 3019),
+    ('Microsoft-Windows-DNS Client Events/Operational', 3020),
+]
+
+def EVENTLOGDNS(configuration, result_query=None):
 
     #db = database.Database()
     #db.open()
 
     dns_list = []
     dns_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where (event_id like '1001' or event_id like '3006' or event_id like '3008' or event_id like '3010' or event_id like '3019' or event_id like '3020') and source like '%DNS Client Events%'"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         dns_information = DNS_Information()
         try:
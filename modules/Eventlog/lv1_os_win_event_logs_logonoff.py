@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class Eventlog_Information:
     par_id = ''
@@ -17,17 +18,28 @@ class Eventlog_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGONOFF(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('Security', 4624), ('Security', 4634), ('Security', 4625), ('Security', 4648), ('Security', 7002),
+    ('Microsoft-Windows-User Profile Service/Operational', 1),
+    ('Microsoft-Windows-User Profile Service/Operational', 2),
+    ('Microsoft-Windows-User Profile Service/Operational', 3),
+    ('Microsoft-Windows-User Profile Service/Operational', 4),
+]
+
+def EVENTLOGONOFF(configuration, result_query=None):
 
     #db = database.Database()
     #db.open()
 
     event_list = []
     event_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where (event_id like '4624' and source like '%Security%' and data like '%S-1-5-21%') or (event_id like '4634' and source like '%Security%') or (event_id like '4625' and source like '%Security%') or (event_id like '4648' and source like '%Security%') or (event_id like '7002' and source like '%Security%') or (event_id like '1' and source like '%User Profile Service%') or (event_id like '2' and source like '%User Profile Service%') or (event_id like '3' and source like '%User Profile Service%') or (event_id like '4' and source like '%User Profile Service%')"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
+        # Only the logons of local and domain accounts.
+        if result_data[1] == '4624' and 'S-1-5-21' not in result_data[0]:
+            continue
         eventlog_information = Eventlog_Information()
         try:
             if result_data[1] == '4624' or result_data[1] == '4648':
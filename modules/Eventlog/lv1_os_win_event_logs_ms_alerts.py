@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class MS_Alerts_Information:
     par_id = ''
@@ -21,15 +22,19 @@ class MS_Alerts_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGMSALERTS(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('OAlerts', 300),
+]
+
+def EVENTLOGMSALERTS(configuration, result_query=None):
     #db = database.Database()
     #db.open()
 
     ms_alerts_list = []
     ms_alerts_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where event_id like '300' and source like '%OAlerts.evtx%'"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         ms_alerts_information = MS_Alerts_Information()
         try:
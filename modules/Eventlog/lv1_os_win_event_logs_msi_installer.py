@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class MSI_Installer_Information:
     par_id = ''
@@ -20,16 +21,20 @@ class MSI_Installer_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGMSIINSTALLER(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    (None, 1033), (None, 11707), (None, 11724),
+]
+
+def EVENTLOGMSIINSTALLER(configuration, result_query=None):
 
     #db = database.Database()
     #db.open()
 
     msi_installer_list = []
     msi_installer_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where (event_id = '1033' or event_id = '11707' or event_id = '11724')"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         msi_installer_information = MSI_Installer_Information()
         try:
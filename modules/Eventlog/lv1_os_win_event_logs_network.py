@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class Network_Information:
     par_id = ''
@@ -20,15 +21,19 @@ class Network_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGNETWORK(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('Microsoft-Windows-NetworkProfile/Operational', 10000), ('Microsoft-Windows-NetworkProfile/Operational', 10001),
+]
+
+def EVENTLOGNETWORK(configuration, result_query=None):
     #db = database.Database()
     #db.open()
 
     network_list = []
     network_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where source like '%NetworkProfile%' and (event_id like '10000' or event_id like '10001')"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         network_information = Network_Information()
         try:
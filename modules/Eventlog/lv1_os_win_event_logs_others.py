@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class Others_Information:
     par_id = ''
@@ -18,16 +19,20 @@ class Others_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGOTHERS(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('System', 7000), ('System', 6), ('System', 19), ('System', 7045),
+]
+
+def EVENTLOGOTHERS(configuration, result_query=None):
 
     #db = database.Database()
     #db.open()
 
     others_list = []
     others_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where source like '%System%' and (event_id like '7000' or event_id like '6' or event_id like '19' or event_id like '7045')"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         others_information = Others_Information()
         try:
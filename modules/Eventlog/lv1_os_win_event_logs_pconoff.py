@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class Eventlog_Information:
     par_id = ''
@@ -17,16 +18,20 @@ class Eventlog_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGPCONOFF(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('System', 6005), ('System', 1074), ('System', 6006),
+]
+
+def EVENTLOGPCONOFF(configuration, result_query=None):
 
     #db = database.Database()
     #db.open()
 
     event_list = []
     event_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where (event_id like '6005' or event_id like '1074' or event_id like '6006') and source like '%System%'"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         eventlog_information = Eventlog_Information()
         try:
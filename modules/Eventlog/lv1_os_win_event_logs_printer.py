@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class Printer_Information:
     par_id = ''
@@ -20,15 +21,20 @@ class Printer_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGPRINTER(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('Microsoft-Windows-PrintService/Admin', 307), ('Microsoft-Windows-PrintService/Admin', 801),
+    ('Microsoft-Windows-PrintService/Admin', 802),
+]
+
+def EVENTLOGPRINTER(configuration, result_query=None):
     #db = database.Database()
     #db.open()
 
     printer_list = []
     printer_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where source like '%PrintService%' and (event_id like '307' or event_id like '801' or event_id like '801' or event_id like '802')"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         printer_information = Printer_Information()
         try:
@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class Process_Information:
     par_id = ''
@@ -18,16 +19,20 @@ class Process_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGPROCESS(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('Security', 4688), ('Security', 4689),
+]
+
+def EVENTLOGPROCESS(configuration, result_query=None):
 
     #db = database.Database()
     #db.open()
 
     process_list = []
     process_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where (event_id like '4688' or event_id like '4689') and source like '%Security.evtx%'"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         process_information = Process_Information()
         try:
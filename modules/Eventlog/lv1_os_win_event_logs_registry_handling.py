@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class Registry_Handling_Information:
     par_id = ''
@@ -21,16 +22,20 @@ class Registry_Handling_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGREGISTRYHANDLING(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('Security', 4657),
+]
+
+def EVENTLOGREGISTRYHANDLING(configuration, result_query=None):
 
     #db = database.Database()
     #db.open()
 
     registry_list = []
     registry_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where event_id like '4657' and source like '%Security.evtx%'"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         registry_handling_information = Registry_Handling_Information()
         try:
@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class Remote_Information:
     par_id = ''
@@ -19,16 +20,31 @@ class Remote_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGREMOTEONOFF(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('Microsoft-Windows-TerminalServices-LocalSessionManager/Operational', 24),
+    ('Microsoft-Windows-TerminalServices-LocalSessionManager/Operational', 25),
+    ('Microsoft-Windows-TerminalServices-LocalSessionManager/Operational', 42),
+    ('Microsoft-Windows-TerminalServices-RemoteConnectionManager/Operational', 261),
+    ('Microsoft-Windows-TerminalServices-RemoteConnectionManager/Operational', 1149),
+    ('Microsoft-Windows-TerminalServices-RemoteConnectionManager/Operational', 41),
+    ('Microsoft-Windows-TerminalServices-RDPClient/Operational', 1024),
+    ('Microsoft-Windows-TerminalServices-RDPClient/Operational', 1102),
+    ('Microsoft-Windows-TerminalServices-RDPClient/Operational', 1027),
+    ('Microsoft-Windows-TerminalServices-RDPClient/Operational', 1105),
+    ('Microsoft-Windows-TerminalServices-RDPClient/Operational', 1026),
+    ('Security', 4689),
+]
+
+def EVENTLOGREMOTEONOFF(configuration, result_query=None):
 
     #db = database.Database()
     #db.open()
 
     remote_list = []
     remote_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where (source like '%TerminalServices-LocalSessionmanager%' and event_id like '24') or (source like '%TerminalServices-LocalSessionmanager%' and event_id like '25') or (source like '%TerminalServices-LocalSessionmanager%' and event_id like '42') or (source like '%TerminalServices-RemoteConnectionManager%' and event_id like '261') or (source like '%TerminalServices-RemoteConnectionManager%' and event_id like '1149') or (source like '%TerminalServices-RemoteConnectionManager%' and event_id like '41') or (source like '%TerminalServices-RDPClient%' and event_id like '1024') or (source like '%TerminalServices-RDPClient%' and event_id like '1102') or (source like '%TerminalServices-RDPClient%' and event_id like '1027') or (source like '%TerminalServices-RDPClient%' and event_id like '1105') or (source like '%TerminalServices-RDPClient%' and event_id like '1026') or (source like '%Security.evtx%' and event_id like '4689')"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         remote_information = Remote_Information()
         try:
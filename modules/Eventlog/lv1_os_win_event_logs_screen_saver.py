@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class Screen_Saver_Information:
     par_id = ''
@@ -17,16 +18,20 @@ class Screen_Saver_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGSCREENSAVER(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('Security', 4802),
+]
+
+def EVENTLOGSCREENSAVER(configuration, result_query=None):
 
     #db = database.Database()
     #db.open()
 
     screen_saver_list = []
     screen_saver_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where event_id like '4802' and source like '%Security.evtx%'"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         screen_saver_information = Screen_Saver_Information()
         try:
@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class Shared_Folder_Information:
     par_id = ''
@@ -17,16 +18,23 @@ class Shared_Folder_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGSHAREDFOLDER(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('Security', 4656), ('Security', 4663), ('Security', 5140),
+    ('Microsoft-Windows-SmbClient/Connectivity', 30804), ('Microsoft-Windows-SmbClient/Connectivity', 30805),
+    ('Microsoft-Windows-SmbClient/Connectivity', 30806), ('Microsoft-Windows-SmbClient/Connectivity', 30807),
+    ('Microsoft-Windows-SmbClient/Connectivity', 30808),
+]
+
+def EVENTLOGSHAREDFOLDER(configuration, result_query=None):
 
     #db = database.Database()
     #db.open()
 
     shared_folder_list = []
     shared_folder_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where (event_id like '4656' and source like '%Security.evtx%') or (event_id like '4663' and source like '%Security.evtx%') or (event_id like '5140' and source like '%Security.evtx%') or (event_id like '30804' and source like '%SMBClient%') or (event_id like '30805' and source like '%SMBClient%') or (event_id like '30806' and source like '%SMBClient%') or (event_id like '30807' and source like '%SMBClient%') or (event_id like '30808' and source like '%SMBClient%')"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         shared_folder_information = Shared_Folder_Information()
         try:
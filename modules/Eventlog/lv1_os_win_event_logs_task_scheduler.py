@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class Task_Scheduler_Information:
     par_id = ''
@@ -18,16 +19,21 @@ class Task_Scheduler_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGTASKSCHEDULER(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('Microsoft-Windows-TaskScheduler/Maintenance', 200), ('Microsoft-Windows-TaskScheduler/Maintenance', 201),
+    ('Microsoft-Windows-TaskScheduler/Operational', 200), ('Microsoft-Windows-TaskScheduler/Operational', 201),
+]
+
+def EVENTLOGTASKSCHEDULER(configuration, result_query=None):
 
     #db = database.Database()
     #db.open()
 
     task_scheduler_list = []
     task_scheduler_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where (event_id like '200' or event_id like '201') and source like '%TaskScheduler%'"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         screen_saver_information = Task_Scheduler_Information()
         try:
@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class Telemetry_Information:
     par_id = ''
@@ -19,16 +20,21 @@ class Telemetry_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGTELEMETRY(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('Microsoft-Windows-Application-Experience/Program-Telemetry', 500),
+    ('Microsoft-Windows-Application-Experience/Program-Telemetry', 505),
+]
+
+def EVENTLOGTELEMETRY(configuration, result_query=None):
 
     #db = database.Database()
     #db.open()
 
     telemetry_list = []
     telemetry_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where (event_id like '500' or event_id like '505') and source like '%Telemetry%'"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         telemetry_information = Telemetry_Information()
         try:
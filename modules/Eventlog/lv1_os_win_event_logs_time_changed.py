@@ -5,6 +5,7 @@ import os, sys, re
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class Time_Information:
     par_id = ''
@@ -18,16 +19,23 @@ class Time_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGTIMECHANGED(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('Security', 4616),
+    (None, 1),
+    ('Microsoft-Windows-DateTimeControlPanel/Operational', 20000),
+    ('Microsoft-Windows-DateTimeControlPanel/Operational', 20001),
+]
+
+def EVENTLOGTIMECHANGED(configuration, result_query=None):
 
     #db = database.Database()
     #db.open()
 
     time_list = []
     time_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where (event_id like '4616' and source like '%Security%') or (event_id like '1') or (event_id like '20000' and source like '%DateTimeControlPanel%') or (event_id like '20001' and source like '%DateTimeControlPanel%')"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         time_information = Time_Information()
         try:
@@ -5,6 +5,7 @@ import os, sys, re, numpy
 from datetime import datetime
 
 from utility import database
+from modules.Eventlog import evtx_store
 
 class USB_Information:
     par_id = ''
@@ -24,14 +25,24 @@ class USB_Information:
     source = ''
     event_id_description = ''
 
-def EVENTLOGUSBDEVICES(configuration):
+# (channel, event identifier) of the events of the classifier, see evtx_store.
+EVENTS = [
+    ('Microsoft-Windows-Partition/Diagnostic', 1006),
+    ('Microsoft-Windows-Storage-ClassPnP/Operational', 507), ('Microsoft-Windows-Storage-ClassPnP/Operational', 504),
+    ('System', 10000), ('System', 20001), ('System', 20003),
+    ('Microsoft-Windows-DriverFrameworks-UserMode/Operational', 2003),
+    ('Microsoft-Windows-DriverFrameworks-UserMode/Operational', 2101),
+    ('Microsoft-Windows-DriverFrameworks-UserMode/Operational', 2102),
+    ('Microsoft-Windows-DriverFrameworks-UserMode/Operational', 2901),
+]
+
+def EVENTLOGUSBDEVICES(configuration, result_query=None):
     #db = database.Database()
     #db.open()
     usb_list = []
     usb_count = 0
-    query = r"SELECT data, event_id, time_created, source, user_sid FROM lv1_os_win_evt_total where (event_id like '1006' and source like '%Partition%') or (event_id like '507' and source like '%Storage%') or (event_id like '504'and source like '%Storage%') or (event_id like '10000'and source like '%System.evtx%') or (event_id like '20001'and source like '%System.evtx%') or (event_id like '20003'and source like '%System.evtx%') or (event_id like '2003'and source like '%DriverFrameworks%') or (event_id like '2101'and source like '%DriverFrameworks%') or (event_id like '2102'and source like '%DriverFrameworks%') or (event_id like '2901'and source like '%DriverFrameworks%')"
-    #result_query = db.execute_query_mul(query)
-    result_query = configuration.cursor.execute_query_mul(query)
+    if result_query is None:
+        result_query = evtx_store.GetEvents(configuration, EVENTS)
     for result_data in result_query:
         usb_information = USB_Information()
         try:
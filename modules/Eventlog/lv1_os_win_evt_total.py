@@ -1,7 +1,35 @@
+import collections
+import mmap
+
 import Evtx.Evtx as evtx
+import Evtx.Nodes as e_nodes
+import Evtx.Views as e_views
 import xml.etree.ElementTree as XML
 import html.parser
 
+try:
+    from importlib import metadata as importlib_metadata
+except ImportError:
+    import importlib_metadata
+
+from modules.Eventlog import evtx_cache
+
+# Number of chunks parsed per task by the worker processes.
+CHUNKS_PER_TASK = 16
+
+# ParseRecordFields reads the templates and substitutions of python-evtx,
+# which are not part of its API, so it is only used with the versions it was
+# verified against. Other versions render every record and parse the XML.
+SUBSTITUTION_EVTX_VERSIONS = frozenset(['0.6.1', '0.8.1'])
+
+def _GetEvtxVersion():
+    try:
+        return importlib_metadata.version('python-evtx')
+    except importlib_metadata.PackageNotFoundError:
+        return None
+
+SUBSTITUTIONS_SUPPORTED = _GetEvtxVersion() in SUBSTITUTION_EVTX_VERSIONS
+
 class Eventlog_Total_Information:
     par_id = ''
     case_id = ''
@@ -11,35 +39,377 @@ class Eventlog_Total_Information:
     source = ''
     data = ''
     user_sid = ''
+    event_record_id = ''
+    event_data = []
 
 ns = ''
 tag = lambda v: ns + v if ns else v
 
-def EventlogTotal(filename):
-    result = []
-    eventlog_count = 0
-    with evtx.Evtx(filename) as log:
-        for i, rec in enumerate(log.records()):
-            try:
-                xml_str = rec.xml()
-            except:
+def _GetLocalName(tag_name):
+    return tag_name.rsplit('}', 1)[-1]
+
+def ParseRecord(rec):
+    """Parses an EVTX record.
+
+    Returns:
+        list[object]: event identifier, creation time, user SID, XML, record
+            number and EventData name and value pairs of the record or None if
+            the record cannot be rendered.
+    """
+    try:
+        xml_str = rec.xml()
+    except:
+        return None
+
+    root = XML.fromstring(xml_str)  # Event Tag
+    assert len(XML._namespaces(root)) == 2
+
+    event_id = root[0][1].text
+    if 'TimeCreated' in root[0][5].tag:
+        time_created = root[0][5].get('SystemTime').replace(' ', 'T') + 'Z'
+    else:
+        time_created = root[0][7].get('SystemTime').replace(' ', 'T') + 'Z'
+    user_sid = root[0][-1].get('UserID')
+
+    event_data = []
+    for element in root:
+        if _GetLocalName(element.tag) == 'EventData':
+            for data in element:
+                if _GetLocalName(data.tag) == 'Data' and data.get('Name') is not None:
+                    event_data.append([data.get('Name'), data.text or ''])
+    return [event_id, time_created, user_sid, html.unescape(xml_str), rec.record_num(), event_data]
+
+def _GetSubstitutionIndex(node):
+    if isinstance(node, (e_nodes.NormalSubstitutionNode, e_nodes.ConditionalSubstitutionNode)):
+        return node.index()
+    return None
+
+def _GetAttributeSubstitutionIndex(element, attribute_name):
+    for child in element.children():
+        if isinstance(child, e_nodes.AttributeNode) and child.attribute_name().string() == attribute_name:
+            return _GetSubstitutionIndex(child.attribute_value())
+    return None
+
+def _GetEventDataFields(event_data):
+    """Finds the substitutions of the named Data elements of EventData.
+
+    Returns:
+        list[tuple[str, int]]: name and substitution index per Data element,
+            the index is None for an empty element, or None if a value is not
+            a substitution of the template.
+    """
+    fields = []
+    for data in event_data.children():
+        if not isinstance(data, e_nodes.OpenStartElementNode) or data.tag_name() != 'Data':
+            continue
+        name = None
+        values = []
+        for child in data.children():
+            if isinstance(child, e_nodes.AttributeNode):
+                if child.attribute_name().string() == 'Name':
+                    if not isinstance(child.attribute_value(), e_nodes.ValueNode):
+                        return None
+                    name = child.attribute_value().children()[0].string()
+            elif not isinstance(child, (e_nodes.CloseStartElementNode, e_nodes.CloseEmptyElementNode,
+                                        e_nodes.CloseElementNode)):
+                values.append(child)
+        if name is None:
+            continue
+        if len(values) > 1 or (values and _GetSubstitutionIndex(values[0]) is None):
+            return None
+        fields.append((name, _GetSubstitutionIndex(values[0]) if values else None))
+    return fields
+
+def GetTemplateFields(template):
+    """Finds the substitutions of the System fields and of EventData in a record template.
+
+    Args:
+        template (TemplateNode): template of the records.
+
+    Returns:
+        tuple[int, int, int, list[tuple[str, int]]]: substitution index of the
+            event identifier, the creation time and the user SID and the
+            EventData fields or None if one of the values is not a substitution
+            of the template.
+    """
+    event = None
+    for node in template.children():
+        if isinstance(node, e_nodes.OpenStartElementNode):
+            event = node
+            break
+    if event is None:
+        return None
+
+    fields = {}
+    event_data = []
+    for element in event.children():
+        if not isinstance(element, e_nodes.OpenStartElementNode):
+            continue
+        if element.tag_name() == 'EventData':
+            event_data = _GetEventDataFields(element)
+            if event_data is None:
+                return None
+            continue
+        if element.tag_name() != 'System' or fields:
+            continue
+        for system_element in element.children():
+            if not isinstance(system_element, e_nodes.OpenStartElementNode):
                 continue
+            tag_name = system_element.tag_name()
+            if tag_name == 'EventID':
+                for child in system_element.children():
+                    if not isinstance(child, e_nodes.AttributeNode):
+                        index = _GetSubstitutionIndex(child)
+                        if index is not None:
+                            fields[tag_name] = index
+                            break
+            elif tag_name == 'TimeCreated':
+                fields[tag_name] = _GetAttributeSubstitutionIndex(system_element, 'SystemTime')
+            elif tag_name == 'Security':
+                fields[tag_name] = _GetAttributeSubstitutionIndex(system_element, 'UserID')
+
+    indexes = (fields.get('EventID'), fields.get('TimeCreated'), fields.get('Security'))
+    if None in indexes:
+        return None
+    return indexes + (event_data,)
+
+class _TemplateRoot(object):
+    """Root node of a record that renders with a parsed template.
+
+    RootNode.template() parses the template again for every record, the
+    template of the records of a chunk is parsed once instead.
+    """
+
+    def __init__(self, template):
+        super(_TemplateRoot, self).__init__()
+        self._template = template
+
+    def template(self):
+        return self._template
+
+def ParseRecordFields(rec, templates):
+    """Parses an EVTX record, reading the fields from its substitutions.
+
+    The System fields and the EventData values are read from the substitution
+    values of the record instead of from the rendered XML. Records of which the
+    template has no substitution for one of the fields are parsed by
+    ParseRecord.
+
+    Args:
+        rec (Record): EVTX record.
+        templates (dict[int, tuple[TemplateNode, tuple]]): template and
+            substitution indexes of the fields per template offset, see
+            GetTemplateFields.
+
+    Returns:
+        list[object]: values of the record, see ParseRecord, or None if the
+            record cannot be rendered.
+    """
+    try:
+        root = rec.root()
+        template_offset = root.template_instance().template_offset()
+        if template_offset not in templates:
+            template = root.template()
+            templates[template_offset] = (template, GetTemplateFields(template))
+        template, fields = templates[template_offset]
+        if fields is None:
+            return ParseRecord(rec)
+
+        substitutions = root.substitutions()
+        event_id, time_created, user_sid = [substitutions[index] for index in fields[:3]]
+        event_data = [[name, substitutions[index] if index is not None else None] for name, index in fields[3]]
+        values = [event_id, time_created, user_sid] + [value for _, value in event_data]
+        if any(isinstance(value, e_nodes.BXmlTypeNode) for value in values):
+            return ParseRecord(rec)
+
+        xml_str = e_views.render_root_node_with_subs(_TemplateRoot(template), substitutions)
+    except:
+        return None
+
+    for pair in event_data:
+        pair[1] = pair[1].string() if pair[1] is not None else ''
+
+    # An empty element has no text, an empty attribute is an empty string.
+    return [event_id.string() or None, time_created.string().replace(' ', 'T') + 'Z', user_sid.string(),
+            html.unescape(xml_str), rec.record_num(), event_data]
+
+def ParseChunk(chunk):
+    records = []
+    templates = {}
+    for rec in chunk.records():
+        if SUBSTITUTIONS_SUPPORTED:
+            record = ParseRecordFields(rec, templates)
+        else:
+            record = ParseRecord(rec)
+        if record is not None:
+            records.append(record)
+    return records
+
+def GetNumberOfChunks(filename):
+    """Determines the number of chunks of an EVTX file.
+
+    Args:
+        filename (str): path of the EVTX file.
+
+    Returns:
+        int: number of chunks, without the inactive chunks beyond the chunk
+            count of the file header.
+    """
+    with evtx.Evtx(filename) as log:
+        return sum(1 for _ in log.chunks())
+
+def ParseChunks(filename, chunk_indexes):
+    """Parses chunks of an EVTX file.
+
+    Args:
+        filename (str): path of the EVTX file.
+        chunk_indexes (list[int]): indexes of the chunks to parse.
+
+    Returns:
+        list[list[list[object]]]: values per record per chunk, see ParseRecord.
+    """
+    records_per_chunk = []
+    with open(filename, 'rb') as file_object:
+        buf = mmap.mmap(file_object.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for chunk_index in chunk_indexes:
+                chunk = evtx.ChunkHeader(buf, evtx_cache.FILE_HEADER_SIZE + chunk_index * evtx_cache.CHUNK_SIZE)
+                records_per_chunk.append(ParseChunk(chunk))
+        finally:
+            buf.close()
+    return records_per_chunk
+
+def _MapInOrder(executor, function, arguments, maximum_pending):
+    """Runs a function on arguments in a pool and yields results in order.
+
+    Args:
+        executor (futures.Executor): pool of worker processes.
+        function (function): function to run.
+        arguments (iterable[tuple]): arguments per call.
+        maximum_pending (int): maximum number of pending calls.
+
+    Yields:
+        object: result per call, in the order of the arguments.
+    """
+    pending = collections.deque()
+    try:
+        for call_arguments in arguments:
+            pending.append(executor.submit(function, *call_arguments))
+            if len(pending) >= maximum_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+    finally:
+        for future in pending:
+            future.cancel()
+
+def ParseChunksParallel(filename, chunk_indexes, executor=None, number_of_workers=1):
+    """Parses chunks of an EVTX file in a pool of worker processes.
+
+    Every chunk is self-contained, so the chunks are parsed independently and
+    the records are yielded in the order of the chunks. The pool is shared by
+    the EVTX files, a file of one task is parsed in the current process.
+
+    Args:
+        filename (str): path of the EVTX file.
+        chunk_indexes (list[int]): indexes of the chunks to parse.
+        executor (Optional[futures.Executor]): pool of worker processes, None
+            to parse the chunks in the current process.
+        number_of_workers (Optional[int]): number of worker processes of the
+            pool.
+
+    Yields:
+        tuple[int, list[list[object]]]: chunk index and values per record of the
+            chunk, see ParseRecord.
+    """
+    tasks = [chunk_indexes[index:index + CHUNKS_PER_TASK]
+             for index in range(0, len(chunk_indexes), CHUNKS_PER_TASK)]
+
+    if executor is None or len(tasks) <= 1:
+        for task in tasks:
+            yield from zip(task, ParseChunks(filename, task))
+        return
+
+    results = _MapInOrder(executor, ParseChunks, [(filename, task) for task in tasks], number_of_workers * 2)
+    for task, records_per_chunk in zip(tasks, results):
+        yield from zip(task, records_per_chunk)
+
+def ParseCachedFile(filename, cache, executor=None, number_of_workers=1):
+    """Parses the chunks of an EVTX file that are not in the cache.
+
+    Args:
+        filename (str): path of the EVTX file.
+        cache (EvtxCache): EVTX cache.
+        executor (Optional[futures.Executor]): pool of worker processes, None
+            to parse the chunks in the current process.
+        number_of_workers (Optional[int]): number of worker processes of the
+            pool.
+
+    The records of a cached chunk are read when the chunk is reached, so only
+    the records of one cached chunk are kept in memory.
+
+    Yields:
+        list[object]: values per record, see ParseRecord.
+    """
+    file_sha1, chunk_hashes = evtx_cache.HashEvtxFile(filename)
+    # Inactive chunks are not parsed.
+    chunk_hashes = chunk_hashes[:GetNumberOfChunks(filename)]
+    file_cached = cache.GetFileChunks(file_sha1) == chunk_hashes
+
+    cached_chunks = cache.GetCachedChunks(chunk_hashes)
+    chunk_indexes = [chunk_index for chunk_index, chunk_sha1 in enumerate(chunk_hashes)
+                     if chunk_sha1 not in cached_chunks]
+    if chunk_indexes:
+        file_cached = False
+
+    parsed_chunks = ParseChunksParallel(filename, chunk_indexes, executor, number_of_workers)
+    for chunk_index, chunk_sha1 in enumerate(chunk_hashes):
+        if chunk_sha1 in cached_chunks:
+            records = cache.GetChunkRecords(chunk_sha1)
+            if records is None:
+                # The cache was dropped by another task with a different format.
+                records = ParseChunks(filename, [chunk_index])[0]
+                cache.AddChunkRecords(chunk_sha1, records)
+                file_cached = False
+        else:
+            _, records = next(parsed_chunks)
+            cache.AddChunkRecords(chunk_sha1, records)
+        yield from records
+
+    if not file_cached:
+        cache.AddFile(file_sha1, chunk_hashes)
+
+def EventlogTotal(filename, cache=None, executor=None, number_of_workers=1):
+    """Parses the records of an EVTX file.
+
+    Args:
+        filename (str): path of the EVTX file.
+        cache (Optional[EvtxCache]): EVTX cache.
+        executor (Optional[futures.Executor]): pool of worker processes, None
+            to parse the chunks in the current process.
+        number_of_workers (Optional[int]): number of worker processes of the
+            pool.
+
+    Yields:
+        Eventlog_Total_Information: record, in the order of the file.
+    """
+    if cache is None:
+        chunk_indexes = list(range(GetNumberOfChunks(filename)))
+        records = (record for _, chunk_records in ParseChunksParallel(
+            filename, chunk_indexes, executor, number_of_workers) for record in chunk_records)
+    else:
+        records = ParseCachedFile(filename, cache, executor, number_of_workers)
 
-            root = XML.fromstring(xml_str)  # Event Tag
-            assert len(XML._namespaces(root)) == 2
-            ns = list(XML._namespaces(root)[1])
-            ns = '{%s}' % ns[0] if len(ns) > 0 else ''
-
-            event_total_information = Eventlog_Total_Information()
-            result.append(event_total_information)
-            result[eventlog_count].event_id = root[0][1].text
-            if 'TimeCreated' in root[0][5].tag:
-                result[eventlog_count].time_created = root[0][5].get('SystemTime').replace(' ', 'T') + 'Z'
-            else:
-                result[eventlog_count].time_created = root[0][7].get('SystemTime').replace(' ', 'T') + 'Z'
-            result[eventlog_count].user_sid = root[0][-1].get('UserID')
-            result[eventlog_count].source = filename.split('/')[-1]
-            result[eventlog_count].data = html.unescape(xml_str)
-            eventlog_count = eventlog_count + 1
-
-    return result
+    source = filename.split('/')[-1]
+    for event_id, time_created, user_sid, data, event_record_id, event_data in records:
+        event_total_information = Eventlog_Total_Information()
+        event_total_information.event_id = event_id
+        event_total_information.time_created = time_created
+        event_total_information.user_sid = user_sid
+        event_total_information.source = source
+        event_total_information.data = data
+        event_total_information.event_record_id = event_record_id
+        event_total_information.event_data = event_data
+        yield event_total_information
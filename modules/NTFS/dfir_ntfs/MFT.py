@@ -5,7 +5,7 @@
 
 from . import Attributes, BootSector
 import struct
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
 
 FILE_RECORD_SEGMENT_SIZES_SUPPORTED = [ 1024, 4096 ]
 MULTI_SECTOR_HEADER_SIGNATURE_GOOD = b'FILE'
@@ -832,6 +832,221 @@ class FileRecord(object):
 	def __str__(self):
 		return 'FileRecord, 1 base file record segment, {} child file record segment(s)'.format(len(self.child_frs_list))
 
+def GetFileRecordSegmentReference(frs):
+	"""Get and return a reference to a file record segment (FileRecordSegment), with the sequence number adjusted for deallocated file record segments."""
+
+	mft_number = frs.get_master_file_table_number()
+	sequence_number = frs.get_sequence_number()
+
+	if not frs.is_in_use(): # The sequence number is incremented each time a file record segment is deallocated (and the new sequence number can be zero).
+		if sequence_number >= 2:
+			sequence_number -= 1
+		elif sequence_number == 0:
+			sequence_number = 0xFFFF # Handle the overflow.
+
+	return EncodeFileRecordSegmentReference(mft_number, sequence_number)
+
+def ParseFileRecords(buf, file_record_segment_size, child_file_record_segments, in_use_file_records_only = False):
+	"""This function yields file records (FileRecord) from a buffer with consecutive file record segments (a range of an $MFT file).
+	The 'child_file_record_segments' argument is a dict: a reference to a base file record segment -> a list of buffers of its child file record segments.
+	If the 'in_use_file_records_only' argument is True, limit the output to in-use file records only.
+	"""
+
+	pos = 0
+	while pos + file_record_segment_size <= len(buf):
+		try:
+			frs = FileRecordSegment(buf[pos : pos + file_record_segment_size])
+		except FileRecordSegmentException:
+			# An invalid file record segment, ignore it and continue.
+			pos += file_record_segment_size
+			continue
+
+		pos += file_record_segment_size
+
+		if in_use_file_records_only and not frs.is_in_use():
+			continue
+
+		if frs.is_base_file_record_segment():
+			reference = GetFileRecordSegmentReference(frs)
+
+			child_frs_list = []
+			for child_buf in child_file_record_segments.get(reference, []):
+				child_frs_list.append(FileRecordSegment(child_buf))
+
+			yield FileRecord(frs, child_frs_list)
+
+class ParentMap(object):
+	"""This class is used to build full paths from a precomputed table of file records, without reading parent file records again."""
+
+	entries = None
+	"""A dict: a base file record segment number -> (a sequence number, a flag to show if it is a directory, a preferred file name, a reference to its parent directory,
+	a file name and a reference to its parent directory used for the first full path). File names are None if a file record has no file names.
+	"""
+
+	def __init__(self, entries = None):
+		"""Create a ParentMap object, optionally from existing entries (the 'entries' argument)."""
+
+		if entries is None:
+			entries = dict()
+
+		self.entries = entries
+
+	def add_file_record(self, file_record):
+		"""Add a file record (FileRecord) to the table."""
+
+		file_names = []
+		for attr in file_record.attributes():
+			if type(attr) is AttributeRecordNonresident or attr.type_code != Attributes.ATTR_TYPE_FILE_NAME:
+				continue
+
+			attr_value = attr.value_decoded()
+			if type(attr_value) is not Attributes.FileName:
+				continue
+
+			file_names.append((attr_value.get_flags(), attr_value.get_file_name(), attr_value.get_parent_directory()))
+
+		preferred_file_name = None
+		first_file_name = None
+		for file_name in file_names:
+			flags = file_name[0]
+			if flags & Attributes.FILE_NAME_NTFS > 0 or flags == 0: # Win32 and POSIX name spaces are preferred.
+				if preferred_file_name is None:
+					preferred_file_name = file_name
+
+				# The last preferred file name comes first in build_full_paths().
+				first_file_name = file_name
+
+		if len(file_names) > 0:
+			if preferred_file_name is None:
+				preferred_file_name = file_names[0]
+				first_file_name = file_names[0]
+
+			names = (preferred_file_name[1], preferred_file_name[2], first_file_name[1], first_file_name[2])
+		else:
+			names = (None, None, None, None)
+
+		segment_number, sequence_number = DecodeFileRecordSegmentReference(GetFileRecordSegmentReference(file_record.base_frs))
+		is_directory = file_record.get_flags() & FILE_FILE_NAME_INDEX_PRESENT > 0
+
+		self.entries[segment_number] = (sequence_number, is_directory) + names
+
+	def update(self, entries):
+		"""Add entries from another table (the 'entries' argument, a dict)."""
+
+		self.entries.update(entries)
+
+	def directories(self):
+		"""Return a new table (ParentMap) with directories only. It is enough to build full paths for file records at hand."""
+
+		return ParentMap(dict((segment_number, entry) for segment_number, entry in self.entries.items() if entry[1]))
+
+	def get_entry(self, segment_number, sequence_number):
+		"""Get and return an entry for a base file record segment number and an expected sequence number (or None, if not found)."""
+
+		entry = self.entries.get(segment_number)
+		if entry is None or entry[0] != sequence_number:
+			return
+
+		return entry
+
+	def build_path(self, file_name, parent_reference):
+		"""Build and return a full path (as a string) for a file name and a reference to its parent directory.
+		This works like the MasterFileTableParser.build_full_paths() method.
+		"""
+
+		path_components = [ file_name ]
+		parent_segment_number, parent_sequence_number = DecodeFileRecordSegmentReference(parent_reference)
+
+		if parent_segment_number == FILE_NUMBER_ROOT:
+			path_components.append('') # Add a root directory.
+		else:
+			entry = self.get_entry(parent_segment_number, parent_sequence_number)
+			if entry is None or not entry[1]:
+				# An invalid parent file record or not a directory.
+				path_components.append(UNKNOWN_PATH_PLACEHOLDER)
+			else:
+				track = set()
+				track.add(parent_segment_number)
+
+				while True:
+					if entry[2] is None:
+						raise MasterFileTableException('A given file record has no file names')
+
+					path_components.append(entry[2])
+					parent_segment_number, parent_sequence_number = DecodeFileRecordSegmentReference(entry[3])
+
+					if parent_segment_number in track:
+						# An invalid path.
+						path_components.append(UNKNOWN_PATH_PLACEHOLDER)
+						break
+					else:
+						track.add(parent_segment_number)
+
+					entry = self.get_entry(parent_segment_number, parent_sequence_number)
+					if entry is None:
+						# An invalid parent file record.
+						path_components.append(UNKNOWN_PATH_PLACEHOLDER)
+						break
+
+					if parent_segment_number == FILE_NUMBER_ROOT:
+						path_components.append('') # Add a root directory.
+						break
+
+					if not entry[1]:
+						# Not a directory.
+						path_components.append(UNKNOWN_PATH_PLACEHOLDER)
+						break
+
+		path_components.reverse()
+		return PATH_SEPARATOR.join(path_components)
+
+	def build_full_paths(self, file_record, include_attributes = False):
+		"""Build and return a list of full paths (as strings) for a given file record (FileRecord), like the MasterFileTableParser.build_full_paths() method does.
+		If the 'include_attributes' argument is True, a list of (full path, $ FILE_NAME attribute value) tuples is returned.
+		"""
+
+		attr_file_names = []
+		for attr in file_record.attributes():
+			if type(attr) is AttributeRecordNonresident:
+				continue
+
+			attr_value = attr.value_decoded()
+			if type(attr_value) is not Attributes.FileName:
+				continue
+
+			flags = attr_value.get_flags()
+
+			# Win32 and POSIX name spaces are preferred.
+			if flags & Attributes.FILE_NAME_NTFS > 0 or flags == 0:
+				attr_file_names.insert(0, attr_value)
+			else:
+				attr_file_names.append(attr_value)
+
+		paths = []
+		for attr_value in attr_file_names:
+			path = self.build_path(attr_value.get_file_name(), attr_value.get_parent_directory())
+
+			if not include_attributes:
+				paths.append(path)
+			else:
+				paths.append((path, attr_value))
+
+		return paths
+
+	def get_path(self, reference):
+		"""Get and return the first full path (as a string) of a file record by its reference (or None, if not found)."""
+
+		segment_number, sequence_number = DecodeFileRecordSegmentReference(reference)
+
+		entry = self.get_entry(segment_number, sequence_number)
+		if entry is None or entry[4] is None:
+			return
+
+		return self.build_path(entry[4], entry[5])
+
+	def __str__(self):
+		return 'ParentMap, {} file record(s)'.format(len(self.entries))
+
 class MasterFileTableParser(object):
 	"""This class is used to read and parse an $MFT file."""
 
@@ -853,11 +1068,24 @@ class MasterFileTableParser(object):
 	first_pass_done = None
 	"""A flag to show if we executed the first pass."""
 
-	def __init__(self, file_object, do_first_pass = True):
-		"""Create a MasterFileTableParser object from a file object (the 'file_object' argument). Complete the first pass, if requested (the 'do_first_pass' argument)."""
+	parent_map = None
+	"""A table of file records (ParentMap) used to resolve paths, see the build_parent_map() method."""
+
+	path_cache = None
+	"""A cache of resolved paths: (a file record segment number, an expected sequence number) -> a full path (or None)."""
+
+	path_cache_size = None
+	"""A maximum number of entries in the cache of resolved paths."""
+
+	def __init__(self, file_object, do_first_pass = True, path_cache_size = 65536):
+		"""Create a MasterFileTableParser object from a file object (the 'file_object' argument). Complete the first pass, if requested (the 'do_first_pass' argument).
+		The 'path_cache_size' argument limits the number of resolved paths kept in the cache.
+		"""
 
 		self.file_object = file_object
 		self.child_cache = dict()
+		self.path_cache = OrderedDict()
+		self.path_cache_size = path_cache_size
 		self.statistics = (None, None)
 		self.first_pass_done = False
 
@@ -1199,6 +1427,80 @@ class MasterFileTableParser(object):
 
 		return paths
 
+	def build_parent_map(self):
+		"""Build a table of file records (ParentMap) in one pass over this $MFT file, it is used to resolve paths without reading parent file records again."""
+
+		parent_map = ParentMap()
+		for file_record in self.file_records():
+			parent_map.add_file_record(file_record)
+
+		self.set_parent_map(parent_map)
+
+	def set_parent_map(self, parent_map):
+		"""Use a table of file records (ParentMap) built for this $MFT file to resolve paths."""
+
+		self.parent_map = parent_map
+		self.path_cache.clear()
+
+	def resolve_path(self, file_record_segment_number, expected_sequence_number = None):
+		"""Resolve and return the first full path (as a string) for a file record by its file record segment number and an expected sequence number (or None, if not resolved).
+		This is what the build_full_paths() method returns first for a file record returned by the get_file_record_by_number() method, but resolved paths are cached
+		and parent directories are taken from the table of file records, if it was built.
+		"""
+
+		key = (file_record_segment_number, expected_sequence_number)
+		if key in self.path_cache:
+			self.path_cache.move_to_end(key)
+			return self.path_cache[key]
+
+		path = self._resolve_path(file_record_segment_number, expected_sequence_number)
+
+		self.path_cache[key] = path
+		if len(self.path_cache) > self.path_cache_size:
+			self.path_cache.popitem(last = False)
+
+		return path
+
+	def resolve_paths(self, references):
+		"""Resolve and return a list of first full paths (as strings or None) for a list of file record segment references.
+		Each distinct reference is resolved once, in the order of file record segment numbers.
+		"""
+
+		paths = dict()
+		for reference in sorted(set(references), key = lambda reference: reference & 0xFFFFFFFFFFFF):
+			file_record_segment_number, sequence_number = DecodeFileRecordSegmentReference(reference)
+			paths[reference] = self.resolve_path(file_record_segment_number, sequence_number)
+
+		return [ paths[reference] for reference in references ]
+
+	def _resolve_path(self, file_record_segment_number, expected_sequence_number):
+		"""Resolve and return the first full path for a file record without the cache (or None, if not resolved)."""
+
+		if self.parent_map is not None:
+			entry = self.parent_map.entries.get(file_record_segment_number)
+			if entry is not None:
+				if expected_sequence_number is not None and entry[0] != expected_sequence_number:
+					return
+
+				if entry[4] is None:
+					# No file names.
+					return
+
+				try:
+					return self.parent_map.build_path(entry[4], entry[5])
+				except MasterFileTableException:
+					return
+
+		# Not a base file record segment in the table (or no table), read the file record.
+		try:
+			file_record = self.get_file_record_by_number(file_record_segment_number, expected_sequence_number)
+			file_paths = self.build_full_paths(file_record)
+		except MasterFileTableException:
+			return
+
+		if len(file_paths) > 0:
+			return file_paths[0]
+
 	def execute_first_pass(self):
 		"""Populate a cache of child in-use file record segments, calculate the statistics."""
 
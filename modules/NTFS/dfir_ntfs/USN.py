@@ -3,9 +3,12 @@
 #
 # This module implements an interface to work with the update sequence number change journal.
 
+import re
 import struct
 from .Attributes import DecodeFiletime
 
+NON_NULL_BYTE = re.compile(b'[^\\x00]')
+
 # Codes for reasons:
 USN_REASON_BASIC_INFO_CHANGE = 0x00008000
 USN_REASON_CLOSE = 0x80000000
@@ -361,6 +364,28 @@ class USN_RECORD_V4(object):
 	def __str__(self):
 		return 'USN_RECORD_V4, version: {}.{}, record length: {}'.format(self.get_major_version(), self.get_minor_version(), self.get_record_length())
 
+def GetDataRanges(DataRuns, ClusterSize, FileSize):
+	"""Convert data runs of a $UsnJrnl:$J file (a list of (offset, length) tuples in clusters, sparse ranges have the offset item set to None)
+	to a list of (offset, size) tuples of allocated ranges in this file (in bytes).
+	"""
+
+	data_ranges = []
+
+	vcn = 0
+	for lcn, length in DataRuns:
+		if lcn is not None:
+			offset = vcn * ClusterSize
+			size = min(length * ClusterSize, FileSize - offset)
+			if size > 0:
+				if len(data_ranges) > 0 and data_ranges[-1][0] + data_ranges[-1][1] == offset: # Merge adjacent ranges.
+					data_ranges[-1] = (data_ranges[-1][0], data_ranges[-1][1] + size)
+				else:
+					data_ranges.append((offset, size))
+
+		vcn += length
+
+	return data_ranges
+
 class ChangeJournalParser(object):
 	"""This class is used to read and parse a $UsnJrnl:$J file."""
 
@@ -370,41 +395,105 @@ class ChangeJournalParser(object):
 	file_size = None
 	"""A size of this $UsnJrnl:$J file."""
 
-	def __init__(self, file_object):
+	data_ranges = None
+	"""A list of (offset, size) tuples of allocated ranges in this file (in bytes), other ranges are sparse."""
+
+	buffer_size = 16 * 1024 * 1024
+	"""A number of bytes read at once."""
+
+	record_size_max = 8192
+	"""A maximum number of bytes given to the GetUsnRecord() function."""
+
+	window_size = 4 * 1024 * 1024 * 1024
+	"""A size of windows that can be scanned independently, see the windows() method."""
+
+	def __init__(self, file_object, data_ranges = None):
+		"""Create a ChangeJournalParser object from a file object (the 'file_object' argument).
+		If the 'data_ranges' argument is given (see the GetDataRanges() function), sparse ranges are not read.
+		"""
+
 		self.file_object = file_object
 
 		self.file_object.seek(0, 2)
 		self.file_size = self.file_object.tell()
 		self.file_object.seek(0)
 
-	def usn_records(self):
-		"""This method yields USN records (USN_RECORD_V2_OR_V3 or USN_RECORD_V4) found in this $UsnJrnl:$J file."""
-
-		chunk_size = 8192
+		if data_ranges is None:
+			data_ranges = [ (0, self.file_size) ]
+
+		self.data_ranges = data_ranges
+
+	def windows(self):
+		"""This method yields (start offset, end offset) tuples of windows with allocated data. Windows are aligned to the window size.
+		USN records do not cross page boundaries, so each window can be given to the usn_records() method of its own parser (in parallel).
+		"""
+
+		for window_offset in range(0, self.file_size, self.window_size):
+			window_end = min(window_offset + self.window_size, self.file_size)
+
+			for range_offset, range_size in self.data_ranges:
+				if range_offset < window_end and range_offset + range_size > window_offset:
+					yield (window_offset, window_end)
+					break
+
+	def usn_records(self, start_offset = 0, end_offset = None):
+		"""This method yields USN records (USN_RECORD_V2_OR_V3 or USN_RECORD_V4) found in this $UsnJrnl:$J file.
+		If the 'start_offset' and 'end_offset' arguments are given, limit the output to USN records starting in this range.
+		"""
+
+		if end_offset is None or end_offset > self.file_size:
+			end_offset = self.file_size
+
+		for range_offset, range_size in self.data_ranges:
+			range_start = max(range_offset, start_offset)
+			range_end = min(range_offset + range_size, end_offset)
+
+			if range_start < range_end:
+				for usn in self.scan(range_start - range_start % 8, range_end):
+					yield usn
+
+	def scan(self, start_offset, end_offset):
+		"""This method yields USN records starting in a given range of this $UsnJrnl:$J file. The start offset must be aligned to 8 bytes.
+		The range is read in large buffers, runs of null bytes are skipped at once.
+		"""
+
+		buf = b''
+		buf_view = memoryview(buf)
+		buf_offset = start_offset
+
+		pos = start_offset
+		while pos < end_offset:
+			buf_end = buf_offset + len(buf)
+			if pos >= buf_end or (pos + self.record_size_max > buf_end and buf_end < self.file_size):
+				self.file_object.seek(pos)
+				buf = self.file_object.read(self.buffer_size)
+				buf_view = memoryview(buf)
+				buf_offset = pos
+
+				if len(buf) == 0: # A read error.
+					break
+
+			# Skip null bytes, USN records are aligned to 8 bytes.
+			match = NON_NULL_BYTE.search(buf, pos - buf_offset, min(len(buf), end_offset - buf_offset))
+			if match is None:
+				pos = buf_offset + len(buf)
+				continue
 
-		pos = 0
-		while pos < self.file_size:
-			self.file_object.seek(pos)
-			buf = self.file_object.read(chunk_size)
+			new_pos = buf_offset + match.start()
+			new_pos -= new_pos % 8
 
-			tmp_buf = buf
-			if tmp_buf.lstrip(b'\x00') == b'': # Check if this is an empty buffer (this should be fast).
-				pos += len(buf)
+			if new_pos > pos:
+				pos = new_pos
 				continue
 
-			new_pos = pos + len(buf) - len(tmp_buf)
-			if new_pos == 0 or new_pos % 8 == 0: # USN records are aligned to 8 bytes.
-				new_pos_aligned = new_pos
+			i = pos - buf_offset
+			if len(buf) - i >= 4:
+				record_length = struct.unpack_from('<L', buf, i)[0]
 			else:
-				new_pos_aligned = new_pos - new_pos % 8
-
-			pos = new_pos_aligned
-
-			self.file_object.seek(pos)
-			buf = self.file_object.read(chunk_size)
+				record_length = 0
 
 			try:
-				usn = GetUsnRecord(buf)
+				usn = GetUsnRecord(bytes(buf_view[i : i + min(max(record_length, 8), self.record_size_max)]))
 			except (ValueError, NotImplementedError):
 				# An invalid (or missing) USN record.
 				pos += 8
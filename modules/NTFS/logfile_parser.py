@@ -31,16 +31,7 @@ def log_record_parse(log_record, mft_file):
     if target is not None:
         log_record_items.append(target)
 
-        try:
-            file_record = mft_file.get_file_record_by_number(target)
-            file_paths = mft_file.build_full_paths(file_record)
-        except MFT.MasterFileTableException:
-            fr_file_path = None
-        else:
-            if len(file_paths) > 0:
-                fr_file_path = file_paths[0]
-            else:
-                fr_file_path = None
+        fr_file_path = mft_file.resolve_path(target)
         log_record_items.append(None)  # target_reference
         log_record_items.append(None)  # target_attribute_name
         log_record_items.append(fr_file_path)
@@ -59,16 +50,7 @@ def log_record_parse(log_record, mft_file):
 
             fr_number, fr_sequence = MFT.DecodeFileRecordSegmentReference(target_reference)
 
-            try:
-                file_record = mft_file.get_file_record_by_number(fr_number, fr_sequence)
-                file_paths = mft_file.build_full_paths(file_record)
-            except MFT.MasterFileTableException:
-                fr_file_path = None
-            else:
-                if len(file_paths) > 0:
-                    fr_file_path = file_paths[0]
-                else:
-                    fr_file_path = None
+            fr_file_path = mft_file.resolve_path(fr_number, fr_sequence)
             log_record_items.append(fr_file_path)
         else:
             log_record_items.append(None)  # target_reference
@@ -155,16 +137,7 @@ def log_record_parse(log_record, mft_file):
 
                         fr_number, fr_sequence = MFT.DecodeFileRecordSegmentReference(parent_reference)
 
-                        try:
-                            file_record = mft_file.get_file_record_by_number(fr_number, fr_sequence)
-                            file_paths = mft_file.build_full_paths(file_record)
-                        except MFT.MasterFileTableException:
-                            fr_file_path = None
-                        else:
-                            if len(file_paths) > 0:
-                                fr_file_path = file_paths[0]
-                            else:
-                                fr_file_path = None
+                        fr_file_path = mft_file.resolve_path(fr_number, fr_sequence)
                         file_name['parent_file_path'] = fr_file_path
                         if 'file_name' in attr_items:
                             attr_items['second_file_name'] = file_name
@@ -233,16 +206,7 @@ def log_record_parse(log_record, mft_file):
 
                         fr_number, fr_sequence = MFT.DecodeFileRecordSegmentReference(parent_reference)
 
-                        try:
-                            file_record = mft_file.get_file_record_by_number(fr_number, fr_sequence)
-                            file_paths = mft_file.build_full_paths(file_record)
-                        except MFT.MasterFileTableException:
-                            fr_file_path = None
-                        else:
-                            if len(file_paths) > 0:
-                                fr_file_path = file_paths[0]
-                            else:
-                                fr_file_path = None
+                        fr_file_path = mft_file.resolve_path(fr_number, fr_sequence)
                         file_name['parent_file_path'] = fr_file_path
                         attr_items['file_name'] = file_name
 
@@ -286,16 +250,7 @@ def log_record_parse(log_record, mft_file):
 
             fr_number, fr_sequence = MFT.DecodeFileRecordSegmentReference(parent_reference)
 
-            try:
-                file_record = mft_file.get_file_record_by_number(fr_number, fr_sequence)
-                file_paths = mft_file.build_full_paths(file_record)
-            except MFT.MasterFileTableException:
-                fr_file_path = None
-            else:
-                if len(file_paths) > 0:
-                    fr_file_path = file_paths[0]
-                else:
-                    fr_file_path = None
+            fr_file_path = mft_file.resolve_path(fr_number, fr_sequence)
 
             file_name['parent_file_path'] = fr_file_path
             attr_items['file_name_index'] = file_name
@@ -1,8 +1,20 @@
+import collections
+
+from concurrent import futures
+
 from modules.NTFS import util
 from modules.NTFS.dfir_ntfs import WSL, Attributes, MFT
 
 
-def mft_parse(info, mft_file, file_record, file_paths):
+# Number of file record segments decoded per task by mft_parse_parallel.
+RANGE_SIZE = 8192
+
+# State of the current worker process, set by _InitializeWorker.
+_worker_info = None
+_worker_parent_map = None
+
+
+def mft_parse(info, mft_file, file_record, file_paths, parent_map=None):
     mft_list = []
 
     attr_standard_information = None
@@ -165,16 +177,13 @@ def mft_parse(info, mft_file, file_record, file_paths):
             parent_fr_number, parent_fr_sequence = MFT.DecodeFileRecordSegmentReference(
                 parent_directory_reference)
 
-            try:
-                parent_file_record = mft_file.get_file_record_by_number(parent_fr_number, parent_fr_sequence)
-                parent_file_paths = mft_file.build_full_paths(parent_file_record)
-            except MFT.MasterFileTableException:
-                parent_file_path = None
-            else:
-                if len(parent_file_paths) > 0:
-                    parent_file_path = parent_file_paths[0]
-                else:
+            if parent_map is not None:
+                try:
+                    parent_file_path = parent_map.get_path(parent_directory_reference)
+                except MFT.MasterFileTableException:
                     parent_file_path = None
+            else:
+                parent_file_path = mft_file.resolve_path(parent_fr_number, parent_fr_sequence)
 
             if parent_file_path is not None:
                 if parent_file_path == '/.':
@@ -200,3 +209,185 @@ def mft_parse(info, mft_file, file_record, file_paths):
                                     fn_mtime, fn_atime, fn_ctime, fn_etime, '', file_size, '', '', '', ''))
 
     return mft_list
+
+
+def _InitializeWorker(info, parent_map):
+    """Initializes a worker process of mft_parse_parallel.
+
+    Args:
+        info (tuple): partition, case and evidence identifiers.
+        parent_map (MFT.ParentMap): directories of the $MFT file.
+    """
+    global _worker_info
+    global _worker_parent_map
+
+    _worker_info = info
+    _worker_parent_map = parent_map
+
+
+def _ScanRange(buf, file_record_segment_size, child_file_record_segments):
+    """Builds the parent map entries of a range of file record segments.
+
+    Args:
+        buf (bytes): file record segments of the range.
+        file_record_segment_size (int): size of a file record segment.
+        child_file_record_segments (dict[int, list[bytes]]): child file record
+            segments per base file record segment reference.
+
+    Returns:
+        dict[int, tuple]: parent map entries per file record segment number.
+    """
+    parent_map = MFT.ParentMap()
+    for file_record in MFT.ParseFileRecords(buf, file_record_segment_size, child_file_record_segments):
+        parent_map.add_file_record(file_record)
+    return parent_map.entries
+
+
+def _ParseRange(buf, file_record_segment_size, child_file_record_segments):
+    """Parses a range of file record segments into rows.
+
+    Args:
+        buf (bytes): file record segments of the range.
+        file_record_segment_size (int): size of a file record segment.
+        child_file_record_segments (dict[int, list[bytes]]): child file record
+            segments per base file record segment reference.
+
+    Returns:
+        list[tuple]: rows of the file records in the range.
+    """
+    rows = []
+    for file_record in MFT.ParseFileRecords(buf, file_record_segment_size, child_file_record_segments):
+        try:
+            file_paths = _worker_parent_map.build_full_paths(file_record, True)
+        except MFT.MasterFileTableException:
+            continue
+        # TODO: file_path 중복 수정
+        if file_paths:
+            file_paths = [file_paths[0]]
+        rows.extend(mft_parse(_worker_info, None, file_record, file_paths, parent_map=_worker_parent_map))
+    return rows
+
+
+def _ReadRanges(mft_file):
+    """Reads the $MFT file in ranges of RANGE_SIZE file record segments.
+
+    Args:
+        mft_file (MFT.MasterFileTableParser): $MFT file, after the first pass.
+
+    Yields:
+        tuple[bytes, int, dict[int, list[bytes]]]: file record segments of the
+            range, size of a file record segment and child file record segments
+            of the base file record segments in the range.
+    """
+    file_record_segment_size = mft_file.file_record_segment_size
+    range_bytes = RANGE_SIZE * file_record_segment_size
+
+    child_references = {}
+    for reference in mft_file.child_cache:
+        segment_number, _ = MFT.DecodeFileRecordSegmentReference(reference)
+        child_references.setdefault(segment_number // RANGE_SIZE, []).append(reference)
+
+    range_index = 0
+    while range_index * range_bytes < mft_file.file_size:
+        mft_file.file_object.seek(range_index * range_bytes)
+        buf = mft_file.file_object.read(range_bytes)
+
+        child_file_record_segments = {}
+        for reference in child_references.get(range_index, []):
+            child_buffers = []
+            for child_frs_number in mft_file.child_cache[reference]:
+                mft_file.file_object.seek(child_frs_number * file_record_segment_size)
+                child_buffers.append(mft_file.file_object.read(file_record_segment_size))
+            child_file_record_segments[reference] = child_buffers
+
+        yield buf, file_record_segment_size, child_file_record_segments
+
+        if len(buf) != range_bytes:
+            # A read error or a truncated $MFT file.
+            break
+        range_index += 1
+
+
+def _MapInOrder(executor, function, arguments, maximum_pending):
+    """Runs a function on arguments in a pool and yields results in order.
+
+    At most maximum_pending ranges are read ahead of the results, so memory use
+    does not grow with the size of the $MFT file.
+
+    Args:
+        executor (futures.Executor): pool of worker processes.
+        function (function): function to run.
+        arguments (iterable[tuple]): arguments per call.
+        maximum_pending (int): maximum number of pending calls.
+
+    Yields:
+        object: result per call, in the order of the arguments.
+    """
+    pending = collections.deque()
+    try:
+        for call_arguments in arguments:
+            pending.append(executor.submit(function, *call_arguments))
+            if len(pending) >= maximum_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def build_parent_map(mft_file, number_of_workers):
+    """Builds the parent map of a $MFT file in a pool of worker processes.
+
+    Args:
+        mft_file (MFT.MasterFileTableParser): $MFT file, after the first pass.
+        number_of_workers (int): number of worker processes.
+
+    Returns:
+        MFT.ParentMap: parent map of every base file record.
+    """
+    # A small $MFT file has fewer ranges than workers.
+    range_bytes = RANGE_SIZE * mft_file.file_record_segment_size
+    number_of_workers = min(number_of_workers, -(-mft_file.file_size // range_bytes))
+    if number_of_workers <= 1:
+        mft_file.build_parent_map()
+        return mft_file.parent_map
+
+    parent_map = MFT.ParentMap()
+    with futures.ProcessPoolExecutor(max_workers=number_of_workers) as executor:
+        for entries in _MapInOrder(executor, _ScanRange, _ReadRanges(mft_file), number_of_workers * 2):
+            parent_map.update(entries)
+
+    return parent_map
+
+
+def mft_parse_parallel(info, mft_file, number_of_workers):
+    """Parses the file records of a $MFT file in a pool of worker processes.
+
+    The $MFT file is split in ranges of file record segments, which are
+    decoded independently. A first pass builds the parent map from which the
+    second pass builds the full paths, instead of reading the parent file
+    records of every file record again.
+
+    Args:
+        info (tuple): partition, case and evidence identifiers.
+        mft_file (MFT.MasterFileTableParser): $MFT file, after the first pass.
+        number_of_workers (int): number of worker processes.
+
+    Yields:
+        tuple: row per file record, index entry or slack entry, in $MFT order.
+    """
+    if mft_file.parent_map is None:
+        mft_file.set_parent_map(build_parent_map(mft_file, number_of_workers))
+
+    # Full paths are built from the directories only.
+    parent_map = mft_file.parent_map.directories()
+
+    with futures.ProcessPoolExecutor(
+            max_workers=number_of_workers, initializer=_InitializeWorker,
+            initargs=(info, parent_map)) as executor:
+        for rows in _MapInOrder(executor, _ParseRange, _ReadRanges(mft_file), number_of_workers * 2):
+            for row in rows:
+                yield row
@@ -2,7 +2,7 @@ from modules.NTFS import util
 from modules.NTFS.dfir_ntfs import USN, MFT
 
 
-def usnjrnl_parse(mft_file, usn_record):
+def usnjrnl_parse(mft_file, usn_record, fr_file_path=None):
     r_usn = usn_record.get_usn()
     r_source = USN.ResolveSourceCodes(usn_record.get_source_info())
     r_reason = USN.ResolveReasonCodes(usn_record.get_reason())
@@ -18,16 +18,10 @@ def usnjrnl_parse(mft_file, usn_record):
 
     fr_number, fr_sequence = MFT.DecodeFileRecordSegmentReference(fr_reference_number)
 
-    try:
-        file_record = mft_file.get_file_record_by_number(fr_number, fr_sequence)
-        file_paths = mft_file.build_full_paths(file_record)
-    except MFT.MasterFileTableException:
+    if fr_file_path is None:
+        fr_file_path = mft_file.resolve_path(fr_number, fr_sequence)
+    if fr_file_path is None:
         fr_file_path = ''
-    else:
-        if len(file_paths) > 0:
-            fr_file_path = file_paths[0]
-        else:
-            fr_file_path = ''
 
     return (r_usn, r_source, r_reason, fr_reference_number, parent_fr_reference_number, r_timestamp,
             fr_file_name, fr_file_path)
\ No newline at end of file
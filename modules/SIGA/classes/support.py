@@ -1,22 +1,27 @@
 # -*- coding: utf-8 -*-
 from __future__ import unicode_literals
 
+from modules.SIGA import definitions
+
+SIG_ZIP = b'\x50\x4b'
+SIG_COMPOUND = definitions.COMPOUND_SIGNATURE
+
 SUPPORT_MODULE = [
-    #modulename, classname
-    ['modules.SIGA.classes.compressed.gzip', 'GZip'],
-    ['modules.SIGA.classes.compressed.sevenzip', 'SevenZip'],
-    ['modules.SIGA.classes.compressed.tar', 'Tar'],
-    ['modules.SIGA.classes.compressed.egg', 'EGG'],
-    ['modules.SIGA.classes.compressed.rar', 'RAR'],
-    ['modules.SIGA.classes.documents.pdf', 'PDF'],
-    ['modules.SIGA.classes.documents.odf', 'ODF'],
-    ['modules.SIGA.classes.documents.ooxml', 'OOXML'],
-    ['modules.SIGA.classes.compressed.zip', 'Zip'],
-    ['modules.SIGA.classes.compressed.alz', 'Alz'],
-    ['modules.SIGA.classes.documents.hwp', 'HWP'],
-    ['modules.SIGA.classes.documents.xls', 'XLS'],
-    ['modules.SIGA.classes.documents.ppt', 'PPT'],
-    ['modules.SIGA.classes.documents.doc', 'DOC'],
-    ['modules.SIGA.classes.documents.compound', 'Compound'],
-    ['modules.SIGA.classes.windows.prefetch', 'Prefetch']
+    #modulename, classname, signatures as (offset, magic), formats without signatures are always tried
+    ['modules.SIGA.classes.compressed.gzip', 'GZip', [(0, b'\x1f\x8b')]],
+    ['modules.SIGA.classes.compressed.sevenzip', 'SevenZip', [(0, b'\x37\x7a\xbc\xaf\x27\x1c')]],
+    ['modules.SIGA.classes.compressed.tar', 'Tar', []],
+    ['modules.SIGA.classes.compressed.egg', 'EGG', [(0, b'EGGA')]],
+    ['modules.SIGA.classes.compressed.rar', 'RAR', [(0, b'Rar!')]],
+    ['modules.SIGA.classes.documents.pdf', 'PDF', [(0, b'%PDF-1')]],
+    ['modules.SIGA.classes.documents.odf', 'ODF', [(0, SIG_ZIP)]],
+    ['modules.SIGA.classes.documents.ooxml', 'OOXML', [(0, SIG_ZIP)]],
+    ['modules.SIGA.classes.compressed.zip', 'Zip', [(0, SIG_ZIP)]],
+    ['modules.SIGA.classes.compressed.alz', 'Alz', [(0, b'\x41\x4c\x5a\x01')]],
+    ['modules.SIGA.classes.documents.hwp', 'HWP', [(0, SIG_COMPOUND)]],
+    ['modules.SIGA.classes.documents.xls', 'XLS', [(0, SIG_COMPOUND)]],
+    ['modules.SIGA.classes.documents.ppt', 'PPT', [(0, SIG_COMPOUND)]],
+    ['modules.SIGA.classes.documents.doc', 'DOC', [(0, SIG_COMPOUND)]],
+    ['modules.SIGA.classes.documents.compound', 'Compound', [(0, SIG_COMPOUND)]],
+    ['modules.SIGA.classes.windows.prefetch', 'Prefetch', []]
 ]
\ No newline at end of file
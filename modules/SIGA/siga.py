@@ -28,6 +28,11 @@ class SIGA():
         self.ext = None
         self.cls = None
 
+        # Built once by _BuildFormats and reused for every identification.
+        self._formats = None
+        self._signature_table = None
+        self._unconditional_formats = None
+
     def Identify(self, file_object, DirOrFile=None):
 
         if self.mode == 'file':
@@ -51,15 +56,73 @@ class SIGA():
     def _IdentifyFormatFromFile(self):
         pass
 
+    def _BuildFormats(self):
+        """Imports and instantiates the supported format classes, and builds the
+        signature table that maps a magic-byte prefix to the formats to try."""
+
+        self._formats = []
+        self._signature_table = {}
+        self._unconditional_formats = []
+
+        for index, (module_name, class_name, signatures) in enumerate(support.SUPPORT_MODULE):
+            mod = __import__('%s' % (module_name), fromlist=[module_name])
+            self._formats.append(getattr(mod, class_name)())
+
+            if not signatures:
+                self._unconditional_formats.append(index)
+
+            for offset, magic in signatures:
+                prefixes = self._signature_table.setdefault(offset, {})
+                prefixes.setdefault(len(magic), {}).setdefault(magic, []).append(index)
+
+    def _GetFormatIndexes(self, data):
+        """Returns the indexes of the formats whose signature matches the data,
+        in the order of support.SUPPORT_MODULE."""
+
+        indexes = list(self._unconditional_formats)
+        for offset, prefixes in self._signature_table.items():
+            for length, magics in prefixes.items():
+                indexes.extend(magics.get(data[offset:offset + length], []))
+
+        return sorted(indexes)
+
     def _IdentifyFormatFromMemory(self, file_object):
         if len(file_object) == 0 :
             return
 
-        for module_name, class_name in support.SUPPORT_MODULE:
-            mod = __import__('%s' % (module_name), fromlist=[module_name])
-            cls = getattr(mod, class_name)()
+        if self._formats is None:
+            self._BuildFormats()
+
+        self.ext = False
+        for index in self._GetFormatIndexes(file_object):
+            cls = self._formats[index]
+
+            # The format objects are reused, forget the result of the previous data.
+            cls._ext = None
+            if getattr(cls, '_cp', None) is not None:
+                cls._cp._dir_entries = None
+
             self.ext = cls.identifyFormatFromMemory(file_object)
 
             if self.ext != False:
                 self.cls = cls
-                break
\ No newline at end of file
+                break
+
+    def IdentifyBatch(self, buffers):
+        """Identifies the formats of many headers in one call.
+
+        Args:
+            buffers (list[bytes]): headers or contents of the files.
+
+        Returns:
+            list[str]: extension per buffer, such as ".docx", or None if the
+                format is not identified.
+        """
+        extensions = []
+        for buffer in buffers:
+            self.ext = None
+            self.cls = None
+            self._IdentifyFormatFromMemory(buffer)
+            extensions.append(self.ext or None)
+
+        return extensions
@@ -1,29 +1,35 @@
 #-*- coding: utf-8 -*-
 import os
 import logging
-import math
 import subprocess
 from modules.andForensics.modules.utils.android_sqlite3 import SQLite3
-from modules.andForensics.modules.utils.android_jadx import JADX
-from multiprocessing import Process, Queue, Lock
-import math
+from modules.andForensics.modules.utils.android_jadx import JADX, JADX_TIMEOUT
+from modules.andForensics.modules.utils.android_pool import TaskPool
 
 logger = logging.getLogger('andForensics')
 
+# seconds a decompilation task may take, jadx itself is killed after JADX_TIMEOUT
+DECOMPILE_TASK_TIMEOUT = JADX_TIMEOUT + 60
+
 class APKDecompiler(object):
-	def do_decompile(list_file_info, case, result):
-		for file_info in list_file_info:
-			file_name = file_info[0]
-			extracted_file_path = file_info[1]
+	def do_decompile(file_info, case):
+		file_name = file_info[0]
+		extracted_file_path = file_info[1]
+
+		extracted_file_dir = os.path.dirname(extracted_file_path)
+		decompiled_files_dir_path = case.extracted_files_dir_path_apk + "_decompiled" + extracted_file_dir.split(case.extracted_files_dir_path_apk)[1] + os.sep
+		decompiled_files_path = decompiled_files_dir_path + file_name
 
-			extracted_file_dir = os.path.dirname(extracted_file_path)
-			decompiled_files_dir_path = case.extracted_files_dir_path_apk + "_decompiled" + extracted_file_dir.split(case.extracted_files_dir_path_apk)[1] + os.sep
-			decompiled_files_path = decompiled_files_dir_path + file_name
+		apk_path = extracted_file_path
+		decompiled_path = decompiled_files_path
+		JADX.decompile(apk_path, decompiled_path)
 
-			apk_path = extracted_file_path
-			decompiled_path = decompiled_files_path
-			JADX.decompile(apk_path, decompiled_path)
-		result.put(len(list_file_info))
+#---------------------------------------------------------------------------------------------------------------
+	def get_apk_file_size(file_info):
+		try:
+			return os.path.getsize(file_info[1])
+		except OSError:
+			return 0
 
 #---------------------------------------------------------------------------------------------------------------
 	def decompile_with_jadx(case):
@@ -35,38 +41,6 @@ class APKDecompiler(object):
 			logger.error('There are no files to extract.')
 			return False
 
-		length = len(list_file_info)
-		NUMBER_OF_PROCESSES = case.number_of_input_processes
-		MAX_NUMBER_OF_PROCESSES_THIS_MODULE = math.ceil(length/2)
-		
-		if NUMBER_OF_PROCESSES*2 > length:
-			NUMBER_OF_PROCESSES = MAX_NUMBER_OF_PROCESSES_THIS_MODULE
-		if length < NUMBER_OF_PROCESSES:
-			result = Queue()
-			APKDecompiler.do_decompile(list_file_info, case, result)
-		else:
-			num_item_per_list = math.ceil(length/NUMBER_OF_PROCESSES)
-			start_pos = 0
-			divied_list = list()
-			for idx in range(start_pos, length, num_item_per_list):
-				out = list_file_info[start_pos:start_pos+num_item_per_list]
-				if out != []:
-					divied_list.append(out)
-				start_pos += num_item_per_list
-
-			result = Queue()
-			procs = []
-
-			for i in range(len(divied_list)):
-				proc = Process(target=APKDecompiler.do_decompile, args=(divied_list[i], case, result))
-				procs.append(proc)
-				proc.start()
-
-			for proc in procs:
-				proc.join()
-
-			result.put('STOP')
-			while True:
-				tmp = result.get()
-				if tmp == 'STOP':
-					break
+		TaskPool.run('Decompiling APK files', APKDecompiler.do_decompile, list_file_info, args=(case,),
+					 number_of_processes=case.number_of_input_processes, get_task_size=APKDecompiler.get_apk_file_size,
+					 timeout=DECOMPILE_TASK_TIMEOUT)
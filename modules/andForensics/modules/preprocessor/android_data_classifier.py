@@ -1,15 +1,18 @@
 #-*- coding: utf-8 -*-
 import os
 import logging
-import math
-from modules.andForensics.modules.utils.android_sqlite3 import SQLite3
+from modules.andForensics.modules.utils.android_sqlite3 import SQLite3, SQLiteWriter
 from modules.andForensics.modules.utils.android_TSK import TSK
 from binascii import b2a_hex
-from multiprocessing import Process, Queue
+from modules.andForensics.modules.utils.android_pool import TaskPool
 
 logger = logging.getLogger('andForensics')
 #FILE_FORMAT_CONF_PATH = os.getcwd() + os.sep + 'config' + os.sep + 'FILE_FORMAT.conf'
 FILE_FORMAT_CONF_PATH = '/home/byeongchan/modules/andForensics/config/FILE_FORMAT.conf'
+# number of format updates a process sends to the writer at once
+UPDATE_BATCH_SIZE = 1000
+# number of files classified per task
+CLASSIFY_TASK_SIZE = 5000
 
 class Classifier(object):
 	def set_loaddb(load_db_path):
@@ -134,64 +137,45 @@ class Classifier(object):
 				SQLite3.execute_commit_query(query, load_db_path)
 
 #---------------------------------------------------------------------------------------------------------------
-	def do_compare(list_file_inode, image_file_path, size_buf, list_dic_file_format_signature, load_db_path, result):
-		for i in range(0, len(list_file_inode)):
-			inode = '%d' % list_file_inode.pop()
-			header = TSK.get_file_buffer(image_file_path, int(inode), size_buf)
+	def do_compare(list_file_inode, image_file_path, size_buf, list_dic_file_format_signature, dic_format_flag, writer):
+		query = 'UPDATE tsk_files set format = ? WHERE meta_addr = ? and dir_flags != 2 and type = 0'
+		list_params = list()
+		# the inodes are sorted by block address, read them in order
+		for inode, header in TSK.get_file_buffers(image_file_path, list_file_inode, size_buf):
 			header_hex = b2a_hex(header)
 
 			# insert_file_signature_to_loaddb
 			format_name = Classifier.compare_signature(header_hex, list_dic_file_format_signature)
 			if format_name != False:
-				query = 'SELECT flag FROM file_format WHERE format = "%s"' % format_name
-				flag_signature = SQLite3.execute_fetch_query(query, load_db_path)
+				flag_signature = dic_format_flag.get(format_name)
 				if flag_signature != None:
-					query = 'UPDATE tsk_files set format = %d WHERE meta_addr = %d and dir_flags != 2 and type = 0' % (int(flag_signature[0]), int(inode))
-					# print("query: ", query)
-					SQLite3.execute_commit_query(query, load_db_path)
-		result.put(len(list_file_inode))
+					list_params.append((int(flag_signature), int(inode)))
+					if len(list_params) >= UPDATE_BATCH_SIZE:
+						writer.put(query, list_params)
+						list_params = list()
+		writer.put(query, list_params)
 
 #---------------------------------------------------------------------------------------------------------------
 	def classify_with_file_format(size_buf, list_dic_file_format_signature, case):
 		# get_list_all_file_inode
-		query = "SELECT meta_addr FROM tsk_files WHERE size != 0 and dir_flags != 2 and dir_type = 5 and type = 0"
-		list_all_file_inode = SQLite3.execute_fetch_query_multi_values(query, case.load_db_path)
-		length = len(list_all_file_inode)
-
-		NUMBER_OF_PROCESSES = case.number_of_input_processes
-		MAX_NUMBER_OF_PROCESSES_THIS_MODULE = math.ceil(length/2)
-		if NUMBER_OF_PROCESSES*2 > length:
-			NUMBER_OF_PROCESSES = MAX_NUMBER_OF_PROCESSES_THIS_MODULE
-
-		if length < NUMBER_OF_PROCESSES:
-			result = Queue()
-			Classifier.do_compare(list_all_file_inode, case.image_file_path, size_buf, list_dic_file_format_signature, case.load_db_path, result)
-		else:
-			num_item_per_list = math.ceil(length/NUMBER_OF_PROCESSES)
-			start_pos = 0
-			divied_list = list()
-			for idx in range(start_pos, length, num_item_per_list):
-				out = list_all_file_inode[start_pos:start_pos+num_item_per_list]
-				if out != []:
-					divied_list.append(out)
-				start_pos += num_item_per_list
-
-			result = Queue()
-			procs = []
-
-			for i in range(len(divied_list)):
-				proc = Process(target=Classifier.do_compare, args=(divied_list[i], case.image_file_path, size_buf, list_dic_file_format_signature, case.load_db_path, result))
-				procs.append(proc)
-				proc.start()
-
-			for proc in procs:
-				proc.join()
-
-			result.put('STOP')
-			while True:
-				tmp = result.get()
-				if tmp == 'STOP':
-					break
+		# sorted by the address of the first block, so every process reads its part of the image sequentially
+		query = "SELECT tsk_files.meta_addr FROM tsk_files LEFT JOIN tsk_file_layout ON tsk_file_layout.obj_id = tsk_files.obj_id and tsk_file_layout.sequence = 0 " \
+				"WHERE tsk_files.size != 0 and tsk_files.dir_flags != 2 and tsk_files.dir_type = 5 and tsk_files.type = 0 ORDER BY tsk_file_layout.byte_start"
+		list_all_file_inode = [file_inode[0] for file_inode in SQLite3.execute_fetch_query_multi_values(query, case.load_db_path)]
+
+		query = 'SELECT format, flag FROM file_format'
+		dic_format_flag = dict(SQLite3.execute_fetch_query_multi_values(query, case.load_db_path))
+
+		# the format updates of all processes are written by a single writer process
+		writer = SQLiteWriter(case.load_db_path)
+		writer.start()
+
+		# contiguous runs of inodes keep the reads of a process sequential
+		list_task = [list_all_file_inode[pos:pos+CLASSIFY_TASK_SIZE] for pos in range(0, len(list_all_file_inode), CLASSIFY_TASK_SIZE)]
+		TaskPool.run('Classifying files', Classifier.do_compare, list_task, args=(case.image_file_path, size_buf, list_dic_file_format_signature, dic_format_flag, writer),
+					 number_of_processes=case.number_of_input_processes)
+
+		writer.close()
 
 #---------------------------------------------------------------------------------------------------------------
 	def set_file_format_table(file_name, load_db_path):
@@ -235,7 +219,7 @@ class Classifier(object):
 		size_buf = ret[0]
 		list_dic_file_format_signature = ret[1]
 
-		size_buf = Classifier.set_file_format_table_to_loaddb(list_dic_file_format_signature, case.load_db_path)
+		Classifier.set_file_format_table_to_loaddb(list_dic_file_format_signature, case.load_db_path)
 		Classifier.classify_with_file_format(size_buf, list_dic_file_format_signature, case)
 
 #---------------------------------------------------------------------------------------------------------------
@@ -1,16 +1,30 @@
 #-*- coding: utf-8 -*-
 import os
 import logging
-import math
-from modules.andForensics.modules.utils.android_sqlite3 import SQLite3
+import functools
+from modules.andForensics.modules.utils.android_sqlite3 import SQLite3, SQLiteWriter
 from modules.andForensics. modules.utils.android_TSK import TSK
-from multiprocessing import Process, Queue
+from modules.andForensics.modules.utils.android_pool import TaskPool
 import sys
 
 logger = logging.getLogger('andForensics')
 
+# the extracted files of a process are sent to the writer in batches
+INSERT_BATCH_SIZE = 1000
+
 class FileExtractor(object):
-	def insert_extracted_files_info_to_resultdb(format_name, file_info, preprocess_db_path, extracted_file_path):
+	# extracted files of the current process not sent to the writer yet
+	list_extracted_file_info = list()
+
+	def get_insert_query(format_name):
+		if format_name.upper() == "SQLITEDB":
+			table_name = 'sqlitedb_info'
+		elif format_name.upper() == "APK":
+			table_name = 'apk_file_info'
+		return 'INSERT INTO %s(inode, id_package, parent_path, name, size, ctime, crtime, atime, mtime, extracted_path) VALUES(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)' % table_name
+
+#---------------------------------------------------------------------------------------------------------------
+	def get_extracted_files_info(file_info, extracted_file_path):
 		inode = file_info[0]
 		id_package = file_info[1]
 		parent_path = file_info[2]
@@ -21,39 +35,40 @@ class FileExtractor(object):
 		atime = file_info[7]
 		mtime = file_info[8]
 
+		return (int(inode), int(id_package), parent_path, name, int(size), int(ctime), int(crtime), int(atime), int(mtime), extracted_file_path)
+
+#---------------------------------------------------------------------------------------------------------------
+	def do_extract(file_info, case, format_name, writer):
+		inode = file_info[0]
+		id_package = file_info[1]
+		parent_path = file_info[2]
+		name = file_info[3]
+		extracted_parent_path = str(file_info[2]).replace("/", os.sep)
+
 		if format_name.upper() == "SQLITEDB":
-			query = 'INSERT INTO sqlitedb_info(inode, id_package, parent_path, name, size, ctime, crtime, atime, mtime, extracted_path) VALUES(%d, %d, "%s", "%s", %d, %d, %d, %d, %d, "%s")' % (int(inode), int(id_package), parent_path, name, int(size), int(ctime), int(crtime), int(atime), int(mtime), extracted_file_path)
+			extracted_file_dir = case.extracted_files_dir_path_sqlitedb + extracted_parent_path
 		elif format_name.upper() == "APK":
-			query = 'INSERT INTO apk_file_info(inode, id_package, parent_path, name, size, ctime, crtime, atime, mtime, extracted_path) VALUES(%d, %d, "%s", "%s", %d, %d, %d, %d, %d, "%s")' % (int(inode), int(id_package), parent_path, name, int(size), int(ctime), int(crtime), int(atime), int(mtime), extracted_file_path)
-
-		SQLite3.execute_commit_query(query, preprocess_db_path)
+			extracted_file_dir = case.extracted_files_dir_path_apk + extracted_parent_path
+
+		if os.path.exists(extracted_file_dir) == False:
+			try:
+				os.makedirs(extracted_file_dir)
+			except OSError as e:
+				logger.error("Directory is already exist. filepath: %s" % extracted_file_dir + name)
+				pass
+
+		extracted_file_path = extracted_file_dir + name
+		if os.path.exists(extracted_file_path) == False:
+			if TSK.icat_for_extract_file(case.image_file_path, inode, extracted_file_path):
+				FileExtractor.list_extracted_file_info.append(FileExtractor.get_extracted_files_info(file_info, extracted_file_path))
+				if len(FileExtractor.list_extracted_file_info) >= INSERT_BATCH_SIZE:
+					FileExtractor.flush_extracted_files_info(format_name, writer)
 
 #---------------------------------------------------------------------------------------------------------------
-	def do_extract(list_file_info, case, format_name, result):
-		for file_info in list_file_info:
-			inode = file_info[0]
-			id_package = file_info[1]
-			parent_path = file_info[2]
-			name = file_info[3]
-			extracted_parent_path = str(file_info[2]).replace("/", os.sep)
-
-			if format_name.upper() == "SQLITEDB":
-				extracted_file_dir = case.extracted_files_dir_path_sqlitedb + extracted_parent_path
-			elif format_name.upper() == "APK":
-				extracted_file_dir = case.extracted_files_dir_path_apk + extracted_parent_path
-
-			if os.path.exists(extracted_file_dir) == False:
-				try:
-					os.makedirs(extracted_file_dir)
-				except OSError as e:
-					logger.error("Directory is already exist. filepath: %s" % extracted_file_dir + name)
-					pass
-
-			extracted_file_path = extracted_file_dir + name
-			if os.path.exists(extracted_file_path) == False:
-				if TSK.icat_for_extract_file(case.image_file_path, inode, extracted_file_path):
-					FileExtractor.insert_extracted_files_info_to_resultdb(format_name, file_info, case.preprocess_db_path, extracted_file_path)
-		result.put(len(list_file_info))
+	def flush_extracted_files_info(format_name, writer):
+		# a new list, the queue of the writer pickles the sent list in the background
+		writer.put(FileExtractor.get_insert_query(format_name), FileExtractor.list_extracted_file_info)
+		FileExtractor.list_extracted_file_info = list()
 
 #---------------------------------------------------------------------------------------------------------------
 	def extract_files_with_format(case, format_name):
@@ -70,40 +85,13 @@ class FileExtractor(object):
 			logger.error('There are no files to extract.')
 			return False
 
-		length = len(list_file_info)
-		NUMBER_OF_PROCESSES = case.number_of_input_processes
-		MAX_NUMBER_OF_PROCESSES_THIS_MODULE = math.ceil(length/2)
-
-		if NUMBER_OF_PROCESSES*2 > length:
-			NUMBER_OF_PROCESSES = MAX_NUMBER_OF_PROCESSES_THIS_MODULE
-		if length < NUMBER_OF_PROCESSES:
-			result = Queue()
-			FileExtractor.do_extract(list_file_info, case, format_name, result)
-		else:
-			num_item_per_list = math.ceil(length/NUMBER_OF_PROCESSES)
-			start_pos = 0
-			divied_list = list()
-			for idx in range(start_pos, length, num_item_per_list):
-				out = list_file_info[start_pos:start_pos+num_item_per_list]
-				if out != []:
-					divied_list.append(out)
-				start_pos += num_item_per_list
-
-			result = Queue()
-			procs = []
-
-			for i in range(len(divied_list)):
-				proc = Process(target=FileExtractor.do_extract, args=(divied_list[i], case, format_name, result))
-				procs.append(proc)
-				proc.start()
-
-			for proc in procs:
-				proc.join()
-
-			result.put('STOP')
-			while True:
-				tmp = result.get()
-				if tmp == 'STOP':
-					break
+		# the extracted files of all processes are inserted by a single writer process
+		writer = SQLiteWriter(case.preprocess_db_path)
+		writer.start()
 
+		# the largest files first, size is the 5th column of the file info
+		TaskPool.run('Extracting %s files' % format_name, FileExtractor.do_extract, list_file_info, args=(case, format_name, writer),
+					 number_of_processes=case.number_of_input_processes, get_task_size=lambda file_info: file_info[4],
+					 finalizer=functools.partial(FileExtractor.flush_extracted_files_info, format_name, writer))
 
+		writer.close()
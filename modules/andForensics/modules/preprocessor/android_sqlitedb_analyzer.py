@@ -3,12 +3,13 @@ import os
 import logging
 import math
 from modules.andForensics.modules.utils.android_sqlite3 import SQLite3
-from multiprocessing import Process, Queue, Lock
+from modules.andForensics.modules.utils.android_pool import TaskPool
 import sqlite3
 import binascii
 import base64
 import time
 import re
+import random
 import sys
 
 
@@ -29,6 +30,10 @@ LATITUDE_END 	= 40
 LONGITUDE_START = 123
 LONGITUDE_END 	= 133
 
+# number of values sampled per column, and number of records scanned for the samples
+SAMPLE_SIZE = 50
+SAMPLE_MAX_RECORDS = 100000
+
 #USER_INFO_TYPE_COL_NAME_CONF_PATH = os.getcwd() + os.sep + 'config' + os.sep + 'USER_INFO_TYPE_COL_NAME.conf'
 USER_INFO_TYPE_COL_NAME_CONF_PATH = '/home/byeongchan/modules/andForensics/config/USER_INFO_TYPE_COL_NAME.conf'
 LIST_USER_INFO_TIMESTAMP = list()
@@ -104,28 +109,28 @@ PASSWORD_FORMAT_PASSWORD			= "password"
 # PASSWORD_FORMAT_CREDENTIAL			= "credential"
 CIPHER_FORMAT_HASH					= "hash"
 
-## RE
-RE_DATETIME_INT8_YYYYMMDD			= '^(20[0-9]{2})([0-1]{1}[0-9]{1})([0-3]{1}[0-9]{1})$'
-RE_DATETIME_INT14_YYYYMMDDHHMMSS	='^(20[0-9]{2})([0-1]{1}[0-9]{1})([0-3]{1}[0-9]{1})([0-2]{1}[0-9]{1})([0-5]{1}[0-9]{1})([0-5]{1}[0-9]{1})$'
+## RE, compiled once instead of on every matched value
+RE_DATETIME_INT8_YYYYMMDD			= re.compile('^(20[0-9]{2})([0-1]{1}[0-9]{1})([0-3]{1}[0-9]{1})$')
+RE_DATETIME_INT14_YYYYMMDDHHMMSS	=re.compile('^(20[0-9]{2})([0-1]{1}[0-9]{1})([0-3]{1}[0-9]{1})([0-2]{1}[0-9]{1})([0-5]{1}[0-9]{1})([0-5]{1}[0-9]{1})$')
 
-RE_DATETIME_TEXT 		= '^\d{4}[/:-]*[.]*\d{2}[/:-]*[.]*\d{2}.\d{2}[/:-]*[.]*\d{2}[/:-]*[.]*\d{2}'
-RE_DATETIME_TEXT2 		= '^\d{4}[/:-]*[.]*\d{2}[/:-]*[.]*\d{2}'
+RE_DATETIME_TEXT 		= re.compile('^\d{4}[/:-]*[.]*\d{2}[/:-]*[.]*\d{2}.\d{2}[/:-]*[.]*\d{2}[/:-]*[.]*\d{2}')
+RE_DATETIME_TEXT2 		= re.compile('^\d{4}[/:-]*[.]*\d{2}[/:-]*[.]*\d{2}')
 
-RE_SPECIALCHAR = '[=+,#/\?^$@*\"※~&%ㆍ!{}』\\‘|\(\)\[\]\<\>`\'…》]'
+RE_SPECIALCHAR = re.compile('[=+,#/\?^$@*\"※~&%ㆍ!{}』\\‘|\(\)\[\]\<\>`\'…》]')
 # RE_EMAIL        = '^[a-zA-Z0-9.!#$%&\'*+\/=?^_`{|}~-]+@[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(?:\.[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*'
 # RE_EMAIL        = '^[a-zA-Z0-9.!#$%&\'*+\/=?^_`{|}~-]+@[A-Z0-9.-]+\.[A-Z]{2,}$'
-RE_EMAIL = '^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$'
+RE_EMAIL = re.compile('^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$')
 
-RE_PHONENUM     = '^0?\d{7,10}$'
-RE_PHONENUM2    = '^0?10\d{8}$'
-RE_PHONENUM3     = '^\d{2,3}0?10\d{8}$'
-RE_PHONENUM4     = '^\d{2,3}0?\d{7,10}$'
+RE_PHONENUM     = re.compile('^0?\d{7,10}$')
+RE_PHONENUM2    = re.compile('^0?10\d{8}$')
+RE_PHONENUM3     = re.compile('^\d{2,3}0?10\d{8}$')
+RE_PHONENUM4     = re.compile('^\d{2,3}0?\d{7,10}$')
 
-RE_IP_ADDRESS   = '^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$'
-RE_MAC_ADDRESS = '^[\d\w]{2}\:[\d\w]{2}\:[\d\w]{2}\:[\d\w]{2}\:[\d\w]{2}\:[\d\w]{2}'
-RE_URL          = '^(https?:\/\/)'
-RE_URL2          = '^(https?:\/\/)?([a-z\d\.-]+)\.([a-z\.]{2,6})([\/\w\.-]*)*\/?$'
-RE_PACKAGENAME = '^[a-zA-Z0-9]*\.[a-zA-Z0-9]*.?[a-zA-Z0-9]*.?[a-zA-Z0-9]*.?[a-zA-Z0-9]*.?[a-zA-Z0-9]*.?[a-zA-Z0-9]*.?[a-zA-Z0-9]*$'
+RE_IP_ADDRESS   = re.compile('^\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}$')
+RE_MAC_ADDRESS = re.compile('^[\d\w]{2}\:[\d\w]{2}\:[\d\w]{2}\:[\d\w]{2}\:[\d\w]{2}\:[\d\w]{2}')
+RE_URL          = re.compile('^(https?:\/\/)')
+RE_URL2          = re.compile('^(https?:\/\/)?([a-z\d\.-]+)\.([a-z\.]{2,6})([\/\w\.-]*)*\/?$')
+RE_PACKAGENAME = re.compile('^[a-zA-Z0-9]*\.[a-zA-Z0-9]*.?[a-zA-Z0-9]*.?[a-zA-Z0-9]*.?[a-zA-Z0-9]*.?[a-zA-Z0-9]*.?[a-zA-Z0-9]*.?[a-zA-Z0-9]*$')
 
 class SQLiteAnalyzer(object):
 	def exception_rule_column_type(col_name, col_type_sqlite):
@@ -246,10 +251,39 @@ class SQLiteAnalyzer(object):
 						return col_value, col_value_size, CONTENTS_UNKNOWN
 
 #---------------------------------------------------------------------------------------------------------------
-	def get_col_value(table_name, col_name, col_type_sqlite, sqlite_file_path, cnt):
-		query = 'SELECT "%s" FROM "%s" ORDER BY "%s" DESC LIMIT %d' % (col_name, table_name, col_name, cnt)
-		query2 = 'SELECT "%s" FROM "%s" LIMIT %d' % (col_name, table_name, cnt)
-		return SQLite3.execute_fetch_query_multi_values_order(query, query2, sqlite_file_path)
+	def get_col_samples(table_name, list_col_name, sqlite_file_path, cnt):
+		# samples all columns of a table in one scan instead of sorting the table per column,
+		# every column keeps a reservoir of cnt non-empty values of the first SAMPLE_MAX_RECORDS records
+		query = 'SELECT %s FROM "%s" LIMIT %d' % (', '.join(['"%s"' % col_name for col_name in list_col_name]), table_name, SAMPLE_MAX_RECORDS)
+		try:
+			con = SQLite3.get_connection(sqlite_file_path)
+			cursor = con.execute(query)
+		except sqlite3.Error as e:
+			logger.error("SQLite query execution error. query: %s, db: %s" % (query, sqlite_file_path))
+			return False
+
+		# seeded per table, so the same database is always classified the same way
+		rand = random.Random(table_name)
+		list_cnt_value = [0] * len(list_col_name)
+		list_col_sample = [list() for col_name in list_col_name]
+		try:
+			for record in cursor:
+				for idx, col_value in enumerate(record):
+					if (col_value == None) or (col_value == "") or (col_value == '0') or (col_value == 0):
+						continue
+					list_cnt_value[idx] += 1
+					if list_cnt_value[idx] <= cnt:
+						list_col_sample[idx].append(col_value)
+					else:
+						pos = rand.randrange(list_cnt_value[idx])
+						if pos < cnt:
+							list_col_sample[idx][pos] = col_value
+		except sqlite3.Error as e:
+			logger.error("SQLite query execution error. query: %s, db: %s" % (query, sqlite_file_path))
+			return False
+		finally:
+			cursor.close()
+		return list_col_sample
 
 #---------------------------------------------------------------------------------------------------------------
 	def get_user_info_type():
@@ -305,7 +339,7 @@ class SQLiteAnalyzer(object):
 			return USER_INFO_TYPE_UNKNOWN, col_value_type, col_value_size
 		if col_value_size == 8: # YYYYMMDD
 			col_value = "%s" % col_value
-			if re.match(RE_DATETIME_INT8_YYYYMMDD, col_value):
+			if RE_DATETIME_INT8_YYYYMMDD.match(col_value):
 				return USER_INFO_TYPE_TIMESTAMP, TIME_FORMAT_DATETIME_YYYYMMDD
 			else:
 				return USER_INFO_TYPE_UNKNOWN, CONTENTS_DIGIT_POSITIVE, col_value_size
@@ -327,7 +361,7 @@ class SQLiteAnalyzer(object):
 				return USER_INFO_TYPE_TIMESTAMP, TIME_FORMAT_UNIXTIME_MILLISEC
 		elif col_value_size == 14: # YYYYMMDDHHMMSS
 			col_value = "%s" % col_value
-			if re.match(RE_DATETIME_INT14_YYYYMMDDHHMMSS, col_value):
+			if RE_DATETIME_INT14_YYYYMMDDHHMMSS.match(col_value):
 				return USER_INFO_TYPE_TIMESTAMP, TIME_FORMAT_DATETIME_YYYYMMDDHHMMSS
 			else:
 				return USER_INFO_TYPE_UNKNOWN, CONTENTS_DIGIT_POSITIVE, col_value_size
@@ -371,11 +405,11 @@ class SQLiteAnalyzer(object):
 			col_value_size = len(str(col_value))
 			return SQLiteAnalyzer.searching_timestamp_int(col_value, col_value_size, col_value_type, sqlite_file_path, table_name, col_name)
 		elif col_value_type == CONTENTS_UNKNOWN:
-			if re.search(RE_SPECIALCHAR, col_value):
+			if RE_SPECIALCHAR.search(col_value):
 				return USER_INFO_TYPE_UNKNOWN, col_value_type, col_value_size
-			if re.match(RE_DATETIME_TEXT, col_value):
+			if RE_DATETIME_TEXT.match(col_value):
 				return USER_INFO_TYPE_TIMESTAMP, TIME_FORMAT_DATETIME_TEXT
-			elif re.match(RE_DATETIME_TEXT2, col_value):
+			elif RE_DATETIME_TEXT2.match(col_value):
 				return USER_INFO_TYPE_TIMESTAMP, TIME_FORMAT_DATETIME_TEXT
 			else:
 				return USER_INFO_TYPE_UNKNOWN, col_value_type, col_value_size
@@ -398,7 +432,7 @@ class SQLiteAnalyzer(object):
 		elif col_value_type == CONTENTS_UNKNOWN:
 			# if (col_value.count("@") != 1) | (col_value.find(" ") >= 1):
 			if (col_value.count("@") == 1) & (col_value.count(" ") == 0):
-				if re.search(RE_EMAIL, col_value):					
+				if RE_EMAIL.search(col_value):					
 					return USER_INFO_TYPE_ID_ACCOUNT, ID_FORMAT_EMAIL
 				else:
 					return USER_INFO_TYPE_UNKNOWN, col_value_type, col_value_size
@@ -414,13 +448,13 @@ class SQLiteAnalyzer(object):
 		if ("TIME" in col_name.upper()) | ("VERSION" in col_name.upper()) | ("KEY" in col_name.upper()):
 			return USER_INFO_TYPE_UNKNOWN, col_value_type, col_value_size
 		col_value = "%s" % col_value
-		if re.match(RE_PHONENUM, col_value):
+		if RE_PHONENUM.match(col_value):
 			return USER_INFO_TYPE_ID_PHONENUMBER, ID_FORMAT_PHONENUMBER
-		elif re.match(RE_PHONENUM2, col_value):
+		elif RE_PHONENUM2.match(col_value):
 			return USER_INFO_TYPE_ID_PHONENUMBER, ID_FORMAT_PHONENUMBER
-		elif re.match(RE_PHONENUM3, col_value):
+		elif RE_PHONENUM3.match(col_value):
 			return USER_INFO_TYPE_ID_PHONENUMBER, ID_FORMAT_PHONENUMBER
-		elif re.match(RE_PHONENUM4, col_value):
+		elif RE_PHONENUM4.match(col_value):
 			return USER_INFO_TYPE_ID_PHONENUMBER, ID_FORMAT_PHONENUMBER
 		else:
 			return USER_INFO_TYPE_UNKNOWN, col_value_type, col_value_size
@@ -450,13 +484,13 @@ class SQLiteAnalyzer(object):
 					return SQLiteAnalyzer.searching_id_phonenumber_int(col_value, col_value_size, col_value_type, sqlite_file_path, table_name, col_name)
 				else:
 					return USER_INFO_TYPE_UNKNOWN, col_value_type, col_value_size
-			# elif re.match(RE_EMAIL, col_value):
+			# elif RE_EMAIL.match(col_value):
 			# 	return USER_INFO_TYPE_ID_ACCOUNT, ID_FORMAT_EMAIL
 			elif (col_value.count("@") == 1) & (col_value.count(" ") == 0):
-				# if re.search(RE_EMAIL, col_value):
-				if re.search(RE_EMAIL, col_value):
+				# if RE_EMAIL.search(col_value):
+				if RE_EMAIL.search(col_value):
 					return USER_INFO_TYPE_ID_ACCOUNT, ID_FORMAT_EMAIL
-				if re.search(RE_SPECIALCHAR, col_value):
+				if RE_SPECIALCHAR.search(col_value):
 					return USER_INFO_TYPE_UNKNOWN, col_value_type, col_value_size
 				else:
 					return USER_INFO_TYPE_UNKNOWN, col_value_type, col_value_size
@@ -473,12 +507,12 @@ class SQLiteAnalyzer(object):
 		if col_value_type == CONTENTS_UNKNOWN:
 			col_value = "%s" % col_value
 			if col_value.count('.') == 3:
-				if re.match(RE_IP_ADDRESS, col_value):
+				if RE_IP_ADDRESS.match(col_value):
 					return USER_INFO_TYPE_ID_IPADDRESS, ID_FORMAT_IPADDRESS
 				else:
 					return USER_INFO_TYPE_UNKNOWN, col_value_type, col_value_size
 			elif (col_value.count(":") == 5) & (len(col_value) <= 20):
-				if re.match(RE_MAC_ADDRESS, col_value):
+				if RE_MAC_ADDRESS.match(col_value):
 					return USER_INFO_TYPE_ID_MACADDRESS, ID_FORMAT_MACADDRESS
 				else:
 					return USER_INFO_TYPE_UNKNOWN, col_value_type, col_value_size
@@ -496,7 +530,7 @@ class SQLiteAnalyzer(object):
 				return USER_INFO_TYPE_URL, URL_FORMAT_HTTP
 			elif col_value.upper().startswith("WWW."):
 				return USER_INFO_TYPE_URL, URL_FORMAT_HTTP			
-			elif re.search(RE_URL, col_value):
+			elif RE_URL.search(col_value):
 				return USER_INFO_TYPE_URL, URL_FORMAT_HTTP
 			else:
 				return USER_INFO_TYPE_UNKNOWN, col_value_type, col_value_size			
@@ -581,7 +615,7 @@ class SQLiteAnalyzer(object):
 	def searching_package(col_value, col_value_size, col_value_type, sqlite_file_path, table_name, col_name):
 		if col_value_type == CONTENTS_UNKNOWN:
 			if (col_value.count('.') >= 1) & (col_value.count('.') <= 7) & (col_value_size <= 60) & (col_value.count(' ') == 0):
-				if re.match(RE_PACKAGENAME, col_value):
+				if RE_PACKAGENAME.match(col_value):
 					return USER_INFO_TYPE_CONTENTS, CONTENTS_FORMAT_PACKAGE
 				else:
 					return USER_INFO_TYPE_UNKNOWN, col_value_type, col_value_size
@@ -797,6 +831,7 @@ class SQLiteAnalyzer(object):
 			logger.error('corrupted table_name: "%s", db: "%s"' % (table_name, sqlite_file_path))
 			return False
 
+		list_col = list()
 		for col_info in list_col_info:
 			col_name = col_info[1]
 			col_num = col_info[0] + 1
@@ -805,38 +840,29 @@ class SQLiteAnalyzer(object):
 				continue
 			if SQLiteAnalyzer.exception_rule_column_type(col_name, col_type_sqlite):
 				continue
+			list_col.append((col_name, col_num, col_type_sqlite))
+		if list_col == []:
+			return
 
-			list_ret_col_schema = list()
-			list_col_value = SQLiteAnalyzer.get_col_value(table_name, col_name, col_type_sqlite, sqlite_file_path, 50)
-			if list_col_value == False:
-				logger.error('corrupted column: "%s", table_name: "%s", db: "%s"' % (col_name, table_name, sqlite_file_path))
-				return False
-
-# debugging -----------------------------------------------------------
-				# if (table_name == "package_list") & (col_name == "name"):
-				# 	print(col_value_type, list_col_value)
-# debugging -----------------------------------------------------------				
+		list_col_sample = SQLiteAnalyzer.get_col_samples(table_name, [col[0] for col in list_col], sqlite_file_path, SAMPLE_SIZE)
+		if list_col_sample == False:
+			logger.error('corrupted table_name: "%s", db: "%s"' % (table_name, sqlite_file_path))
+			return False
 
+		for (col_name, col_num, col_type_sqlite), list_col_value in zip(list_col, list_col_sample):
+			list_ret_col_schema = list()
 			for col_value in list_col_value:
 				# print("col_value: %s, col_name: %s, table_name: %s, sqlite_file_path: %s" % (col_value, col_name, table_name, sqlite_file_path))
-				if (col_value[0] == None) | (col_value[0] == "") | (col_value[0] == '0') | (col_value[0] == 0):
-					continue
-								
 				if (col_type_sqlite == "BLOB") | (col_type_sqlite == "BYTE"):
 					ret_col_schema = USER_INFO_TYPE_CONTENTS, CONTENTS_FORMAT_BIN
 					list_ret_col_schema.append(ret_col_schema)
 					continue
 
-				ret_col_value_info = SQLiteAnalyzer.check_col_value_info(col_value[0])
+				ret_col_value_info = SQLiteAnalyzer.check_col_value_info(col_value)
 				col_value = ret_col_value_info[0]
 				col_value_size = ret_col_value_info[1]
 				col_value_type = ret_col_value_info[2]
 
-# debugging -----------------------------------------------------------
-				# if (table_name == "AppUsage") & (col_name == "GnDate"):
-				# 	print(col_value_type, col_value)
-# debugging -----------------------------------------------------------
-
 				if SQLiteAnalyzer.exception_rule_contents(col_name, col_value, col_value_size, col_value_type):
 					continue
 				ret_col_schema = SQLiteAnalyzer.analyze_col_value_with_col_name(col_name, col_value, col_value_size, col_value_type, table_name, sqlite_file_path)
@@ -862,50 +888,54 @@ class SQLiteAnalyzer(object):
 		SQLite3.execute_commit_query(query, preprocess_db_path)
 
 #---------------------------------------------------------------------------------------------------------------
-	def do_analyze(list_sqlite, case, result):
-		SQLiteAnalyzer.get_user_info_type()		
-		for sqlite_inode_path_name in list_sqlite:
-			inode = sqlite_inode_path_name[0]
-			sqlite_file_path = sqlite_inode_path_name[1]
-			db_name = sqlite_inode_path_name[2]
+	def analyze_sqlite(sqlite_inode_path_name, case):
+		inode = sqlite_inode_path_name[0]
+		sqlite_file_path = sqlite_inode_path_name[1]
+		db_name = sqlite_inode_path_name[2]
 
 # debugging -----------------------------------------------------------
-			# if sqlite_file_path != "c:\Result\20150123_SM-N910L_data\extracted_files\format_sqlitedb\data\com.apusapps.launcher\databases\b_r.db":
-			if db_name == "b_r.db":
-				continue
+		# if sqlite_file_path != "c:\Result\20150123_SM-N910L_data\extracted_files\format_sqlitedb\data\com.apusapps.launcher\databases\b_r.db":
+		if db_name == "b_r.db":
+			return
 # debugging -----------------------------------------------------------
 
-			# if there are no tables, skip the sqlitedb
-			query = "SELECT tbl_name FROM sqlite_master WHERE type='table' and sql LIKE '%CREATE TABLE%' and tbl_name!='sqlite_sequence' and tbl_name!='android_metadata'"
-			list_table = SQLite3.execute_fetch_query_multi_values(query, sqlite_file_path)
-			if (list_table == False) | (list_table == []):
+		# if there are no tables, skip the sqlitedb
+		query = "SELECT tbl_name FROM sqlite_master WHERE type='table' and sql LIKE '%CREATE TABLE%' and tbl_name!='sqlite_sequence' and tbl_name!='android_metadata'"
+		list_table = SQLite3.execute_fetch_query_multi_values(query, sqlite_file_path)
+		if (list_table == False) | (list_table == []):
+			return
+
+		for table_info in list_table:
+			# if there are no records, skip the table
+			query = 'SELECT count(*) FROM "%s"' % table_info[0]
+			ret = SQLite3.execute_fetch_query(query, sqlite_file_path)
+			if ret == False:
+				logger.error('corrupted table: "%s", db: "%s"' % (table_info[0], sqlite_file_path))
 				continue
-
-			for table_info in list_table:
-				# if there are no records, skip the table
-				query = 'SELECT count(*) FROM "%s"' % table_info[0]
-				ret = SQLite3.execute_fetch_query(query, sqlite_file_path)
-				if ret == False:
-					logger.error('corrupted table: "%s", db: "%s"' % (table_info[0], sqlite_file_path))
+			else:
+				cnt_records = ret[0]
+				if cnt_records == 0:
 					continue
-				else:
-					cnt_records = ret[0]
-					if cnt_records == 0:
-						continue
 
-				dic_table_info = {'file_inode':0, 'file_name':"", 'table_name':"", 'cnt_records':0, 'cnt_timestamp':0, 'cnt_time_duration':0, 'cnt_phonenumber':0, 'cnt_account':0, 'cnt_pwd':0, 'cnt_url':0, 'cnt_geodata':0, 'cnt_ip':0, 'cnt_mac':0, 'cnt_digit_positive':0, 'cnt_contents':0, 'cnt_bin':0, 'cnt_file':0, 'cnt_cipher':0, 'cnt_pkg':0, 'timestamp':"", 'time_duration':"", 'phonenumber':"", 'account':"", 'pwd':"", 'url':"", 'geodata':"", 'ip':"", 'mac':"", 'digit_positive':"", 'contents':"", 'bin':"", 'file':"", 'cipher':"", 'pkg':"", 'table_signature':"", 'table_info':"", 'last':0, 'has_data':0}
-				dic_table_info['file_inode'] = inode
-				dic_table_info['file_name'] = db_name
-				dic_table_info['table_name'] = table_info[0]
-				dic_table_info['cnt_records'] = cnt_records
+			dic_table_info = {'file_inode':0, 'file_name':"", 'table_name':"", 'cnt_records':0, 'cnt_timestamp':0, 'cnt_time_duration':0, 'cnt_phonenumber':0, 'cnt_account':0, 'cnt_pwd':0, 'cnt_url':0, 'cnt_geodata':0, 'cnt_ip':0, 'cnt_mac':0, 'cnt_digit_positive':0, 'cnt_contents':0, 'cnt_bin':0, 'cnt_file':0, 'cnt_cipher':0, 'cnt_pkg':0, 'timestamp':"", 'time_duration':"", 'phonenumber':"", 'account':"", 'pwd':"", 'url':"", 'geodata':"", 'ip':"", 'mac':"", 'digit_positive':"", 'contents':"", 'bin':"", 'file':"", 'cipher':"", 'pkg':"", 'table_signature':"", 'table_info':"", 'last':0, 'has_data':0}
+			dic_table_info['file_inode'] = inode
+			dic_table_info['file_name'] = db_name
+			dic_table_info['table_name'] = table_info[0]
+			dic_table_info['cnt_records'] = cnt_records
 
-				if SQLiteAnalyzer.exception_rule_db_table(db_name, dic_table_info['table_name']):
-					continue
+			if SQLiteAnalyzer.exception_rule_db_table(db_name, dic_table_info['table_name']):
+				continue
+
+			SQLiteAnalyzer.analyze_table_info(dic_table_info, sqlite_file_path)
+			if dic_table_info['has_data'] == 1:
+				SQLiteAnalyzer.insert_table_info_to_preprocessdb(dic_table_info, case.preprocess_db_path)
 
-				SQLiteAnalyzer.analyze_table_info(dic_table_info, sqlite_file_path)
-				if dic_table_info['has_data'] == 1:
-					SQLiteAnalyzer.insert_table_info_to_preprocessdb(dic_table_info, case.preprocess_db_path)
-		result.put(len(list_sqlite))
+#---------------------------------------------------------------------------------------------------------------
+	def get_sqlite_file_size(sqlite_inode_path_name):
+		try:
+			return os.path.getsize(sqlite_inode_path_name[1])
+		except OSError:
+			return 0
 
 #---------------------------------------------------------------------------------------------------------------
 	def analyze_sqlitedb(case):
@@ -915,46 +945,7 @@ class SQLiteAnalyzer(object):
 		if list_sqlite == False:
 			return False
 
-# for single-processing -----------------------------------------------------------------------------		
-		# result = Queue()
-		# SQLiteAnalyzer.do_analyze(list_sqlite, case, result)
-# for single-processing -----------------------------------------------------------------------------
-
-		length = len(list_sqlite)
-		NUMBER_OF_PROCESSES = case.number_of_input_processes
-
-		MAX_NUMBER_OF_PROCESSES_THIS_MODULE = math.ceil(length/2)
-		if NUMBER_OF_PROCESSES*2 > length:
-			NUMBER_OF_PROCESSES = MAX_NUMBER_OF_PROCESSES_THIS_MODULE
-
-		if length < NUMBER_OF_PROCESSES:
-			result = Queue()
-			SQLiteAnalyzer.do_analyze(list_sqlite, case, result)
-		else:
-			num_item_per_list = math.ceil(length/NUMBER_OF_PROCESSES)
-			start_pos = 0
-			divied_list = list()
-			for idx in range(start_pos, length, num_item_per_list):
-				out = list_sqlite[start_pos:start_pos+num_item_per_list]
-				if out != []:
-					divied_list.append(out)
-				start_pos += num_item_per_list
-
-			result = Queue()
-			procs = []
-
-			for i in range(len(divied_list)):
-				proc = Process(target=SQLiteAnalyzer.do_analyze, args=(divied_list[i], case, result))
-				procs.append(proc)
-				proc.start()
-
-			for proc in procs:
-				proc.join()
-
-			result.put('STOP')
-			while True:
-				tmp = result.get()
-				if tmp == 'STOP':
-					break
-
-
+		# the largest databases first, analyze_sqlite is run per database
+		TaskPool.run('Analyzing SQLite databases', SQLiteAnalyzer.analyze_sqlite, list_sqlite, args=(case,),
+					 number_of_processes=case.number_of_input_processes, get_task_size=SQLiteAnalyzer.get_sqlite_file_size,
+					 initializer=SQLiteAnalyzer.get_user_info_type)
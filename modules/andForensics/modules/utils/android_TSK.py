@@ -7,10 +7,40 @@ import io
 import shutil
 import logging
 
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.lib import errors as dfvfs_errors
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import context as dfvfs_context
+from dfvfs.resolver import resolver as path_spec_resolver
+
 logger = logging.getLogger('andForensics')
 TSK_PATH = os.getcwd() + os.sep + 'tools' + os.sep + 'sleuthkit' + os.sep
 
+# size of the chunks an extracted file is copied in
+EXTRACT_CHUNK_SIZE = 1024 * 1024
+
 class TSK(object):
+	# dfVFS resolver context of the current process, it caches the opened
+	# image and file system, so all reads of a process share one pytsk3 handle.
+	_resolver_context = None
+	_resolver_context_pid = None
+
+	def get_resolver_context():
+		# a forked process must not share the image file descriptor of its parent
+		if TSK._resolver_context_pid != os.getpid():
+			TSK._resolver_context = dfvfs_context.Context()
+			TSK._resolver_context_pid = os.getpid()
+		return TSK._resolver_context
+
+#---------------------------------------------------------------------------------------------------------------
+	def open_file_object(image_file_path, inode):
+		os_path_spec = path_spec_factory.Factory.NewPathSpec(
+			dfvfs_definitions.TYPE_INDICATOR_OS, location=os.path.abspath(image_file_path))
+		tsk_path_spec = path_spec_factory.Factory.NewPathSpec(
+			dfvfs_definitions.TYPE_INDICATOR_TSK, inode=int(inode), parent=os_path_spec)
+		return path_spec_resolver.Resolver.OpenFileObject(
+			tsk_path_spec, resolver_context=TSK.get_resolver_context())
+
 	def loaddb(image_file_path, load_db_path):
 		if os.path.exists(load_db_path):
 			return load_db_path
@@ -30,24 +60,46 @@ class TSK(object):
 	
 #---------------------------------------------------------------------------------------------------------------
 	def icat_for_extract_file(image_file_path, inode, extracted_file_path):
-		#cmd = TSK_PATH + "icat \"%s\" %d > \"%s\" " %(image_file_path, inode, extracted_file_path)
-		cmd = "/usr/local/bin/icat \'%s\' %d > \'%s\' " % (image_file_path, inode, extracted_file_path)
-		ret = subprocess.Popen(cmd, shell=True, stderr=subprocess.PIPE, stdout=subprocess.PIPE)
-		ret_code = ret.stdout.read()
-		f = io.StringIO(str(ret_code))
-		result_msg = f.readline()
-		f.close()
-		if result_msg != "b''":
+		try:
+			file_object = TSK.open_file_object(image_file_path, inode)
+		except (dfvfs_errors.Error, IOError, OSError, ValueError):
 			logger.error('\"icat %s %d > %s\" failed.' % (image_file_path, inode, extracted_file_path))
 			return False
-		else:
-			return True
+
+		try:
+			with open(extracted_file_path, 'wb') as f:
+				while True:
+					data = file_object.read(EXTRACT_CHUNK_SIZE)
+					if not data:
+						break
+					f.write(data)
+		except (dfvfs_errors.Error, IOError, OSError):
+			logger.error('\"icat %s %d > %s\" failed.' % (image_file_path, inode, extracted_file_path))
+			return False
+		finally:
+			file_object.close()
+		return True
 
 #---------------------------------------------------------------------------------------------------------------
 	def get_file_buffer(src_image_path, inode, size_buf):
-		#cmd = TSK_PATH + "icat.exe \"%s\" %d" % (src_image_path, inode)
-		cmd = "/usr/local/bin/icat \"%s\" %d" % (src_image_path, inode)
-		ret = subprocess.Popen(cmd, shell=True, stderr=subprocess.PIPE, stdout=subprocess.PIPE)
-		file_buffer = ret.stdout.read(size_buf)
-		ret.kill()
-		return file_buffer
+		try:
+			file_object = TSK.open_file_object(src_image_path, inode)
+		except (dfvfs_errors.Error, IOError, OSError, ValueError):
+			return b''
+
+		try:
+			if size_buf is None:
+				return file_object.read()
+			return file_object.read(size_buf)
+		except (dfvfs_errors.Error, IOError, OSError):
+			return b''
+		finally:
+			file_object.close()
+
+#---------------------------------------------------------------------------------------------------------------
+	def get_file_buffers(src_image_path, list_inode, size_buf):
+		# reads the headers of many files with one file system handle, pass the
+		# inodes sorted by block address (tsk_file_layout.byte_start) to read the
+		# image sequentially.
+		for inode in list_inode:
+			yield inode, TSK.get_file_buffer(src_image_path, inode, size_buf)
@@ -1,6 +1,7 @@
 #-*- coding: utf-8 -*-
 
 import os
+import signal
 import subprocess
 import io
 import logging
@@ -8,15 +9,25 @@ import logging
 logger = logging.getLogger('andForensics')
 #JADX_PATH = os.getcwd() + os.sep + 'tools' + os.sep + 'jadx' + os.sep + 'bin' + os.sep
 
+# seconds a decompilation may take before jadx is killed
+JADX_TIMEOUT = 600
+
 class JADX(object):
-	def decompile(apk_path, decompiled_path):
+	def decompile(apk_path, decompiled_path, timeout=JADX_TIMEOUT):
 		if os.path.exists(decompiled_path):
 			return True
 
 		#cmd = JADX_PATH + "jadx -d \"%s\" \"%s\"" % (decompiled_path, apk_path)
 		cmd = "/home/dfrc/Desktop/jadx -d \"%s\" \"%s\"" % (decompiled_path, apk_path)
-		ret = subprocess.Popen(cmd, shell=True, stderr=subprocess.PIPE, stdout=subprocess.PIPE)
-		ret_code = ret.stdout.read()
+		# jadx runs in its own process group, so the shell and the JVM are killed together
+		ret = subprocess.Popen(cmd, shell=True, stderr=subprocess.PIPE, stdout=subprocess.PIPE, start_new_session=True)
+		try:
+			ret_code, _ = ret.communicate(timeout=timeout)
+		except subprocess.TimeoutExpired:
+			os.killpg(ret.pid, signal.SIGKILL)
+			ret.communicate()
+			logger.error('JADX timed out after %d seconds. APK path: \"%s\"' % (timeout, apk_path))
+			return False
 		f = io.StringIO(str(ret_code))
 		result_msg = f.readline()
 		if result_msg.split("processing ...")[1].split(" ")[0].find("ERROR") == 4:
@@ -0,0 +1,139 @@
+#-*- coding: utf-8 -*-
+import time
+import queue
+import logging
+from multiprocessing import Process, Queue
+
+logger = logging.getLogger('andForensics')
+
+# seconds between the checks of the running tasks
+POLL_INTERVAL = 1
+# the progress of a stage is reported every PROGRESS_STEP percent
+PROGRESS_STEP = 10
+
+class TaskPool(object):
+	# Runs the tasks of a stage in a pool of processes. A process is given the
+	# next task when it is done, the largest tasks are started first, one task
+	# per process is in flight and a task running longer than the timeout is
+	# stopped by terminating its process. The initializer is called by every
+	# process before its first task and the finalizer after its last task.
+	def run(stage_name, func, list_task, args=(), number_of_processes=1, get_task_size=None, timeout=None, initializer=None, finalizer=None):
+		list_task = list(list_task)
+		if get_task_size != None:
+			list_task.sort(key=get_task_size, reverse=True)
+		cnt_task = len(list_task)
+		if cnt_task == 0:
+			return 0
+
+		number_of_processes = min(number_of_processes, cnt_task)
+		if number_of_processes <= 1:
+			if initializer != None:
+				initializer()
+			progress_step = 0
+			for idx in range(cnt_task):
+				TaskPool.run_task(stage_name, func, list_task[idx], args)
+				progress_step = TaskPool.report_progress(stage_name, idx+1, cnt_task, progress_step)
+			if finalizer != None:
+				finalizer()
+			return cnt_task
+
+		# every process has its own task queue, so the running task of every
+		# process is known when it times out or exits
+		done_queue = Queue()
+		dic_worker = dict()			# worker id -> [process, task queue, running task index, start time]
+		set_finished = set()
+		state = {'next_task':0, 'next_worker':0, 'progress_step':0}
+
+		def start_worker():
+			worker_id = state['next_worker']
+			state['next_worker'] += 1
+			task_queue = Queue()
+			proc = Process(target=TaskPool.do_work, args=(stage_name, func, args, initializer, finalizer, worker_id, task_queue, done_queue))
+			proc.start()
+			dic_worker[worker_id] = [proc, task_queue, None, 0]
+			assign_task(worker_id)
+
+		def assign_task(worker_id):
+			worker = dic_worker[worker_id]
+			if state['next_task'] < cnt_task:
+				worker[1].put((state['next_task'], list_task[state['next_task']]))
+				worker[2] = state['next_task']
+				worker[3] = time.time()
+				state['next_task'] += 1
+			else:
+				worker[1].put(None)
+				worker[2] = None
+
+		def finish_task(idx):
+			if idx in set_finished:
+				return
+			set_finished.add(idx)
+			state['progress_step'] = TaskPool.report_progress(stage_name, len(set_finished), cnt_task, state['progress_step'])
+
+		def replace_worker(worker_id):
+			del dic_worker[worker_id]
+			if state['next_task'] < cnt_task:
+				start_worker()
+
+		for i in range(number_of_processes):
+			start_worker()
+
+		while len(set_finished) < cnt_task:
+			try:
+				worker_id, idx = done_queue.get(timeout=POLL_INTERVAL)
+				finish_task(idx)
+				if (worker_id in dic_worker) and (dic_worker[worker_id][2] == idx):
+					assign_task(worker_id)
+			except queue.Empty:
+				pass
+
+			for worker_id, (proc, task_queue, idx, start_time) in list(dic_worker.items()):
+				if idx == None:
+					continue
+				if (timeout != None) and (time.time() - start_time > timeout):
+					logger.error('%s: task timed out after %d seconds: %s' % (stage_name, timeout, list_task[idx]))
+					proc.terminate()
+					proc.join()
+					finish_task(idx)
+					replace_worker(worker_id)
+				elif not proc.is_alive():
+					logger.error('%s: process exited while running the task: %s' % (stage_name, list_task[idx]))
+					finish_task(idx)
+					replace_worker(worker_id)
+
+		for proc, task_queue, idx, start_time in dic_worker.values():
+			if idx != None:
+				task_queue.put(None)
+		for proc, task_queue, idx, start_time in dic_worker.values():
+			proc.join()
+		return cnt_task
+
+#---------------------------------------------------------------------------------------------------------------
+	def do_work(stage_name, func, args, initializer, finalizer, worker_id, task_queue, done_queue):
+		if initializer != None:
+			initializer()
+		while True:
+			item = task_queue.get()
+			if item == None:
+				break
+			idx, task = item
+			TaskPool.run_task(stage_name, func, task, args)
+			done_queue.put((worker_id, idx))
+		if finalizer != None:
+			finalizer()
+
+#---------------------------------------------------------------------------------------------------------------
+	def run_task(stage_name, func, task, args):
+		try:
+			func(task, *args)
+		except Exception as e:
+			logger.error('%s: task failed: %s, error: %s' % (stage_name, task, e))
+			return False
+		return True
+
+#---------------------------------------------------------------------------------------------------------------
+	def report_progress(stage_name, cnt_done, cnt_task, progress_step):
+		step = cnt_done * 100 // cnt_task // PROGRESS_STEP
+		if step > progress_step:
+			logger.info('      - %s: %d/%d (%d%%)' % (stage_name, cnt_done, cnt_task, cnt_done * 100 // cnt_task))
+		return step
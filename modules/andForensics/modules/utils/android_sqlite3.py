@@ -1,15 +1,65 @@
 #-*- coding: utf-8 -*-
+import os
 import sqlite3
 import logging
 import sys
+from collections import OrderedDict
+from multiprocessing import Process, Queue
 
 
 logger = logging.getLogger('andForensics')
 
+# number of connections kept open per process, the least recently used one is closed first
+MAX_NUMBER_OF_CONNECTIONS = 16
+# seconds a connection waits for the lock of another process
+CONNECTION_TIMEOUT = 60
+# number of rows the writer process commits at once
+WRITER_BATCH_SIZE = 10000
+
 class SQLite3(object):
-	def execute_fetch_query_multi_values_order(query, query2, db):
+	# persistent connections of the current process per database path
+	_connections = OrderedDict()
+	_connections_pid = None
+	# connections inherited from the parent process, which must not be used or
+	# closed by a forked process, they are only kept referenced
+	_inherited_connections = []
+
+	def get_connection(db):
+		if SQLite3._connections_pid != os.getpid():
+			if SQLite3._connections:
+				SQLite3._inherited_connections.append(SQLite3._connections)
+			SQLite3._connections = OrderedDict()
+			SQLite3._connections_pid = os.getpid()
+
+		con = SQLite3._connections.get(db, None)
+		if con is not None:
+			SQLite3._connections.move_to_end(db)
+			return con
+
+		con = sqlite3.connect(db, timeout=CONNECTION_TIMEOUT)
+		SQLite3._connections[db] = con
+		if len(SQLite3._connections) > MAX_NUMBER_OF_CONNECTIONS:
+			_, con_lru = SQLite3._connections.popitem(last=False)
+			con_lru.close()
+		return con
+
+	def close_connection(db):
+		if SQLite3._connections_pid != os.getpid():
+			return
+		con = SQLite3._connections.pop(db, None)
+		if con is not None:
+			con.close()
+
+	def close_all_connections():
+		if SQLite3._connections_pid != os.getpid():
+			return
+		for con in SQLite3._connections.values():
+			con.close()
+		SQLite3._connections.clear()
+
+	def execute_fetch_query_multi_values_order(query, query2, db, params=()):
 		try:
-			con = sqlite3.connect(db)
+			con = SQLite3.get_connection(db)
 		except sqlite3.Error as e:
 			logger.error("SQLite open error. it is an invalid file: %s" % db)
 			return False
@@ -17,97 +67,180 @@ class SQLite3(object):
 		# con.text_factory = lambda x: x.decode("utf-8") + "foo"
 		cursor = con.cursor()
 		try:
-			cursor.execute(query)
-		except sqlite3.Error as e:
 			try:
-				cursor.execute(query2)
+				cursor.execute(query, params)
 			except sqlite3.Error as e:
-				logger.error("SQLite query execution error. query: %s, db: %s" % (query2, db))			
+				try:
+					cursor.execute(query2, params)
+				except sqlite3.Error as e:
+					logger.error("SQLite query execution error. query: %s, db: %s" % (query2, db))
+					return False
+			try:
+				ret = cursor.fetchall()
+			except sqlite3.Error as e:
+				logger.error("SQLite query execution error. query: %s, db: %s" % (query, db))
 				return False
-		try:
-			ret = cursor.fetchall()
-		except sqlite3.Error as e:
-			logger.error("SQLite query execution error. query: %s, db: %s" % (query, db))
-			return False
-		con.close()
+		finally:
+			cursor.close()
 		return ret
 
 
-	def execute_fetch_query_multi_values(query, db):
+	def execute_fetch_query_multi_values(query, db, params=()):
 		try:
-			con = sqlite3.connect(db)
+			con = SQLite3.get_connection(db)
 		except sqlite3.Error as e:
 			logger.error("SQLite open error. it is an invalid file: %s" % db)
 			return False
 
-		# con = sqlite3.connect(db)
-		# # con.text_factory = str
-		# # con.text_factory = lambda x: x.decode("utf-8") + "foo"
 		cursor = con.cursor()
 		try:
-			cursor.execute(query)
-		except sqlite3.Error as e:
-			logger.error("SQLite query execution error. query: %s, db: %s" % (query, db))
-			return False
+			try:
+				cursor.execute(query, params)
+			except sqlite3.Error as e:
+				logger.error("SQLite query execution error. query: %s, db: %s" % (query, db))
+				return False
+			try:
+				ret = cursor.fetchall()
+			except sqlite3.Error as e:
+				logger.error("SQLite query execution error. query: %s, db: %s" % (query, db))
+				return False
+		finally:
+			cursor.close()
+		return ret
+
+
+	def execute_fetch_query(query, db, params=()):
 		try:
-			ret = cursor.fetchall()
+			con = SQLite3.get_connection(db)
 		except sqlite3.Error as e:
-			logger.error("SQLite query execution error. query: %s, db: %s" % (query, db))
+			logger.error("SQLite open error. it is an invalid file: %s" % db)
 			return False
-		con.close()
+		cursor = con.cursor()
+		try:
+			try:
+				cursor.execute(query, params)
+			except sqlite3.Error as e:
+				logger.error("SQLite query execution error. query: %s" % query)
+				return False
+			try:
+				ret = cursor.fetchone()
+			except sqlite3.Error as e:
+				logger.error("SQLite query execution error. query: %s" % query)
+				return False
+		finally:
+			# an unfinished statement keeps the database locked for other processes
+			cursor.close()
 		return ret
 
 
-	def execute_fetch_query(query, db):
+	def execute_commit_query(queries, db, params=()):
 		try:
-			con = sqlite3.connect(db)
+			con = SQLite3.get_connection(db)
 		except sqlite3.Error as e:
 			logger.error("SQLite open error. it is an invalid file: %s" % db)
-			return False		
+			return False
 		cursor = con.cursor()
+
+		query_type = type(queries)
+
 		try:
-			cursor.execute(query)
+			if query_type == list:
+				for query in queries:
+					try:
+						cursor.execute(query)
+					except sqlite3.Error as e:
+						logger.error("SQLite query execution error. query: %s" % query)
+						con.rollback()
+						return False
+			elif query_type == str:
+				try:
+					cursor.execute(queries, params)
+				except sqlite3.Error as e:
+					logger.error("SQLite query execution error. query: %s" % queries)
+					con.rollback()
+					return False
+			else:
+				print(query_type)
+
+			con.commit()
+		finally:
+			cursor.close()
+		return
+
+
+	def execute_many_commit_query(query, list_params, db):
+		# the statement is prepared once and executed for every row in one transaction
+		try:
+			con = SQLite3.get_connection(db)
 		except sqlite3.Error as e:
-			logger.error("SQLite query execution error. query: %s" % query)
+			logger.error("SQLite open error. it is an invalid file: %s" % db)
 			return False
 		try:
-			ret = cursor.fetchone()
+			con.executemany(query, list_params)
 		except sqlite3.Error as e:
 			logger.error("SQLite query execution error. query: %s" % query)
+			con.rollback()
 			return False
-		con.close()
-		return ret
+		con.commit()
+		return True
+
+#---------------------------------------------------------------------------------------------------------------
+class SQLiteWriter(object):
+	# Single writer of a database. The worker processes put their rows to the
+	# queue and one writer process executes them in batches, so the workers do
+	# not fight over the lock of the database.
+	def __init__(self, db, batch_size=WRITER_BATCH_SIZE):
+		self.db = db
+		self.batch_size = batch_size
+		self.queue = Queue()
+		self.proc = None
 
+	def start(self):
+		self.proc = Process(target=SQLiteWriter.do_write, args=(self.db, self.queue, self.batch_size))
+		self.proc.start()
 
-	def execute_commit_query(queries, db):
-		# con = sqlite3.connect(db.decode('cp949'))
-		# con = sqlite3.connect(io.StringIO(db.decode('cp949')))
+	def put(self, query, list_params):
+		if list_params:
+			self.queue.put((query, list_params))
+
+	def close(self):
+		self.queue.put(None)
+		self.proc.join()
+		self.proc = None
+
+	def do_write(db, queue, batch_size):
 		try:
-			con = sqlite3.connect(db)
+			con = sqlite3.connect(db, timeout=CONNECTION_TIMEOUT)
 		except sqlite3.Error as e:
 			logger.error("SQLite open error. it is an invalid file: %s" % db)
-			return False
-		cursor = con.cursor()
+			# drain the queue, so the workers are not blocked
+			while queue.get() != None:
+				pass
+			return
 
-		query_type = type(queries)
-
-		if query_type == list:
-			for query in queries:
-				# print('query: %s' % query)
-				try:
-					cursor.execute(query)
-				except sqlite3.Error as e:
-					logger.error("SQLite query execution error. query: %s" % query)
-					return False
-		elif query_type == str:
+		cnt_pending = 0
+		while True:
+			item = queue.get()
+			if item == None:
+				break
+			query, list_params = item
+			# a failed batch is rolled back to its savepoint, which keeps the
+			# pending batches before it
+			if not con.in_transaction:
+				con.execute("BEGIN")
+			con.execute("SAVEPOINT batch")
 			try:
-				cursor.execute(queries)
+				con.executemany(query, list_params)
 			except sqlite3.Error as e:
-				logger.error("SQLite query execution error. query: %s" % queries)
-				return False
-		else:
-			print(query_type)
-
+				con.execute("ROLLBACK TO batch")
+				logger.error("SQLite query execution error. query: %s" % query)
+				continue
+			finally:
+				con.execute("RELEASE batch")
+			cnt_pending += len(list_params)
+			# commit when the workers are idle as well, not to hold the lock in between
+			if cnt_pending >= batch_size or queue.empty():
+				con.commit()
+				cnt_pending = 0
 		con.commit()
 		con.close()
-		return
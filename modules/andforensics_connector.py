@@ -15,6 +15,14 @@ class AndForensicsConnector(interface.ModuleConnector):
     NAME = 'andforensics_connector'
     DESCRIPTION = 'Module for android'
     TABLE_NAME = 'lv1_os_android_andforensics'
+    PRODUCED_TABLES = [
+        'lv1_os_and_app_list',
+        'lv1_os_and_call_history',
+        'lv1_os_and_emb_file',
+        'lv1_os_and_file_history',
+        'lv1_os_and_geodata',
+        'lv1_os_and_id_pw_hash',
+        'lv1_os_and_web_browser_history']
 
     _plugin_classes = {}
 
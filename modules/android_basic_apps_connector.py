@@ -14,6 +14,7 @@ from dfvfs.lib import definitions as dfvfs_definitions
 class AndroidBasicAppsConnector(interface.ModuleConnector):
     NAME = 'android_basic_apps_connector'
     DESCRIPTION = 'Module for android basic apps'
+    PRODUCED_TABLES = ['lv1_os_and_basic_app_*']
 
     def __init__(self):
         super(AndroidBasicAppsConnector, self).__init__()
@@ -57,8 +58,7 @@ class AndroidBasicAppsConnector(interface.ModuleConnector):
         output_path += os.sep + configuration.case_id + os.sep + configuration.evidence_id + os.sep + par_id \
                        + os.sep + 'AB2A_Raw_Files'
 
-        if not os.path.exists(output_path):
-            os.mkdir(output_path)
+        os.makedirs(output_path, exist_ok=True)
 
         for spec in find_specs:
             self.ExtractTargetDirToPath(source_path_spec=source_path_spec,
@@ -16,6 +16,7 @@ class AndroidUserAppsConnector(interface.ModuleConnector):
 
     NAME = 'android_user_apps_connector'
     DESCRIPTION = 'Module for android user apps'
+    PRODUCED_TABLES = ['lv1_os_and_geodata']
 
     def __init__(self):
         super(AndroidUserAppsConnector, self).__init__()
@@ -1,7 +1,9 @@
-import io, sqlite3
+import io
 import datetime
 import json
 
+from modules.app_chromium.chromium import chromium
+
 def _count_microseconds(microseconds):
     time = datetime.timedelta(microseconds=microseconds)
     return time
@@ -70,10 +72,7 @@ def _bookmark_dir_tree(row, path, bookmark_result):
                     last_visited_desktop = _convert_timestamp(int(row['meta_info']['last_visited_desktop']))
 
                 if column == 'name':
-                    if type(row['name']) == str and ("\'" or "\"") in row['name']:
-                        name = row['name'].replace("\'", "\'\'").replace('\"', '\"\"')
-                    else:
-                        name = row['name']
+                    name = row['name']
 
                 if column == 'type':
                     bookmark_type = row['type']
@@ -88,30 +87,22 @@ def _bookmark_dir_tree(row, path, bookmark_result):
             print('KeyError')
 
 def chrome_search_terms(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
         cur.execute('select urls.last_visit_time, urls.url, keyword_search_terms.term from keyword_search_terms, urls where keyword_search_terms.url_id = urls.id order by last_visit_time asc')
-        result = cur.fetchall()
+        result = cur
     except:
         print("[Web/Chrome] Search Terms " + "\033[31m" + "Main Query Error" + "\033[0m")
         result = []
 
-    search_terms = []
-
     for row in result:
 
         date = _convert_timestamp(row[0])
         url = row[1]
 
-        if type(row[2]) == str and ("\'" or "\"") in row[2]:
-            search_word = row[2].replace("\'", "\'\'").replace('\"', '\"\"')
-        else:
-            search_word = row[2]
+        search_word = row[2]
 
         google_search = "://www.google.co"
         naver_search = "://search.naver.com/"
@@ -135,194 +126,53 @@ def chrome_search_terms(file):
 
         outputformat = (url, search_word, date, search_site)
 
-        search_terms.append(outputformat)
+        yield outputformat
 
     conn.close()
 
-    return search_terms
-
 def chrome_visit_urls(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
         cur.execute('select urls.url, urls.last_visit_time, urls.title, urls.visit_count, urls.typed_count  from urls order by last_visit_time asc')
-        result = cur.fetchall()
+        result = cur
     except:
         print("[Web/Chrome] Visit Urls " + "\033[31m" + "Main Query Error" + "\033[0m")
         result = []
 
-    visit_urls = []
-
     for row in result:
 
         url = row[0]
         last_visited_time = _convert_timestamp(row[1])
 
-        if type(row[2]) == str and ("\'" or "\"") in row[2]:
-            title = row[2].replace("\'", "\'\'").replace('\"', '\"\"')
-        else:
-            title = row[2]
+        title = row[2]
 
         visit_count = row[3]
         typed_count = row[4]
 
         outputformat = (url, last_visited_time, title, visit_count, typed_count)
 
-        visit_urls.append(outputformat)
+        yield outputformat
 
     conn.close()
 
-    return visit_urls
-
 def chrome_visit_history(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
-    cur = conn.cursor()
-
-    try:
-        cur.execute('select id, url from urls')
-        id_url = cur.fetchall()
-        id_url_dict = dict(id_url)
-    except:
-        print("[Web/Chrome] Visit History " + "\033[31m" + "id-url dict query error" + "\033[0m")
-        id_url_dict = {}
-
-    try:
-        cur.execute('select id, title from urls')
-        id_title = cur.fetchall()
-        id_title_dict = dict(id_title)
-    except:
-        print("[Web/Chrome] Visit History " + "\033[31m" + "id-title dict query error" + "\033[0m")
-        id_title_dict = {}
-
-    try:
-        cur.execute('select id, url from visits')
-        id_url_visits = cur.fetchall()
-    except:
-        print("[Web/Chrome] Visit History " + "\033[31m" + "id-url-from-visits query error" + "\033[0m")
-        id_url_visits = []
-
-    id_url_match = []
-    for row in id_url_visits:
-        visits_id = row[0]
-        url = id_url_dict[row[1]]
-
-        output = [visits_id, url]
-        id_url_match.append(output)
-
-    id_url_visits_dict = dict(id_url_match)
-
-    try:
-        cur.execute('select id, name from segments')
-        id_name_seg = cur.fetchall()
-        id_name_seg_dict = dict(id_name_seg)
-    except:
-        print("[Web/Chrome] Visit History " + "\033[31m" + "id-name-seg query error" + "\033[0m")
-        id_name_seg_dict = {}
-
-
-    transition_mask = 255 #0xFF
-    transition_dict = {'0':'LINK', '1':'TYPED', '2':'AUTO_BOOKMARK', '3':'AUTO_SUBFRAME', '4':'MANUAL_SUBFRAME',
-                       '5':'GENERATED', '6':'START_PAGE', '7':'FORM_SUBMIT', '8':'RELOAD', '9':'KEYWORD',
-                       '10':'KEYWORD_GENERATED'}
-
-    qualifiers_mask = 4294967040 #0x
-    qualifiers_first_dict = {'1':'CHAIN_START', '2':'CHAIN_END', '4':'CLIENT_REDIRECT',
-                             '8':'SERVER_REDIRECT', 'c':'IS_REDIRECT_MASK',
-                             '6':'CHAIN_END, CLIENT_REDIRECT', 'a':'CHAIN_END, SERVER_REDIRECT',
-                             '3':'CHAIN_START, CHAIN_END'}
-    qualifiers_second_dict = {'1':'FORWARD_BACK', '2':'FROM_ADDRESS_BAR', '3':'FORWARD_BACK, FROM_ADDRESS_BAR',
-                              '4':'HOME_PAGE'}
-    try:
-        cur.execute('select url, visit_time, from_visit, transition, segment_id, visit_duration from visits order by id asc')
-        result = cur.fetchall()
-    except:
-        print("[Web/Chrome] Visit History " + "\033[31m" + "Main Query Error" + "\033[0m")
-        result = []
-
-    visit_history = []
-    for row in result:
-
-        try:
-            from_url = id_url_visits_dict[row[2]]
-        except:
-            from_url = ''
-        try:
-            url = id_url_dict[row[0]]
-        except:
-            url = ''
-        try:
-            segment_url = id_name_seg_dict[row[4]]
-        except:
-            segment_url = ''
-        try:
-            title = id_title_dict[row[0]]
-        except:
-            title = ''
-
-        if type(title) == str and ("\'" or "\"") in title:
-            title = title.replace("\'", "\'\'").replace('\"', '\"\"')
-        else:
-            pass
-
-        visit_time = _convert_timestamp(row[1])
-        visit_duration = _count_microseconds(row[5])
-
-        try:
-            transition_decimal = row[3]
-            transition = "{0:x}".format(transition_decimal & transition_mask)
-            transition = transition_dict[transition]
-        except:
-            transition_decimal = row[3]
-            unknown_transition = "{0:x}".format(transition_decimal & transition_mask)
-            transition = 'Unknown : %s' %unknown_transition
-
-        try:
-            transition_decimal = row[3]
-            qualifiers = "{0:x}".format(transition_decimal & qualifiers_mask)
-            qualifiers_first = qualifiers_first_dict[qualifiers[0]]
-
-            if qualifiers[1] != '0':
-                qualifiers_second = qualifiers_second_dict[qualifiers[1]]
-                qualifiers = qualifiers_first + ', ' + qualifiers_second
-            else:
-                qualifiers = qualifiers_first
-
-        except:
-            transition_decimal = row[3]
-            unknown_qualifiers = "{0:x}".format(transition_decimal & qualifiers_mask)
-            qualifiers = 'Unknown : %s' %unknown_qualifiers
-
-        outputformat = (from_url, url, segment_url, title, visit_time, visit_duration, transition, qualifiers)
-        visit_history.append(outputformat)
-
-    conn.close()
-
-    return visit_history
+    return chromium.VisitHistory(file, 'Chrome', _convert_timestamp)
 
 def chrome_download(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
         cur.execute(
             'select target_path, start_time, received_bytes, total_bytes, state, interrupt_reason, end_time, opened, last_access_time,'
             ' referrer, site_url, tab_url, tab_referrer_url, last_modified, mime_type, original_mime_type from downloads order by start_time asc')
-        result = cur.fetchall()
+        result = cur
     except:
         print("[Web/Chrome] Downloads " + "\033[31m" + "Main Query Error" + "\033[0m")
         result = []
 
-    download_list = []
     for row in result:
         filename_index = row[0].rfind("\\")
 
@@ -355,18 +205,13 @@ def chrome_download(file):
         file_last_modified_time, download_tab_url, download_tab_refer_url, site_url, refer_url, mime_type,
         original_mime_type)
 
-        download_list.append(outputformat)
+        yield outputformat
 
     conn.close()
 
-    return download_list
-
 def chrome_top_sites(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -382,10 +227,7 @@ def chrome_top_sites(file):
 
         url = row[0]
 
-        if type(row[1]) == str and ("\'" or "\"") in row[1]:
-            title = row[1].replace("\'", "\'\'").replace('\"', '\"\"')
-        else:
-            title = row[1]
+        title = row[1]
 
         url_rank = row[2]
 
@@ -399,22 +241,17 @@ def chrome_top_sites(file):
 
 def chrome_shortcuts(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
         cur.execute('select text, fill_into_edit, url, contents, description, keyword, last_access_time, number_of_hits '
                     'from omni_box_shortcuts order by last_access_time asc ')
-        result = cur.fetchall()
+        result = cur
     except:
         print("[Web/Chrome] Shortcuts " + "\033[31m" + "Main Query Error" + "\033[0m")
         result = []
 
-    shortcuts = []
-
     for row in result:
 
         text = row[0]
@@ -422,10 +259,7 @@ def chrome_shortcuts(file):
         url = row[2]
         contents = row[3]
 
-        if type(row[4]) == str and ("\'" or "\"") in row[4]:
-            description = row[4].replace("\'", "\'\'").replace('\"', '\"\"')
-        else:
-            description = row[4]
+        description = row[4]
 
         keyword = row[5]
         last_access_time = _convert_timestamp(row[6])
@@ -433,18 +267,13 @@ def chrome_shortcuts(file):
 
         outputformat = (text, fill_into_edit, url, contents, description, keyword, last_access_time, number_of_hits)
 
-        shortcuts.append(outputformat)
+        yield outputformat
 
     conn.close()
 
-    return shortcuts
-
 def chrome_favicons(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -480,10 +309,7 @@ def chrome_favicons(file):
 
 def chrome_cookies(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -521,10 +347,7 @@ def chrome_cookies(file):
 
 def chrome_autofill(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -540,15 +363,9 @@ def chrome_autofill(file):
 
         name = row[0]
 
-        if type(row[1]) == str and ("\'" or "\"") in row[1]:
-            value = row[1].replace("\'", "\'\'").replace('\"', '\"\"')
-        else:
-            value = row[1]
+        value = row[1]
 
-        if type(row[2]) == str and ("\'" or "\"") in row[2]:
-            value_lower = row[2].replace("\'", "\'\'").replace('\"', '\"\"')
-        else:
-            value_lower = row[2]
+        value_lower = row[2]
 
         date_created = _convert_unixtimestamp(row[3])
         date_last_used = _convert_unixtimestamp(row[4])
@@ -564,10 +381,7 @@ def chrome_autofill(file):
 
 def chrome_logindata(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -800,3 +614,20 @@ def chrome_zoom_level(file):
         else:
             zoom_level_list = []
             return zoom_level_list
+
+# Output table, profile file and parser per artifact.
+ARTIFACTS = [
+    ('lv1_app_web_chrome_domain', 'Preferences', chrome_domain_analysis),
+    ('lv1_app_web_chrome_google_account', 'Preferences', chrome_google_account),
+    ('lv1_app_web_chrome_zoom_level', 'Preferences', chrome_zoom_level),
+    ('lv1_app_web_chrome_search_terms', 'History', chrome_search_terms),
+    ('lv1_app_web_chrome_visit_urls', 'History', chrome_visit_urls),
+    ('lv1_app_web_chrome_download', 'History', chrome_download),
+    ('lv1_app_web_chrome_visit_history', 'History', chrome_visit_history),
+    ('lv1_app_web_chrome_top_sites', 'Top Sites', chrome_top_sites),
+    ('lv1_app_web_chrome_shortcuts', 'Shortcuts', chrome_shortcuts),
+    ('lv1_app_web_chrome_favicons', 'Favicons', chrome_favicons),
+    ('lv1_app_web_chrome_cookies', 'Cookies', chrome_cookies),
+    ('lv1_app_web_chrome_autofill', 'Web Data', chrome_autofill),
+    ('lv1_app_web_chrome_logindata', 'Login Data', chrome_logindata),
+    ('lv1_app_web_chrome_bookmarks', 'Bookmarks', chrome_bookmarks)]
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""Parser engine shared by the Chromium based web browsers.
+
+A profile opens every SQLite database, such as History or Web Data, once and
+hands the same connection to all artifact parsers of the browser vendor. The
+parsers return or yield their rows, which are streamed to the caller. The
+Firefox parsers follow the same conventions and are run by the same engine.
+"""
+
+import datetime
+import os
+import sqlite3
+
+
+SQLITE_SIGNATURE = b'SQLite format 3\x00'
+
+TRANSITION_MASK = 0xFF
+TRANSITION_TYPES = {
+    '0': 'LINK', '1': 'TYPED', '2': 'AUTO_BOOKMARK', '3': 'AUTO_SUBFRAME', '4': 'MANUAL_SUBFRAME',
+    '5': 'GENERATED', '6': 'START_PAGE', '7': 'FORM_SUBMIT', '8': 'RELOAD', '9': 'KEYWORD',
+    '10': 'KEYWORD_GENERATED'}
+
+QUALIFIERS_MASK = 0xFFFFFF00
+QUALIFIERS_FIRST = {
+    '1': 'CHAIN_START', '2': 'CHAIN_END', '4': 'CLIENT_REDIRECT', '8': 'SERVER_REDIRECT',
+    'c': 'IS_REDIRECT_MASK', '6': 'CHAIN_END, CLIENT_REDIRECT', 'a': 'CHAIN_END, SERVER_REDIRECT',
+    '3': 'CHAIN_START, CHAIN_END'}
+QUALIFIERS_SECOND = {
+    '1': 'FORWARD_BACK', '2': 'FROM_ADDRESS_BAR', '3': 'FORWARD_BACK, FROM_ADDRESS_BAR', '4': 'HOME_PAGE'}
+
+# A visit is joined to its URL, the URL of the visit it came from and its
+# segment in SQLite, rows missing on the right-hand side are ''.
+VISIT_HISTORY_QUERY = (
+    'SELECT CASE WHEN from_urls.id IS NULL THEN \'\' ELSE from_urls.url END, '
+    'CASE WHEN urls.id IS NULL THEN \'\' ELSE urls.url END, '
+    '{segment_name}, '
+    'CASE WHEN urls.id IS NULL THEN \'\' ELSE urls.title END, '
+    'visits.visit_time, visits.visit_duration, visits.transition '
+    'FROM visits '
+    'LEFT JOIN urls ON urls.id = visits.url '
+    'LEFT JOIN visits AS from_visits ON from_visits.id = visits.from_visit '
+    'LEFT JOIN urls AS from_urls ON from_urls.id = from_visits.url '
+    '{segments_join}'
+    'ORDER BY visits.id ASC')
+
+
+class SharedConnection(object):
+    """SQLite connection shared by the artifact parsers of a profile.
+
+    The parsers close their connection when they are done, which is ignored,
+    the profile closes the underlying connection.
+    """
+
+    def __init__(self, connection):
+        """Initializes a shared connection.
+
+        Args:
+            connection (sqlite3.Connection): SQLite connection.
+        """
+        super(SharedConnection, self).__init__()
+        self._connection = connection
+
+    def close(self):
+        """Ignores the close request of a parser."""
+        return
+
+    def cursor(self):
+        return self._connection.cursor()
+
+    def execute(self, *args):
+        return self._connection.execute(*args)
+
+
+def OpenDatabase(file):
+    """Opens a SQLite database for an artifact parser.
+
+    Args:
+        file (str|SharedConnection): path of the database, or connection shared
+            by the profile.
+
+    Returns:
+        sqlite3.Connection|SharedConnection: connection.
+    """
+    if isinstance(file, str):
+        return sqlite3.connect(file)
+    return file
+
+
+def IsSQLiteFile(path):
+    """Determines if a file is a SQLite database.
+
+    Args:
+        path (str): path of the file.
+
+    Returns:
+        bool: True if the file starts with the SQLite signature.
+    """
+    with open(path, 'rb') as file_object:
+        return file_object.read(len(SQLITE_SIGNATURE)) == SQLITE_SIGNATURE
+
+
+def DecodeTransition(transition_decimal):
+    """Decodes the page transition of a visit.
+
+    Args:
+        transition_decimal (int): transition value of the visits table.
+
+    Returns:
+        tuple[str, str]: core transition type and transition qualifiers.
+    """
+    try:
+        transition = TRANSITION_TYPES["{0:x}".format(transition_decimal & TRANSITION_MASK)]
+    except:
+        transition = 'Unknown : %s' % "{0:x}".format(transition_decimal & TRANSITION_MASK)
+
+    try:
+        qualifiers = "{0:x}".format(transition_decimal & QUALIFIERS_MASK)
+        qualifiers_first = QUALIFIERS_FIRST[qualifiers[0]]
+
+        if qualifiers[1] != '0':
+            qualifiers = qualifiers_first + ', ' + QUALIFIERS_SECOND[qualifiers[1]]
+        else:
+            qualifiers = qualifiers_first
+    except:
+        qualifiers = 'Unknown : %s' % "{0:x}".format(transition_decimal & QUALIFIERS_MASK)
+
+    return transition, qualifiers
+
+
+def VisitHistory(file, vendor, convert_timestamp):
+    """Parses the visits of a History database in a single query.
+
+    Args:
+        file (str|SharedConnection): path of the History database, or connection
+            shared by the profile.
+        vendor (str): vendor name used in error messages, such as "Chrome".
+        convert_timestamp (function): converts a WebKit timestamp of the vendor.
+
+    Yields:
+        tuple: from URL, URL, segment URL, title, visit time, visit duration,
+            transition and qualifiers of a visit.
+    """
+    conn = OpenDatabase(file)
+    try:
+        cur = conn.cursor()
+        cur.execute('select name from sqlite_master where type = \'table\' and name = \'segments\'')
+        if cur.fetchone():
+            query = VISIT_HISTORY_QUERY.format(
+                segment_name='CASE WHEN segments.id IS NULL THEN \'\' ELSE segments.name END',
+                segments_join='LEFT JOIN segments ON segments.id = visits.segment_id ')
+        else:
+            print("[Web/" + vendor + "] Visit History " + "\033[31m" + "id-name-seg query error" + "\033[0m")
+            query = VISIT_HISTORY_QUERY.format(segment_name='\'\'', segments_join='')
+        cur.execute(query)
+    except sqlite3.Error:
+        print("[Web/" + vendor + "] Visit History " + "\033[31m" + "Main Query Error" + "\033[0m")
+        conn.close()
+        return
+
+    try:
+        for from_url, url, segment_url, title, visit_time, visit_duration, transition_decimal in cur:
+            transition, qualifiers = DecodeTransition(transition_decimal)
+
+            yield (from_url, url, segment_url, title, convert_timestamp(visit_time),
+                   datetime.timedelta(microseconds=visit_duration), transition, qualifiers)
+    finally:
+        conn.close()
+
+
+class ChromiumProfile(object):
+    """Profile of a Chromium based web browser.
+
+    Every artifact is described by its output table, the profile file it is
+    parsed from and the parser of the vendor. SQLite files are opened once and
+    the connection is shared by all parsers of the file, other files, such as
+    Bookmarks or Preferences, are passed to the parser by path.
+    """
+
+    def __init__(self, profile_path, artifacts):
+        """Initializes a profile.
+
+        Args:
+            profile_path (str): path of the directory the profile files were
+                extracted to.
+            artifacts (list[tuple[str, str, function]]): output table, file name
+                and parser per artifact, see ARTIFACTS of the vendor modules.
+        """
+        super(ChromiumProfile, self).__init__()
+        self._artifacts = artifacts
+        self._connections = []
+        self._files = {}
+        self._profile_path = profile_path
+
+    def _OpenFile(self, file_name):
+        """Opens a profile file for the artifact parsers.
+
+        Args:
+            file_name (str): name of the profile file, such as "History".
+
+        Returns:
+            str|SharedConnection: connection if the file is a SQLite database,
+                path if it is another file or None if the profile has no such file.
+        """
+        if file_name in self._files:
+            return self._files[file_name]
+
+        path = os.path.join(self._profile_path, file_name)
+        if not os.path.isfile(path):
+            file = None
+        elif IsSQLiteFile(path):
+            connection = sqlite3.connect(path)
+            self._connections.append(connection)
+            file = SharedConnection(connection)
+        else:
+            file = path
+
+        self._files[file_name] = file
+        return file
+
+    def Close(self):
+        """Closes the SQLite databases of the profile."""
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+        self._files = {}
+
+    def ParseArtifacts(self):
+        """Parses the artifacts of the profile.
+
+        Yields:
+            tuple[str, tuple]: output table and values per row.
+        """
+        try:
+            for table_name, file_name, parser in self._artifacts:
+                file = self._OpenFile(file_name)
+                if file is None:
+                    continue
+
+                try:
+                    for row in parser(file):
+                        yield table_name, row
+                except (sqlite3.Error, ValueError, KeyError) as exception:
+                    print("[Web] " + table_name + " " + "\033[31m" + "Parse Error" + "\033[0m" +
+                          ": {0!s}".format(exception))
+        finally:
+            self.Close()
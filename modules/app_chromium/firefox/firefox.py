@@ -1,7 +1,9 @@
-import io, sqlite3
+import io
 import datetime
 import json
 
+from modules.app_chromium.chromium import chromium
+
 def _convert_unixtimestamp(timestamp):
 
     if timestamp == None:
@@ -103,10 +105,7 @@ def _bookmark_dir_tree(row, bookmark_id_title, bookmark_id_parent):
         return mod_path
 
 def firefox_visit_history(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -169,10 +168,7 @@ def firefox_visit_history(file):
     return result
 
 def firefox_visit_urls(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -190,10 +186,7 @@ def firefox_visit_urls(file):
 
         url = row[0]
 
-        if type(row[1]) == str and ("\'" or "\"") in row[1]:
-            title = row[1].replace("\'", "\'\'").replace('\"', '\"\"')
-        else:
-            title = row[1]
+        title = row[1]
 
         rev_host = row[2]
         visit_count = row[3]
@@ -204,10 +197,7 @@ def firefox_visit_urls(file):
         guid = row[8]
         foreign_count = row[9]
 
-        if type(row[10]) == str and ("\'" or "\"") in row[10]:
-            description = row[10].replace("\'", "\'\'").replace('\"', '\"\"')
-        else:
-            description = row[10]
+        description = row[10]
 
         preview_image_url = row[11]
 
@@ -219,10 +209,7 @@ def firefox_visit_urls(file):
     return result
 
 def firefox_domain(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -249,10 +236,7 @@ def firefox_domain(file):
     return result
 
 def firefox_downloads(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -334,10 +318,7 @@ def firefox_downloads(file):
     return result
 
 def firefox_cookies(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -398,10 +379,7 @@ def firefox_cookies(file):
     return result
 
 def firefox_perms(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
     try:
         cur.execute('select origin, type, permission, expireType, expireTime, modificationTime from moz_perms order by id asc')
@@ -428,10 +406,7 @@ def firefox_perms(file):
     return result
 
 def firefox_forms(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -459,10 +434,7 @@ def firefox_forms(file):
     return result
 
 def firefox_favicons(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -542,10 +514,7 @@ def firefox_favicons(file):
     return result
 
 def firefox_prefs(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -586,10 +555,7 @@ def firefox_prefs(file):
     return result
 
 def firefox_bookmarks(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -679,3 +645,15 @@ def firefox_bookmarks(file):
 
     return result
 
+# Output table, profile file and parser per artifact.
+ARTIFACTS = [
+    ('lv1_app_web_firefox_visit_history', 'places.sqlite', firefox_visit_history),
+    ('lv1_app_web_firefox_visit_urls', 'places.sqlite', firefox_visit_urls),
+    ('lv1_app_web_firefox_domain', 'places.sqlite', firefox_domain),
+    ('lv1_app_web_firefox_download', 'places.sqlite', firefox_downloads),
+    ('lv1_app_web_firefox_bookmarks', 'places.sqlite', firefox_bookmarks),
+    ('lv1_app_web_firefox_cookies', 'cookies.sqlite', firefox_cookies),
+    ('lv1_app_web_firefox_permissions', 'permissions.sqlite', firefox_perms),
+    ('lv1_app_web_firefox_formhistory', 'formhistory.sqlite', firefox_forms),
+    ('lv1_app_web_firefox_favicons', 'favicons.sqlite', firefox_favicons),
+    ('lv1_app_web_firefox_content_prefs', 'content-prefs.sqlite', firefox_prefs)]
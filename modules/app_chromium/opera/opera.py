@@ -1,7 +1,9 @@
-import io, sqlite3
+import io
 import datetime
 import json
 
+from modules.app_chromium.chromium import chromium
+
 def _count_microseconds(microseconds):
     time = datetime.timedelta(microseconds=microseconds)
     #print(time)
@@ -84,29 +86,22 @@ def _bookmark_dir_tree (row, path, bookmark_result):
             print('KeyError')
 
 def opera_search_terms(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
         cur.execute('select urls.last_visit_time, urls.url, keyword_search_terms.term from keyword_search_terms, urls where keyword_search_terms.url_id = urls.id order by last_visit_time asc')
-        result = cur.fetchall()
+        result = cur
     except:
         print("[Web/Opera] Search Terms " + "\033[31m" + "Main Query Error" + "\033[0m")
         result = []
 
-    search_terms = []
     for row in result:
 
         date = _convert_timestamp(row[0])
         url = row[1]
 
-        if type(row[2]) == str and ("\'" or "\"") in row[2]:
-            search_word = row[2].replace("\'", "\'\'").replace('\"', '\"\"')
-        else:
-            search_word = row[2]
+        search_word = row[2]
 
         google_search = "://www.google.co"
         naver_search = "://search.naver.com/"
@@ -130,36 +125,26 @@ def opera_search_terms(file):
 
         outputformat = (url, search_word, date, search_site)
 
-        search_terms.append(outputformat)
+        yield outputformat
 
     conn.close()
 
-    return search_terms
-
 def opera_visit_urls(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
         cur.execute('select url, title, visit_count, typed_count, last_visit_time, hidden, activity_time, display_time, open_time, last_display, display_count, links_clicked_count from urls order by last_visit_time asc')
-        result = cur.fetchall()
+        result = cur
     except:
         print("[Web/Opera] Visit Urls " + "\033[31m" + "Query Error" + "\033[0m")
         result = []
 
-    visit_urls = []
-
     for row in result:
 
         url = row[0]
 
-        if type(row[1]) == str and ("\'" or "\"") in row[1]:
-            title = row[1].replace("\'", "\'\'").replace('\"', '\"\"')
-        else:
-            title = row[1]
+        title = row[1]
 
         visit_count = row[2]
         typed_count = row[3]
@@ -174,156 +159,25 @@ def opera_visit_urls(file):
 
         outputformat = (url, title, visit_count, typed_count, display_count, links_clicked_count, hidden, activity_time, display_time, open_time, last_visit_time, last_display_time)
 
-        visit_urls.append(outputformat)
+        yield outputformat
 
     conn.close()
 
-    return visit_urls
-
 def opera_visit_history(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
-    cur = conn.cursor()
-
-    try:
-        cur.execute('select id, url from urls')
-        id_url = cur.fetchall()
-        id_url_dict = dict(id_url)
-    except:
-        print("[Web/Opera] Visit History " + "\033[31m" + "id-url dict query error" + "\033[0m")
-        id_url_dict = {}
-
-    try:
-        cur.execute('select id, title from urls')
-        id_title = cur.fetchall()
-        id_title_dict = dict(id_title)
-    except:
-        print("[Web/Opera] Visit History " + "\033[31m" + "id-title dict query error" + "\033[0m")
-        id_title_dict = {}
-
-    try:
-        cur.execute('select id, url from visits')
-        id_url_visits = cur.fetchall()
-    except:
-        print("[Web/Opera] Visit History " + "\033[31m" + "id-url-from-visits query error" + "\033[0m")
-        id_url_visits = []
-
-    id_url_match = []
-    for row in id_url_visits:
-        visits_id = row[0]
-        url = id_url_dict[row[1]]
-
-        output = [visits_id, url]
-        id_url_match.append(output)
-
-    id_url_visits_dict = dict(id_url_match)
-
-    try:
-        cur.execute('select id, name from segments')
-        id_name_seg = cur.fetchall()
-        id_name_seg_dict = dict(id_name_seg)
-    except:
-        print("[Web/Opera] Visit History " + "\033[31m" + "id-name-seg query error" + "\033[0m")
-        id_name_seg_dict = {}
-
-
-    transition_mask = 255 #0xFF
-    transition_dict = {'0':'LINK', '1':'TYPED', '2':'AUTO_BOOKMARK', '3':'AUTO_SUBFRAME', '4':'MANUAL_SUBFRAME',
-                       '5':'GENERATED', '6':'START_PAGE', '7':'FORM_SUBMIT', '8':'RELOAD', '9':'KEYWORD',
-                       '10':'KEYWORD_GENERATED'}
-
-    qualifiers_mask = 4294967040 #0x
-    qualifiers_first_dict = {'1':'CHAIN_START', '2':'CHAIN_END', '4':'CLIENT_REDIRECT',
-                             '8':'SERVER_REDIRECT', 'c':'IS_REDIRECT_MASK',
-                             '6':'CHAIN_END, CLIENT_REDIRECT', 'a':'CHAIN_END, SERVER_REDIRECT',
-                             '3':'CHAIN_START, CHAIN_END'}
-    qualifiers_second_dict = {'1':'FORWARD_BACK', '2':'FROM_ADDRESS_BAR', '3':'FORWARD_BACK, FROM_ADDRESS_BAR',
-                              '4':'HOME_PAGE'}
-    try:
-        cur.execute('select url, visit_time, from_visit, transition, segment_id, visit_duration from visits order by id asc')
-        result = cur.fetchall()
-    except:
-        print("[Web/Opera] Visit History " + "\033[31m" + "Main Query Error" + "\033[0m")
-        result = []
-
-    visit_history = []
-    for row in result:
-
-        try:
-            from_url = id_url_visits_dict[row[2]]
-        except:
-            from_url = ''
-        try:
-            url = id_url_dict[row[0]]
-        except:
-            url = ''
-        try:
-            segment_url = id_name_seg_dict[row[4]]
-        except:
-            segment_url = ''
-        try:
-            title = id_title_dict[row[0]]
-        except:
-            title = ''
-
-        if type(title) == str and ("\'" or "\"") in title:
-            title = title.replace("\'", "\'\'").replace('\"', '\"\"')
-        else:
-            pass
-
-        visit_time = _convert_timestamp(row[1])
-        visit_duration = _count_microseconds(row[5])
-
-        try:
-            transition_decimal = row[3]
-            transition = "{0:x}".format(transition_decimal & transition_mask)
-            transition = transition_dict[transition]
-        except:
-            transition_decimal = row[3]
-            unknown_transition = "{0:x}".format(transition_decimal & transition_mask)
-            transition = 'Unknown : %s' %unknown_transition
-
-        try:
-            transition_decimal = row[3]
-            qualifiers = "{0:x}".format(transition_decimal & qualifiers_mask)
-            qualifiers_first = qualifiers_first_dict[qualifiers[0]]
-
-            if qualifiers[1] != '0':
-                qualifiers_second = qualifiers_second_dict[qualifiers[1]]
-                qualifiers = qualifiers_first + ', ' + qualifiers_second
-            else:
-                qualifiers = qualifiers_first
-
-        except:
-            transition_decimal = row[3]
-            unknown_qualifiers = "{0:x}".format(transition_decimal & qualifiers_mask)
-            qualifiers = 'Unknown : %s' %unknown_qualifiers
-
-        outputformat = (from_url, url, segment_url, title, visit_time, visit_duration, transition, qualifiers)
-        visit_history.append(outputformat)
-
-    conn.close()
-
-    return visit_history
+    return chromium.VisitHistory(file, 'Opera', _convert_timestamp)
 
 def opera_download(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
         cur.execute('select target_path, start_time, received_bytes, total_bytes, state, interrupt_reason, end_time, opened, last_access_time,'
                     ' referrer, site_url, tab_url, tab_referrer_url, last_modified, mime_type, original_mime_type from downloads order by start_time asc')
-        result = cur.fetchall()
+        result = cur
     except:
         print("[Web/Opera] Downloads " + "\033[31m" + "Main Query Error" + "\033[0m")
         result = []
 
-    download_list = []
     for row in result:
 
         filename_index = row[0].rfind("\\")
@@ -354,19 +208,13 @@ def opera_download(file):
         outputformat = (file_name, download_path, received_bytes, total_bytes, state, interrupt_reason, opened, start_time, end_time, file_last_access_time,
                         file_last_modified_time, download_tab_url, download_tab_refer_url, site_url, refer_url, mime_type, original_mime_type)
 
-        download_list.append(outputformat)
+        yield outputformat
 
     conn.close()
 
-    return download_list
-
 def opera_top_sites(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        #conn = sqlite3.connect(":file:")
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     # History SQLite DB에 visit_urls에 맞는 쿼리 날리기
@@ -395,21 +243,16 @@ def opera_top_sites(file):
 
 def opera_shortcuts(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
         cur.execute('select text, fill_into_edit, url, contents, description, keyword, last_access_time, number_of_hits from omni_box_shortcuts order by last_access_time asc ')
-        result = cur.fetchall()
+        result = cur
     except:
         print("[Web/Opera] Shortcuts " + "\033[31m" + "Main Query Error" + "\033[0m")
         result = []
 
-    shortcuts = []
-
     for row in result:
 
         text = row[0]
@@ -423,18 +266,13 @@ def opera_shortcuts(file):
 
         outputformat = (text, fill_into_edit, url, contents, description, keyword, last_access_time, number_of_hits)
 
-        shortcuts.append(outputformat)
+        yield outputformat
 
     conn.close()
 
-    return shortcuts
-
 def opera_favicons(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -469,10 +307,7 @@ def opera_favicons(file):
 
 def opera_cookies(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -511,10 +346,7 @@ def opera_cookies(file):
 
 def opera_autofill(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -530,15 +362,9 @@ def opera_autofill(file):
 
         name = row[0]
 
-        if type(row[1]) == str and ("\'" or "\"") in row[1]:
-            value = row[1].replace("\'", "\'\'").replace('\"', '\"\"')
-        else:
-            value = row[1]
+        value = row[1]
 
-        if type(row[2]) == str and ("\'" or "\"") in row[2]:
-            value_lower = row[2].replace("\'", "\'\'").replace('\"', '\"\"')
-        else:
-            value_lower = row[2]
+        value_lower = row[2]
 
         date_created = _convert_unixtimestamp(row[3])
         date_last_used = _convert_unixtimestamp(row[4])
@@ -552,10 +378,7 @@ def opera_autofill(file):
 
 def opera_logindata (file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -652,4 +475,17 @@ def opera_bookmarks (file):
             except:
                 pass
 
-    return bookmark_result
\ No newline at end of file
+    return bookmark_result
+
+# Output table, profile file and parser per artifact.
+ARTIFACTS = [
+    ('lv1_app_web_opera_search_terms', 'History', opera_search_terms),
+    ('lv1_app_web_opera_visit_urls', 'History', opera_visit_urls),
+    ('lv1_app_web_opera_download', 'History', opera_download),
+    ('lv1_app_web_opera_visit_history', 'History', opera_visit_history),
+    ('lv1_app_web_opera_shortcuts', 'Shortcuts', opera_shortcuts),
+    ('lv1_app_web_opera_favicons', 'Favicons', opera_favicons),
+    ('lv1_app_web_opera_cookies', 'Cookies', opera_cookies),
+    ('lv1_app_web_opera_autofill', 'Web Data', opera_autofill),
+    ('lv1_app_web_opera_logindata', 'Login Data', opera_logindata),
+    ('lv1_app_web_opera_bookmarks', 'Bookmarks', opera_bookmarks)]
@@ -1,7 +1,9 @@
-import io, sqlite3
+import io
 import datetime
 import json
 
+from modules.app_chromium.chromium import chromium
+
 def _convert_strdate_to_datetime(strdate):
     #day_of_week = strdate[0:3]
     month_dic = {'Jan': '01', 'Feb': '02', 'Mar': '03', 'Apr': '04', 'May': '05', 'Jun': '06',
@@ -124,22 +126,18 @@ def whale_bookmarks(file):
     return bookmark_result
 
 def whale_download(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
         cur.execute(
             'select target_path, start_time, received_bytes, total_bytes, state, interrupt_reason, end_time, opened, last_access_time,'
             ' referrer, site_url, tab_url, tab_referrer_url, last_modified, mime_type, original_mime_type from downloads order by start_time asc')
-        result = cur.fetchall()
+        result = cur
     except:
         print("[Web/Whale] Downloads " + "\033[31m" + "Main Query Error" + "\033[0m")
         result = []
 
-    download_list = []
     for row in result:
         filename_index = row[0].rfind("\\")
 
@@ -172,18 +170,13 @@ def whale_download(file):
         file_last_modified_time, download_tab_url, download_tab_refer_url, site_url, refer_url, mime_type,
         original_mime_type)
 
-        download_list.append(outputformat)
+        yield outputformat
 
     conn.close()
 
-    return download_list
-
 def whale_visit_urls(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -202,137 +195,11 @@ def whale_visit_urls(file):
     return url_list
 
 def whale_visit_history(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
-    cur = conn.cursor()
-
-    try:
-        cur.execute('select id, url from urls')
-        id_url = cur.fetchall()
-        id_url_dict = dict(id_url)
-    except:
-        print("[Web/Whale] Visit History " + "\033[31m" + "id-url dict query error" + "\033[0m")
-        id_url_dict = {}
-
-    try:
-        cur.execute('select id, title from urls')
-        id_title = cur.fetchall()
-        id_title_dict = dict(id_title)
-    except:
-        print("[Web/Whale] Visit History " + "\033[31m" + "id-title dict query error" + "\033[0m")
-        id_title_dict = {}
-
-    try:
-        cur.execute('select id, url from visits')
-        id_url_visits = cur.fetchall()
-    except:
-        print("[Web/Whale] Visit History " + "\033[31m" + "id-url-from-visits query error" + "\033[0m")
-        id_url_visits = []
-
-    id_url_match = []
-    for row in id_url_visits:
-        visits_id = row[0]
-        url = id_url_dict[row[1]]
-
-        output = [visits_id, url]
-        id_url_match.append(output)
-    id_url_visits_dict = dict(id_url_match)
-
-    try:
-        cur.execute('select id, name from segments')
-        id_name_seg = cur.fetchall()
-        id_name_seg_dict = dict(id_name_seg)
-    except:
-        print("[Web/Whale] Visit History " + "\033[31m" + "id-name-seg query error" + "\033[0m")
-        id_name_seg_dict = {}
-
-
-    transition_mask = 255 #0xFF
-    transition_dict = {'0':'LINK', '1':'TYPED', '2':'AUTO_BOOKMARK', '3':'AUTO_SUBFRAME', '4':'MANUAL_SUBFRAME',
-                       '5':'GENERATED', '6':'START_PAGE', '7':'FORM_SUBMIT', '8':'RELOAD', '9':'KEYWORD',
-                       '10':'KEYWORD_GENERATED'}
-
-    qualifiers_mask = 4294967040 #0xFFFFFF00
-    qualifiers_first_dict = {'1':'CHAIN_START', '2':'CHAIN_END', '4':'CLIENT_REDIRECT',
-                             '8':'SERVER_REDIRECT', 'c':'IS_REDIRECT_MASK',
-                             '6':'CHAIN_END, CLIENT_REDIRECT', 'a':'CHAIN_END, SERVER_REDIRECT',
-                             '3':'CHAIN_START, CHAIN_END'}
-    qualifiers_second_dict = {'1':'FORWARD_BACK', '2':'FROM_ADDRESS_BAR', '3':'FORWARD_BACK, FROM_ADDRESS_BAR',
-                              '4':'HOME_PAGE'}
-
-    try:
-        cur.execute('select url, visit_time, from_visit, transition, segment_id, visit_duration from visits order by id asc')
-        result = cur.fetchall()
-    except:
-        print("[Web/Whale] Visit History " + "\033[31m" + "Main Query Error" + "\033[0m")
-        result = []
-
-    visit_history = []
-    for row in result:
-
-        try:
-            from_url = id_url_visits_dict[row[2]]
-        except:
-            from_url = ''
-
-        try:
-            url = id_url_dict[row[0]]
-        except:
-            url = ''
-
-        try:
-            segment_url = id_name_seg_dict[row[4]]
-        except:
-            segment_url = ''
-
-        title = id_title_dict[row[0]]
-        if type(title) == str and ("\'" or "\"") in title:
-            title = title.replace("\'", "\'\'").replace('\"', '\"\"')
-        else:
-            pass
-        visit_time = _convert_timestamp(row[1])
-        visit_duration = _count_microseconds(row[5])
-
-        try:
-            transition_decimal = row[3]
-            transition = "{0:x}".format(transition_decimal & transition_mask)
-            transition = transition_dict[transition]
-        except:
-            transition_decimal = row[3]
-            unknown_transition = "{0:x}".format(transition_decimal & transition_mask)
-            transition = 'Unknown : %s' %unknown_transition
-
-        try:
-            transition_decimal = row[3]
-            qualifiers = "{0:x}".format(transition_decimal & qualifiers_mask)
-            qualifiers_first = qualifiers_first_dict[qualifiers[0]]
-
-            if qualifiers[1] != '0':
-                qualifiers_second = qualifiers_second_dict[qualifiers[1]]
-                qualifiers = qualifiers_first + ', ' + qualifiers_second
-            else:
-                qualifiers = qualifiers_first
-
-        except:
-            transition_decimal = row[3]
-            unknown_qualifiers = "{0:x}".format(transition_decimal & qualifiers_mask)
-            qualifiers = 'Unknown : %s' %unknown_qualifiers
-
-        outputformat = (from_url, url, segment_url, title, visit_time, visit_duration, transition, qualifiers)
-        visit_history.append(outputformat)
-
-    conn.close()
-
-    return visit_history
+    return chromium.VisitHistory(file, 'Whale', _convert_timestamp)
 
 def whale_search_terms(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     keyword_dict, url_dict = {}, {}
@@ -366,10 +233,7 @@ def whale_search_terms(file):
 
 def whale_cookies(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -389,10 +253,7 @@ def whale_cookies(file):
     return cookies_list
 
 def whale_top_sites(file):
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     # url, url_rank, title
@@ -413,10 +274,7 @@ def whale_top_sites(file):
 
 def whale_autofill (file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     # value, date_crated, date_last_used, count
@@ -437,10 +295,7 @@ def whale_autofill (file):
 
 def whale_logindata (file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -519,21 +374,16 @@ def whale_logindata (file):
 
 def whale_shortcuts(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
         cur.execute('select text, fill_into_edit, url, contents, description, keyword, last_access_time, number_of_hits from omni_box_shortcuts order by last_access_time asc ')
-        result = cur.fetchall()
+        result = cur
     except:
         print("[Web/Whale] Shortcuts " + "\033[31m" + "Main Query Error" + "\033[0m")
         result = []
 
-    shortcuts = []
-
     for row in result:
 
         text = row[0]
@@ -547,18 +397,13 @@ def whale_shortcuts(file):
 
         outputformat = (text, fill_into_edit, url, contents, description, keyword, last_access_time, number_of_hits)
 
-        shortcuts.append(outputformat)
+        yield outputformat
 
     conn.close()
 
-    return shortcuts
-
 def whale_favicons(file):
 
-    if isinstance(file, str):
-        conn = sqlite3.connect(file)
-    else:
-        conn = sqlite3.connect(file.read())
+    conn = chromium.OpenDatabase(file)
     cur = conn.cursor()
 
     try:
@@ -586,4 +431,18 @@ def whale_favicons(file):
 
     conn.close()
 
-    return favicons
\ No newline at end of file
+    return favicons
+
+# Output table, profile file and parser per artifact.
+ARTIFACTS = [
+    ('lv1_app_web_whale_search_terms', 'History', whale_search_terms),
+    ('lv1_app_web_whale_visit_urls', 'History', whale_visit_urls),
+    ('lv1_app_web_whale_download', 'History', whale_download),
+    ('lv1_app_web_whale_visit_history', 'History', whale_visit_history),
+    ('lv1_app_web_whale_bookmarks', 'Bookmarks', whale_bookmarks),
+    ('lv1_app_web_whale_cookies', 'Cookies', whale_cookies),
+    ('lv1_app_web_whale_top_sites', 'Top Sites', whale_top_sites),
+    ('lv1_app_web_whale_autofill', 'Web Data', whale_autofill),
+    ('lv1_app_web_whale_logindata', 'Login Data', whale_logindata),
+    ('lv1_app_web_whale_shortcuts', 'Shortcuts', whale_shortcuts),
+    ('lv1_app_web_whale_favicons', 'Favicons', whale_favicons)]
@@ -1,13 +1,18 @@
 # -*- coding: utf-8 -*-
 """module for Chromium Web Browser."""
+import itertools
 import os
+import pickle
 import shutil
+import time
 
+from concurrent import futures
 
 from dfvfs.lib import definitions as dfvfs_definitions
 from modules import logger
 from modules import manager
 from modules import interface
+from modules.app_chromium.chromium import chromium
 from modules.app_chromium.chrome import chrome
 from modules.app_chromium.whale import whale
 from modules.app_chromium.chromium_edge import chromium_edge
@@ -15,15 +20,372 @@ from modules.app_chromium.opera import opera
 from modules.app_chromium.firefox import firefox
 
 
+# Name of the file a worker process writes the rows of a profile to.
+_ROWS_FILE_NAME = 'carpe_rows.pickle'
+
+
+def _ParseProfileRows(profile_output_path, artifacts, info):
+    """Parses the extracted files of a browser profile.
+
+    An error stops the profile, not the other profiles, the rows parsed before
+    the error are kept.
+
+    Args:
+        profile_output_path (str): path of the directory the profile files were
+            extracted to.
+        artifacts (list[tuple[str, str, function]]): output table, file name and
+            parser per artifact.
+        info (list[str]): partition, case and evidence identifier, OS user and
+            profile name.
+
+    Yields:
+        tuple[str, tuple]: table name and values per row.
+    """
+    try:
+        for table_name, row in chromium.ChromiumProfile(profile_output_path, artifacts).ParseArtifacts():
+            # The OS user and profile name are the last columns.
+            values = info[:3] + list(row) + info[3:]
+            yield table_name, tuple(value if isinstance(value, bytes) else str(value) for value in values)
+
+    except Exception as exception:
+        logger.error('[Web] Unable to parse profile {0:s}/{1:s} with error: {2!s}'.format(
+            info[3], info[4], exception))
+
+
+def _ParseProfile(profile_output_path, artifacts, info, batch_size):
+    """Parses the extracted files of a browser profile in a worker process.
+
+    The rows are written to a file in the profile directory in batches, so the
+    rows of a profile are not held in memory.
+
+    Args:
+        profile_output_path (str): path of the directory the profile files were
+            extracted to.
+        artifacts (list[tuple[str, str, function]]): output table, file name and
+            parser per artifact.
+        info (list[str]): partition, case and evidence identifier, OS user and
+            profile name.
+        batch_size (int): number of rows written per batch.
+
+    Returns:
+        tuple[str, float]: path of the rows file, see _ReadRows, and parsing time
+            in seconds.
+    """
+    start_time = time.time()
+    rows = _ParseProfileRows(profile_output_path, artifacts, info)
+    rows_path = os.path.join(profile_output_path, _ROWS_FILE_NAME)
+    with open(rows_path, 'wb') as file_object:
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            pickle.dump(batch, file_object, protocol=pickle.HIGHEST_PROTOCOL)
+    return rows_path, time.time() - start_time
+
+
+def _ReadRows(rows_path):
+    """Reads the rows a worker process wrote, one batch at a time.
+
+    Args:
+        rows_path (str): path of the rows file.
+
+    Yields:
+        tuple[str, tuple]: table name and values per row.
+    """
+    with open(rows_path, 'rb') as file_object:
+        while True:
+            try:
+                batch = pickle.load(file_object)
+            except EOFError:
+                return
+            yield from batch
+
+
+class _RowWriter(object):
+    """Writes rows to the database in fixed-size batches per table."""
+
+    def __init__(self, cursor, batch_size):
+        """Initializes a row writer.
+
+        Args:
+            cursor (Database): database connection.
+            batch_size (int): number of rows inserted per batch.
+        """
+        super(_RowWriter, self).__init__()
+        self._batch_size = batch_size
+        self._batches = {}
+        self._cursor = cursor
+        self._queries = {}
+        self.number_of_rows = 0
+
+    def Flush(self):
+        """Inserts the remaining rows."""
+        for table_name, batch in self._batches.items():
+            if batch:
+                self._cursor.bulk_execute(self._queries[table_name], batch)
+                self.number_of_rows += len(batch)
+        self._batches = {table_name: [] for table_name in self._batches}
+
+    def Write(self, rows):
+        """Writes rows.
+
+        Args:
+            rows (iterable[tuple[str, tuple]]): table name and values per row.
+
+        Returns:
+            int: number of rows.
+        """
+        number_of_rows = 0
+        for table_name, values in rows:
+            number_of_rows += 1
+            if table_name not in self._queries:
+                self._queries[table_name] = f"Insert into {table_name} values ({', '.join(['%s'] * len(values))});"
+                self._batches[table_name] = []
+
+            batch = self._batches[table_name]
+            batch.append(values)
+            if len(batch) >= self._batch_size:
+                self._cursor.bulk_execute(self._queries[table_name], batch)
+                self.number_of_rows += len(batch)
+                self._batches[table_name] = []
+
+        return number_of_rows
+
+
 class ChromiumConnector(interface.ModuleConnector):
     NAME = 'chromium_connector'
     DESCRIPTION = 'Module for Chromium'
+    PRODUCED_TABLES = [
+        'lv1_app_web_chrome_autofill',
+        'lv1_app_web_chrome_bookmarks',
+        'lv1_app_web_chrome_cookies',
+        'lv1_app_web_chrome_domain',
+        'lv1_app_web_chrome_download',
+        'lv1_app_web_chrome_favicons',
+        'lv1_app_web_chrome_google_account',
+        'lv1_app_web_chrome_logindata',
+        'lv1_app_web_chrome_search_terms',
+        'lv1_app_web_chrome_shortcuts',
+        'lv1_app_web_chrome_top_sites',
+        'lv1_app_web_chrome_visit_history',
+        'lv1_app_web_chrome_visit_urls',
+        'lv1_app_web_chrome_zoom_level',
+        'lv1_app_web_chromium_edge_autofill',
+        'lv1_app_web_chromium_edge_bookmarks',
+        'lv1_app_web_chromium_edge_cookies',
+        'lv1_app_web_chromium_edge_download',
+        'lv1_app_web_chromium_edge_favicons',
+        'lv1_app_web_chromium_edge_logindata',
+        'lv1_app_web_chromium_edge_search_terms',
+        'lv1_app_web_chromium_edge_shortcuts',
+        'lv1_app_web_chromium_edge_top_sites',
+        'lv1_app_web_chromium_edge_visit_history',
+        'lv1_app_web_chromium_edge_visit_urls',
+        'lv1_app_web_firefox_bookmarks',
+        'lv1_app_web_firefox_content_prefs',
+        'lv1_app_web_firefox_cookies',
+        'lv1_app_web_firefox_domain',
+        'lv1_app_web_firefox_download',
+        'lv1_app_web_firefox_favicons',
+        'lv1_app_web_firefox_formhistory',
+        'lv1_app_web_firefox_permissions',
+        'lv1_app_web_firefox_visit_history',
+        'lv1_app_web_firefox_visit_urls',
+        'lv1_app_web_opera_autofill',
+        'lv1_app_web_opera_bookmarks',
+        'lv1_app_web_opera_cookies',
+        'lv1_app_web_opera_download',
+        'lv1_app_web_opera_favicons',
+        'lv1_app_web_opera_logindata',
+        'lv1_app_web_opera_search_terms',
+        'lv1_app_web_opera_shortcuts',
+        'lv1_app_web_opera_visit_history',
+        'lv1_app_web_opera_visit_urls',
+        'lv1_app_web_whale_autofill',
+        'lv1_app_web_whale_bookmarks',
+        'lv1_app_web_whale_cookies',
+        'lv1_app_web_whale_download',
+        'lv1_app_web_whale_favicons',
+        'lv1_app_web_whale_logindata',
+        'lv1_app_web_whale_search_terms',
+        'lv1_app_web_whale_shortcuts',
+        'lv1_app_web_whale_top_sites',
+        'lv1_app_web_whale_visit_history',
+        'lv1_app_web_whale_visit_urls']
+
+    _BATCH_SIZE = 10000
+
+    # Browser, name, profile directory and artifacts of the web browsers.
+    # Opera keeps its only profile in the user data directory.
+    _BROWSERS = [
+        ('chrome', 'Chrome', '/AppData/Local/Google/Chrome/User Data/{profile}/', chrome.ARTIFACTS),
+        ('whale', 'Whale', '/AppData/Local/Naver/Naver Whale/User Data/{profile}/', whale.ARTIFACTS),
+        ('chromium_edge', 'Chromium Edge', '/AppData/Local/Microsoft/Edge/User Data/{profile}/',
+         chromium_edge.ARTIFACTS),
+        ('opera', 'Opera', '/AppData/Roaming/Opera Software/Opera Stable/', opera.ARTIFACTS),
+        ('firefox', 'Firefox', '/AppData/Roaming/Mozilla/Firefox/Profiles/{profile}.default-release/',
+         firefox.ARTIFACTS)]
 
     _plugin_classes = {}
 
     def __init__(self):
         super(ChromiumConnector, self).__init__()
 
+    def _GetProfiles(self, browser, file_entries, user_list):
+        """Matches the profiles of a web browser to the OS users.
+
+        Args:
+            browser (str): browser, such as "chrome".
+            file_entries (list[tuple[str, str, str]]): name, parent path and
+                extension of the files in the user data directories.
+            user_list (list[str]): names of the OS users.
+
+        Returns:
+            list[list[str]]: OS user and profile name per profile.
+        """
+        if browser == 'opera':
+            return [[user, 'default user'] for user in user_list]
+
+        profiles = []
+        for name, parent_path, _ in file_entries:
+            if browser == 'firefox':
+                if '.default-release' not in name:
+                    continue
+                name = name[:name.rfind('default-release') - 1]
+
+            elif 'Default' not in name and 'Profile' not in name:
+                continue
+
+            for user in user_list:
+                if parent_path.find(user) != -1 and [user, name] not in profiles:
+                    profiles.append([user, name])
+
+        return profiles
+
+    def _ExtractProfile(self, configuration, source_path_spec, output_path, browser, profile_path,
+                        artifacts, profile_match):
+        """Extracts the files of a browser profile.
+
+        Args:
+            configuration (Configuration): configuration values.
+            source_path_spec (dfvfs.PathSpec): path specification of the partition.
+            output_path (str): path of the web output directory of the partition.
+            browser (str): browser, such as "chrome".
+            profile_path (str): path of the profile directory relative to the
+                user directory, where {profile} is replaced by the profile name.
+            artifacts (list[tuple[str, str, function]]): output table, file name
+                and parser per artifact.
+            profile_match (list[str]): OS user and profile name.
+
+        Returns:
+            str: path of the directory the profile files were extracted to.
+        """
+        profile_output_path = output_path + browser + os.sep + profile_match[0] + os.sep + profile_match[1] + os.sep
+        os.makedirs(profile_output_path, exist_ok=True)
+
+        file_names = []
+        for _, file_name, _ in artifacts:
+            if file_name not in file_names:
+                file_names.append(file_name)
+
+        for file_name in file_names:
+            self.ExtractTargetFileToPath(
+                source_path_spec=source_path_spec,
+                configuration=configuration,
+                file_path='/Users/' + profile_match[0] + profile_path.format(profile=profile_match[1]) + file_name,
+                output_path=profile_output_path)
+
+        return profile_output_path
+
+    def _ParseProfiles(self, configuration, source_path_spec, par_id, profiles):
+        """Parses browser profiles, one unit of work per profile.
+
+        The profile files are extracted in this process, which the image is
+        opened by, and parsed in a pool of worker processes while the next
+        profile is extracted. The rows of the finished profiles are written by
+        a single batched writer in this process. A profile that fails is logged
+        and the other profiles are parsed.
+
+        Args:
+            configuration (Configuration): configuration values.
+            source_path_spec (dfvfs.PathSpec): path specification of the partition.
+            par_id (str): partition identifier.
+            profiles (list[tuple[str, str, str, list, list[str]]]): browser,
+                browser name, profile directory, artifacts and profile match
+                per profile.
+        """
+        output_path = configuration.root_tmp_path + os.sep + configuration.case_id + os.sep + \
+                      configuration.evidence_id + os.sep + par_id + os.sep + "web" + os.sep
+        info = [par_id, configuration.case_id, configuration.evidence_id]
+        writer = _RowWriter(configuration.cursor, self._BATCH_SIZE)
+        number_of_workers = min(self._GetNumberOfWorkers(configuration), len(profiles))
+        start_time = time.time()
+
+        def _Extract(profile):
+            browser, _, profile_path, artifacts, profile_match = profile
+            extraction_start_time = time.time()
+            profile_output_path = self._ExtractProfile(
+                configuration, source_path_spec, output_path, browser, profile_path, artifacts, profile_match)
+            return profile_output_path, time.time() - extraction_start_time
+
+        def _Finish(profile, profile_output_path, extraction_time, number_of_rows, parse_time):
+            _, browser_name, _, _, profile_match = profile
+            shutil.rmtree(profile_output_path, ignore_errors=True)
+            print(f'[Web] {browser_name} {profile_match[0]}/{profile_match[1]}: {number_of_rows} rows '
+                  f'(extraction {extraction_time:.1f}s, parsing {parse_time:.1f}s)')
+
+        def _Write(profile, profile_output_path, extraction_time, future):
+            number_of_rows = 0
+            parse_time = 0.0
+            try:
+                rows_path, parse_time = future.result()
+                number_of_rows = writer.Write(_ReadRows(rows_path))
+            except Exception as exception:
+                logger.error('[Web] Unable to parse profile {0:s}/{1:s} with error: {2!s}'.format(
+                    profile[4][0], profile[4][1], exception))
+            _Finish(profile, profile_output_path, extraction_time, number_of_rows, parse_time)
+
+        if number_of_workers <= 1:
+            for profile in profiles:
+                profile_output_path, extraction_time = _Extract(profile)
+                parse_start_time = time.time()
+                number_of_rows = writer.Write(_ParseProfileRows(profile_output_path, profile[3], info + profile[4]))
+                _Finish(profile, profile_output_path, extraction_time, number_of_rows,
+                        time.time() - parse_start_time)
+
+        else:
+            with futures.ProcessPoolExecutor(max_workers=number_of_workers) as executor:
+                pending = {}
+                try:
+                    for profile in profiles:
+                        profile_output_path, extraction_time = _Extract(profile)
+                        future = executor.submit(
+                            _ParseProfile, profile_output_path, profile[3], info + profile[4], self._BATCH_SIZE)
+                        pending[future] = (profile, profile_output_path, extraction_time)
+
+                        # Write the finished profiles, and bound the number of
+                        # extracted profiles waiting to be parsed.
+                        timeout = None if len(pending) >= number_of_workers * 2 else 0
+                        done, _ = futures.wait(pending, timeout=timeout, return_when=futures.FIRST_COMPLETED)
+                        for future in done:
+                            _Write(*pending.pop(future), future)
+
+                    for future in futures.as_completed(list(pending)):
+                        _Write(*pending.pop(future), future)
+
+                except BaseException:
+                    for future in pending:
+                        future.cancel()
+                    raise
+
+        writer.Flush()
+
+        if os.path.isdir(output_path):
+            shutil.rmtree(output_path)
+
+        print(f'[Web] {len(profiles)} profiles, {writer.number_of_rows} rows '
+              f'({time.time() - start_time:.1f}s, {number_of_workers} workers)')
+
     def Connect(self, configuration, source_path_spec, knowledge_base):
         print('[MODULE]: Chromium Connect')
 
@@ -217,1204 +579,25 @@ class ChromiumConnector(interface.ModuleConnector):
         if not self.check_table_from_yaml(configuration, firefox_yaml_list, firefox_table_list):
             return False
 
-        ################## Chrome ###################
-        if len(chrome_artifact) != 0:  # If chrome artifact remain in partition
-
-            # Chrome profile check
-            full_path = []
-            for i in range(len(chrome_artifact)):
-
-                if 'Default' in chrome_artifact[i][0]:
-                    full_path.append(chrome_artifact[i][1] + os.sep + chrome_artifact[i][0])
-
-                if 'Profile' in chrome_artifact[i][0]:
-                    full_path.append(chrome_artifact[i][1] + os.sep + chrome_artifact[i][0])
-
-            # print(full_path)
-
-            # Make Chrome artifact ouput dir
-            chrome_output_path = configuration.root_tmp_path + os.sep + configuration.case_id + os.sep + \
-                                 configuration.evidence_id + os.sep + par_id + os.sep + "web" + os.sep + "chrome" + os.sep
-
-            # Match between os user chrome profile
-            os_user_chrome_profile = []
-
-            for f in full_path:
-                for user in user_list:
-                    if f.find(user) != -1:
-                        profile_index = f.rfind(os.sep)
-                        os_user_chrome_profile.append([user, f[profile_index + 1:]])
-
-            # print(os_user_chrome_profile)
-
-            # Create profile dir in ouput dir
-            if os.path.isdir(chrome_output_path) == False:
-                for make_dir_tree in os_user_chrome_profile:
-                    os.makedirs(chrome_output_path + make_dir_tree[0] + os.sep + make_dir_tree[1] + os.sep)
-
-            # Extract chrome artifact file
-            chromium_artifact_file_list = ['Preferences', 'History', 'Login Data', 'Shortcuts', 'Top Sites', 'Web Data', 'Favicons',
-                                         'Cookies', 'Bookmarks']
-
-            for make_dir_tree in os_user_chrome_profile:
-
-                for file in chromium_artifact_file_list:
-                    self.ExtractTargetFileToPath(
-                        source_path_spec=source_path_spec,
-                        configuration=configuration,
-                        file_path='/Users/' + make_dir_tree[0] + '/AppData/Local/Google/Chrome/User Data/' +
-                                  make_dir_tree[1] + '/' + file,
-                        output_path=chrome_output_path + make_dir_tree[0] + os.sep + make_dir_tree[1] + os.sep)
-
-            print("[Web] Chrome artifact files extraction success")
-
-            chrome_search_result = []
-            chrome_visit_urls_result = []
-            chrome_download_result = []
-            chrome_top_sites = []
-            chrome_shortcuts = []
-            chrome_favicons = []
-            chrome_cookies = []
-            chrome_autofill = []
-            chrome_logindata = []
-            chrome_bookmarks = []
-            chrome_domain = []
-            chrome_visit_history = []
-            chrome_google_account = []
-            chrome_zoom_level = []
-
-            for file_check in os_user_chrome_profile:
-
-                files = [f for f in os.listdir(chrome_output_path + file_check[0] + os.sep + file_check[1] + os.sep) if
-                         os.path.isfile(
-                             os.path.join(chrome_output_path + file_check[0] + os.sep + file_check[1] + os.sep, f))]
-
-                if 'Preferences' in files:
-                    tmp_file_path = chrome_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Preferences'
-                    chrome_domain.append(chrome.chrome_domain_analysis(tmp_file_path))
-                    chrome_google_account.append(chrome.chrome_google_account(tmp_file_path))
-                    chrome_zoom_level.append(chrome.chrome_zoom_level(tmp_file_path))
-
-                if 'History' in files:
-                    tmp_file_path = chrome_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'History'
-                    chrome_search_result.append(chrome.chrome_search_terms(tmp_file_path))
-                    chrome_visit_urls_result.append(chrome.chrome_visit_urls(tmp_file_path))
-                    chrome_download_result.append(chrome.chrome_download(tmp_file_path))
-                    chrome_visit_history.append(chrome.chrome_visit_history(tmp_file_path))
-
-                if 'Top Sites' in files:
-                    tmp_file_path = chrome_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Top Sites'
-                    chrome_top_sites.append(chrome.chrome_top_sites(tmp_file_path))
-
-                if 'Shortcuts' in files:
-                    tmp_file_path = chrome_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Shortcuts'
-                    chrome_shortcuts.append(chrome.chrome_shortcuts(tmp_file_path))
-
-                if 'Favicons' in files:
-                    tmp_file_path = chrome_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Favicons'
-                    chrome_favicons.append(chrome.chrome_favicons(tmp_file_path))
-
-                if 'Cookies' in files:
-                    tmp_file_path = chrome_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Cookies'
-                    chrome_cookies.append(chrome.chrome_cookies(tmp_file_path))
-
-                if 'Web Data' in files:
-                    tmp_file_path = chrome_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Web Data'
-                    chrome_autofill.append(chrome.chrome_autofill(tmp_file_path))
-                    # ToDo : keywords 테이블 의미 파악 후 반영
-
-                if 'Login Data' in files:
-                    tmp_file_path = chrome_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Login Data'
-                    chrome_logindata.append(chrome.chrome_logindata(tmp_file_path))
-
-                if 'Bookmarks' in files:
-                    tmp_file_path = chrome_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Bookmarks'
-                    chrome_bookmarks.append(chrome.chrome_bookmarks(tmp_file_path))
-
-            # delete chrome output dir
-            shutil.rmtree(chrome_output_path)
-
-            info = [par_id, configuration.case_id, configuration.evidence_id]
-
-            # insert data
-            for search_terms, profile_match in zip(chrome_search_result, os_user_chrome_profile):
-                for row in search_terms:
-                    table_name = 'lv1_app_web_chrome_search_terms'
-
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-            # print("[chrome] search terms data insert complete")
-
-            for visit_urls, profile_match in zip(chrome_visit_urls_result, os_user_chrome_profile):
-                for row in visit_urls:
-                    table_name = 'lv1_app_web_chrome_visit_urls'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for visit_history, profile_match in zip(chrome_visit_history, os_user_chrome_profile):
-                for row in visit_history:
-                    table_name = 'lv1_app_web_chrome_visit_history'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s'," \
-                            f"'%s', '%s', '%s', '%s');" % tuple(row)
-
-                    configuration.cursor.execute_query(query)
-
-            for download_files, profile_match in zip(chrome_download_result, os_user_chrome_profile):
-                for row in download_files:
-                    table_name = 'lv1_app_web_chrome_download'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s'" \
-                            f", '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s'" \
-                            f", '%s', '%s');" % tuple(row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for top_sites, profile_match in zip(chrome_top_sites, os_user_chrome_profile):
-                for row in top_sites:
-                    table_name = 'lv1_app_web_chrome_top_sites'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for shortcuts, profile_match in zip(chrome_shortcuts, os_user_chrome_profile):
-                for row in shortcuts:
-                    table_name = 'lv1_app_web_chrome_shortcuts'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for favicons, profile_match in zip(chrome_favicons, os_user_chrome_profile):
-                for row in favicons:
-                    table_name = 'lv1_app_web_chrome_favicons'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[0:8]) + \
-                            "(UNHEX(\'" + row[8].hex() + "\'))" \
-                                                         ", '%s', '%s', '%s', '%s');" % tuple(row[9:])
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for cookies, profile_match in zip(chrome_cookies, os_user_chrome_profile):
-                for row in cookies:
-                    table_name = 'lv1_app_web_chrome_cookies'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[0:14]) + \
-                            "(UNHEX(\'" + row[14].hex() + "\'))" \
-                                                          ", '%s', '%s', '%s');" % tuple(row[15:])
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for autofill, profile_match in zip(chrome_autofill, os_user_chrome_profile):
-                for row in autofill:
-                    table_name = 'lv1_app_web_chrome_autofill'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for logindata, profile_match in zip(chrome_logindata, os_user_chrome_profile):
-                for row in logindata:
-                    table_name = 'lv1_app_web_chrome_logindata'
-                    row = info + list(row) + profile_match
-
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[0:9]) + \
-                            "(UNHEX(\'" + row[9].hex() + "\'))" \
-                                                         ", '%s', '%s', " % tuple(row[10:12]) + \
-                            "(UNHEX(\'" + row[12].hex() + "\'))" \
-                                                          ", '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[13:23]) + \
-                            "(UNHEX(\'" + row[23].hex() + "\'))" \
-                                                          ", '%s', '%s', '%s', '%s', '%s');" % tuple(row[24:])
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for bookmark, profile_match in zip(chrome_bookmarks, os_user_chrome_profile):
-                for row in bookmark:
-                    table_name = 'lv1_app_web_chrome_bookmarks'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for domain, profile_match in zip(chrome_domain, os_user_chrome_profile):
-                for row in domain:
-                    table_name = 'lv1_app_web_chrome_domain'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for google_account, profile_match in zip(chrome_google_account, os_user_chrome_profile):
-                for row in google_account:
-                    table_name = 'lv1_app_web_chrome_google_account'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " \
-                            f"'%s', '%s', '%s', '%s', '%s', '%s');" % tuple(row)
-
-                    configuration.cursor.execute_query(query)
-
-            for zoom_level, profile_match in zip(chrome_zoom_level, os_user_chrome_profile):
-                for row in zoom_level:
-                    table_name = 'lv1_app_web_chrome_zoom_level'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(row)
-
-                    configuration.cursor.execute_query(query)
-
-            print("[Web] "+"\033[32m"+"Chrome Analysis Complete" +"\033[0m")
-
-        else:
-            print("[Web] "+"\033[31m"+"No Chrome artifact"+"\033[0m"+" in par_id %s." % (par_id))
-
-        ################## Whale ###################
-        if len(whale_artifact) != 0:
-
-            # Whale profile check
-            full_path = []
-            for i in range(len(whale_artifact)):
-
-                if 'Default' in whale_artifact[i][0]:
-                    full_path.append(whale_artifact[i][1] + os.sep + whale_artifact[i][0])
-
-                if 'Profile' in whale_artifact[i][0]:
-                    full_path.append(whale_artifact[i][1] + os.sep + whale_artifact[i][0])
-
-            # print(full_path)
-
-            # Make Whale artifact ouput dir
-            whale_output_path = configuration.root_tmp_path + os.sep + configuration.case_id + os.sep + \
-                                configuration.evidence_id + os.sep + par_id + os.sep + "web" + os.sep + "whale" + os.sep
-
-            # Match between os user whale profile
-            os_user_whale_profile = []
-
-            for f in full_path:
-                for user in user_list:
-                    if f.find(user) != -1:
-                        profile_index = f.rfind(os.sep)
-                        os_user_whale_profile.append([user, f[profile_index + 1:]])
-
-            # print(os_user_whale_profile)
-
-            # Create profile dir in ouput dir
-            if not os.path.isdir(whale_output_path):
-                for make_dir_tree in os_user_whale_profile:
-                    os.makedirs(whale_output_path + make_dir_tree[0] + os.sep + make_dir_tree[1] + os.sep)
-
-            # Extract whale artifact file
-            chromium_artifact_file_list = ['Preferences', 'History', 'Login Data', 'Shortcuts', 'Top Sites', 'Web Data',
-                                        'Favicons', 'Cookies', 'Bookmarks']
-
-            for make_dir_tree in os_user_whale_profile:
-
-                for file in chromium_artifact_file_list:
-                    self.ExtractTargetFileToPath(
-                        source_path_spec=source_path_spec,
-                        configuration=configuration,
-                        file_path='/Users/' + make_dir_tree[0] + '/AppData/Local/Naver/Naver Whale/User Data/' +
-                                  make_dir_tree[1] + '/' + file,
-                        output_path=whale_output_path + make_dir_tree[0] + os.sep + make_dir_tree[1] + os.sep)
-
-            print("[Web] Whale artifact files extraction success")
-
-            whale_search_result = []
-            whale_visit_urls_result = []
-            whale_download_result = []
-            whale_top_sites = []
-            whale_cookies = []
-            whale_autofill = []
-            whale_logindata = []
-            whale_bookmarks = []
-            whale_shortcuts = []
-            whale_favicons = []
-            whale_visit_history = []
-
-            # Parse artifact
-            for file_check in os_user_whale_profile:
-
-                files = [f for f in os.listdir(whale_output_path + file_check[0] + os.sep + file_check[1] + os.sep) if
-                         os.path.isfile(
-                             os.path.join(whale_output_path + file_check[0] + os.sep + file_check[1] + os.sep, f))]
-
-                if 'History' in files:
-                    tmp_file_path = whale_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'History'
-                    whale_search_result.append(whale.whale_search_terms(tmp_file_path))  # fp 대신 dict 자료형으로????
-                    whale_visit_urls_result.append(whale.whale_visit_urls(tmp_file_path))
-                    whale_download_result.append(whale.whale_download(tmp_file_path))
-                    whale_visit_history.append(whale.whale_visit_history(tmp_file_path))
-
-                if 'Bookmarks' in files:
-                    tmp_file_path = whale_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Bookmarks'
-                    whale_bookmarks.append(whale.whale_bookmarks(tmp_file_path))
-
-                if 'Cookies' in files:
-                    tmp_file_path = whale_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Cookies'
-                    whale_cookies.append(whale.whale_cookies(tmp_file_path))
-
-                if 'Top Sites' in files:
-                    tmp_file_path = whale_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Top Sites'
-                    whale_top_sites.append(whale.whale_top_sites(tmp_file_path))
-
-                if 'Web Data' in files:
-                    tmp_file_path = whale_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Web Data'
-                    whale_autofill.append(whale.whale_autofill(tmp_file_path))
-
-                if 'Login Data' in files:
-                    tmp_file_path = whale_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Login Data'
-                    whale_logindata.append(whale.whale_logindata(tmp_file_path))
-
-                if 'Shortcuts' in files:
-                    tmp_file_path = whale_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Shortcuts'
-                    whale_shortcuts.append(whale.whale_shortcuts(tmp_file_path))
-
-                if 'Favicons' in files:
-                    tmp_file_path = whale_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Favicons'
-                    whale_favicons.append(whale.whale_favicons(tmp_file_path))
-
-            # delete chrome output dir
-            shutil.rmtree(whale_output_path)
-
-            info = [par_id, configuration.case_id, configuration.evidence_id]
-
-            # insert data
-            for bookmark, profile_match in zip(whale_bookmarks, os_user_whale_profile):
-                for row in bookmark:
-                    table_name = 'lv1_app_web_whale_bookmarks'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for download, profile_match in zip(whale_download_result, os_user_whale_profile):
-                for row in download:
-                    table_name = 'lv1_app_web_whale_download'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s'" \
-                            f", '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s'" \
-                            f", '%s', '%s');" % tuple(row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for visit_urls, profile_match in zip(whale_visit_urls_result, os_user_whale_profile):
-                for row in visit_urls:
-                    table_name = 'lv1_app_web_whale_visit_urls'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for visit_history, profile_match in zip(whale_visit_history, os_user_whale_profile):
-                for row in visit_history:
-                    table_name = 'lv1_app_web_whale_visit_history'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s'," \
-                            f"'%s', '%s', '%s', '%s');" % tuple(row)
-
-                    configuration.cursor.execute_query(query)
-
-            for search_terms, profile_match in zip(whale_search_result, os_user_whale_profile):
-                for row in search_terms:
-                    table_name = 'lv1_app_web_whale_search_terms'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
+        ################## Web Browsers ###################
+        browser_artifacts = {
+            'chrome': chrome_artifact,
+            'whale': whale_artifact,
+            'chromium_edge': chromium_edge_artifact,
+            'opera': opera_artifact,
+            'firefox': firefox_artifact}
 
-            for cookies, profile_match in zip(whale_cookies, os_user_whale_profile):
-                for row in cookies:
-                    table_name = 'lv1_app_web_whale_cookies'
-                    row = info + list(row) + profile_match
+        profiles = []
+        for browser, browser_name, profile_path, artifacts in self._BROWSERS:
+            if len(browser_artifacts[browser]) == 0:
+                print("[Web] " + "\033[31m" + "No " + browser_name + " artifact" + "\033[0m" + " in par_id %s." % (par_id))
+                continue
 
-                    # query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                    #    row)
+            for profile_match in self._GetProfiles(browser, browser_artifacts[browser], user_list):
+                profiles.append((browser, browser_name, profile_path, artifacts, profile_match))
 
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[0:7]) + \
-                            "(UNHEX(\'" + row[7].hex() + "\'))" \
-                                                         ", '%s', '%s', '%s', '%s', '%s');" % tuple(row[8:])
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for top_sites, profile_match in zip(whale_top_sites, os_user_whale_profile):
-                for row in top_sites:
-                    table_name = 'lv1_app_web_whale_top_sites'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for autofill, profile_match in zip(whale_autofill, os_user_whale_profile):
-                for row in autofill:
-                    table_name = 'lv1_app_web_whale_autofill'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for logindata, profile_match in zip(whale_logindata, os_user_whale_profile):
-                for row in logindata:
-                    table_name = 'lv1_app_web_whale_logindata'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[0:9]) + \
-                            "(UNHEX(\'" + row[9].hex() + "\'))" \
-                                                         ", '%s', '%s', " % tuple(row[10:12]) + \
-                            "(UNHEX(\'" + row[12].hex() + "\'))" \
-                                                          ", '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[13:23]) + \
-                            "(UNHEX(\'" + row[23].hex() + "\'))" \
-                                                          ", '%s', '%s', '%s', '%s', '%s');" % tuple(row[24:])
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for shortcuts, profile_match in zip(whale_shortcuts, os_user_whale_profile):
-                for row in shortcuts:
-                    table_name = 'lv1_app_web_whale_shortcuts'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for favicons, profile_match in zip(whale_favicons, os_user_whale_profile):
-                for row in favicons:
-                    table_name = 'lv1_app_web_whale_favicons'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[0:8]) + \
-                            "(UNHEX(\'" + row[8].hex() + "\'))" \
-                                                         ", '%s', '%s', '%s', '%s');" % tuple(row[9:])
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            print("[Web] " + "\033[32m" + "Whale Analysis Complete" + "\033[0m")
-
-        else:
-            print("[Web] " + "\033[31m" + "No Whale artifact" + "\033[0m" + " in par_id %s." % (par_id))
-
-        ################ Chromium Edge ###################
-        if len(chromium_edge_artifact) != 0:
-
-            # Profile check
-            full_path = []
-            for i in range(len(chromium_edge_artifact)):
-
-                if 'Default' in chromium_edge_artifact[i][0]:
-                    full_path.append(chromium_edge_artifact[i][1] + os.sep + chromium_edge_artifact[i][0])
-
-                if 'Profile' in chromium_edge_artifact[i][0]:
-                    full_path.append(chromium_edge_artifact[i][1] + os.sep + chromium_edge_artifact[i][0])
-
-            # Make Chrome artifact output dir
-            edge_output_path = configuration.root_tmp_path + os.sep + configuration.case_id + os.sep + \
-                               configuration.evidence_id + os.sep + par_id + os.sep + "web" + os.sep + "chromium_edge" + os.sep
-
-            # Match between os user chrome profile
-            os_user_edge_profile = []
-
-            for f in full_path:
-                for user in user_list:
-                    if f.find(user) != -1:
-                        profile_index = f.rfind(os.sep)
-                        os_user_edge_profile.append([user, f[profile_index + 1:]])
-
-            # Create profile dir in output dir
-            if os.path.isdir(edge_output_path) == False:
-                for make_dir_tree in os_user_edge_profile:
-                    os.makedirs(edge_output_path + make_dir_tree[0] + os.sep + make_dir_tree[1] + os.sep)
-
-            # Extract chrome artifact file
-            chromium_artifact_file_list = ['Preferences', 'History', 'Login Data', 'Shortcuts', 'Top Sites', 'Web Data', 'Favicons',
-                                           'Cookies', 'Bookmarks']
-
-            for make_dir_tree in os_user_edge_profile:
-
-                for file in chromium_artifact_file_list:
-                    self.ExtractTargetFileToPath(
-                        source_path_spec=source_path_spec,
-                        configuration=configuration,
-                        file_path='/Users/' + make_dir_tree[0] + '/AppData/Local/Microsoft/Edge/User Data/' +
-                                  make_dir_tree[1] + '/' + file,
-                        output_path=edge_output_path + make_dir_tree[0] + os.sep + make_dir_tree[1] + os.sep)
-
-            print("[Web] Chromium Edge artifact files extraction success")
-
-            edge_search_result = []
-            edge_visit_urls_result = []
-            edge_download_result = []
-            edge_top_sites = []
-            edge_shortcuts = []
-            edge_favicons = []
-            edge_cookies = []
-            edge_autofill = []
-            edge_logindata = []
-            edge_bookmarks = []
-            edge_preferences = []
-            edge_visit_history = []
-
-            for file_check in os_user_edge_profile:
-
-                files = [f for f in os.listdir(edge_output_path + file_check[0] + os.sep + file_check[1] + os.sep) if
-                         os.path.isfile(
-                             os.path.join(edge_output_path + file_check[0] + os.sep + file_check[1] + os.sep, f))]
-
-                if 'Preferences' in files:
-                    tmp_file_path = edge_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Preferences'
-
-
-                if 'History' in files:
-                    tmp_file_path = edge_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'History'
-                    edge_search_result.append(chromium_edge.edge_search_terms(tmp_file_path))  # fp 대신 dict 자료형으로????
-                    edge_visit_urls_result.append(chromium_edge.edge_visit_urls(tmp_file_path))
-                    edge_download_result.append(chromium_edge.edge_download(tmp_file_path))
-                    edge_visit_history.append(chromium_edge.edge_visit_history(tmp_file_path))
-
-                if 'Top Sites' in files:
-                    tmp_file_path = edge_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Top Sites'
-                    edge_top_sites.append(chromium_edge.edge_top_sites(tmp_file_path))
-
-                if 'Shortcuts' in files:
-                    tmp_file_path = edge_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Shortcuts'
-                    edge_shortcuts.append(chromium_edge.edge_shortcuts(tmp_file_path))
-
-                if 'Favicons' in files:
-                    tmp_file_path = edge_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Favicons'
-                    edge_favicons.append(chromium_edge.edge_favicons(tmp_file_path))
-
-                if 'Cookies' in files:
-                    tmp_file_path = edge_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Cookies'
-                    edge_cookies.append(chromium_edge.edge_cookies(tmp_file_path))
-
-                if 'Web Data' in files:
-                    tmp_file_path = edge_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Web Data'
-                    edge_autofill.append(chromium_edge.edge_autofill(tmp_file_path))
-
-                if 'Login Data' in files:
-                    tmp_file_path = edge_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Login Data'
-                    edge_logindata.append(chromium_edge.edge_logindata(tmp_file_path))
-
-                if 'Bookmarks' in files:
-                    tmp_file_path = edge_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Bookmarks'
-                    edge_bookmarks.append(chromium_edge.edge_bookmarks(tmp_file_path))
-
-            # delete chrome output dir
-            shutil.rmtree(edge_output_path)
-
-            info = [par_id, configuration.case_id, configuration.evidence_id]
-
-            # insert data
-            for search_terms, profile_match in zip(edge_search_result, os_user_edge_profile):
-                for row in search_terms:
-                    table_name = 'lv1_app_web_chromium_edge_search_terms'
-
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-            # print("[chrome] search terms data insert complete")
-
-            for visit_urls, profile_match in zip(edge_visit_urls_result, os_user_edge_profile):
-                for row in visit_urls:
-                    table_name = 'lv1_app_web_chromium_edge_visit_urls'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for visit_history, profile_match in zip(edge_visit_history, os_user_edge_profile):
-                for row in visit_history:
-                    table_name = 'lv1_app_web_chromium_edge_visit_history'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s'," \
-                            f"'%s', '%s', '%s', '%s');" % tuple(row)
-
-                    configuration.cursor.execute_query(query)
-
-            for download_files, profile_match in zip(edge_download_result, os_user_edge_profile):
-                for row in download_files:
-                    table_name = 'lv1_app_web_chromium_edge_download'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s'" \
-                            f", '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s'" \
-                            f", '%s', '%s');" % tuple(row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for top_sites, profile_match in zip(edge_top_sites, os_user_edge_profile):
-                for row in top_sites:
-                    table_name = 'lv1_app_web_chromium_edge_top_sites'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for shortcuts, profile_match in zip(edge_shortcuts, os_user_edge_profile):
-                for row in shortcuts:
-                    table_name = 'lv1_app_web_chromium_edge_shortcuts'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for favicons, profile_match in zip(edge_favicons, os_user_edge_profile):
-                for row in favicons:
-                    table_name = 'lv1_app_web_chromium_edge_favicons'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[0:8]) + \
-                            "(UNHEX(\'" + row[8].hex() + "\'))" \
-                                                         ", '%s', '%s', '%s', '%s');" % tuple(row[9:])
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for cookies, profile_match in zip(edge_cookies, os_user_edge_profile):
-                for row in cookies:
-                    table_name = 'lv1_app_web_chromium_edge_cookies'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[0:14]) + \
-                            "(UNHEX(\'" + row[14].hex() + "\'))" \
-                                                          ", '%s', '%s', '%s');" % tuple(row[15:])
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for autofill, profile_match in zip(edge_autofill, os_user_edge_profile):
-                for row in autofill:
-                    table_name = 'lv1_app_web_chromium_edge_autofill'
-                    row = info + list(row) + profile_match
-
-                    # query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(row)
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', " % tuple(row[0:4]) + \
-                            "(UNHEX(\'" + row[4].hex() + "\'))" + ", " + "(UNHEX(\'" + row[5].hex() + "\'))" \
-                                                                                                      ", '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row[6:])
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for logindata, profile_match in zip(edge_logindata, os_user_edge_profile):
-                for row in logindata:
-                    table_name = 'lv1_app_web_chromium_edge_logindata'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[0:9]) + \
-                            "(UNHEX(\'" + row[9].hex() + "\'))" \
-                                                         ", '%s', '%s', " % tuple(row[10:12]) + \
-                            "(UNHEX(\'" + row[12].hex() + "\'))" \
-                                                          ", '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[13:23]) + \
-                            "(UNHEX(\'" + row[23].hex() + "\'))" \
-                                                          ", '%s', '%s', '%s', '%s', '%s');" % tuple(row[24:])
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for bookmark, profile_match in zip(edge_bookmarks, os_user_edge_profile):
-                for row in bookmark:
-                    table_name = 'lv1_app_web_chromium_edge_bookmarks'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            print("[Web] " + "\033[32m" + "Chromium Edge Analysis Complete" + "\033[0m")
-
-        else:
-            print("[Web] " + "\033[31m" + "No Chromium Edge artifact" + "\033[0m" + " in par_id %s." % (par_id))
+        if profiles:
+            self._ParseProfiles(configuration, source_path_spec, par_id, profiles)
 
-        ################ Opera ###################
-        if len(opera_artifact) != 0:
-
-            full_path = []
-
-            for i in range(len(opera_artifact)):
-                full_path.append(opera_artifact[i][1] + os.sep + opera_artifact[i][0])
-
-            # Make Chrome artifact output dir
-            opera_output_path = configuration.root_tmp_path + os.sep + configuration.case_id + os.sep + \
-                               configuration.evidence_id + os.sep + par_id + os.sep + "web" + os.sep + "opera" + os.sep
-
-            # Match between os user chrome profile
-            os_user_opera_profile = []
-
-            for user in user_list:
-                os_user_opera_profile.append([user, 'default user'])
-
-            # print(os_user_firefox_profile)
-
-            # Create profile dir in output dir
-            if os.path.isdir(opera_output_path) == False:
-                for make_dir_tree in os_user_opera_profile:
-                    os.makedirs(opera_output_path + make_dir_tree[0] + os.sep + make_dir_tree[1] + os.sep)
-
-            opera_artifact_file_list = ['Bookmarks', 'Cookies', 'Favicons', 'History', 'Login Data', 'Preferences', 'Shortcuts', 'Web Data']
-
-            for make_dir_tree in os_user_opera_profile:
-
-                for file in opera_artifact_file_list:
-                    self.ExtractTargetFileToPath(
-                        source_path_spec=source_path_spec,
-                        configuration=configuration,
-                        file_path='/Users/' + make_dir_tree[0] + '/AppData/Roaming/Opera Software/Opera Stable/' + file,
-                        output_path=opera_output_path + make_dir_tree[0] + os.sep + make_dir_tree[1] + os.sep)
-
-            print("[Web] Opera artifact files extraction success")
-
-            opera_search_terms = []
-            opera_visit_urls = []
-            opera_download = []
-            opera_visit_history = []
-            opera_shortcuts = []
-            opera_favicons = []
-            opera_cookies = []
-            opera_autofill = []
-            opera_logindata = []
-            opera_bookmarks = []
-
-            for file_check in os_user_opera_profile:
-
-                files = [f for f in os.listdir(opera_output_path + file_check[0] + os.sep + file_check[1] + os.sep) if
-                         os.path.isfile(
-                             os.path.join(opera_output_path + file_check[0] + os.sep + file_check[1] + os.sep, f))]
-
-                if 'History' in files:
-                    tmp_file_path = opera_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'History'
-                    opera_search_terms.append(opera.opera_search_terms(tmp_file_path))
-                    opera_visit_urls.append(opera.opera_visit_urls(tmp_file_path))
-                    opera_download.append(opera.opera_download(tmp_file_path))
-                    opera_visit_history.append(opera.opera_visit_history(tmp_file_path))
-
-                if 'Shortcuts' in files:
-                    tmp_file_path = opera_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Shortcuts'
-                    opera_shortcuts.append(opera.opera_shortcuts(tmp_file_path))
-
-                if 'Favicons' in files:
-                    tmp_file_path = opera_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Favicons'
-                    opera_favicons.append(opera.opera_favicons(tmp_file_path))
-
-                if 'Cookies' in files:
-                    tmp_file_path = opera_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Cookies'
-                    opera_cookies.append(opera.opera_cookies(tmp_file_path))
-
-                if 'Web Data' in files: #autofill
-                    tmp_file_path = opera_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Web Data'
-                    opera_autofill.append(opera.opera_autofill(tmp_file_path))
-
-                if 'Login Data' in files:
-                    tmp_file_path = opera_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Login Data'
-                    opera_logindata.append(opera.opera_logindata(tmp_file_path))
-
-                if 'Bookmarks' in files:
-                    tmp_file_path = opera_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'Bookmarks'
-                    opera_bookmarks.append(opera.opera_bookmarks(tmp_file_path))
-
-
-            # delete chrome output dir
-            shutil.rmtree(opera_output_path)
-
-            info = [par_id, configuration.case_id, configuration.evidence_id]
-
-            # insert data
-            for search_terms, profile_match in zip(opera_search_terms, os_user_opera_profile):
-                for row in search_terms:
-                    table_name = 'lv1_app_web_opera_search_terms'
-
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for visit_urls, profile_match in zip(opera_visit_urls, os_user_opera_profile):
-                for row in visit_urls:
-                    table_name = 'lv1_app_web_opera_visit_urls'
-
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s'" \
-                            f", '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for visit_history, profile_match in zip(opera_visit_history, os_user_opera_profile):
-                for row in visit_history:
-                    table_name = 'lv1_app_web_opera_visit_history'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s'," \
-                            f"'%s', '%s', '%s', '%s');" % tuple(row)
-
-                    configuration.cursor.execute_query(query)
-
-            for downlads, profile_match in zip(opera_download, os_user_opera_profile):
-                for row in downlads:
-                    table_name = 'lv1_app_web_opera_download'
-
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s'" \
-                            f", '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s'" \
-                            f", '%s', '%s');" % tuple(row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for shortcuts, profile_match in zip(opera_shortcuts, os_user_opera_profile):
-                for row in shortcuts:
-                    table_name = 'lv1_app_web_opera_shortcuts'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for favicons, profile_match in zip(opera_favicons, os_user_opera_profile):
-                for row in favicons:
-                    table_name = 'lv1_app_web_opera_favicons'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[0:8]) + \
-                            "(UNHEX(\'" + row[8].hex() + "\'))" \
-                                                         ", '%s', '%s', '%s', '%s');" % tuple(row[9:])
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for cookies, profile_match in zip(opera_cookies, os_user_opera_profile):
-                for row in cookies:
-                    table_name = 'lv1_app_web_opera_cookies'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[0:14]) + \
-                            "(UNHEX(\'" + row[14].hex() + "\'))" \
-                                                          ", '%s', '%s', '%s');" % tuple(row[15:])
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for autofill, profile_match in zip(opera_autofill, os_user_opera_profile):
-                for row in autofill:
-                    table_name = 'lv1_app_web_opera_autofill'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(row)
-
-                    configuration.cursor.execute_query(query)
-
-            for logindata, profile_match in zip(opera_logindata, os_user_opera_profile):
-                for row in logindata:
-                    table_name = 'lv1_app_web_opera_logindata'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[0:9]) + \
-                            "(UNHEX(\'" + row[9].hex() + "\'))" \
-                                                         ", '%s', '%s', " % tuple(row[10:12]) + \
-                            "(UNHEX(\'" + row[12].hex() + "\'))" \
-                                                          ", '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[13:23]) + \
-                            "(UNHEX(\'" + row[23].hex() + "\'))" \
-                                                          ", '%s', '%s', '%s', '%s', '%s');" % tuple(row[24:])
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for bookmark, profile_match in zip(opera_bookmarks, os_user_opera_profile):
-                for row in bookmark:
-                    table_name = 'lv1_app_web_opera_bookmarks'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(
-                        row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            print("[Web] " + "\033[32m" + "Opera Analysis Complete" + "\033[0m")
-
-        else:
-            print("[Web] " + "\033[31m" + "No Opera artifact" + "\033[0m" + " in par_id %s." % (par_id))
-
-        ################ Firefox ###################
-        if len(firefox_artifact) != 0:
-
-            full_path = []
-            for i in range(len(firefox_artifact)):
-
-                if '.default-release' in firefox_artifact[i][0]:
-                    full_path.append(firefox_artifact[i][1] + os.sep + firefox_artifact[i][0])
-
-            # Make Chrome artifact output dir
-            firefox_output_path = configuration.root_tmp_path + os.sep + configuration.case_id + os.sep + \
-                               configuration.evidence_id + os.sep + par_id + os.sep + "web" + os.sep + "firefox" + os.sep
-
-            # Match between os user chrome profile
-            os_user_firefox_profile = []
-
-            for f in full_path:
-                for user in user_list:
-                    if f.find(user) != -1:
-                        profile_start_index = f.rfind(os.sep) + 1
-                        profile_end_index = f.rfind('default-release') - 1
-                        os_user_firefox_profile.append([user, f[profile_start_index:profile_end_index]])
-
-            # Create profile dir in output dir
-            if os.path.isdir(firefox_output_path) == False:
-                for make_dir_tree in os_user_firefox_profile:
-                    os.makedirs(firefox_output_path + make_dir_tree[0] + os.sep + make_dir_tree[1] + os.sep)
-
-            # Extract chrome artifact file
-            firefox_artifact_file_list = ['places.sqlite', 'content-prefs.sqlite', 'cookies.sqlite', 'favicons.sqlite', 'formhistory.sqlite', 'permissions.sqlite', 'prefs.js']
-
-            for make_dir_tree in os_user_firefox_profile:
-
-                for file in firefox_artifact_file_list:
-                    self.ExtractTargetFileToPath(
-                        source_path_spec=source_path_spec,
-                        configuration=configuration,
-                        file_path='/Users/' + make_dir_tree[0] + '/AppData/Roaming/Mozilla/Firefox/Profiles/' +
-                                  make_dir_tree[1] + '.default-release/' + file,
-                        output_path=firefox_output_path + make_dir_tree[0] + os.sep + make_dir_tree[1] + os.sep)
-
-            print("[Web] Firefox artifact files extraction success")
-
-            firefox_visit_history = []
-            firefox_visit_urls = []
-            firefox_domains = []
-            firefox_downloads = []
-            firefox_cookies = []
-            firefox_permissions = []
-            firefox_formhistory = []
-            firefox_favicons = []
-            firefox_content_prefs = []
-            firefox_bookmarks = []
-
-            for file_check in os_user_firefox_profile:
-
-                files = [f for f in os.listdir(firefox_output_path + file_check[0] + os.sep + file_check[1] + os.sep) if
-                         os.path.isfile(
-                             os.path.join(firefox_output_path + file_check[0] + os.sep + file_check[1] + os.sep, f))]
-
-                if 'places.sqlite' in files:
-                    tmp_file_path = firefox_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'places.sqlite'
-                    firefox_visit_history.append(firefox.firefox_visit_history(tmp_file_path))
-                    firefox_visit_urls.append(firefox.firefox_visit_urls(tmp_file_path))
-                    firefox_domains.append(firefox.firefox_domain(tmp_file_path))
-                    firefox_downloads.append(firefox.firefox_downloads(tmp_file_path))
-                    firefox_bookmarks.append(firefox.firefox_bookmarks(tmp_file_path))
-
-                if 'cookies.sqlite' in files:
-                    tmp_file_path = firefox_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'cookies.sqlite'
-                    firefox_cookies.append(firefox.firefox_cookies(tmp_file_path))
-
-                if 'permissions.sqlite' in files:
-                    tmp_file_path = firefox_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'permissions.sqlite'
-                    firefox_permissions.append(firefox.firefox_perms(tmp_file_path))
-
-                if 'formhistory.sqlite' in files:
-                    tmp_file_path = firefox_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'formhistory.sqlite'
-                    firefox_formhistory.append(firefox.firefox_forms(tmp_file_path))
-
-                if 'favicons.sqlite' in files:
-                    tmp_file_path = firefox_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'favicons.sqlite'
-                    firefox_favicons.append(firefox.firefox_favicons(tmp_file_path))
-
-                if 'content-prefs.sqlite' in files:
-                    tmp_file_path = firefox_output_path + file_check[0] + os.sep + file_check[1] + os.sep + 'content-prefs.sqlite'
-                    firefox_content_prefs.append(firefox.firefox_prefs(tmp_file_path))
-
-
-            # delete chrome output dir
-            shutil.rmtree(firefox_output_path)
-
-            info = [par_id, configuration.case_id, configuration.evidence_id]
-
-            for visit_history, profile_match in zip(firefox_visit_history, os_user_firefox_profile):
-                for row in visit_history:
-
-                    table_name = 'lv1_app_web_firefox_visit_history'
-                    row = info + list(row) + profile_match
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for visit_urls, profile_match in zip(firefox_visit_urls, os_user_firefox_profile):
-                for row in visit_urls:
-
-                    table_name = 'lv1_app_web_firefox_visit_urls'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for domain, profile_match in zip(firefox_domains, os_user_firefox_profile):
-                for row in domain:
-
-                    table_name = 'lv1_app_web_firefox_domain'
-                    row = info + list(row) + profile_match
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(row)
-
-                    # print(query)
-                    configuration.cursor.execute_query(query)
-
-            for download, profile_match in zip(firefox_downloads, os_user_firefox_profile):
-                for row in download:
-
-                    table_name = 'lv1_app_web_firefox_download'
-                    row = info + list(row) + profile_match
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(row)
-
-                    configuration.cursor.execute_query(query)
-
-            for cookies, profile_match in zip(firefox_cookies, os_user_firefox_profile):
-                for row in cookies:
-
-                    table_name = 'lv1_app_web_firefox_cookies'
-                    row = info + list(row) + profile_match
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(row)
-
-                    configuration.cursor.execute_query(query)
-
-            for permissions, profile_match in zip(firefox_permissions, os_user_firefox_profile):
-                for row in permissions:
-
-                    table_name = 'lv1_app_web_firefox_permissions'
-                    row = info + list(row) + profile_match
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(row)
-
-                    configuration.cursor.execute_query(query)
-
-            for forms, profile_match in zip(firefox_formhistory, os_user_firefox_profile):
-                for row in forms:
-
-                    table_name = 'lv1_app_web_firefox_formhistory'
-                    row = info + list(row) + profile_match
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(row)
-
-                    configuration.cursor.execute_query(query)
-
-            for favicons, profile_match in zip(firefox_favicons, os_user_firefox_profile):
-                for row in favicons:
-                    table_name = 'lv1_app_web_firefox_favicons'
-                    row = info + list(row) + profile_match
-
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', " % tuple(
-                        row[0:10]) + \
-                            "(UNHEX(\'" + row[10].hex() + "\'))" \
-                                                         ", '%s', '%s', '%s');" % tuple(row[11:])
-
-                    configuration.cursor.execute_query(query)
-
-            for prefs, profile_match in zip(firefox_content_prefs, os_user_firefox_profile):
-                for row in prefs:
-
-                    table_name = 'lv1_app_web_firefox_content_prefs'
-                    row = info + list(row) + profile_match
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(row)
-
-                    configuration.cursor.execute_query(query)
-
-            for bookmarks, profile_match in zip(firefox_bookmarks, os_user_firefox_profile):
-                for row in bookmarks:
-
-                    table_name = 'lv1_app_web_firefox_bookmarks'
-                    row = info + list(row) + profile_match
-                    query = f"Insert into {table_name} values ('%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s', '%s');" % tuple(row)
-
-                    configuration.cursor.execute_query(query)
-
-            print("[Web] " + "\033[32m" + "Firefox Analysis Complete" + "\033[0m")
-
-        else:
-            print("[Web] " + "\033[31m" + "No Firefox artifact" + "\033[0m" + " in par_id %s." % (par_id))
 
 manager.ModulesManager.RegisterModule(ChromiumConnector)
@@ -2,7 +2,16 @@
 """module for DEFA."""
 import os
 import configparser
-from datetime import datetime
+import json
+import signal
+import time
+
+from concurrent import futures
+
+try:
+    import resource
+except ImportError:
+    resource = None
 
 from dfvfs.lib import definitions as dfvfs_definitions
 from elasticsearch import Elasticsearch, helpers
@@ -10,6 +19,304 @@ from elasticsearch import Elasticsearch, helpers
 from modules import manager
 from modules import interface
 
+
+class _DocumentTimeout(BaseException):
+    """Raised in a worker process when parsing a document takes too long.
+
+    Not an Exception, so the exception handlers of the parsers do not catch it.
+    """
+
+
+def _RaiseDocumentTimeout(signal_number, stack_frame):
+    raise _DocumentTimeout()
+
+
+def _GetAddressSpaceSize():
+    """Retrieves the size of the address space of the current process.
+
+    Returns:
+        int: size in bytes or 0 if not available.
+    """
+    try:
+        with open('/proc/self/statm') as file_object:
+            return int(file_object.read().split()[0]) * resource.getpagesize()
+    except (IOError, IndexError, ValueError):
+        return 0
+
+
+def _GetPhysicalMemorySize():
+    """Retrieves the size of the physical memory.
+
+    Returns:
+        int: size in bytes or 0 if not available.
+    """
+    try:
+        return os.sysconf('SC_PHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+
+def _InitializeWorker(memory_limit):
+    """Initializes a document worker process.
+
+    Args:
+        memory_limit (int): memory in MiB a worker may allocate in addition to
+            its size at start, 0 for no limit.
+    """
+    if hasattr(signal, 'SIGALRM'):
+        signal.signal(signal.SIGALRM, _RaiseDocumentTimeout)
+
+    if resource is not None and memory_limit:
+        address_space_size = _GetAddressSpaceSize() + memory_limit * 1024 * 1024
+        _, hard_limit = resource.getrlimit(resource.RLIMIT_AS)
+        if hard_limit != resource.RLIM_INFINITY:
+            address_space_size = min(address_space_size, hard_limit)
+        resource.setrlimit(resource.RLIMIT_AS, (address_space_size, hard_limit))
+
+
+def _SetDocumentTimeout(timeout):
+    """Sets or clears the timeout of the current document.
+
+    The timeout raises _DocumentTimeout. A parser that does not return to the
+    interpreter, or ignores the exception, is stopped by the CPU time limit of
+    twice the timeout, which breaks the pool.
+
+    Args:
+        timeout (int): timeout in seconds, 0 to clear the timeout.
+    """
+    if hasattr(signal, 'SIGALRM'):
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    if resource is not None:
+        _, hard_limit = resource.getrlimit(resource.RLIMIT_CPU)
+        cpu_time_limit = hard_limit
+        if timeout:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            cpu_time_limit = int(usage.ru_utime + usage.ru_stime) + timeout * 2
+            if hard_limit != resource.RLIM_INFINITY:
+                cpu_time_limit = min(cpu_time_limit, hard_limit)
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_time_limit, hard_limit))
+
+
+def _ProcessDocument(plugin, file_path, ole_path, timeout):
+    """Parses an extracted document.
+
+    Runs in a worker process.
+
+    Args:
+        plugin (DEFAPlugin): plugin of the document type.
+        file_path (str): path of the extracted document.
+        ole_path (str): path of the directory embedded objects are extracted to.
+        timeout (int): timeout in seconds, 0 for no timeout.
+
+    Returns:
+        tuple[MappingDocuments, str, float]: parsed document or None, error or
+            None, and parsing time in seconds.
+    """
+    start_time = time.time()
+    result = None
+    error = None
+    try:
+        _SetDocumentTimeout(timeout)
+        try:
+            result = plugin.Process(fp=file_path, ole_path=ole_path)
+        finally:
+            _SetDocumentTimeout(0)
+
+    except _DocumentTimeout:
+        error = f'timed out after {timeout}s'
+    except MemoryError:
+        error = 'memory limit exceeded'
+    except Exception as exception:
+        error = str(exception)
+
+    if result is None and error is None:
+        error = 'not parsed'
+    return result, error, time.time() - start_time
+
+
+class _DocumentProcessPool(object):
+    """Parses documents in a bounded pool of worker processes.
+
+    A worker that is stopped by its CPU time or memory limit breaks the pool.
+    Which document stopped it is not known, so every document of the broken
+    pool is parsed once more in a worker process of its own, and the pool is
+    recreated for the next documents.
+    """
+
+    def __init__(self, number_of_workers, timeout, memory_limit):
+        """Initializes a document process pool.
+
+        Args:
+            number_of_workers (int): number of worker processes.
+            timeout (int): timeout in seconds per document, 0 for no timeout.
+            memory_limit (int): memory in MiB per worker, 0 for no limit.
+        """
+        super(_DocumentProcessPool, self).__init__()
+        self._executor = None
+        self._memory_limit = memory_limit
+        self._number_of_workers = number_of_workers
+        self._pending = {}
+        self._timeout = timeout
+
+    def _CreateExecutor(self, number_of_workers):
+        """Creates a process pool executor with limited worker processes.
+
+        Args:
+            number_of_workers (int): number of worker processes.
+
+        Returns:
+            ProcessPoolExecutor: executor.
+        """
+        return futures.ProcessPoolExecutor(
+            max_workers=number_of_workers, initializer=_InitializeWorker, initargs=(self._memory_limit,))
+
+    def _Collect(self, timeout):
+        """Collects parsed documents.
+
+        Args:
+            timeout (float): seconds to wait for a document, None to wait until
+                one is parsed.
+
+        Yields:
+            tuple[tuple, MappingDocuments, str, float]: document, parsed document
+                or None, error or None, and parsing time in seconds.
+        """
+        done, _ = futures.wait(self._pending, timeout=timeout, return_when=futures.FIRST_COMPLETED)
+        for future in done:
+            document, executor = self._pending.pop(future)
+            try:
+                result, error, parse_time = future.result()
+
+            except futures.BrokenExecutor:
+                if executor is self._executor:
+                    self._executor.shutdown(wait=False)
+                    self._executor = None
+                result, error, parse_time = self._ProcessIsolated(document)
+
+            except Exception as exception:
+                result, error, parse_time = None, str(exception), 0.0
+
+            yield document, result, error, parse_time
+
+    def _ProcessIsolated(self, document):
+        """Parses a document in a worker process of its own.
+
+        Args:
+            document (tuple[DEFAPlugin, str, str, str]): plugin, file path,
+                embedded objects path and path in the image of the document.
+
+        Returns:
+            tuple[MappingDocuments, str, float]: parsed document or None, error or
+                None, and parsing time in seconds.
+        """
+        plugin, file_path, ole_path, _ = document
+        executor = self._CreateExecutor(1)
+        try:
+            return executor.submit(_ProcessDocument, plugin, file_path, ole_path, self._timeout).result()
+        except futures.BrokenExecutor:
+            return None, 'worker process stopped', 0.0
+        except Exception as exception:
+            return None, str(exception), 0.0
+        finally:
+            executor.shutdown(wait=True)
+
+    def _Submit(self, document):
+        """Submits a document to the pool.
+
+        Args:
+            document (tuple[DEFAPlugin, str, str, str]): plugin, file path,
+                embedded objects path and path in the image of the document.
+        """
+        plugin, file_path, ole_path, _ = document
+        while True:
+            if self._executor is None:
+                self._executor = self._CreateExecutor(self._number_of_workers)
+            try:
+                future = self._executor.submit(_ProcessDocument, plugin, file_path, ole_path, self._timeout)
+                break
+            except futures.BrokenExecutor:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+        self._pending[future] = (document, self._executor)
+
+    def Close(self):
+        """Stops the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._pending = {}
+
+    def Finish(self):
+        """Waits for the submitted documents.
+
+        Yields:
+            tuple[tuple, MappingDocuments, str, float]: document, parsed document
+                or None, error or None, and parsing time in seconds.
+        """
+        while self._pending:
+            yield from self._Collect(None)
+
+    def Process(self, document):
+        """Submits a document and collects the documents parsed so far.
+
+        Waits when the number of documents in the pool reaches twice the number
+        of workers, which bounds the parsed documents held in memory.
+
+        Args:
+            document (tuple[DEFAPlugin, str, str, str]): plugin, file path,
+                embedded objects path and path in the image of the document.
+
+        Yields:
+            tuple[tuple, MappingDocuments, str, float]: document, parsed document
+                or None, error or None, and parsing time in seconds.
+        """
+        self._Submit(document)
+        timeout = None if len(self._pending) >= self._number_of_workers * 2 else 0
+        yield from self._Collect(timeout)
+
+
+def _WriteJSONLines(path, actions):
+    """Writes bulk index actions to a JSON lines file, instead of Elasticsearch.
+
+    Args:
+        path (str): path of the JSON lines file.
+        actions (iterable[dict[str, object]]): bulk index actions.
+
+    Returns:
+        int: number of written actions.
+    """
+    number_of_actions = 0
+    with open(path, 'a', encoding='utf-8') as file_object:
+        for action in actions:
+            file_object.write(json.dumps(action, ensure_ascii=False, default=str) + '\n')
+            number_of_actions += 1
+    return number_of_actions
+
+
+def _IndexDocuments(es, actions, chunk_size):
+    """Indexes bulk index actions in Elasticsearch.
+
+    Args:
+        es (Elasticsearch): Elasticsearch client.
+        actions (iterable[dict[str, object]]): bulk index actions.
+        chunk_size (int): number of actions sent per bulk request.
+
+    Returns:
+        int: number of indexed actions.
+    """
+    number_of_actions = 0
+    for ok, item in helpers.streaming_bulk(
+            es, actions, chunk_size=chunk_size, raise_on_error=False, raise_on_exception=False,
+            request_timeout=200):
+        if ok:
+            number_of_actions += 1
+        else:
+            print(f"Error : {str(item)}")
+    return number_of_actions
+
+
 class DEFAConnector(interface.ModuleConnector):
 
     NAME = 'defa_connector'
@@ -20,6 +327,119 @@ class DEFAConnector(interface.ModuleConnector):
     def __init__(self):
         super(DEFAConnector, self).__init__()
 
+    def _GetNumberOfDocumentWorkers(self, configuration, memory_limit):
+        """Retrieves the number of document workers.
+
+        Every worker may allocate up to the memory limit, so the per-task
+        budget is reduced to the number of workers the physical memory holds.
+
+        Args:
+            configuration (Configuration): configuration values.
+            memory_limit (int): memory in MiB per worker, 0 for no limit.
+
+        Returns:
+            int: number of workers.
+        """
+        number_of_workers = self._GetNumberOfWorkers(configuration)
+        physical_memory_size = _GetPhysicalMemorySize()
+        if memory_limit and physical_memory_size:
+            number_of_workers = min(number_of_workers, physical_memory_size // (memory_limit * 1024 * 1024))
+        return max(1, number_of_workers)
+
+    def _ProcessDocuments(self, configuration, source_path_spec, par_id, document_files, plugins,
+                          index_name, type_name, timeout, memory_limit):
+        """Parses documents, one unit of work per document.
+
+        The documents are extracted in this process, which the image is opened
+        by, and parsed in a pool of worker processes while the next document is
+        extracted.
+
+        Args:
+            configuration (Configuration): configuration values.
+            source_path_spec (dfvfs.PathSpec): path specification of the partition.
+            par_id (str): partition identifier.
+            document_files (list[tuple[str, str, str, str]]): name, parent path,
+                signature type and extension per document.
+            plugins (dict[str, DEFAPlugin]): plugin per extension.
+            index_name (str): name of the Elasticsearch index.
+            type_name (str): name of the Elasticsearch document type.
+            timeout (int): timeout in seconds per document, 0 for no timeout.
+            memory_limit (int): memory in MiB per worker, 0 for no limit.
+
+        Yields:
+            dict[str, object]: bulk index action per parsed document.
+        """
+        number_of_workers = self._GetNumberOfDocumentWorkers(configuration, memory_limit)
+        pool = _DocumentProcessPool(number_of_workers, timeout, memory_limit)
+        number_of_documents = 0
+        number_of_errors = 0
+        start_time = time.time()
+
+        def _GetAction(document, result, error, parse_time):
+            _, file_path, ole_path, document_path = document
+            if result is None:
+                print(f'[DEFA] {document_path}: {error} ({parse_time:.1f}s)')
+                return None
+
+            result.case_id = configuration.case_id
+            result.evdnc_id = configuration.evidence_id
+            result.download_path = file_path
+            result.full_path = document_path  # 이미지 내 full_path
+            result.path_with_ext = document_path  # 이미지 내 full_path
+            result.parent_full_path = document_path[:document_path.rfind('/')]
+            result.name = document_path[document_path.rfind('/') + 1:]
+            result.original_size = os.path.getsize(file_path)
+            result.ole_path = ole_path
+            return {
+                '_index': index_name,
+                '_type': type_name,
+                '_source': result.__dict__
+            }
+
+        try:
+            for document in document_files:
+                plugin = plugins.get(document[3].lower())
+                if plugin is None:
+                    continue
+
+                document_path = document[1][document[1].find('/'):] + '/' + document[0]  # document full path
+                output_path = configuration.root_tmp_path + os.sep + configuration.case_id + os.sep + \
+                              configuration.evidence_id + os.sep + par_id + os.sep + document_path.replace(os.sep, '~#')
+                ole_path = output_path + os.sep + "ole"
+
+                if not os.path.exists(output_path):
+                    os.makedirs(output_path)
+                    os.makedirs(ole_path)
+
+                self.ExtractTargetFileToPath(
+                    source_path_spec=source_path_spec,
+                    configuration=configuration,
+                    file_path=document_path,
+                    output_path=output_path)
+
+                file_path = output_path + os.sep + document[0]
+                for document_result in pool.Process((plugin, file_path, ole_path, document_path)):
+                    action = _GetAction(*document_result)
+                    number_of_documents += 1
+                    if action is None:
+                        number_of_errors += 1
+                    else:
+                        yield action
+
+            for document_result in pool.Finish():
+                action = _GetAction(*document_result)
+                number_of_documents += 1
+                if action is None:
+                    number_of_errors += 1
+                else:
+                    yield action
+
+        finally:
+            pool.Close()
+
+        print(f'[DEFA] {number_of_documents} documents, {number_of_errors} errors '
+              f'({time.time() - start_time:.1f}s, {number_of_workers} workers)')
+
     def Connect(self, configuration, source_path_spec, knowledge_base):
         print('[MODULE]: DEFA Connect')
 
@@ -32,44 +452,17 @@ class DEFAConnector(interface.ModuleConnector):
             return False
 
         # 선택한 플러그인 파일만 읽어오기
-        hwp_plugin = None
-        doc_plugin = None
-        docx_plugin = None
-        ppt_plugin = None
-        pptx_plugin = None
-        xls_plugin = None
-        xlsx_plugin = None
-        pdf_plugin = None
+        plugins = {}
 
         # sig_type -> extension 임시 변경,
         query = f"SELECT name, parent_path, sig_type, extension FROM file_info WHERE par_id='{par_id}'" \
                 f"and parent_path not like '%/Hnc/Office%' and parent_path not like '%_damaged%' and parent_path not like '%_encrypted%' and ("  # and parent_path not like '%_damaged/%' 임시
 
         for i in range(0, len(self._plugins)):
-            if self._plugins[i].plugin_name == 'HWP':
-                query += " LOWER(extension) = 'hwp' "
-                hwp_plugin = self._plugins[i]
-            elif self._plugins[i].plugin_name == 'DOC':
-                query += " LOWER(extension) = 'doc' "
-                doc_plugin = self._plugins[i]
-            elif self._plugins[i].plugin_name == 'PPT':
-                query += " LOWER(extension) = 'ppt' "
-                ppt_plugin = self._plugins[i]
-            elif self._plugins[i].plugin_name == 'XLS':
-                query += " LOWER(extension) = 'xls' "
-                xls_plugin = self._plugins[i]
-            elif self._plugins[i].plugin_name == 'DOCX':
-                query += " LOWER(extension) = 'docx' "
-                docx_plugin = self._plugins[i]
-            elif self._plugins[i].plugin_name == 'PPTX':
-                query += " LOWER(extension) = 'pptx' "
-                pptx_plugin = self._plugins[i]
-            elif self._plugins[i].plugin_name == 'XLSX':
-                query += " LOWER(extension) = 'xlsx' "
-                xlsx_plugin = self._plugins[i]
-            elif self._plugins[i].plugin_name == 'PDF':
-                query += " LOWER(extension) = 'pdf' "
-                pdf_plugin = self._plugins[i]
+            if self._plugins[i].plugin_name in ('HWP', 'DOC', 'PPT', 'XLS', 'DOCX', 'PPTX', 'XLSX', 'PDF'):
+                extension = self._plugins[i].plugin_name.lower()
+                query += f" LOWER(extension) = '{extension}' "
+                plugins[extension] = self._plugins[i]
 
             if i == len(self._plugins) - 1:
                 query += ");"
@@ -87,145 +480,25 @@ class DEFAConnector(interface.ModuleConnector):
         if not os.path.exists(conf_file):
             raise Exception('%s file does not exist.\n' % conf_file)
         config.read(conf_file)
-        _host = config.get('elasticsearch', 'host')
-        _port = config.getint('elasticsearch', 'port')
         _index_name = config.get('document', 'index')
         _type_name = config.get('document', 'type')
-        es = Elasticsearch(hosts=_host, port=_port)
-
-        for document in document_files:
-            document_path = document[1][document[1].find('/'):] + '/' + document[0]  # document full path
-            #document_path = "/Users/Woosung/AppData/Local/Mendeley Ltd/Mendeley Desktop/Downloaded/Choi, Lee, Sohn - 2017 - Analyzing research trends in personal information privacy using topic modeling(2).pdf"
-            print("\ndocument_path : " + document_path)
-
-            """ # 이 주석은 메모리로 사용
-            #################### load가 느려서 임시로 추가 ######################
-            sig_type = document[2].lower()
-            extension = document[3].lower()
-            result = None
-            # 에러가 많아서 임시처리로 sig_type, extension이 같아야 동작하게 처리
-            if sig_type != extension:
-                continue
-            #################### load가 느려서 임시로 추가 ######################
-
-            print("loading time : " + str(datetime.now()))
-            file_object = self.LoadTargetFileToMemory(
-                source_path_spec=source_path_spec,
-                configuration=configuration,
-                file_path=document_path)
-            print("load time : " + str(datetime.now()))
-
-            if not file_object:
-                continue
-            
-            sig_type = document[2].lower()
-            extension = document[3].lower()
-            result = None
-            # 에러가 많아서 임시처리로 sig_type, extension이 같아야 동작하게 처리
-            if sig_type == 'hwp' and extension == 'hwp':
-                result = hwp_plugin.Process(fp=file_object)
-            elif sig_type == 'doc' and extension == 'doc':
-                result = doc_plugin.Process(fp=file_object)
-            elif sig_type == 'ppt' and extension == 'ppt':
-                result = ppt_plugin.Process(fp=file_object)
-            elif sig_type == 'xls' and extension == 'xls':
-                result = xls_plugin.Process(fp=file_object)
-            elif sig_type == 'docx' and extension == 'docx':
-                result = docx_plugin.Process(fp=file_object)
-            elif sig_type == 'pptx' and extension == 'pptx':
-                result = pptx_plugin.Process(fp=file_object)
-            elif sig_type == 'xlsx' and extension == 'xlsx':
-                result = xlsx_plugin.Process(fp=file_object)
-            elif sig_type == 'pdf' and extension == 'pdf':
-                try:
-                    result = pdf_plugin.Process(fp=file_object)
-                except Exception:
-                    file_object.close()
-                    continue
-            else:
-                print("unknown sig_type")
-                file_object.close()
-                continue
+        _bulk_chunk_size = config.getint('document', 'bulk_chunk_size', fallback=500)
+        _timeout = config.getint('document', 'timeout', fallback=600)
+        _memory_limit = config.getint('document', 'memory_limit', fallback=2048)
+        _jsonl_path = config.get('document', 'jsonl_path', fallback='')
 
-            if result == None:
-                file_object.close()
-                continue
+        actions = self._ProcessDocuments(
+            configuration, source_path_spec, par_id, document_files, plugins, _index_name, _type_name,
+            _timeout, _memory_limit)
 
+        if _jsonl_path:
+            number_of_actions = _WriteJSONLines(_jsonl_path, actions)
+        else:
+            _host = config.get('elasticsearch', 'host')
+            _port = config.getint('elasticsearch', 'port')
+            es = Elasticsearch(hosts=_host, port=_port)
+            number_of_actions = _IndexDocuments(es, actions, _bulk_chunk_size)
 
-            result.case_id = configuration.case_id
-            result.evdnc_id = configuration.evidence_id
-            result.name = document[0]
-            result.path_with_ext = document_path
-            result.original_size = file_object._size
-
-            file_object.close()
-            """
-            output_path = configuration.root_tmp_path + os.sep + configuration.case_id + os.sep + \
-                            configuration.evidence_id + os.sep + par_id + os.sep + document_path.replace(os.sep, '~#')
-            ole_path = output_path + os.sep + "ole"
-
-            if not os.path.exists(output_path):
-                os.makedirs(output_path)
-                os.makedirs(ole_path)
-
-            self.ExtractTargetFileToPath(
-                source_path_spec=source_path_spec,
-                configuration=configuration,
-                file_path=document_path,
-                output_path=output_path)
-
-            file_path = output_path + os.sep + document[0]
-            extension = document[3].lower()
-
-            if extension == 'hwp':
-                result = hwp_plugin.Process(fp=file_path, ole_path=ole_path)
-            elif extension == 'doc':
-                result = doc_plugin.Process(fp=file_path, ole_path=ole_path)
-            elif extension == 'ppt':
-                result = ppt_plugin.Process(fp=file_path, ole_path=ole_path)
-            elif extension == 'xls':
-                result = xls_plugin.Process(fp=file_path, ole_path=ole_path)
-            elif extension == 'docx':
-                result = docx_plugin.Process(fp=file_path, ole_path=ole_path)
-            elif extension == 'pptx':
-                result = pptx_plugin.Process(fp=file_path, ole_path=ole_path)
-            elif extension == 'xlsx':
-                result = xlsx_plugin.Process(fp=file_path, ole_path=ole_path)
-            elif extension == 'pdf':
-                try:
-                    result = pdf_plugin.Process(fp=file_path, ole_path=ole_path)
-                except Exception:
-                    continue
-
-            result.case_id = configuration.case_id
-            result.evdnc_id = configuration.evidence_id
-            result.download_path = file_path
-            result.full_path = document_path  # 이미지 내 full_path
-            result.path_with_ext = document_path  # 이미지 내 full_path
-            result.parent_full_path = document_path[:document_path.rfind('/')]
-            result.name = document[0]
-            result.original_size = os.path.getsize(file_path)
-            result.ole_path = ole_path
-            print(result.__dict__)
-
-            try:
-                es.index(index=_index_name, doc_type=_type_name, body=result.__dict__)
-            except Exception as e:
-                print(f"Error : {str(e)}")
-                continue
-
-            """
-            jsonobject = {
-                '_index': index_name,
-                '_type': type_name,
-                '_source': result.__dict__
-            }
-            actions = [jsonobject]
-            try:
-                helpers.bulk(es, actions, chunk_size=1000, request_timeout=200)
-            except Exception as e:
-                print(f"Error : {str(e)}")
-                continue
-            """
+        print(f'[DEFA] {number_of_actions} documents indexed')
 
-manager.ModulesManager.RegisterModule(DEFAConnector)
\ No newline at end of file
+manager.ModulesManager.RegisterModule(DEFAConnector)
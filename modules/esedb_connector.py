@@ -16,6 +16,11 @@ class ESEDatabaseConnector(interface.ModuleConnector):
 	NAME = 'esedb_connector'
 	DESCRIPTION = 'Module for esedb'
 	TABLE_NAME = 'lv1_os_win_esedb'
+	PRODUCED_TABLES = [
+		'lv1_os_win_esedb_ie_content',
+		'lv1_os_win_esedb_ie_cookies',
+		'lv1_os_win_esedb_ie_download',
+		'lv1_os_win_esedb_ie_history']
 
 	_plugin_classes = {}
 
@@ -1,11 +1,16 @@
 # -*- coding: utf-8 -*-
 """module for Eventlog."""
 import os
+
+from concurrent import futures
+
 from modules import manager
 from modules import interface
 from modules import logger
 
 from dfvfs.lib import definitions as dfvfs_definitions
+from modules.Eventlog import evtx_cache
+from modules.Eventlog import evtx_store
 from modules.Eventlog import lv1_os_win_evt_total as et
 from modules.Eventlog import lv1_os_win_event_logs_usb_devices as ud
 from modules.Eventlog import lv1_os_win_event_logs_antiforensics as af
@@ -33,6 +38,13 @@ class EventlogConnector(interface.ModuleConnector):
 
     NAME = 'eventlog_connector'
     DESCRIPTION = 'Module for Eventlog'
+    PRODUCED_TABLES = [
+        'lv1_os_win_evt_total',
+        'lv1_os_win_evt_data',
+        'lv1_os_win_event_logs_*']
+
+    # Number of lv1_os_win_evt_total and lv1_os_win_evt_data rows inserted at once.
+    _BATCH_SIZE = 10000
 
     _plugin_classes = {}
 
@@ -44,9 +56,10 @@ class EventlogConnector(interface.ModuleConnector):
             this_file_path = os.path.dirname(
                 os.path.abspath(__file__)) + os.sep + 'schema' + os.sep + 'eventlog' + os.sep
             # Total yaml 파일 리스트
-            total_yaml_list = [this_file_path + 'lv1_os_win_evt_total.yaml']
+            total_yaml_list = [this_file_path + 'lv1_os_win_evt_total.yaml',
+                               this_file_path + 'lv1_os_win_evt_data.yaml']
             # Total 테이블 리스트
-            total_table_list = ['lv1_os_win_evt_total']
+            total_table_list = ['lv1_os_win_evt_total', 'lv1_os_win_evt_data']
 
             if not self.check_table_from_yaml(configuration, total_yaml_list, total_table_list):
                 return False
@@ -109,9 +122,9 @@ class EventlogConnector(interface.ModuleConnector):
             if par_id == None:
                 return False
 
-            query = f"SELECT name, parent_path, extension FROM file_info WHERE (par_id='{par_id}') " \
-                    f"and extension = 'evtx' and parent_path = 'root/Windows/System32/winevt/Logs'"
-            eventlog_files = configuration.cursor.execute_query_mul(query)
+            eventlog_files = self.LocateFiles(
+                configuration, par_id, parent_path='root/Windows/System32/winevt/Logs', extension='evtx',
+                columns=['name', 'parent_path', 'extension', 'file_id'])
 
             if len(eventlog_files) == 0:
                 return False
@@ -133,40 +146,77 @@ class EventlogConnector(interface.ModuleConnector):
                                   'Microsoft-Windows-DateTimeControlPanel%4Operational.evtx',
                                   'Microsoft-Windows-Partition%4Diagnostic.evtx',
                                   'Microsoft-Windows-Storage-ClassPnP%4Operational.evtx']
+            number_of_workers = self._GetNumberOfWorkers(configuration)
+            query = "Insert into lv1_os_win_evt_total values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
             insert_data = []
-
-            for eventlog in eventlog_files:
-                if eventlog[0] in eventlog_file_list:
-                    eventlog_path = eventlog[1][eventlog[1].find('/'):] + '/' + eventlog[0]  # document full path
-                    fileExt = eventlog[2]
-                    fileName = eventlog[0]
-
-                    output_path = configuration.root_tmp_path + os.sep + configuration.case_id + os.sep + \
-                                  configuration.evidence_id + os.sep + par_id
-
-                    self.ExtractTargetFileToPath(
-                        source_path_spec=source_path_spec,
-                        configuration=configuration,
-                        file_path=eventlog_path,
-                        output_path=output_path)
-
-                    fn = output_path + os.path.sep + fileName
-                    # Eventlog Total
-                    print('[MODULE]: Eventlog - Total - ' + fn.split('/')[-1])
-                    for eventlog in et.EventlogTotal(fn):
-                        insert_data.append(tuple(
-                            [par_id, configuration.case_id, configuration.evidence_id, str(eventlog.event_id),
-                             str(eventlog.time_created), str(eventlog.source), str(eventlog.data), str(eventlog.user_sid)]))
-            query = "Insert into lv1_os_win_evt_total values (%s, %s, %s, %s, %s, %s, %s, %s);"
+            data_query = "Insert into lv1_os_win_evt_data values (%s, %s, %s, %s, %s, %s, %s);"
+            insert_event_data = []
+
+            # Logs and chunks parsed in an earlier run are read from the cache.
+            cache = evtx_cache.EvtxCache(
+                os.path.join(configuration.root_tmp_path, 'cache', 'evtx_cache.db'))
+            cache.Open()
+            # One pool parses the chunks of every log of the partition.
+            executor = None
+            if number_of_workers > 1:
+                executor = futures.ProcessPoolExecutor(max_workers=number_of_workers)
+            try:
+                for eventlog in eventlog_files:
+                    if eventlog[0] in eventlog_file_list:
+                        eventlog_path = eventlog[1][eventlog[1].find('/'):] + '/' + eventlog[0]  # document full path
+                        fileExt = eventlog[2]
+                        fileName = eventlog[0]
+
+                        output_path = configuration.root_tmp_path + os.sep + configuration.case_id + os.sep + \
+                                      configuration.evidence_id + os.sep + par_id
+
+                        self.ExtractTargetFileToPath(
+                            source_path_spec=source_path_spec,
+                            configuration=configuration,
+                            file_path=eventlog_path,
+                            output_path=output_path,
+                            inode=eventlog[3])
+
+                        fn = output_path + os.path.sep + fileName
+                        # Eventlog Total
+                        print('[MODULE]: Eventlog - Total - ' + fn.split('/')[-1])
+                        channel = evtx_store.GetChannel(fileName)
+                        for eventlog in et.EventlogTotal(fn, cache, executor, number_of_workers):
+                            insert_data.append(tuple(
+                                [par_id, configuration.case_id, configuration.evidence_id,
+                                 evtx_store.GetEventId(eventlog.event_id), str(eventlog.time_created),
+                                 str(eventlog.source), str(eventlog.data), str(eventlog.user_sid), channel,
+                                 eventlog.event_record_id]))
+                            for name, value in eventlog.event_data:
+                                insert_event_data.append(tuple(
+                                    [par_id, configuration.case_id, configuration.evidence_id, channel,
+                                     eventlog.event_record_id, name, value]))
+                            if len(insert_data) >= self._BATCH_SIZE:
+                                configuration.cursor.bulk_execute(query, insert_data)
+                                insert_data = []
+                            if len(insert_event_data) >= self._BATCH_SIZE:
+                                configuration.cursor.bulk_execute(data_query, insert_event_data)
+                                insert_event_data = []
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+                cache.Close()
             if len(insert_data) > 0:
                 configuration.cursor.bulk_execute(query, insert_data)
+            if len(insert_event_data) > 0:
+                configuration.cursor.bulk_execute(data_query, insert_event_data)
+
+            # The events of all classifiers are read in one query over the indexed event identifiers.
+            events = evtx_store.DispatchEvents(configuration, par_id, {
+                module: module.EVENTS for module in (
+                    ud, af, app, dn, fh, logon, ms, msi, nt, ot, pc, pr, pro, reg, rem, ss, sf, sle, ts, tele, tc)})
 
 
 
             #EVENTLOGUSBDEVICES
             print('[MODULE]: Eventlog - EVENTLOGUSBDEVICES')
             insert_data = []
-            for usb in ud.EVENTLOGUSBDEVICES(configuration):
+            for usb in ud.EVENTLOGUSBDEVICES(configuration, events[ud]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(usb.task), str(usb.time),
                      str(usb.device_instance_id), str(usb.description), str(usb.manufacturer), str(usb.model),
@@ -179,7 +229,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGANTIFORENSICS
             print('[MODULE]: Eventlog - EVENTLOGANTIFORENSICS')
             insert_data = []
-            for antiforensics in af.EVENTLOGANTIFORENSICS(configuration):
+            for antiforensics in af.EVENTLOGANTIFORENSICS(configuration, events[af]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(antiforensics.task), str(antiforensics.time), str(antiforensics.user_sid), str(antiforensics.event_id), str(antiforensics.source), str(antiforensics.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_antiforensics values (%s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -189,7 +239,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGAPPLICATIONS
             print('[MODULE]: Eventlog - EVENTLOGAPPLICATIONS')
             insert_data = []
-            for applications in app.EVENTLOGAPPLICATIONS(configuration):
+            for applications in app.EVENTLOGAPPLICATIONS(configuration, events[app]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(applications.task), str(applications.time), str(applications.application_name), str(applications.path), str(applications.resolver_name), str(applications.user_sid), str(applications.event_id), str(applications.source), str(applications.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_applications values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -199,7 +249,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGDNS
             print('[MODULE]: Eventlog - EVENTLOGDNS')
             insert_data = []
-            for dns in dn.EVENTLOGDNS(configuration):
+            for dns in dn.EVENTLOGDNS(configuration, events[dn]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(dns.task), str(dns.time), str(dns.query_name), str(dns.user_sid), str(dns.event_id), str(dns.source), str(dns.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_dns values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -209,7 +259,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGFILEHANDLING
             print('[MODULE]: Eventlog - EVENTLOGFILEHANDLING')
             insert_data = []
-            for file_handling in fh.EVENTLOGFILEHANDLING(configuration):
+            for file_handling in fh.EVENTLOGFILEHANDLING(configuration, events[fh]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(file_handling.task), str(file_handling.time), str(file_handling.file_name), str(file_handling.user_sid), str(file_handling.event_id), str(file_handling.source), str(file_handling.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_file_handling values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -219,7 +269,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGONOFF
             print('[MODULE]: Eventlog - EVENTLOGONOFF')
             insert_data = []
-            for event in logon.EVENTLOGONOFF(configuration):
+            for event in logon.EVENTLOGONOFF(configuration, events[logon]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(event.task), str(event.time), str(event.user_sid), str(event.event_id), str(event.source), str(event.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_logonoff values (%s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -229,7 +279,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGMSALERTS
             print('[MODULE]: Eventlog - EVENTLOGMSALERTS')
             insert_data = []
-            for ms_alerts in ms.EVENTLOGMSALERTS(configuration):
+            for ms_alerts in ms.EVENTLOGMSALERTS(configuration, events[ms]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(ms_alerts.task), str(ms_alerts.time), str(ms_alerts.program_name), str(ms_alerts.message), str(ms_alerts.error_type), str(ms_alerts.program_version), str(ms_alerts.user_sid), str(ms_alerts.event_id), str(ms_alerts.source), str(ms_alerts.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_ms_alerts values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -239,7 +289,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGMSIINSTALLER
             print('[MODULE]: Eventlog - EVENTLOGMSIINSTALLER')
             insert_data = []
-            for msi_installer in msi.EVENTLOGMSIINSTALLER(configuration):
+            for msi_installer in msi.EVENTLOGMSIINSTALLER(configuration, events[msi]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(msi_installer.task), str(msi_installer.time), str(msi_installer.product_name), str(msi_installer.product_version), str(msi_installer.manufacturer), str(msi_installer.user_sid), str(msi_installer.event_id), str(msi_installer.source), str(msi_installer.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_msi_installer values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -249,7 +299,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGNETWORK
             print('[MODULE]: Eventlog - EVENTLOGNETWORK')
             insert_data = []
-            for network in nt.EVENTLOGNETWORK(configuration):
+            for network in nt.EVENTLOGNETWORK(configuration, events[nt]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(network.task), str(network.time), str(network.network_name), str(network.description), str(network.category), str(network.user_sid), str(network.event_id), str(network.source), str(network.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_network values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -259,7 +309,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGOTHERS
             print('[MODULE]: Eventlog - EVENTLOGOTHERS')
             insert_data = []
-            for others in ot.EVENTLOGOTHERS(configuration):
+            for others in ot.EVENTLOGOTHERS(configuration, events[ot]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(others.task), str(others.time), str(others.name), str(others.user_sid), str(others.event_id), str(others.source), str(others.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_others values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -269,7 +319,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGPCONOFF
             print('[MODULE]: Eventlog - EVENTLOGPCONOFF')
             insert_data = []
-            for event in pc.EVENTLOGPCONOFF(configuration):
+            for event in pc.EVENTLOGPCONOFF(configuration, events[pc]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(event.task), str(event.time), str(event.user_sid), str(event.event_id), str(event.source), str(event.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_pconoff values (%s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -279,7 +329,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGPRINTER
             print('[MODULE]: Eventlog - EVENTLOGPRINTER')
             insert_data = []
-            for printer in pr.EVENTLOGPRINTER(configuration):
+            for printer in pr.EVENTLOGPRINTER(configuration, events[pr]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(printer.task), str(printer.time), str(printer.location), str(printer.size), str(printer.pages), str(printer.user_sid), str(printer.event_id), str(printer.source), str(printer.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_printer values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -289,7 +339,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGPROCESS
             print('[MODULE]: Eventlog - EVENTLOGPROCESS')
             insert_data = []
-            for process in pro.EVENTLOGPROCESS(configuration):
+            for process in pro.EVENTLOGPROCESS(configuration, events[pro]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(process.task), str(process.time), str(process.process_name), str(process.user_sid), str(process.event_id), str(process.source), str(process.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_process values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -299,7 +349,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGREGISTRYHANDLING
             print('[MODULE]: Eventlog - EVENTLOGREGISTRYHANDLING')
             insert_data = []
-            for registry in reg.EVENTLOGREGISTRYHANDLING(configuration):
+            for registry in reg.EVENTLOGREGISTRYHANDLING(configuration, events[reg]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(registry.task), str(registry.time), str(registry.registry_path), str(registry.registry_value_name), str(registry.old_value), str(registry.new_value), str(registry.user_sid), str(registry.event_id), str(registry.source), str(registry.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_registry_handling values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -309,7 +359,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGREMOTEONOFF
             print('[MODULE]: Eventlog - EVENTLOGREMOTEONOFF')
             insert_data = []
-            for remote in rem.EVENTLOGREMOTEONOFF(configuration):
+            for remote in rem.EVENTLOGREMOTEONOFF(configuration, events[rem]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(remote.task), str(remote.time), str(remote.connection), str(remote.address), str(remote.user_sid), str(remote.event_id), str(remote.source), str(remote.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_remoteonoff values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -319,7 +369,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGSCREENSAVER
             print('[MODULE]: Eventlog - EVENTLOGSCREENSAVER')
             insert_data = []
-            for screen_saver in ss.EVENTLOGSCREENSAVER(configuration):
+            for screen_saver in ss.EVENTLOGSCREENSAVER(configuration, events[ss]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(screen_saver.task), str(screen_saver.time), str(screen_saver.user_sid), str(screen_saver.event_id), str(screen_saver.source), str(screen_saver.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_screen_saver values (%s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -329,7 +379,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGSHAREDFOLDER
             print('[MODULE]: Eventlog - EVENTLOGSHAREDFOLDER')
             insert_data = []
-            for shared_folder in sf.EVENTLOGSHAREDFOLDER(configuration):
+            for shared_folder in sf.EVENTLOGSHAREDFOLDER(configuration, events[sf]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(shared_folder.task), str(shared_folder.time), str(shared_folder.user_sid), str(shared_folder.event_id), str(shared_folder.source), str(shared_folder.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_shared_folder values (%s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -339,7 +389,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGSLEEPONOFF
             print('[MODULE]: Eventlog - EVENTLOGSLEEPONOFF')
             insert_data = []
-            for sleep in sle.EVENTLOGSLEEPONOFF(configuration):
+            for sleep in sle.EVENTLOGSLEEPONOFF(configuration, events[sle]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(sleep.task), str(sleep.time_sleep), str(sleep.time_wake), str(sleep.user_sid), str(sleep.event_id), str(sleep.source), str(sleep.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_sleeponoff values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -349,7 +399,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGTASKSCHEDULER
             print('[MODULE]: Eventlog - EVENTLOGTASKSCHEDULER')
             insert_data = []
-            for task_scheduler in ts.EVENTLOGTASKSCHEDULER(configuration):
+            for task_scheduler in ts.EVENTLOGTASKSCHEDULER(configuration, events[ts]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(task_scheduler.task), str(task_scheduler.time), str(task_scheduler.action_name), str(task_scheduler.user_sid), str(task_scheduler.event_id), str(task_scheduler.source), str(task_scheduler.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_task_scheduler values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -359,7 +409,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGTELEMETRY
             print('[MODULE]: Eventlog - EVENTLOGTELEMETRY')
             insert_data = []
-            for telemetry in tele.EVENTLOGTELEMETRY(configuration):
+            for telemetry in tele.EVENTLOGTELEMETRY(configuration, events[tele]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(telemetry.task), str(telemetry.time), str(telemetry.program_name), str(telemetry.program_path), str(telemetry.user_sid), str(telemetry.event_id), str(telemetry.source), str(telemetry.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_telemetry values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -369,7 +419,7 @@ class EventlogConnector(interface.ModuleConnector):
             #EVENTLOGTIMECHANGED
             print('[MODULE]: Eventlog - EVENTLOGTIMECHANGED')
             insert_data = []
-            for time in tc.EVENTLOGTIMECHANGED(configuration):
+            for time in tc.EVENTLOGTIMECHANGED(configuration, events[tc]):
                 insert_data.append(tuple(
                     [par_id, configuration.case_id, configuration.evidence_id, str(time.task), str(time.time_old), str(time.time_new), str(time.user_sid), str(time.event_id), str(time.source), str(time.event_id_description)]))
             query = "Insert into lv1_os_win_event_logs_time_changed values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
@@ -16,6 +16,10 @@ class FileHistoryConnector(interface.ModuleConnector):
 	NAME = 'filehistory_connector'
 	DESCRIPTION = 'Module for FileHistory'
 	TABLE_NAME = 'lv1_os_win_filehistory'
+	PRODUCED_TABLES = [
+		'lv1_os_win_filehistory_file',
+		'lv1_os_win_filehistory_namespace',
+		'lv1_os_win_filehistory_string']
 
 	_plugin_classes = {}
 
@@ -9,6 +9,7 @@ from dfvfs.lib import definitions as dfvfs_definitions
 class IconCacheConnector(interface.ModuleConnector):
     NAME = 'iconcache_connector'
     DESCRIPTION = 'Module for iconcache_connector'
+    PRODUCED_TABLES = ['lv1_os_win_icon_cache']
 
     _plugin_classes = {}
 
@@ -3,12 +3,15 @@
 import os
 import abc
 import yaml
+import collections
 
 from dfvfs.helpers import file_system_searcher
 from dfvfs.resolver import resolver as path_spec_resolver
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.lib import errors as dfvfs_errors
+from dfvfs.path import factory as path_spec_factory
 
+from engine import file_object_io
 from engine import path_extractors
 from engine import path_helper
 from modules import logger
@@ -18,6 +21,11 @@ class BaseConnector(object):
     NAME = 'base_connector'
     DESCRIPTION = ''
 
+    # Database tables written and read by the module. The engine orders the
+    # modules by these, see engine/module_graph.py.
+    PRODUCED_TABLES = []
+    CONSUMED_TABLES = []
+
     _plugin_classes = None
 
     def __init__(self):
@@ -143,6 +151,18 @@ class BaseConnector(object):
 
 class ModuleConnector(BaseConnector):
 
+    # Columns of file_info retrieved by LocateFiles.
+    _LOCATE_COLUMNS = ['name', 'parent_path', 'extension']
+
+    # File systems of which files can be opened by location or inode without
+    # searching the file system.
+    _DIRECT_OPEN_TYPE_INDICATORS = frozenset([dfvfs_definitions.TYPE_INDICATOR_TSK])
+
+    # Path specifications of target paths per partition, shared by the module
+    # connectors of a process and evicted least recently used first.
+    _PATH_SPEC_CACHE_SIZE = 4096
+    _path_spec_cache = collections.OrderedDict()
+
     def __init__(self):
         super(ModuleConnector, self).__init__()
         self._path_spec_extractor = path_extractors.PathSpecExtractor()
@@ -211,27 +231,151 @@ class ModuleConnector(BaseConnector):
 
         return find_specs
 
+    def _GetNumberOfWorkers(self, configuration):
+        """Retrieves the number of worker processes the module can use.
 
-    def LoadTargetFileToMemory(self, source_path_spec, configuration,
-                               file_path = None, file_spec = None, data_stream_name = None):
+        In a worker process of the module scheduler this is the share of the
+        workers per module task, otherwise every CPU can be used.
 
-        try:
-            if not file_spec:
-                find_spec = file_system_searcher.FindSpec(
-                    case_sensitive=False, location=file_path,
-                    location_separator='/')
-            else:
-                find_spec = file_spec
-        except ValueError as exception:
-            logger.error(
-                'Unable to build find specification for path: "{0:s}" with '
-                'error: {1!s}'.format(file_path, exception))
+        Args:
+            configuration (Configuration): configuration values.
 
-        path_spec_generator = self._path_spec_extractor.ExtractPathSpecs(
-            [source_path_spec], find_specs=[find_spec], recurse_file_system=False,
-            resolver_context=configuration.resolver_context)
+        Returns:
+            int: number of worker processes.
+        """
+        return configuration.number_of_workers or os.cpu_count() or 1
+
+    def LocateFiles(self, configuration, par_id, paths=None, parent_path=None, names=None,
+                    extension=None, parent_path_pattern=None, columns=None):
+        """Locates files in the file_info catalog.
+
+        The conditions are combined with AND. Lookups by paths seek the
+        (par_id, normalized_path) index, by parent path the
+        (par_id, parent_path, name) index and by extension the
+        (par_id, extension) index.
+
+        Args:
+          configuration (Configuration): configuration values.
+          par_id (str): partition identifier.
+          paths (Optional[list[str]]): full paths, such as
+              "/Windows/System32/config/SYSTEM", compared case-insensitively.
+          parent_path (Optional[str]): parent path, such as "root/Windows/Prefetch".
+          names (Optional[list[str]]): file names.
+          extension (Optional[str]): extension without the leading dot.
+          parent_path_pattern (Optional[str]): SQL LIKE pattern of the parent path.
+          columns (Optional[list[str]]): file_info columns to retrieve, the default
+              is name, parent_path and extension.
 
-        for path_spec in path_spec_generator:
+        Returns:
+          list[tuple]: column values per file.
+        """
+        conditions = ['par_id = %s']
+        values = [par_id]
+
+        if paths:
+            conditions.append('normalized_path in ({0:s})'.format(', '.join(['%s'] * len(paths))))
+            values.extend([path_helper.PathHelper.GetNormalizedPath(path) for path in paths])
+        if parent_path:
+            conditions.append('parent_path = %s')
+            values.append(parent_path)
+        if names:
+            conditions.append('name in ({0:s})'.format(', '.join(['%s'] * len(names))))
+            values.extend(names)
+        if extension:
+            conditions.append('extension = %s')
+            values.append(extension)
+        if parent_path_pattern:
+            conditions.append('parent_path like %s')
+            values.append(parent_path_pattern)
+
+        query = 'SELECT {0:s} FROM file_info WHERE {1:s}'.format(
+            ', '.join(columns or self._LOCATE_COLUMNS), ' and '.join(conditions))
+
+        files = configuration.cursor.execute_query_mul(query, values)
+        if files == -1:
+            return []
+        return files
+
+    def _GetPathSpecs(self, source_path_spec, configuration, file_path=None, file_spec=None, inode=None):
+        """Retrieves the path specifications of a target file or directory.
+
+        A file with a known inode, such as the file_id of file_info, is opened
+        directly. An exact path is opened by location and cached per partition,
+        only find specifications, and paths the file system cannot open by
+        location, search the file system.
+
+        Args:
+          source_path_spec (dfvfs.PathSpec): path specification of the partition.
+          configuration (Configuration): configuration values.
+          file_path (Optional[str]): path of the target, with "/" as separator.
+          file_spec (Optional[dfvfs.FindSpec]): find specification of the target.
+          inode (Optional[int]): inode or MFT entry number of the target.
+
+        Returns:
+          list[dfvfs.PathSpec]: path specifications of the target.
+        """
+        direct_open = (
+            not file_spec and source_path_spec.type_indicator in self._DIRECT_OPEN_TYPE_INDICATORS)
+
+        if direct_open and inode is not None:
+            path_spec_arguments = {'inode': inode, 'parent': source_path_spec.parent}
+            if file_path:
+                path_spec_arguments['location'] = file_path
+            return [path_spec_factory.Factory.NewPathSpec(
+                source_path_spec.type_indicator, **path_spec_arguments)]
+
+        cache_key = None
+        if not file_spec and file_path:
+            # TSK also opens case-sensitive file systems, such as ext, so the
+            # case of the path is kept.
+            cache_key = (source_path_spec.comparable, file_path)
+            path_specs = self._path_spec_cache.get(cache_key, None)
+            if path_specs is not None:
+                self._path_spec_cache.move_to_end(cache_key)
+                return path_specs
+
+        path_specs = []
+        if direct_open and file_path:
+            path_spec = path_spec_factory.Factory.NewPathSpec(
+                source_path_spec.type_indicator, location=file_path, parent=source_path_spec.parent)
+            try:
+                file_entry = path_spec_resolver.Resolver.OpenFileEntry(
+                    path_spec, resolver_context=configuration.resolver_context)
+            except dfvfs_errors.BackEndError:
+                file_entry = None
+            if file_entry is not None:
+                path_specs.append(path_spec)
+
+        if not path_specs:
+            try:
+                if not file_spec:
+                    find_spec = file_system_searcher.FindSpec(
+                        case_sensitive=False, location=file_path,
+                        location_separator='/')
+                else:
+                    find_spec = file_spec
+            except ValueError as exception:
+                logger.error(
+                    'Unable to build find specification for path: "{0:s}" with '
+                    'error: {1!s}'.format(file_path, exception))
+                return []
+
+            path_specs = list(self._path_spec_extractor.ExtractPathSpecs(
+                [source_path_spec], find_specs=[find_spec], recurse_file_system=False,
+                resolver_context=configuration.resolver_context))
+
+        if cache_key:
+            self._path_spec_cache[cache_key] = path_specs
+            if len(self._path_spec_cache) > self._PATH_SPEC_CACHE_SIZE:
+                self._path_spec_cache.popitem(last=False)
+
+        return path_specs
+
+    def LoadTargetFileToMemory(self, source_path_spec, configuration,
+                               file_path = None, file_spec = None, data_stream_name = None, inode = None):
+
+        for path_spec in self._GetPathSpecs(
+                source_path_spec, configuration, file_path=file_path, file_spec=file_spec, inode=inode):
             display_name = path_helper.PathHelper.GetDisplayNameForPathSpec(path_spec)
 
             try:
@@ -265,27 +409,43 @@ class ModuleConnector(BaseConnector):
                 return False
 
 
-    def ExtractTargetFileToPath(self, source_path_spec, configuration,
-                                file_path = None, file_spec=None, output_path=None,  data_stream_name = None):
-        #TODO: find_spec 있을 경우 처리 해야함. Load참조
-
-        try:
-            if not file_spec:
-                find_spec = file_system_searcher.FindSpec(
-                    case_sensitive=False, location=file_path,
-                    location_separator='/')
-            else:
-                find_spec = file_spec
-        except ValueError as exception:
-            logger.error(
-                'Unable to build find specification for path: "{0:s}" with '
-                'error: {1!s}'.format(file_path, exception))
+    def OpenTargetFile(self, source_path_spec, configuration, file_path=None, file_spec=None,
+                       data_stream_name=None, inode=None,
+                       read_ahead_size=file_object_io.DEFAULT_READ_AHEAD_SIZE):
+        """Opens a target file for parsing in place.
+
+        The file is read directly from the source through a buffered, seekable
+        file object, instead of being extracted to the temporary directory
+        first. Use ExtractTargetFileToPath only for parsers that require a path.
+
+        Args:
+          source_path_spec (dfvfs.PathSpec): path specification of the partition.
+          configuration (Configuration): configuration values.
+          file_path (Optional[str]): path of the target, with "/" as separator.
+          file_spec (Optional[dfvfs.FindSpec]): find specification of the target.
+          data_stream_name (Optional[str]): name of the data stream.
+          inode (Optional[int]): inode or MFT entry number of the target.
+          read_ahead_size (Optional[int]): size of the read-ahead buffer.
 
-        path_spec_generator = self._path_spec_extractor.ExtractPathSpecs(
-            [source_path_spec], find_specs=[find_spec], recurse_file_system=False,
-            resolver_context=configuration.resolver_context)
+        Returns:
+          io.BufferedReader: file object or None if the file cannot be opened.
+        """
+        file_object = self.LoadTargetFileToMemory(
+            source_path_spec, configuration, file_path=file_path, file_spec=file_spec,
+            data_stream_name=data_stream_name, inode=inode)
+        if not file_object:
+            return None
+
+        return file_object_io.OpenFileObject(file_object, read_ahead_size=read_ahead_size)
 
-        for path_spec in path_spec_generator:
+    def ExtractTargetFileToPath(self, source_path_spec, configuration,
+                                file_path = None, file_spec=None, output_path=None,  data_stream_name = None,
+                                inode = None):
+        """Extracts a target file to the output path, for parsers that require
+        a path, see OpenTargetFile otherwise."""
+
+        for path_spec in self._GetPathSpecs(
+                source_path_spec, configuration, file_path=file_path, file_spec=file_spec, inode=inode):
             display_name = path_helper.PathHelper.GetDisplayNameForPathSpec(path_spec)
             try:
                 file_entry = path_spec_resolver.Resolver.OpenFileEntry(
@@ -358,30 +518,13 @@ class ModuleConnector(BaseConnector):
                 dir_path:
                 output_path:
         """
-        try:
-            if not file_spec:
-                find_spec = file_system_searcher.FindSpec(
-                    case_sensitive=False, location=dir_path,
-                    location_separator='/')
-            else:
-                find_spec = file_spec
-
-        except ValueError as exception:
-            logger.error(
-                'Unable to build find specification for path: "{0:s}" with '
-                'error: {1!s}'.format(dir_path, exception))
-
-        path_spec_generator = self._path_spec_extractor.ExtractPathSpecs(
-            [source_path_spec], find_specs=[find_spec], recurse_file_system=False,
-            resolver_context=configuration.resolver_context)
-
-        for path_spec in path_spec_generator:
+        for path_spec in self._GetPathSpecs(
+                source_path_spec, configuration, file_path=dir_path, file_spec=file_spec):
             self.DirectoryTraversal(path_spec, output_path)
 
     def DirectoryTraversal(self, path_spec, output_path):
 
-        if not os.path.exists(output_path):
-            os.mkdir(output_path)
+        os.makedirs(output_path, exist_ok=True)
 
         _path_specs = []
         _path_specs.append(path_spec)
@@ -399,8 +542,7 @@ class ModuleConnector(BaseConnector):
             return
 
         if file_entry.IsDirectory():
-            if not os.path.exists(output_path + os.sep + file_entry.name):
-                os.mkdir(output_path + os.sep + file_entry.name)
+            os.makedirs(output_path + os.sep + file_entry.name, exist_ok=True)
 
             for sub_file_entry in file_entry.sub_file_entries:
                 try:
@@ -496,6 +638,15 @@ class ModuleConnector(BaseConnector):
 
         _cursor.execute_query(query)
 
+        # Indexes: list of index names and columns, created with the table.
+        for index in self._schema['Table'][0].get('Indexes', []):
+            if _standalone_check:
+                index_columns = ', '.join('"' + column + '"' for column in index['Columns'])
+            else:
+                index_columns = ', '.join(index['Columns'])
+            _cursor.execute_query(
+                'CREATE INDEX {0:s} ON {1:s} ({2:s});'.format(index['Name'], table, index_columns))
+
         return True
 
     def CreateTableWithSchema(self, _cursor, _table_name, _schema, _standalone_check=False):
@@ -14,6 +14,9 @@ from dfvfs.lib import definitions as dfvfs_definitions
 class JUMPLISTConnector(interface.ModuleConnector):
     NAME = 'jumplist_connector'
     DESCRIPTION = 'Moudle for Jumplist'
+    PRODUCED_TABLES = [
+        'lv1_os_win_jumplist_automatics',
+        'lv1_os_win_jumplist_custom']
 
     _plugin_classes = {}
 
@@ -45,15 +48,15 @@ class JUMPLISTConnector(interface.ModuleConnector):
 
         # extension -> sig_type 변경해야 함
 
-        query = f"SELECT name, parent_path, extension FROM file_info WHERE par_id like '{par_id}' and " \
-                f"extension like 'automaticDestinations-ms' and parent_path like 'root/Users/%/AppData/Roaming/Microsoft/Windows/Recent/AutomaticDestinations';"
+        jumplist_automatic_files = self.LocateFiles(
+            configuration, par_id, extension='automaticDestinations-ms',
+            columns=['name', 'parent_path', 'extension', 'file_id'],
+            parent_path_pattern='root/Users/%/AppData/Roaming/Microsoft/Windows/Recent/AutomaticDestinations')
 
-        jumplist_automatic_files = configuration.cursor.execute_query_mul(query)
-
-        query = f"SELECT name, parent_path, extension FROM file_info WHERE par_id like '{par_id}' and " \
-                f"extension like 'customDestinations-ms' and parent_path like 'root/Users/%/AppData/Roaming/Microsoft/Windows/Recent/CustomDestinations';"
-
-        jumplist_custom_files = configuration.cursor.execute_query_mul(query)
+        jumplist_custom_files = self.LocateFiles(
+            configuration, par_id, extension='customDestinations-ms',
+            columns=['name', 'parent_path', 'extension', 'file_id'],
+            parent_path_pattern='root/Users/%/AppData/Roaming/Microsoft/Windows/Recent/CustomDestinations')
 
         if len(jumplist_automatic_files) == 0 and len(jumplist_custom_files) == 0:
             return False
@@ -69,14 +72,14 @@ class JUMPLISTConnector(interface.ModuleConnector):
             output_path = configuration.root_tmp_path + os.path.sep + configuration.case_id + os.path.sep + \
                           configuration.evidence_id + os.path.sep + par_id
 
-            if not os.path.exists(output_path):
-                os.mkdir(output_path)
+            os.makedirs(output_path, exist_ok=True)
 
             self.ExtractTargetFileToPath(
                 source_path_spec=source_path_spec,
                 configuration=configuration,
                 file_path=file_path,
-                output_path=output_path)
+                output_path=output_path,
+                inode=jumplist_automatic_file[3])
 
             fn = output_path + os.path.sep + fileName
             app_path = os.path.abspath(os.path.dirname(__file__)) + os.path.sep + "windows_jumplist"
@@ -492,14 +495,14 @@ class JUMPLISTConnector(interface.ModuleConnector):
 
 
             output_path = configuration.root_tmp_path + os.path.sep + configuration.case_id + os.path.sep + configuration.evidence_id + os.path.sep + par_id
-            if os.path.exists(output_path) == False:
-                os.mkdir(output_path)
+            os.makedirs(output_path, exist_ok=True)
 
             self.ExtractTargetFileToPath(
                 source_path_spec=source_path_spec,
                 configuration=configuration,
                 file_path=file_path,
-                output_path=output_path)
+                output_path=output_path,
+                inode=jumplist_custom_file[3])
 
             fn = output_path + os.path.sep + fileName
             app_path = os.path.abspath(os.path.dirname(__file__)) + os.path.sep + "windows_jumplist"
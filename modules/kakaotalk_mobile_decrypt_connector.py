@@ -15,6 +15,12 @@ class KakaotalkMobileDecryptConnector(interface.ModuleConnector):
 	NAME = 'kakaotalk_mobile_decrypt_connector'
 	DESCRIPTION = 'Module for kakaotalk_mobile_decrypt'
 	TABLE_NAME = 'lv1_kakaotalk_mobile_decrypt'
+	PRODUCED_TABLES = [
+		'lv1_app_kakaotalk_mobile_block_friends',
+		'lv1_app_kakaotalk_mobile_channel_history',
+		'lv1_app_kakaotalk_mobile_chatlogs',
+		'lv1_app_kakaotalk_mobile_chatrooms',
+		'lv1_app_kakaotalk_mobile_friends']
 
 	_plugin_classes = {}
 
@@ -13,6 +13,7 @@ class LINKConnector(interface.ModuleConnector):
 
     NAME = 'link_connector'
     DESCRIPTION = 'Module for Link'
+    PRODUCED_TABLES = ['lv1_os_win_link']
 
     _plugin_classes = {}
 
@@ -60,8 +61,7 @@ class LINKConnector(interface.ModuleConnector):
             #print(fileName)
             output_path = configuration.root_tmp_path + os.path.sep + configuration.case_id + os.path.sep + configuration.evidence_id + os.path.sep + par_id
 
-            if not os.path.exists(output_path):
-                os.mkdir(output_path)
+            os.makedirs(output_path, exist_ok=True)
 
             file_object = self.LoadTargetFileToMemory(
                 source_path_spec=source_path_spec,
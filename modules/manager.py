@@ -32,6 +32,15 @@ class ModulesManager(object):
 
         return module_objects
 
+    @classmethod
+    def GetModuleClasses(cls):
+        """Retrieves the registered module classes.
+
+        Returns:
+          dict[str, type]: module classes per lower case name.
+        """
+        return dict(cls._module_classes)
+
     @classmethod
     def RegisterModule(cls, module_class):
         """Registers a module class.
@@ -5,6 +5,7 @@ import enum
 import math
 import json
 import binascii
+import mmap
 
 from ctypes import *
 from struct import *
@@ -97,7 +98,7 @@ class MSSQL():
     def __init__(self):
         self.filepath = ''
         self.fHandle = ''
-        self.fbuf = ''
+        self.fbuf = None # memory map of the file
         self.pagesize = 8192
         
     def open(self, filepath):
@@ -106,19 +107,49 @@ class MSSQL():
         except:
             print('File open error : ' + filepath)
             return 1
+        try:
+            self.fbuf = mmap.mmap(self.fHandle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError): # empty file or mmap is not supported
+            self.fbuf = None
         self.filepath = filepath
         print('Open ' + filepath)
 
     def read(self, offset, size):
         buf = ''
         try:
-            self.fHandle.seek(offset)
-            buf = self.fHandle.read(size)
+            if self.fbuf is not None:
+                buf = self.fbuf[offset:offset + size]
+            else:
+                self.fHandle.seek(offset)
+                buf = self.fHandle.read(size)
         except:
             print('File read error')
         return buf
 
+    def readPage(self, pagenumber):
+        return self.read(pagenumber * self.pagesize, self.pagesize)
+
+    def getNumberOfPages(self):
+        if self.fbuf is not None:
+            return len(self.fbuf) // self.pagesize
+        return os.fstat(self.fHandle.fileno()).st_size // self.pagesize
+
+    def getPageObjectId(self, pagenumber):
+        # objectid of a data page without a copy of the page, None for other pages
+        offset = pagenumber * self.pagesize
+        if self.fbuf is None:
+            buf = self.read(offset, sizeof(_MSSQLPageHeader))
+            offset = 0
+        else:
+            buf = self.fbuf
+        if buf[offset + 0x01] != 0x01:
+            return None
+        return unpack_from('<I', buf, offset + _MSSQLPageHeader.objectid.offset)[0]
+
     def close(self):
+        if self.fbuf is not None:
+            self.fbuf.close()
+            self.fbuf = None
         self.fHandle.close()
 
     def getPageHeader(self, buf):
@@ -136,6 +167,8 @@ class MSSQLRecovery():
     def __init__(self, mssql):
         self.mssql = mssql
         self.pages = defaultdict(lambda : 0) # pageMap
+        self.objectpages = defaultdict(list) # objectid -> page numbers, in page order
+        self.catalogpages = {} # page number -> (buf, pageheader, rowoffsetarray) of system table pages
         self.systemschemesmap = defaultdict(list)
         self.userschemesmap = defaultdict(list)
         self.tablelist = []
@@ -144,7 +177,6 @@ class MSSQLRecovery():
 
     def scanPages(self, filename):
         print('MDF Page Scan')
-        pagenumber = 0
         jsonFilename = os.path.abspath(os.path.splitext(filename)[0] + '.json')
 
         if os.path.isfile(jsonFilename):
@@ -152,78 +184,27 @@ class MSSQLRecovery():
             for pagenumber, objectid in pages.items():
                 self.pages[int(pagenumber)] = objectid                
         else:
-            while True:
-                buf = self.mssql.read(self.mssql.pagesize * pagenumber, self.mssql.pagesize)
-                if not buf:
-                    break
-                
-                if buf[0x01] != 0x01:
-                    pagenumber += 1
-                    continue
-
-                pageheader = self.mssql.getPageHeader(buf)
-                self.pages[pagenumber] = pageheader.objectid
-                pagenumber += 1
-
-                del buf
+            for pagenumber in range(self.mssql.getNumberOfPages()):
+                objectid = self.mssql.getPageObjectId(pagenumber)
+                if objectid is not None:
+                    self.pages[pagenumber] = objectid
 
             json.dump(self.pages, open(jsonFilename, 'w'))
 
+        # inverted index, so the pages of an object are not searched in the page map per table
+        for pagenumber, objectid in self.pages.items():
+            self.objectpages[objectid].append(pagenumber)
+
     def getSystemTableColumnInfo(self):
         print('Get System Table Column Information')
 
         systemTable = [('sysschobjs', 0x22), ('sysiscols', 0x37), ('sysrowsets', 0x05), ('sysallocunits', 0x07)]
 
-        syscol_page = defaultdict(list, {k: v for k, v in self.pages.items() if v == 0x29})
-        for _, t_objectID in systemTable:
-            for k, v in syscol_page.items():
-                buf = self.mssql.read(k * self.mssql.pagesize, self.mssql.pagesize)
-                pageheader = self.mssql.getPageHeader(buf)
-
-                if pageheader.flagbits & 0x100:
-                    self._tornbits(buf)
-
-                rowoffsetarray = sorted(self.mssql.getRowOffsetArray(buf, pageheader))
-
-                for offset in rowoffsetarray:
-                    tboID = unpack('<I', buf[offset + 0x4 : offset + 0x8])[0]
-
-                    if tboID != t_objectID:
-                        continue
-
-                    colRecordLen = unpack('<H', buf[offset + 0x33 : offset + 0x35])[0]
-                    if colRecordLen <= 0:
-                        continue
-
-                    colData = buf[offset : offset + colRecordLen]
-
-                    scInfo = SchemeInfo()
-                    scInfo.ismax = False
-                    scInfo.tobjectid = t_objectID
-                    scInfo.colorder = unpack('<H', colData[0x0A : 0x0C])[0]
-                    scInfo.xtype = colData[0x0E]
-                    scInfo.utype = unpack('<I', colData[0x0F : 0x13])[0]
-                    scInfo.colsize = unpack('<H', colData[0x13 : 0x15])[0]
-                    if scInfo.colsize >= 0xFFFF:
-                        scInfo.colsize = 0x10
-                        scInfo.ismax = True
-                    scInfo.colname = colData[0x35:].decode('utf-16')
-                    scInfo.datatype = self._getTypeName(scInfo.xtype, scInfo.utype)
-                    if scInfo.datatype == 'numeric' or scInfo.datatype == 'decimal':
-                        scInfo.precisionofnumeric = colData[0x15]
-                        scInfo.scaleofnumeric = colData[0x16]
-                        scInfo.datatype = scInfo.datatype + '({}, {})'.format(str(scInfo.precisionofnumeric), str(scInfo.scaleofnumeric))
-                    elif scInfo.datatype == 'time' or scInfo.datatype == 'datetime2' or scInfo.datatype == 'datetimeoffset':
-                        scInfo.precisionoftime = colData[0x16]
-                        scInfo.datatype = scInfo.datatype + '({})'.format(str(scInfo.precisionoftime))
-                    self.systemschemesmap[t_objectID].append(scInfo)
-                
-                del buf
+        self._getColumnRecords({t_objectID: 1 for _, t_objectID in systemTable}, self.systemschemesmap)
     
     def getTableInfo(self):
         print('Get Table Information')
 
-        sysschobjs_page = defaultdict(list, {k: v for k, v in self.pages.items() if v == 0x22}) # sysschobjs
         sysschobjs_schemes = self.systemschemesmap[0x22] # sysschobjs
         sysschobjs_schemes = sorted(sysschobjs_schemes, key=lambda SchemeInfo: SchemeInfo.colorder)
 
@@ -238,23 +219,11 @@ class MSSQLRecovery():
         if len(sysschobjs_schemes) != rowinfo.numoftotalcol:
             return False
 
-        for k, v in sysschobjs_page.items():
-            buf = self.mssql.read(k * self.mssql.pagesize, self.mssql.pagesize)
-            pageheader = self.mssql.getPageHeader(buf)
-
-            if pageheader.flagbits & 0x100:
-                self._tornbits(buf)
-
-            rowoffsetarray = sorted(self.mssql.getRowOffsetArray(buf, pageheader))
+        for buf, offset, length in self._getCatalogRecords(0x22): # sysschobjs
+            tbinfo = TableInfo()
 
-            recordlen = rowoffsetarray[1:] + [self.mssql.pagesize - len(rowoffsetarray) * 2]
-            for offset, length in zip(rowoffsetarray, recordlen):
-                tbinfo = TableInfo()
-                
-                if self._parseTableInfoRecord(buf[offset:], length - offset, tbinfo, sysschobjs_schemes, rowinfo) == True:
-                    self.tablelist.append(tbinfo)
-
-            del buf
+            if self._parseTableInfoRecord(buf[offset:], length - offset, tbinfo, sysschobjs_schemes, rowinfo) == True:
+                self.tablelist.append(tbinfo)
         
         if len(self.tablelist) == 0:
             return False
@@ -264,58 +233,15 @@ class MSSQLRecovery():
     def getColumnInfo(self):
         print('Get Column Information')
 
-        syscolpars_page = defaultdict(list, {k: v for k, v in self.pages.items() if v == 0x29})
-
+        tableids = defaultdict(int)
         for tableinfo in self.tablelist:
-            tobjectid = tableinfo.tobjectid
-
-            for k, v in syscolpars_page.items():
-                buf = self.mssql.read(k * self.mssql.pagesize, self.mssql.pagesize)
-                pageheader = self.mssql.getPageHeader(buf)
+            tableids[tableinfo.tobjectid] += 1
 
-                if pageheader.flagbits & 0x100:
-                    self._tornbits(buf)
-
-                rowoffsetarray = sorted(self.mssql.getRowOffsetArray(buf, pageheader))
-
-                for offset in rowoffsetarray:
-                    tboId = unpack('<I', buf[offset + 0x04:offset + 0x08])[0]
-                    if tboId != tobjectid:
-                        continue
-                    
-                    colRecordLen = unpack('<H', buf[offset + 0x33:offset + 0x35])[0]
-                    if colRecordLen <= 0:
-                        continue
-
-                    colData = buf[offset:offset + colRecordLen]
-
-                    scinfo = SchemeInfo()
-                    scinfo.ismax = False
-                    scinfo.tobjectid = tobjectid
-                    scinfo.colorder = unpack('<H', colData[0x0A:0x0C])[0]
-                    scinfo.xtype = colData[0x0E]
-                    scinfo.utype = unpack('<I', colData[0x0F:0x13])[0]
-                    scinfo.colsize = unpack('<H', colData[0x13:0x15])[0]
-                    if scinfo.colsize >= 0xFFFF:
-                        scinfo.colsize = 0x10
-                        scinfo.ismax = True
-                    scinfo.colname = colData[0x35:].decode('utf-16')
-                    scinfo.datatype = self._getTypeName(scinfo.xtype, scinfo.utype)
-                    if scinfo.datatype == 'numeric' or scinfo.datatype == 'decimal':
-                        scinfo.precisionofnumeric = colData[0x15]
-                        scinfo.scaleofnumeric = colData[0x16]
-                        scinfo.datatype = scinfo.datatype + '({}, {})'.format(str(scinfo.precisionofnumeric), str(scinfo.scaleofnumeric))
-                    elif scinfo.datatype == 'time' or scinfo.datatype == 'datetime2' or scinfo.datatype == 'datetimeoffset':
-                        scinfo.precisionoftime = colData[0x16]
-                        scinfo.datatype = scinfo.datatype + '({})'.format(str(scinfo.precisionoftime))
-                    self.userschemesmap[tobjectid].append(scinfo)
-
-                del buf
+        self._getColumnRecords(tableids, self.userschemesmap)
 
     def getKeyColumnInfo(self):
         print('Get Key Column Information')
 
-        sysiscols_page = defaultdict(list, {k: v for k, v in self.pages.items() if v == 0x37})
         sysiscols_schemes = self.systemschemesmap[0x37]
         sysiscols_schemes = sorted(sysiscols_schemes, key=lambda SchemeInfo: SchemeInfo.colorder)
 
@@ -330,34 +256,21 @@ class MSSQLRecovery():
         if len(sysiscols_schemes) != rowinfo.numoftotalcol:
             return False
 
-        for tableinfo in self.tablelist:
-            tobjectid = tableinfo.tobjectid
-
-            for k, v in sysiscols_page.items():
-                buf = self.mssql.read(k * self.mssql.pagesize, self.mssql.pagesize)
-                pageheader = self.mssql.getPageHeader(buf)
-
-                if pageheader.flagbits & 0x100:
-                    self._tornbits(buf)
-
-                rowoffsetarray = sorted(self.mssql.getRowOffsetArray(buf, pageheader))
+        tableids = set(tableinfo.tobjectid for tableinfo in self.tablelist)
 
-                recordlen = rowoffsetarray[1:] + [self.mssql.pagesize - len(rowoffsetarray) * 2]
-                for offset, length in zip(rowoffsetarray, recordlen):
-                    indexcolumnid = 0
-                    columnid = 0
-                    if self._parseIndexInfoRecord(buf[offset:], length - offset, sysiscols_schemes, rowinfo, tobjectid, indexcolumnid, columnid) == True:
-                        if (indexcolumnid != 0) and (columnid != 0) and (indexcolumnid != columnid):
-                            self._changeOrdinal(sysiscols_schemes, indexcolumnid, columnid, '', tobjectid)
-
-                del buf
+        for buf, offset, length in self._getCatalogRecords(0x37): # sysiscols
+            indexcolumnid = 0
+            columnid = 0
+            tobjectid = self._parseIndexInfoRecord(buf[offset:], length - offset, sysiscols_schemes, rowinfo, tableids, indexcolumnid, columnid)
+            if tobjectid != 0:
+                if (indexcolumnid != 0) and (columnid != 0) and (indexcolumnid != columnid):
+                    self._changeOrdinal(sysiscols_schemes, indexcolumnid, columnid, '', tobjectid)
         
         return True
 
     def getPageObjectId(self):
         print('Get Page Object Id')
 
-        sysrowsets_page = defaultdict(list, {k: v for k, v in self.pages.items() if v == 0x05})
         sysrowsets_schemes = self.systemschemesmap[0x05]
         sysrowsets_schemes = sorted(sysrowsets_schemes, key=lambda SchemeInfo: SchemeInfo.colorder)
 
@@ -372,32 +285,23 @@ class MSSQLRecovery():
         if len(sysrowsets_schemes) != rowinfo.numoftotalcol:
             return False
 
-        for tableinfo in self.tablelist:
-            tobjectid = tableinfo.tobjectid
-            isFindId = False
-
-            for k, v in sysrowsets_page.items():
-                if isFindId:
-                    break
+        # first partition of every table
+        partitions = {}
+        for buf, offset, length in self._getCatalogRecords(0x05): # sysrowsets
+            tobjectid, partitionid = self._parseObjectInfoRecord(buf[offset:], length - offset, sysrowsets_schemes, rowinfo)
+            if partitionid != 0:
+                partitions.setdefault(tobjectid, partitionid)
 
-                buf = self.mssql.read(k * self.mssql.pagesize, self.mssql.pagesize)
-                pageheader = self.mssql.getPageHeader(buf)
+        allocationunits = self._searchSysallocunits()
 
-                if pageheader.flagbits & 0x100:
-                    self._tornbits(buf)
-
-                rowoffsetarray = sorted(self.mssql.getRowOffsetArray(buf, pageheader))
+        for tableinfo in self.tablelist:
+            tableinfo.partitionid = partitions.get(tableinfo.tobjectid, 0)
+            if tableinfo.partitionid == 0 or tableinfo.partitionid not in allocationunits:
+                continue
 
-                recordlen = rowoffsetarray[1:] + [self.mssql.pagesize - len(rowoffsetarray) * 2]
-                for offset, length in zip(rowoffsetarray, recordlen):
-                    tableinfo.partitionid = self._parseObjectInfoRecord(buf[offset:], length - offset, sysrowsets_schemes, rowinfo, tobjectid)
-                    if tableinfo.partitionid != 0:
-                        if (self._searchSysallocunits(tableinfo)):
-                            isFindId = True
-                            break
+            allocationid = allocationunits[tableinfo.partitionid]
+            tableinfo.pobjectid = ((allocationid) - ((allocationid >> 48) << 48)) >> 16
 
-                del buf
-        
         return True
 
     def recovery(self, output_path):
@@ -440,20 +344,11 @@ class MSSQLRecovery():
             create_query = create_query + '(' + ','.join(colinfo) + ')\n'
             self.of.write(create_query)
             # run query
-            table_page = defaultdict(list, {k: v for k, v in self.pages.items() if v == tableinfo.pobjectid})
-
-            for k, v in table_page.items():
-                if k == 3276283:
-                    a = 0
-
-                buf = self.mssql.read(k * self.mssql.pagesize, self.mssql.pagesize)
-                pageheader = self.mssql.getPageHeader(buf)
+            for k in self.objectpages[tableinfo.pobjectid]:
+                buf, pageheader = self._readPage(k)
                 if pageheader.type != 0x01:
                     continue
 
-                if pageheader.flagbits & 0x100:
-                    self._tornbits(buf)
-
                 print('Carving... PageID : ' + str(k) + ', Table : ' + tableinfo.tablename)
                 
                 rowoffsetarray = sorted(self.mssql.getRowOffsetArray(buf, pageheader))
@@ -485,6 +380,70 @@ class MSSQLRecovery():
             self.of.close()
         
 
+    def _readPage(self, pagenumber):
+        buf = self.mssql.readPage(pagenumber)
+        pageheader = self.mssql.getPageHeader(buf)
+
+        if pageheader.flagbits & 0x100:
+            buf = bytearray(buf)
+            self._tornbits(buf)
+            buf = bytes(buf)
+
+        return buf, pageheader
+
+    def _getCatalogPage(self, pagenumber):
+        # system table pages are read by several steps, so each is decoded once
+        if pagenumber not in self.catalogpages:
+            buf, pageheader = self._readPage(pagenumber)
+            rowoffsetarray = sorted(self.mssql.getRowOffsetArray(buf, pageheader))
+            self.catalogpages[pagenumber] = (buf, pageheader, rowoffsetarray)
+
+        return self.catalogpages[pagenumber]
+
+    def _getCatalogRecords(self, objectid):
+        # (page buffer, record offset, end of the record area) per record of a system table
+        for pagenumber in self.objectpages[objectid]:
+            buf, _, rowoffsetarray = self._getCatalogPage(pagenumber)
+
+            recordlen = rowoffsetarray[1:] + [self.mssql.pagesize - len(rowoffsetarray) * 2]
+            for offset, length in zip(rowoffsetarray, recordlen):
+                yield buf, offset, length
+
+    def _getColumnRecords(self, tableids, schemesmap):
+        # syscolpars is read once for all tables, tableids maps objectid -> number of entries of the table
+        for buf, offset, _ in self._getCatalogRecords(0x29): # syscolpars
+            tboId = unpack('<I', buf[offset + 0x04:offset + 0x08])[0]
+            if tboId not in tableids:
+                continue
+
+            colRecordLen = unpack('<H', buf[offset + 0x33:offset + 0x35])[0]
+            if colRecordLen <= 0:
+                continue
+
+            colData = buf[offset:offset + colRecordLen]
+
+            for _ in range(tableids[tboId]):
+                scinfo = SchemeInfo()
+                scinfo.ismax = False
+                scinfo.tobjectid = tboId
+                scinfo.colorder = unpack('<H', colData[0x0A:0x0C])[0]
+                scinfo.xtype = colData[0x0E]
+                scinfo.utype = unpack('<I', colData[0x0F:0x13])[0]
+                scinfo.colsize = unpack('<H', colData[0x13:0x15])[0]
+                if scinfo.colsize >= 0xFFFF:
+                    scinfo.colsize = 0x10
+                    scinfo.ismax = True
+                scinfo.colname = colData[0x35:].decode('utf-16')
+                scinfo.datatype = self._getTypeName(scinfo.xtype, scinfo.utype)
+                if scinfo.datatype == 'numeric' or scinfo.datatype == 'decimal':
+                    scinfo.precisionofnumeric = colData[0x15]
+                    scinfo.scaleofnumeric = colData[0x16]
+                    scinfo.datatype = scinfo.datatype + '({}, {})'.format(str(scinfo.precisionofnumeric), str(scinfo.scaleofnumeric))
+                elif scinfo.datatype == 'time' or scinfo.datatype == 'datetime2' or scinfo.datatype == 'datetimeoffset':
+                    scinfo.precisionoftime = colData[0x16]
+                    scinfo.datatype = scinfo.datatype + '({})'.format(str(scinfo.precisionoftime))
+                schemesmap[tboId].append(scinfo)
+
     def _getTypeName(self, xtype, utype):
         if xtype == 0x7F:
             return 'bigint'
@@ -669,13 +628,13 @@ class MSSQLRecovery():
         else:
             return False
 
-    def _parseIndexInfoRecord(self, buf, recordlen, schemlist, rowinfo, objectid, indexcolumnid, columnid):
+    def _parseIndexInfoRecord(self, buf, recordlen, schemlist, rowinfo, objectids, indexcolumnid, columnid):
         lenofnullbitmap = math.ceil(rowinfo.numoftotalcol/8)
         offsetoftotalnumofcol = unpack('<H', buf[0x02 : 0x04])[0]
         totalnumofcol = unpack('<H', buf[offsetoftotalnumofcol:offsetoftotalnumofcol + 0x02])[0]
 
         if rowinfo.numoftotalcol != totalnumofcol:
-            return False
+            return 0
 
         staticoffset = 1 + 1 + 2 # statusBit A + statusBit B + OffsetOfTotalNumOfCol
 
@@ -734,10 +693,10 @@ class MSSQLRecovery():
 
             del columnbuff
 
-        if (tboId != objectid) or ~(tbStatus & 2):
-            return False
+        if (tboId not in objectids) or ~(tbStatus & 2):
+            return 0
         else:
-            return True
+            return tboId
     
     def _changeOrdinal(self, schemlist, indexcolumnid, columnid, colname, objectid):
         table_schemes = self.userschemesmap[objectid]
@@ -756,14 +715,15 @@ class MSSQLRecovery():
             if (schema.colorder < tmpOrdinal) and (schema.colData > indexcolumnid):
                 schema.colorder += 1
 
-    def _parseObjectInfoRecord(self, buf, recordlen, schemlist, rowinfo, objectid):
+    def _parseObjectInfoRecord(self, buf, recordlen, schemlist, rowinfo):
         lenofnullbitmap = math.ceil(rowinfo.numoftotalcol/8)
         offsetoftotalnumofcol = unpack('<H', buf[0x02 : 0x04])[0]
         totalnumofcol = unpack('<H', buf[offsetoftotalnumofcol:offsetoftotalnumofcol + 0x02])[0]
         partitionid = 0
+        tboId = 0
 
         if rowinfo.numoftotalcol != totalnumofcol:
-            return False
+            return 0, 0
 
         staticoffset = 1 + 1 + 2 # statusBit A + statusBit B + OffsetOfTotalNumOfCol
 
@@ -819,53 +779,42 @@ class MSSQLRecovery():
 
             #del columnbuff
         
-        if (partitionid == 0) or (tboId != objectid):
-            return 0
-        else:
-            return partitionid
+        return tboId, partitionid
+
+    def _searchSysallocunits(self):
+        # allocation unit of every partition
+        allocationunits = {}
 
-    def _searchSysallocunits(self, tableinfo):
-        sysallocunits_page = defaultdict(list, {k: v for k, v in self.pages.items() if v == 0x07})
         sysallocunits_schemes = self.systemschemesmap[0x07]
         sysallocunits_schemes = sorted(sysallocunits_schemes, key=lambda SchemeInfo: SchemeInfo.colorder)
 
         rowinfo = RowInfo()
 
         if len(sysallocunits_schemes) == 0:
-            return False
+            return allocationunits
 
         for schema in sysallocunits_schemes:
             self._tableSchemeAnalyzer(schema, rowinfo)
 
         if len(sysallocunits_schemes) != rowinfo.numoftotalcol:
-            return False
+            return allocationunits
         
-        for k, v in sysallocunits_page.items():
-            buf = self.mssql.read(k * self.mssql.pagesize, self.mssql.pagesize)
-            pageheader = self.mssql.getPageHeader(buf)
-
-            if pageheader.flagbits & 0x100:
-                self._tornbits(buf)
+        for buf, offset, length in self._getCatalogRecords(0x07): # sysallocunits
+            partitionid, allocationid = self._parseAllocUnitInfoRecord(buf[offset:], length - offset, sysallocunits_schemes, rowinfo)
+            if allocationid != 0:
+                allocationunits[partitionid] = allocationid
 
-            rowoffsetarray = sorted(self.mssql.getRowOffsetArray(buf, pageheader))
-
-            recordlen = rowoffsetarray[1:] + [self.mssql.pagesize - len(rowoffsetarray) * 2]
-            for offset, length in zip(rowoffsetarray, recordlen):
-                allocationid = self._parseAllocUnitInfoRecord(buf[offset:], length - offset, sysallocunits_schemes, rowinfo, tableinfo)
-                if allocationid != 0:
-                    tableinfo.pobjectid = ((allocationid) - ((allocationid >> 48) << 48)) >> 16
-
-        return True
+        return allocationunits
                 
 
-    def _parseAllocUnitInfoRecord(self, buf, recordlen, schemlist, rowinfo, tableinfo):
+    def _parseAllocUnitInfoRecord(self, buf, recordlen, schemlist, rowinfo):
         lenofnullbitmap = math.ceil(rowinfo.numoftotalcol/8)
         offsetoftotalnumofcol = unpack('<H', buf[0x02 : 0x04])[0]
         totalnumofcol = unpack('<H', buf[offsetoftotalnumofcol:offsetoftotalnumofcol + 0x02])[0]
         allocationid = 0
 
         if rowinfo.numoftotalcol != totalnumofcol:
-            return False
+            return 0, 0
 
         staticoffset = 1 + 1 + 2 # statusBit A + statusBit B + OffsetOfTotalNumOfCol
 
@@ -923,10 +872,10 @@ class MSSQLRecovery():
 
             del columnbuff
         
-        if (pid == 0) or (pid != tableinfo.partitionid) or (flag != 0x01):
-            return 0
+        if (pid == 0) or (flag != 0x01):
+            return 0, 0
         else:
-            return allocationid
+            return pid, allocationid
     
     def _tornbits(self, buf):
         tornbit = unpack('<I', buf[0x3c:0x40])[0]
@@ -1118,11 +1067,7 @@ class MSSQLRecovery():
 
             lobpos = sorted(lobpos)
             for _, rowid, row_offset in lobpos:
-                lob_buf = self.mssql.read(rowid.pageId * self.mssql.pagesize, self.mssql.pagesize)
-                pageheader = self.mssql.getPageHeader(lob_buf)
-
-                if pageheader.flagbits & 0x100:
-                    self._tornbits(lob_buf)
+                lob_buf, pageheader = self._readPage(rowid.pageId)
                 if lob_buf[1] == 0x03 or lob_buf[1] == 0x04:
                     recordLen = unpack('<H', lob_buf[row_offset + 0x02:row_offset + 0x04])[0]
                     byte_output += lob_buf[row_offset + 0x0E:row_offset + recordLen]
@@ -1156,11 +1101,7 @@ class MSSQLRecovery():
 
             lobpos = sorted(lobpos)
             for _, rowid, row_offset in lobpos:
-                lob_buf = self.mssql.read(rowid.pageId * self.mssql.pagesize, self.mssql.pagesize)
-                pageheader = self.mssql.getPageHeader(lob_buf)
-
-                if pageheader.flagbits & 0x100:
-                    self._tornbits(lob_buf)
+                lob_buf, pageheader = self._readPage(rowid.pageId)
                 if lob_buf[1] == 0x03 or lob_buf[1] == 0x04:
                     recordLen = unpack('<H', lob_buf[row_offset + 0x02:row_offset + 0x04])[0]
                     byte_output += lob_buf[row_offset + 0x0E:row_offset + recordLen]
@@ -1169,11 +1110,7 @@ class MSSQLRecovery():
 
     def _reconstructLOBData(self, length, rowid, timestamp, lobpos, offset=0, size=0):
         # row-overflow
-        lob_buf = self.mssql.read(rowid.pageId * self.mssql.pagesize, self.mssql.pagesize)
-        pageheader = self.mssql.getPageHeader(lob_buf)
-
-        if pageheader.flagbits & 0x100:
-            self._tornbits(lob_buf)
+        lob_buf, pageheader = self._readPage(rowid.pageId)
         if lob_buf[1] == 0x03 or lob_buf[1] == 0x04:
             rowoffsetarray = self.mssql.getRowOffsetArray(lob_buf, pageheader)
             if len(rowoffsetarray) > rowid.slotNumber:
@@ -22,4 +22,5 @@ def main(input_path, output_path):
 
     #### Recovery
     mssql_recovery.recovery(output_path)
+    mssql_class.close()
 
@@ -14,6 +14,9 @@ class NotificationConnector(interface.ModuleConnector):
     NAME = 'notification_connector'
     DESCRIPTION = 'Module for notification'
     TABLE_NAME = 'lv1_os_win_notification'
+    PRODUCED_TABLES = [
+        'lv1_os_win_notification_new',
+        'lv1_os_win_notification_old']
 
     _plugin_classes = {}
 
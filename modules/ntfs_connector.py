@@ -2,12 +2,13 @@
 """module for DFIR_NTFS_caller."""
 
 import os
+import time
 
 from tqdm import tqdm
 from modules import manager
 from modules import interface
 from modules.NTFS import mft_parser, logfile_parser, usnjrnl_parser
-from modules.NTFS.dfir_ntfs import USN, LogFile, MFT
+from modules.NTFS.dfir_ntfs import USN, LogFile, MFT, BootSector
 from dfvfs.lib import definitions as dfvfs_definitions
 
 
@@ -15,15 +16,25 @@ from dfvfs.lib import definitions as dfvfs_definitions
 class NTFSConnector(interface.ModuleConnector):
     NAME = 'ntfs_connector'
     DESCRIPTION = 'Module for DFIR_NTFS'
+    PRODUCED_TABLES = [
+        'lv1_fs_ntfs_mft',
+        'lv1_fs_ntfs_usnjrnl',
+        'lv1_fs_ntfs_logfile_log_record',
+        'lv1_fs_ntfs_logfile_restart_area']
+
+    # Number of rows inserted per bulk_execute call.
+    _BATCH_SIZE = 10000
 
     _plugin_classes = {}
 
     def __init__(self):
         super(NTFSConnector, self).__init__()
+        self._source_path_spec = None
+        self._configuration = None
         self._mft_path = None
-        self._mftmirr_path = None
         self._usnjrnl_path = None
         self._logfile_path = None
+        self._parent_map = None
         self._deleted_files = []
 
     def Connect(self, configuration, source_path_spec, knowledge_base):
@@ -57,92 +68,229 @@ class NTFSConnector(interface.ModuleConnector):
 
         print('[MODULE]: DFIR_NTFS_Connector Call - partition ID(%s)' % par_id)
 
-        # path, name, ads_name
-        file_list = [['/', '$MFT', None], ['/', '$MFTMirr', None], ['/$Extend/', '$UsnJrnl', '$J'],
-                     ['/', '$LogFile', None]]
-
-        output_path = configuration.root_tmp_path + os.sep + configuration.case_id + os.sep + \
-                      configuration.evidence_id + os.sep + par_id
-
-        for file in file_list:
-            self.ExtractTargetFileToPath(source_path_spec=source_path_spec,
-                                         configuration=configuration,
-                                         file_path=file[0] + file[1],
-                                         output_path=output_path,
-                                         data_stream_name=file[2])
-
-        self._mft_path = output_path + os.sep + '$MFT'
-        self._mftmirr_path = output_path + os.sep + '$MFTMirr'
-        self._logfile_path = output_path + os.sep + '$LogFile'
-        self._usnjrnl_path = output_path + os.sep + '$UsnJrnl_$J'
+        self._source_path_spec = source_path_spec
+        self._configuration = configuration
+        self._parent_map = None
 
+        # The files are parsed in place, see OpenTargetFile.
+        self._mft_path = '/$MFT'
+        self._logfile_path = '/$LogFile'
+        self._usnjrnl_path = '/$Extend/$UsnJrnl'
 
+        mft_object = self._OpenFile(self._mft_path)
+        if not mft_object:
+            return False
+        mft_object.close()
 
-        if os.path.exists(self._mft_path):
-            print("Start parsing $MFT")
-            self.process_mft(par_id, configuration, table_list)
+        print("Start parsing $MFT")
+        self.process_mft(par_id, configuration, table_list)
 
-        if os.path.exists(self._mft_path) and os.path.exists(self._logfile_path):
+        logfile_object = self._OpenFile(self._logfile_path)
+        if logfile_object:
+            logfile_object.close()
             print("Start parsing $Logfile")
             self.process_logfile(par_id, configuration, table_list)
 
-        if os.path.exists(self._mft_path) and os.path.exists(self._usnjrnl_path):
+        usnjrnl_object = self._OpenFile(self._usnjrnl_path, data_stream_name='$J')
+        if usnjrnl_object:
+            usnjrnl_object.close()
             print("Start parsing $UsnJrnl")
             self.process_usnjrnl(par_id, configuration, table_list)
 
+    def _OpenFile(self, file_path, data_stream_name=None):
+        """Opens a NTFS metadata file of the partition being processed.
+
+        Args:
+            file_path (str): path of the file.
+            data_stream_name (Optional[str]): name of the data stream.
+
+        Returns:
+            io.BufferedReader: file object or None if not available.
+        """
+        return self.OpenTargetFile(
+            self._source_path_spec, self._configuration, file_path=file_path,
+            data_stream_name=data_stream_name)
+
+    def _SetParentMap(self, configuration, mft_file):
+        """Lets a $MFT parser resolve paths from the parent map of the partition.
+
+        The parent map is built once per partition and shared by the $MFT,
+        $LogFile and $UsnJrnl parsers. It is built with the workers of the module
+        task, see ModuleConnector._GetNumberOfWorkers.
+
+        Args:
+            configuration (Configuration): configuration values.
+            mft_file (MFT.MasterFileTableParser): $MFT parser.
+        """
+        if self._parent_map is None:
+            self._parent_map = mft_parser.build_parent_map(
+                mft_file, self._GetNumberOfWorkers(configuration))
+        mft_file.set_parent_map(self._parent_map)
+
+    def _GetUsnJrnlDataRanges(self, mft_file, file_size):
+        """Determines the allocated ranges of $UsnJrnl:$J from its $DATA run list.
+
+        The journal is mostly sparse, only the allocated ranges are scanned.
+
+        Args:
+            mft_file (MFT.MasterFileTableParser): $MFT parser with a parent map.
+            file_size (int): size of $UsnJrnl:$J.
+
+        Returns:
+            list[tuple[int, int]]: offset and size of the allocated ranges or
+                None if the run list is not available.
+        """
+        boot_object = self._OpenFile('/$Boot')
+        if not boot_object:
+            return None
+
+        try:
+            boot_sector = BootSector.BootSector(boot_object.read(512))
+            cluster_size = boot_sector.get_bytes_per_sector() * boot_sector.get_sectors_per_cluster()
+        except BootSector.BootSectorException:
+            return None
+        finally:
+            boot_object.close()
+
+        for segment_number, entry in mft_file.parent_map.entries.items():
+            if entry[2] != '$UsnJrnl':
+                continue
+            parent_segment_number, _ = MFT.DecodeFileRecordSegmentReference(entry[3])
+            if parent_segment_number != MFT.FILE_NUMBER_EXTEND:
+                continue
+
+            try:
+                file_record = mft_file.get_file_record_by_number(segment_number, entry[0])
+                if not file_record.is_in_use():
+                    continue
+                data_runs = file_record.get_data_runs('$J')
+            except MFT.MasterFileTableException:
+                continue
+
+            if data_runs:
+                return USN.GetDataRanges(data_runs, cluster_size, file_size)
+
+        return None
+
+    def _InsertRows(self, configuration, queries, rows, description):
+        """Inserts rows in fixed-size batches while they are parsed.
+
+        Args:
+            configuration (Configuration): configuration values.
+            queries (dict[str, str]): insert query per table name.
+            rows (iterable[tuple[str, tuple]]): table name and values per row.
+            description (str): description of the rows, used in the progress output.
+
+        Returns:
+            dict[str, int]: number of rows inserted per table name.
+        """
+        batches = {table_name: [] for table_name in queries}
+        number_of_rows = dict.fromkeys(queries, 0)
+        start_time = time.time()
+
+        for table_name, values in tqdm(rows, desc=description, unit=' records'):
+            batch = batches[table_name]
+            batch.append(values)
+            if len(batch) >= self._BATCH_SIZE:
+                configuration.cursor.bulk_execute(queries[table_name], batch)
+                number_of_rows[table_name] += len(batch)
+                batches[table_name] = []
+
+        for table_name, batch in batches.items():
+            if batch:
+                configuration.cursor.bulk_execute(queries[table_name], batch)
+                number_of_rows[table_name] += len(batch)
+
+        elapsed_time = time.time() - start_time
+        total_number_of_rows = sum(number_of_rows.values())
+        print(f'{description} num: {total_number_of_rows} ({elapsed_time:.1f}s, '
+              f'{total_number_of_rows / max(elapsed_time, 0.001):.0f} records/s)')
+
+        return number_of_rows
+
+    def _ParseMFT(self, info, mft_file, table_name):
+        for file_record in mft_file.file_records():
+            try:
+                file_paths = mft_file.parent_map.build_full_paths(file_record, True)
+            except MFT.MasterFileTableException:
+                continue
+            # TODO: file_path 중복 수정
+            if file_paths:
+                file_paths = [file_paths[0]]
+            for values in mft_parser.mft_parse(info, mft_file, file_record, file_paths):
+                yield table_name, values
+
+    def _ParseMFTParallel(self, info, mft_file, table_name, number_of_workers):
+        for values in mft_parser.mft_parse_parallel(info, mft_file, number_of_workers):
+            yield table_name, values
+
+    def _ParseLogFile(self, info, log_file, mft_file, restart_area_table_name, log_record_table_name):
+        for log_item in log_file.parse_ntfs_records():
+            if type(log_item) is LogFile.NTFSRestartArea:
+                output_data = logfile_parser.restart_area_parse(log_item)
+                yield restart_area_table_name, info + tuple(output_data)
+            elif type(log_item) is LogFile.NTFSLogRecord:
+                output_data = logfile_parser.log_record_parse(log_item, mft_file)
+                yield log_record_table_name, info + tuple(output_data)
+
+    def _ParseUsnJrnl(self, info, usn_journal, mft_file, table_name):
+        usn_records = []
+        for usn_record in usn_journal.usn_records():
+            usn_records.append(usn_record)
+            if len(usn_records) >= self._BATCH_SIZE:
+                yield from self._ParseUsnRecords(info, usn_records, mft_file, table_name)
+                usn_records = []
+
+        yield from self._ParseUsnRecords(info, usn_records, mft_file, table_name)
+
+    def _ParseUsnRecords(self, info, usn_records, mft_file, table_name):
+        file_paths = mft_file.resolve_paths(
+            [usn_record.get_file_reference_number() for usn_record in usn_records])
+        for usn_record, file_path in zip(usn_records, file_paths):
+            yield table_name, info + usnjrnl_parser.usnjrnl_parse(mft_file, usn_record, file_path)
+
     def process_mft(self, par_id, configuration, table_list):
-        mft_object = open(self._mft_path, 'rb')
+        mft_object = self._OpenFile(self._mft_path)
 
         mft_file = MFT.MasterFileTableParser(mft_object)
+        self._SetParentMap(configuration, mft_file)
 
         info = tuple([par_id, configuration.case_id, configuration.evidence_id])
 
         query = f"Insert into {table_list[0]} values(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, " \
                 f"%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
 
-        mft_list = []
-        for idx, file_record in tqdm(enumerate(mft_file.file_records())):
-            try:
-                file_paths = mft_file.build_full_paths(file_record, True)
-            except MFT.MasterFileTableException:
-                continue
-            # TODO: file_path 중복 수정
-            if not file_paths:
-                mft_list.extend(mft_parser.mft_parse(info, mft_file, file_record, file_paths))
-            else:
-                mft_list.extend(mft_parser.mft_parse(info, mft_file, file_record, [file_paths[0]]))
+        number_of_workers = self._GetNumberOfWorkers(configuration)
+        if number_of_workers > 1:
+            rows = self._ParseMFTParallel(info, mft_file, table_list[0], number_of_workers)
+        else:
+            rows = self._ParseMFT(info, mft_file, table_list[0])
 
-        print(f'mft num: {len(mft_list)}')
-        configuration.cursor.bulk_execute(query, mft_list)
+        try:
+            self._InsertRows(configuration, {table_list[0]: query}, rows, 'mft')
+        finally:
+            mft_object.close()
 
     def process_logfile(self, par_id, configuration, table_list):
-        logfile_object = open(self._logfile_path, 'rb')
-        mft_object = open(self._mft_path, 'rb')
+        logfile_object = self._OpenFile(self._logfile_path)
+        mft_object = self._OpenFile(self._mft_path)
 
         log_file = LogFile.LogFileParser(logfile_object)
         mft_file = MFT.MasterFileTableParser(mft_object)
+        self._SetParentMap(configuration, mft_file)
 
-        restart_area_list = []
-        log_record_list = []
         info = tuple([par_id, configuration.case_id, configuration.evidence_id])
 
-        for idx, log_item in tqdm(enumerate(log_file.parse_ntfs_records())):
-            if not type(log_item):
-                continue
-            elif type(log_item) is LogFile.NTFSRestartArea:
-                output_data = logfile_parser.restart_area_parse(log_item)
-                restart_area_list.append(info + tuple(output_data))
-            elif type(log_item) is LogFile.NTFSLogRecord:
-                output_data = logfile_parser.log_record_parse(log_item, mft_file)
-                log_record_list.append(info + tuple(output_data))
-
         restart_area_query = f"Insert into {table_list[1]} values(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
         log_record_query = f"Insert into {table_list[2]} values(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
 
-        print(f'restart area num: {len(restart_area_list)}')
-        print(f'log record num: {len(log_record_list)}')
-        configuration.cursor.bulk_execute(restart_area_query, restart_area_list)
-        configuration.cursor.bulk_execute(log_record_query, log_record_list)
+        try:
+            self._InsertRows(
+                configuration, {table_list[1]: restart_area_query, table_list[2]: log_record_query},
+                self._ParseLogFile(info, log_file, mft_file, table_list[1], table_list[2]), 'logfile')
+        finally:
+            logfile_object.close()
+            mft_object.close()
 
         # if len(self._deleted_files) > 0:
         #     # print('Files and directories with these MFT numbers were deleted (in this order):\n')
@@ -150,21 +298,25 @@ class NTFSConnector(interface.ModuleConnector):
         # # print(self._deleted_files)
 
     def process_usnjrnl(self, par_id, configuration, table_list):
-        usn_object = open(self._usnjrnl_path, 'rb')
-        mft_object = open(self._mft_path, 'rb')
-        usn_journal = USN.ChangeJournalParser(usn_object)
+        usn_object = self._OpenFile(self._usnjrnl_path, data_stream_name='$J')
+        mft_object = self._OpenFile(self._mft_path)
         mft_file = MFT.MasterFileTableParser(mft_object)
+        self._SetParentMap(configuration, mft_file)
 
-        query = f"Insert into {table_list[3]} values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
+        usn_journal = USN.ChangeJournalParser(
+            usn_object, self._GetUsnJrnlDataRanges(mft_file, usn_object.seek(0, os.SEEK_END)))
+
+        info = tuple([par_id, configuration.case_id, configuration.evidence_id])
 
-        usnjrnl_list = []
-        for idx, usn_record in tqdm(enumerate(usn_journal.usn_records())):
-            usn_tuple = usnjrnl_parser.usnjrnl_parse(mft_file, usn_record)
-            values = (par_id, configuration.case_id, configuration.evidence_id) + usn_tuple
-            usnjrnl_list.append(values)
+        query = f"Insert into {table_list[3]} values (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);"
 
-        print(f'usnjrnl num: {len(usnjrnl_list)}')
-        configuration.cursor.bulk_execute(query, usnjrnl_list)
+        try:
+            self._InsertRows(
+                configuration, {table_list[3]: query},
+                self._ParseUsnJrnl(info, usn_journal, mft_file, table_list[3]), 'usnjrnl')
+        finally:
+            usn_object.close()
+            mft_object.close()
 
 
 manager.ModulesManager.RegisterModule(NTFSConnector)
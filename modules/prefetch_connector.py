@@ -15,6 +15,10 @@ class PREFETCHConnector(interface.ModuleConnector):
 
     NAME = 'prefetch_connector'
     DESCRIPTION = 'Moudle for Prefetch'
+    PRODUCED_TABLES = [
+        'lv1_os_win_prefetch',
+        'lv1_os_win_prefetch_run_info',
+        'lv1_os_win_prefetch_volume_info']
 
     _plugin_classes = {}
 
@@ -48,10 +52,9 @@ class PREFETCHConnector(interface.ModuleConnector):
         print('[MODULE]: Prefetch Connect - partition ID(%s)' % par_id)
 
         # extension -> sig_type 변경해야 함
-        query = f"SELECT name, parent_path, extension, ctime, ctime_nano FROM file_info WHERE par_id='{par_id}' and " \
-                f"parent_path = 'root/Windows/Prefetch' and extension = 'pf';"
-
-        prefetch_files = configuration.cursor.execute_query_mul(query)
+        prefetch_files = self.LocateFiles(
+            configuration, par_id, parent_path='root/Windows/Prefetch', extension='pf',
+            columns=['name', 'parent_path', 'extension', 'ctime', 'ctime_nano', 'file_id'])
 
         if len(prefetch_files) == 0:
             return False
@@ -74,14 +77,14 @@ class PREFETCHConnector(interface.ModuleConnector):
             output_path = configuration.root_tmp_path + os.path.sep + configuration.case_id \
                           + os.path.sep + configuration.evidence_id + os.path.sep + par_id
 
-            if not os.path.exists(output_path):
-                os.mkdir(output_path)
+            os.makedirs(output_path, exist_ok=True)
 
             self.ExtractTargetFileToPath(
                 source_path_spec=source_path_spec,
                 configuration=configuration,
                 file_path=prefetch_path,
-                output_path=output_path)
+                output_path=output_path,
+                inode=prefetch[5])
 
             fn = output_path + os.path.sep + fileName
             app_path = os.path.abspath(os.path.dirname(__file__)) + os.path.sep + "windows_prefetch"
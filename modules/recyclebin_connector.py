@@ -15,6 +15,7 @@ class RECYCLEBINConnector(interface.ModuleConnector):
 
     NAME = 'recyclebin_connector'
     DESCRIPTION = 'Moudle for RecycleBin'
+    PRODUCED_TABLES = ['lv1_os_win_recyclebin']
 
     _plugin_classes = {}
 
@@ -64,8 +65,7 @@ class RECYCLEBINConnector(interface.ModuleConnector):
             output_path = configuration.root_tmp_path + os.path.sep + configuration.case_id + \
                           os.path.sep + configuration.evidence_id + os.path.sep + par_id
 
-            if not os.path.exists(output_path):
-                os.mkdir(output_path)
+            os.makedirs(output_path, exist_ok=True)
 
             self.ExtractTargetFileToPath(
                 source_path_spec=source_path_spec,
@@ -34,6 +34,29 @@ from dfvfs.lib import definitions as dfvfs_definitions
 class RegistryConnector(interface.ModuleConnector):
     NAME = 'registry_connector'
     DESCRIPTION = 'Module for Registry'
+    PRODUCED_TABLES = [
+        'lv1_os_win_reg_amcache_file',
+        'lv1_os_win_reg_amcache_program',
+        'lv1_os_win_reg_file_connection',
+        'lv1_os_win_reg_installed_program',
+        'lv1_os_win_reg_known_dll',
+        'lv1_os_win_reg_mac_address',
+        'lv1_os_win_reg_mru_file',
+        'lv1_os_win_reg_mru_folder',
+        'lv1_os_win_reg_mui_cache',
+        'lv1_os_win_reg_network_drive',
+        'lv1_os_win_reg_network_interface',
+        'lv1_os_win_reg_network_profile',
+        'lv1_os_win_reg_os_information',
+        'lv1_os_win_reg_recent_docs',
+        'lv1_os_win_reg_run_command',
+        'lv1_os_win_reg_search_keyword',
+        'lv1_os_win_reg_shim_cache',
+        'lv1_os_win_reg_start_list',
+        'lv1_os_win_reg_system_service',
+        'lv1_os_win_reg_usb_device',
+        'lv1_os_win_reg_user_account',
+        'lv1_os_win_reg_user_assist']
 
     _plugin_classes = {}
 
@@ -112,80 +135,41 @@ class RegistryConnector(interface.ModuleConnector):
                     continue
                 useraccount_list.append(hostname.username)
 
-        query = f"SELECT name, parent_path, extension FROM file_info WHERE (par_id='{par_id}') and " \
-                f"((name = 'SYSTEM' and parent_path = 'root/Windows/System32/config') or " \
-                f"(name = 'SOFTWARE' and parent_path = 'root/Windows/System32/config') or " \
-                f"(name = 'SAM' and parent_path = 'root/Windows/System32/config') or " \
-                f"(name = 'Amcache.hve' and parent_path = 'root/Windows/appcompat/Programs') or " \
-                f"(name = 'setupapi.dev.log' and parent_path = 'root/Windows/INF')  or " \
-                f"(name = 'SYSTEM.LOG1' and parent_path = 'root/Windows/System32/config') or " \
-                f"(name = 'SYSTEM.LOG2' and parent_path = 'root/Windows/System32/config') or " \
-                f"(name = 'SOFTWARE.LOG1' and parent_path = 'root/Windows/System32/config') or " \
-                f"(name = 'SOFTWARE.LOG2' and parent_path = 'root/Windows/System32/config') or " \
-                f"(name = 'SAM.LOG1' and parent_path = 'root/Windows/System32/config') or " \
-                f"(name = 'SAM.LOG2' and parent_path = 'root/Windows/System32/config') or " \
-                f"(name = 'Amcache.hve.LOG1' and parent_path = 'root/Windows/appcompat/Programs') or " \
-                f"(name = 'Amcache.hve.LOG2' and parent_path = 'root/Windows/appcompat/Programs'))"
-
-        registry_files = configuration.cursor.execute_query_mul(query)
+        hive_names = ['SYSTEM', 'SOFTWARE', 'SAM']
+        hive_log_names = [name + log for name in hive_names for log in ['.LOG1', '.LOG2']]
+
+        registry_files = self.LocateFiles(
+            configuration, par_id,
+            paths=['/Windows/System32/config/' + name for name in hive_names + hive_log_names] +
+                  ['/Windows/appcompat/Programs/' + name
+                   for name in ['Amcache.hve', 'Amcache.hve.LOG1', 'Amcache.hve.LOG2']] +
+                  ['/Windows/INF/setupapi.dev.log'])
 
         if len(registry_files) == 0:
             return False
 
         registry_files2 = []
         for useraccount in useraccount_list:
-            query2 = f"SELECT name, parent_path, extension FROM file_info WHERE (par_id='{par_id}') and " \
-                     f"((name = 'UsrClass.dat' and parent_path like '%{useraccount}%') or " \
-                     f"(name = 'NTUSER.DAT' and parent_path like '%{useraccount}%') or " \
-                     f"(name = 'UsrClass.dat.LOG1' and parent_path like '%{useraccount}%') or " \
-                     f"(name = 'UsrClass.dat.LOG2' and parent_path like '%{useraccount}%') or " \
-                     f"(name = 'ntuser.dat.LOG1' and parent_path like '%{useraccount}%') or " \
-                     f"(name = 'ntuser.dat.LOG2' and parent_path like '%{useraccount}%'))"
-
-            registry_files2.append(configuration.cursor.execute_query_mul(query2))
+            registry_files2.append(self.LocateFiles(
+                configuration, par_id,
+                names=['UsrClass.dat', 'NTUSER.DAT', 'UsrClass.dat.LOG1', 'UsrClass.dat.LOG2',
+                       'ntuser.dat.LOG1', 'ntuser.dat.LOG2'],
+                parent_path_pattern=f'%{useraccount}%'))
 
         print('[MODULE]: Registry Connect')
 
-        query3 = f"SELECT name, parent_path, extension FROM file_info WHERE (par_id='{par_id}') and " \
-                 f"((name = 'SYSTEM' and parent_path = 'root/Windows.old/Windows/System32/config') or " \
-                 f"(name = 'SOFTWARE' and parent_path = 'root/Windows.old/Windows/System32/config') or " \
-                 f"(name = 'SAM' and parent_path = 'root/Windows.old/Windows/System32/config') or " \
-                 f"(name = 'Amcache.hve' and parent_path = 'root/Windows.old/Windows/appcompat/Programs') or " \
-                 f"(name = 'setupapi.dev.log' and parent_path = 'root/Windows.old/Windows/INF') or " \
-                 f"(name = 'SYSTEM.LOG1' and parent_path = 'root/Windows.old/Windows/System32/config') or " \
-                 f"(name = 'SYSTEM.LOG2' and parent_path = 'root/Windows.old/Windows/System32/config') or " \
-                 f"(name = 'SOFTWARE.LOG1' and parent_path = 'root/Windows.old/Windows/System32/config') or " \
-                 f"(name = 'SOFTWARE.LOG2' and parent_path = 'root/Windows.old/Windows/System32/config') or " \
-                 f"(name = 'SAM.LOG1' and parent_path = 'root/Windows.old/Windows/System32/config') or " \
-                 f"(name = 'SAM.LOG2' and parent_path = 'root/Windows.old/Windows/System32/config') or " \
-                 f"(name = 'Amcache.hve.LOG1' and parent_path = 'root/Windows.old/Windows/appcompat/Programs') or " \
-                 f"(name = 'Amcache.hve.LOG2' and parent_path = 'root/Windows.old/Windows/appcompat/Programs'))"
-
-        query4 = f"SELECT name, parent_path, extension FROM file_info WHERE (par_id='{par_id}') and " \
-                 f"((name = 'SYSTEM' and parent_path = 'root/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SOFTWARE' and parent_path = 'root/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SAM' and parent_path = 'root/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SYSTEM.LOG1' and parent_path = 'root/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SYSTEM.LOG2' and parent_path = 'root/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SOFTWARE.LOG1' and parent_path = 'root/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SOFTWARE.LOG2' and parent_path = 'root/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SAM.LOG1' and parent_path = 'root/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SAM.LOG2' and parent_path = 'root/Windows/System32/config/RegBack'))"
-
-        query5 = f"SELECT name, parent_path, extension FROM file_info WHERE (par_id='{par_id}') and " \
-                 f"((name = 'SYSTEM' and parent_path = 'root/Windows.old/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SOFTWARE' and parent_path = 'root/Windows.old/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SAM' and parent_path = 'root/Windows.old/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SYSTEM.LOG1' and parent_path = 'root/Windows.old/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SYSTEM.LOG2' and parent_path = 'root/Windows.old/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SOFTWARE.LOG1' and parent_path = 'root/Windows.old/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SOFTWARE.LOG2' and parent_path = 'root/Windows.old/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SAM.LOG1' and parent_path = 'root/Windows.old/Windows/System32/config/RegBack') or " \
-                 f"(name = 'SAM.LOG2' and parent_path = 'root/Windows.old/Windows/System32/config/RegBack'))"
-
-        registry_files3 = configuration.cursor.execute_query_mul(query3)
-        registry_files4 = configuration.cursor.execute_query_mul(query4)
-        registry_files5 = configuration.cursor.execute_query_mul(query5)
+        registry_files3 = self.LocateFiles(
+            configuration, par_id,
+            paths=['/Windows.old/Windows/System32/config/' + name for name in hive_names + hive_log_names] +
+                  ['/Windows.old/Windows/appcompat/Programs/' + name
+                   for name in ['Amcache.hve', 'Amcache.hve.LOG1', 'Amcache.hve.LOG2']] +
+                  ['/Windows.old/Windows/INF/setupapi.dev.log'])
+        registry_files4 = self.LocateFiles(
+            configuration, par_id,
+            paths=['/Windows/System32/config/RegBack/' + name for name in hive_names + hive_log_names])
+        registry_files5 = self.LocateFiles(
+            configuration, par_id,
+            paths=['/Windows.old/Windows/System32/config/RegBack/' + name for name in hive_names + hive_log_names])
 
         registry_file_list = [registry_files]
 
@@ -18,6 +18,9 @@ class SearchDBConnector(interface.ModuleConnector):
 	NAME = 'searchdb_connector'
 	DESCRIPTION = 'Module for searchdb'
 	TABLE_NAME = 'lv1_os_win_searchdb'
+	PRODUCED_TABLES = [
+		'lv1_os_win_searchdb_gthr',
+		'lv1_os_win_searchdb_gthrpth']
 
 	_plugin_classes = {}
 
@@ -13,6 +13,7 @@ class ShellbagConnector(interface.ModuleConnector):
     NAME = 'shellbag_connector'
     DESCRIPTION = 'Module for shellbag'
     TABLE_NAME = 'lv1_os_win_reg_shellbag'
+    PRODUCED_TABLES = ['lv1_os_win_reg_shellbag']
 
     _plugin_classes = {}
 
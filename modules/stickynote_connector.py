@@ -12,6 +12,7 @@ class StickyNoteConnector(interface.ModuleConnector):
 
     NAME = 'stickynote_connector'
     DESCRIPTION = 'Module for StickyNote'
+    PRODUCED_TABLES = ['lv1_os_win_sticky_note']
 
     _plugin_classes = {}
 
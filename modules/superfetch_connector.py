@@ -15,6 +15,7 @@ class SUPERFETCHConnector(interface.ModuleConnector):
 
     NAME = 'superfetch_connector'
     DESCRIPTION = 'Module for Superfetch'
+    PRODUCED_TABLES = ['lv1_os_win_superfetch']
 
     _plugin_classes = {}
 
@@ -62,8 +63,7 @@ class SUPERFETCHConnector(interface.ModuleConnector):
             output_path = configuration.root_tmp_path + os.path.sep + configuration.case_id \
                           + os.path.sep + configuration.evidence_id + os.path.sep + par_id
 
-            if not os.path.exists(output_path):
-                os.mkdir(output_path)
+            os.makedirs(output_path, exist_ok=True)
 
             self.ExtractTargetFileToPath(
                 source_path_spec=source_path_spec,
@@ -9,6 +9,7 @@ from modules.windows_thumbnailcache import ThumbnailParser as tc
 class ThumbnailCacheConnector(interface.ModuleConnector):
     NAME = 'thumbnailcache_connector'
     DESCRIPTION = 'Module for ThumbnailCache_connector'
+    PRODUCED_TABLES = ['lv1_os_win_thumbnail_cache']
 
     _plugin_classes = {}
 
@@ -12,6 +12,7 @@ class WindowsTimelineConnector(interface.ModuleConnector):
 
     NAME = 'windows_timeline_connector'
     DESCRIPTION = 'Module for windwos_timeline'
+    PRODUCED_TABLES = ['lv1_os_win_windows_timeline']
 
     _plugin_classes = {}
 
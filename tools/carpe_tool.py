@@ -85,7 +85,7 @@ class CarpeTool(extraction_tool.ExtractionTool,
         module_group = argument_parser.add_argument_group(
             'module arguments')
 
-        argument_helper_names = ['artifact_definitions', 'modules', 'advanced_modules']
+        argument_helper_names = ['artifact_definitions', 'modules', 'advanced_modules', 'workers']
         helpers_manager.ArgumentHelperManager.AddCommandLineArguments(
             module_group, names=argument_helper_names)
 
@@ -116,6 +116,13 @@ class CarpeTool(extraction_tool.ExtractionTool,
             )
         )
 
+        argument_parser.add_argument(
+            '--bulk-load', action='store_true', dest='bulk_load',
+            default=False, help=(
+                'Load file information into MariaDB with LOAD DATA LOCAL INFILE. '
+                'The server has to allow local_infile.'
+            ))
+
         argument_parser.add_argument(
             '--rds-check', action='store_true', dest='rds_check',
             default=False, help=(
@@ -167,7 +174,7 @@ class CarpeTool(extraction_tool.ExtractionTool,
             BadConfigOption: if the options are invalid.
         """
         # Check the list options first otherwise required options will raise.
-        argument_helper_names = ['artifact_definitions', 'modules', 'advanced_modules']
+        argument_helper_names = ['artifact_definitions', 'modules', 'advanced_modules', 'workers']
         helpers_manager.ArgumentHelperManager.ParseOptions(
             options, self, names=argument_helper_names)
 
@@ -179,6 +186,7 @@ class CarpeTool(extraction_tool.ExtractionTool,
         self.standalone_check = getattr(options, 'standalone_check', False)
         self.signature_check = getattr(options, 'signature_check', False)
         self.rds_check = getattr(options, 'rds_check', False)
+        self.bulk_load = getattr(options, 'bulk_load', False)
         self.show_info = getattr(options, 'show_info', False)
         self.show_troubleshooting = getattr(options, 'show_troubleshooting', False)
         self.dependencies_check = getattr(options, 'dependencies_check', True)
@@ -215,7 +223,7 @@ class CarpeTool(extraction_tool.ExtractionTool,
                 self._cursor.initialize()
                 self._output_writer.Write("Standalone version")
             else:
-                self._cursor = database.Database()
+                self._cursor = database.Database(local_infile=self.bulk_load)
             self._cursor.open()
         except Exception as exception:
             self._output_writer.Write('Failed tor connect to the database: {0!s}'.format(exception))
@@ -331,18 +339,14 @@ class CarpeTool(extraction_tool.ExtractionTool,
         self._Preprocess(engine)
 
 
-        # set modules
-        engine.SetProcessModules(module_filter_expression=configuration.module_filter_expression)
+        # set modules and advanced modules
+        engine.SetProcessModules(
+            module_filter_expression=configuration.module_filter_expression,
+            advanced_module_filter_expression=configuration.advanced_module_filter_expression)
 
-        # parse Artifacts
+        # parse Artifacts, advanced modules run as soon as their inputs are ready
         engine.Process(configuration)
 
-
-        # # set advanced modules
-        engine.SetProcessAdvancedModules(advanced_module_filter_expression=configuration.advanced_module_filter_expression)
-        #
-        engine.ProcessAdvancedModules(configuration)
-
         self._cursor.close()
 
         now = datetime.now()
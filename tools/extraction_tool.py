@@ -22,6 +22,7 @@ class ExtractionTool(storage_media_tool.StorageMediaTool,
         self._resolver_context = dfvfs_context.Context()
         self._module_filter_expression = None
         self._advanced_module_filter_expression = None
+        self._number_of_workers = 0
         self._operating_systems = []
 
 
@@ -45,6 +46,7 @@ class ExtractionTool(storage_media_tool.StorageMediaTool,
         configuration.cursor = self._cursor
         configuration.partition_list = self._partition_list
         configuration.operating_systems = self._operating_systems
+        configuration.number_of_workers = self._number_of_workers
 
         return configuration
 
@@ -4,3 +4,4 @@
 from tools.helpers import modules
 from tools.helpers import artifact_definitions
 from tools.helpers import advanced_modules
+from tools.helpers import workers
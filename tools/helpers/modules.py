@@ -37,7 +37,9 @@ class ModulesArgumentsHelper(interface.ArgumentsHelper):
             'bash_history parser. "sqlite,!sqlite/chrome_history" enables '
             'all sqlite plugins except for chrome_history". "win7,syslog" '
             'enables the win7 preset, as well as the syslog parser. Use '
-            '"--modules list" or "--info" to list available modules.'))
+            '"--modules list" or "--info" to list available modules. '
+            'Advanced modules can be named as well; the modules producing the '
+            'tables they read are then added automatically.'))
 
   @classmethod
   def ParseOptions(cls, options, configuration_object):
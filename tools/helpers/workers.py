@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""The workers CLI arguments helper."""
+
+from __future__ import unicode_literals
+
+from tools import carpe_tool
+from tools.helpers import interface
+from tools.helpers import manager
+from utility import errors
+
+
+class WorkersArgumentsHelper(interface.ArgumentsHelper):
+  """Workers CLI arguments helper."""
+
+  NAME = 'workers'
+  DESCRIPTION = 'Worker processes command line arguments.'
+
+  @classmethod
+  def AddArguments(cls, argument_group):
+    """Adds command line arguments to an argument group.
+    This function takes an argument parser or an argument group object and adds
+    to it all the command line arguments this helper supports.
+    Args:
+      argument_group (argparse._ArgumentGroup|argparse.ArgumentParser):
+          argparse group.
+    """
+    argument_group.add_argument(
+        '--workers', dest='workers', type=int, action='store', default=0,
+        metavar='NUMBER_OF_WORKERS', help=(
+            'Number of worker processes used to run the modules. Every '
+            '(module, partition) pair is processed as a separate task. '
+            'The default is 0, which uses one worker per CPU. Use 1 to run '
+            'all modules sequentially in the main process.'))
+
+  @classmethod
+  def ParseOptions(cls, options, configuration_object):
+    """Parses and validates options.
+    Args:
+      options (argparse.Namespace): parser options.
+      configuration_object (CLITool): object to be configured by the argument
+          helper.
+    Raises:
+      BadConfigObject: when the configuration object is of the wrong type.
+      BadConfigOption: when the number of workers is invalid.
+    """
+    if not isinstance(configuration_object, carpe_tool.CarpeTool):
+      raise errors.BadConfigObject(
+          'Configuration object is not an instance of CLITool')
+
+    number_of_workers = cls._ParseNumericOption(
+        options, 'workers', default_value=0)
+
+    if number_of_workers < 0:
+      raise errors.BadConfigOption(
+          'Invalid number of workers value cannot be negative.')
+
+    setattr(configuration_object, '_number_of_workers', number_of_workers)
+
+
+manager.ArgumentHelperManager.RegisterHelper(WorkersArgumentsHelper)
@@ -6,7 +6,6 @@ import uuid
 import hashlib
 import codecs
 import configparser
-from pyarrow import csv
 
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.lib import errors as dfvfs_errors
@@ -24,6 +23,7 @@ from tools import logger, tools
 from containers import carpe_file as CarpeFile
 from utility import definitions
 from utility import errors
+from utility import rds_index
 from engine import path_extractors
 from engine.preprocessors import signature_tool
 from engine import path_helper
@@ -36,6 +36,22 @@ class StorageMediaTool(tools.CLITool):
     _SUPPORTED_CREDENTIAL_TYPES = [
         'key_data', 'password', 'recovery_password', 'startup_key']
 
+    # Number of file_info records inserted per transaction.
+    _FILE_INFO_BATCH_SIZE = 10000
+
+    _DEFAULT_RDS_INDEX_PATH = '/home/carpe/rds/NSRLFile.idx'
+
+    # Data streams are read once in chunks of this size.
+    _READ_BUFFER_SIZE = 1024 * 1024
+
+    # Number of leading bytes SIGA identifies a format from.
+    _SIGA_HEADER_SIZE = 4096
+
+    # SIGA identifies ZIP and compound file based formats, such as docx and hwp,
+    # from their directory structures, which requires the whole file.
+    _SIGA_CONTAINER_SIGNATURES = (b'PK', b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1')
+    _SIGA_CONTAINER_MAXIMUM_SIZE = 32 * 1024 * 1024
+
     def __init__(self, input_reader=None, output_writer=None):
         super(StorageMediaTool, self).__init__(
             input_reader=input_reader, output_writer=output_writer)
@@ -59,6 +75,7 @@ class StorageMediaTool(tools.CLITool):
 
         self._root_storage_path = root_storage_path
         self._root_tmp_path = root_tmp_path
+        self._rds_index_path = config.get('paths', 'rds_index_path', fallback=self._DEFAULT_RDS_INDEX_PATH)
 
         self._partition_list = {}
         self._partitions = None
@@ -70,8 +87,9 @@ class StorageMediaTool(tools.CLITool):
         self.standalone_check = None
         self.signature_check = None
         self._signature_tool = signature_tool.SignatureTool()
-        self._rds = None
         self._rds_set = None
+        self.bulk_load = False
+        self._file_info_records = []
 
     def _ParseStorageMediaOptions(self, options):
         self._ParseSourcePathOption(options)
@@ -630,11 +648,16 @@ class StorageMediaTool(tools.CLITool):
         return normalized_volume_identifiers
 
     def LoadReferenceDataSet(self):
+        """Opens the RDS index built with "carpe.py rds-index".
+
+        Raises:
+            BadConfigOption: if the RDS index cannot be opened.
+        """
         try:
-            self._rds = csv.read_csv('/home/carpe/rds/NSRLFile.txt')
-            self._rds_set = set(self._rds.columns[0].to_pylist())  # 중복제거
-        except KeyboardInterrupt:
-            raise errors.UserAbort('File system scan aborted.')
+            self._rds_set = rds_index.RDSIndex(self._rds_index_path)
+        except IOError as exception:
+            raise errors.BadConfigOption(
+                'Unable to open RDS index: {0:s} with error: {1!s}'.format(self._rds_index_path, exception))
 
     def InsertImageInformation(self):
 
@@ -770,6 +793,8 @@ class StorageMediaTool(tools.CLITool):
             if path_spec.IsFileSystem():
                 self._RecursiveFileSearch(path_spec)
 
+        self._FlushFileInfoRecords()
+
     def _RecursiveFileSearch(self, path_spec):
         _path_specs = [path_spec]
 
@@ -933,9 +958,11 @@ class StorageMediaTool(tools.CLITool):
         if file_entry.IsFile():
             for data_stream in file_entry.data_streams:
                 signature_result = ''
-                hash_result = ''
+                md5_result = ''
+                sha1_result = ''
+                sha3_result = ''
                 rds_result = ''
-                if self.signature_check and file._size > 0 and file_entry.IsFile():
+                if (self.signature_check or self.rds_check) and file._size > 0:
 
                     file_object = file_entry.GetFileObject(data_stream_name=data_stream.name)
 
@@ -943,48 +970,19 @@ class StorageMediaTool(tools.CLITool):
                         return False
 
                     try:
-                        results = self._signature_tool.ScanFileObject(file_object)
-
-                        if results:
-                            sig = results[0].identifier.split(':')
-                            signature_result = sig[0]
-                        else:
-                            file_object.seek(0, os.SEEK_SET)
-                            file_content = file_object.read()
-                            self._signature_tool.siga.Identify(file_content)
-
-                            if self._signature_tool.siga.ext:
-                                signature_result = self._signature_tool.siga.ext[1:]
-
+                        signature_result, md5_result, sha1_result, sha3_result = self._ScanFileObject(
+                            file_object)
                     except IOError as exception:
-                            raise errors.BackEndError(
-                                'Unable to scan file: error: {0:s}'.format(exception))
+                        raise errors.BackEndError(
+                            'Unable to scan file: {0:s} with error: {1!s}'.format(file_entry.name, exception))
                     finally:
                         file_object.close()
 
-                if self.rds_check and file._size > 0 and file_entry.IsFile():
-
-                    file_object = file_entry.GetFileObject(data_stream_name=data_stream.name)
-
-                    if not file_object:
-                        return False
-
-                    try:
-                        hash_result = hashlib.sha1(file_object.read(file._size)).hexdigest().upper()
-                    except Exception as exception:
-                        raise errors.HashCalculateError(
-                            'Failed to compute SHA1 hash for file({0:s}): error: {1:s} '.format(file_entry.name, exception))
-                        logger.error('Failed to compute SHA1 hash for file: {0:s} '.format(
-                            file_entry.name))
-                        continue
-
-                    finally:
-                        file_object.close()
-
-                    if file._sha1 in self._rds_set:
-                        rds_result = "Matching"
-                    else:
-                        rds_result = "Not Matching"
+                    if self.rds_check:
+                        if sha1_result in self._rds_set:
+                            rds_result = "Matching"
+                        else:
+                            rds_result = "Not Matching"
 
                 if data_stream.name:
                     file_ads = CarpeFile.CarpeFile()
@@ -993,12 +991,16 @@ class StorageMediaTool(tools.CLITool):
                     file_ads._extension = ''
                     file_ads._size = data_stream._tsk_attribute.info.size
                     file_ads._sig_type = signature_result
-                    file_ads._sha1 = hash_result
+                    file_ads._md5 = md5_result
+                    file_ads._sha1 = sha1_result
+                    file_ads._sha3 = sha3_result
                     file_ads._rds_existed = rds_result
                     files.append(file_ads)
                 else:
                     file._sig_type = signature_result
-                    file._sha1 = hash_result
+                    file._md5 = md5_result
+                    file._sha1 = sha1_result
+                    file._sha3 = sha3_result
                     file._rds_existed = rds_result
                     files.append(file)
         else:
@@ -1027,17 +1029,79 @@ class StorageMediaTool(tools.CLITool):
 
         # print(file._name +":"+ str(file._sha1) + ":"+str(file._sig_type))
 
-    def _InsertFileInfoRecords(self, files):
-        file_list = map(lambda f: f.toTuple(), files)
-        for file in file_list:
-            if file is not None:
-                try:
-                    query = self._cursor.insert_query_builder("file_info")
-                    query = (query + "\n values " + "%s" % (file, ))
-                    self._cursor.execute_query(query)
-                except Exception as exception:
-                    print(exception)
+    def _ScanFileObject(self, file_object):
+        """Hashes and identifies the format of a data stream in a single pass.
 
+        The data is read once in fixed-size chunks that are fed to the hashes and
+        the signature scanner, so memory use does not depend on the file size.
+        SIGA only gets the header, or the whole file for small ZIP and compound
+        files, when the signature scanner has no result.
 
-        self._cursor.commit()
+        Args:
+            file_object (dfvfs.FileIO): file-like object of the data stream.
+
+        Returns:
+            tuple[str, str, str, str]: signature, MD5, SHA-1 and SHA3-256 of
+                the data stream.
+        """
+        data_size = file_object.get_size()
+        md5_context = hashlib.md5()
+        sha1_context = hashlib.sha1()
+        sha3_context = hashlib.sha3_256()
+
+        scan_state = None
+        if self.signature_check:
+            scan_state = self._signature_tool.StartScan(data_size)
+
+        file_object.seek(0, os.SEEK_SET)
+        header = file_object.read(self._READ_BUFFER_SIZE)
+
+        siga_data = None
+        if (self.signature_check and data_size <= self._SIGA_CONTAINER_MAXIMUM_SIZE and
+                header.startswith(self._SIGA_CONTAINER_SIGNATURES)):
+            siga_data = bytearray()
+
+        data = header
+        while data:
+            md5_context.update(data)
+            sha1_context.update(data)
+            sha3_context.update(data)
+            if scan_state:
+                self._signature_tool.ScanBuffer(scan_state, data)
+            if siga_data is not None:
+                siga_data.extend(data)
+            data = file_object.read(self._READ_BUFFER_SIZE)
+
+        signature_result = ''
+        if scan_state:
+            results = self._signature_tool.StopScan(scan_state)
+            if results:
+                signature_result = results[0].identifier.split(':')[0]
+            else:
+                if siga_data is None:
+                    siga_data = header[:self._SIGA_HEADER_SIZE]
+                self._signature_tool.siga.ext = None
+                self._signature_tool.siga.Identify(bytes(siga_data))
+                if self._signature_tool.siga.ext:
+                    signature_result = self._signature_tool.siga.ext[1:]
+
+        return (signature_result, md5_context.hexdigest().upper(), sha1_context.hexdigest().upper(),
+                sha3_context.hexdigest().upper())
+
+    def _InsertFileInfoRecords(self, files):
+        for file in files:
+            file._normalized_path = path_helper.PathHelper.GetNormalizedPath(file._parent_path, file._name)
+            record = file.toTuple()
+            if record is not None:
+                self._file_info_records.append(record)
+
+        if len(self._file_info_records) >= self._FILE_INFO_BATCH_SIZE:
+            self._FlushFileInfoRecords()
+
+    def _FlushFileInfoRecords(self):
+        """Inserts the buffered file_info records in a single transaction."""
+        if not self._file_info_records:
+            return
+        self._cursor.bulk_insert("file_info", self._file_info_records)
+        self._file_info_records = []
 
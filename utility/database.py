@@ -1,5 +1,6 @@
 import os
 import pymysql
+import tempfile
 import configparser
 
 from utility import logger
@@ -22,7 +23,7 @@ class Database(object):
 					 "additional_atime_nano":"BIGINT", "additional_ctime_nano":"BIGINT", "additional_etime_nano":"BIGINT",
 					 "mode":"INTEGER", "uid":"INTEGER", "gid":"INTEGER", "md5":"TEXT", "sha1":"TEXT", "sha3":"TEXT",
 					 "parent_path":"TEXT", "extension":"TEXT", "parent_id":"BIGINT", "bookmark":"BOOLEAN",
-					 "ads":"INTEGER", "sig_type":"TEXT", "rds_existed":"TEXT"},
+					 "ads":"INTEGER", "sig_type":"TEXT", "rds_existed":"TEXT", "normalized_path":"TEXT"},
 		"block_info":{"par_id":"VARCHAR", "start":"BIGINT", "end":"BIGINT"}
 	}
 	#To Do
@@ -43,7 +44,7 @@ class Database(object):
 		"evidence_info":"CREATE TABLE evidence_info (evd_id VARCHAR(100) NOT NULL, evd_name TEXT NOT NULL, evd_path TEXT NOT NULL, tmp_path TEXT NOT NULL, case_id VARCHAR(100) NOT NULL, main_type TEXT NOT NULL, sub_type TEXT NOT NULL, timezone TEXT NOT NULL, acquired_date DATETIME, md5 TEXT, sha1 TEXT, sha3 TEXT, process_state INT(11) DEFAULT 0, PRIMARY KEY(evd_id), FOREIGN KEY(case_id) REFERENCES case_info(case_id));",
 		"partition_info":"CREATE TABLE partition_info (par_id VARCHAR(100) NOT NULL, par_name TEXT NOT NULL, evd_id VARCHAR(100) NOT NULL, par_type TEXT NOT NULL, sector_size INT(11) NOT NULL DEFAULT 0, par_size BIGINT NOT NULL DEFAULT 0, md5 TEXT, sha1 TEXT, sha3 TEXT, start_sector BIGINT NOT NULL, PRIMARY KEY(par_id), FOREIGN KEY(evd_id) REFERENCES evidence_info(evd_id));",
 		"fs_info":"CREATE TABLE fs_info (fs_id VARCHAR(100) NOT NULL, par_id VARCHAR(100) NOT NULL, block_size INT(11), block_count BIGINT, root_inum INT(11), first_inum INT(11), last_inum BIGINT, PRIMARY KEY(fs_id), FOREIGN KEY(par_id) REFERENCES partition_info(par_id));",
-		"file_info":"CREATE TABLE file_info (id BIGINT NOT NULL AUTO_INCREMENT, file_id BIGINT NOT NULL, par_id VARCHAR(100) NOT NULL, inode TEXT, name TEXT NOT NULL, meta_seq BIGINT, type INTEGER, dir_type INTEGER, meta_type INTEGER, meta_flags INTEGER, size BIGINT, mtime BIGINT, atime BIGINT, ctime BIGINT, etime BIGINT, mtime_nano BIGINT, atime_nano BIGINT, ctime_nano BIGINT, etime_nano BIGINT, additional_mtime BIGINT, additional_atime BIGINT, additional_ctime BIGINT, additional_etime BIGINT, additional_mtime_nano BIGINT, additional_atime_nano BIGINT, additional_ctime_nano BIGINT, additional_etime_nano BIGINT, mode INTEGER, uid INTEGER, gid INTEGER, md5 TEXT, sha1 TEXT, sha3 TEXT, parent_path TEXT, extension TEXT, parent_id BIGINT, bookmark BOOLEAN, PRIMARY KEY(id), FOREIGN KEY(par_id) REFERENCES partition_info(par_id));",
+		"file_info":"CREATE TABLE file_info (id BIGINT NOT NULL AUTO_INCREMENT, file_id BIGINT NOT NULL, par_id VARCHAR(100) NOT NULL, inode TEXT, name TEXT NOT NULL, meta_seq BIGINT, type INTEGER, dir_type INTEGER, meta_type INTEGER, meta_flags INTEGER, size BIGINT, mtime BIGINT, atime BIGINT, ctime BIGINT, etime BIGINT, mtime_nano BIGINT, atime_nano BIGINT, ctime_nano BIGINT, etime_nano BIGINT, additional_mtime BIGINT, additional_atime BIGINT, additional_ctime BIGINT, additional_etime BIGINT, additional_mtime_nano BIGINT, additional_atime_nano BIGINT, additional_ctime_nano BIGINT, additional_etime_nano BIGINT, mode INTEGER, uid INTEGER, gid INTEGER, md5 TEXT, sha1 TEXT, sha3 TEXT, parent_path TEXT, extension TEXT, parent_id BIGINT, bookmark BOOLEAN, ads INTEGER, sig_type TEXT, rds_existed TEXT, normalized_path TEXT, PRIMARY KEY(id), INDEX idx_file_info_path (par_id, parent_path(255), name(255)), INDEX idx_file_info_extension (par_id, extension(32)), INDEX idx_file_info_normalized_path (par_id, normalized_path(255)), FOREIGN KEY(par_id) REFERENCES partition_info(par_id));",
 		"block_info":"CREATE TABLE block_info (par_id VARCHAR(100) NOT NULL, start BIGINT, end BIGINT);"
 	}
 
@@ -52,8 +53,10 @@ class Database(object):
 	PREPARED_QUERY = {		
 	}
 
-	def __init__(self):
+	def __init__(self, local_infile=False):
 		self._conn = None
+		# LOAD DATA LOCAL INFILE lets the server read client files, only enable it on request
+		self._local_infile = local_infile
 
 		config = configparser.ConfigParser()
 		conf_file = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep + 'config' + os.sep + 'carpe.conf'
@@ -69,7 +72,8 @@ class Database(object):
 	def open(self):
 		try:
 			self._conn = pymysql.connect(host=self._host, port=self._port, user=self._user, passwd=self._passwd,
-										 db=self._database, charset='utf8', autocommit=True)
+										 db=self._database, charset='utf8', autocommit=True,
+										 local_infile=self._local_infile)
 		except Exception as exception:
 			self._conn=None
 			logger.error("Failed to connect to the database: {0!s}".format(exception))
@@ -126,6 +130,98 @@ class Database(object):
 			print("db execution error : " + str(e))
 			return -1
 
+	def bulk_insert(self, table_name, values):
+		"""Inserts rows into a table in a single transaction.
+
+		The rows are sent with a parameterised executemany, which pymysql turns into
+		multi-row INSERT statements, or with LOAD DATA LOCAL INFILE if enabled. If the
+		transaction fails, the rows are inserted one by one and the rows that fail
+		are logged and skipped.
+
+		Args:
+			table_name (str): table name, the columns are ordered like insert_query_builder.
+			values (list[tuple]): rows to insert.
+		"""
+		if not values:
+			return
+		if self._local_infile:
+			return self.load_data_infile(table_name, values)
+
+		query = self.insert_query_builder(table_name)
+		query += "values ({0:s})".format(", ".join(["%s"] * len(self.TABLE_INFO[table_name])))
+		try:
+			cursor = self._conn.cursor()
+			self._conn.begin()
+			cursor.executemany(query, values)
+			self._conn.commit()
+			cursor.close()
+		except Exception as exception:
+			self._conn.rollback()
+			logger.warning("Failed to insert {0:d} rows into {1:s}, inserting them one by one: {2!s}".format(
+				len(values), table_name, exception))
+			return self._insert_rows(table_name, query, values)
+
+	def _insert_rows(self, table_name, query, values):
+		"""Inserts rows into a table one by one, skipping the rows that fail.
+
+		Args:
+			table_name (str): table name.
+			query (str): parameterised INSERT query.
+			values (list[tuple]): rows to insert.
+
+		Returns:
+			int: -1 if a row failed, None otherwise.
+		"""
+		number_of_failed_rows = 0
+		cursor = self._conn.cursor()
+		for row in values:
+			try:
+				cursor.execute(query, row)
+			except Exception as exception:
+				number_of_failed_rows += 1
+				logger.error("Failed to insert row into {0:s}: {1!s} {2!r}".format(table_name, exception, row))
+		cursor.close()
+		if number_of_failed_rows:
+			logger.error("Skipped {0:d} of {1:d} rows of {2:s}".format(number_of_failed_rows, len(values), table_name))
+			return -1
+
+	def load_data_infile(self, table_name, values):
+		"""Loads rows into a table through a temporary tab-separated file.
+
+		Args:
+			table_name (str): table name, the columns are ordered like insert_query_builder.
+			values (list[tuple]): rows to insert.
+		"""
+		columns = sorted(self.TABLE_INFO[table_name].keys())
+		with tempfile.NamedTemporaryFile(mode='w', encoding='utf-8', errors='replace',
+										 suffix='.tsv', delete=False) as tsv_file:
+			for row in values:
+				tsv_file.write("\t".join(map(self._escape_infile_value, row)))
+				tsv_file.write("\n")
+			tsv_path = tsv_file.name
+
+		query = "LOAD DATA LOCAL INFILE %s INTO TABLE {0:s} CHARACTER SET utf8 " \
+				"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' ({1:s})".format(
+					table_name, ", ".join(columns))
+		try:
+			cursor = self._conn.cursor()
+			cursor.execute(query, (tsv_path, ))
+			cursor.close()
+		except Exception as e:
+			print("db execution error : " + str(e))
+			return -1
+		finally:
+			os.remove(tsv_path)
+
+	@staticmethod
+	def _escape_infile_value(value):
+		if value is None:
+			return "\\N"
+		if isinstance(value, bool):
+			return str(int(value))
+		return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n") \
+			.replace("\r", "\\r").replace("\0", "\\0")
+
 	def insert_query_builder(self, table_name):
 		if table_name in self.TABLE_INFO.keys():
 			query = "INSERT INTO {0} (".format(table_name)
@@ -148,10 +244,10 @@ class Database(object):
 			print("db execution failed: %s" % e)
 			return -1
 
-	def execute_query_mul(self, query):
+	def execute_query_mul(self, query, values=None):
 		cursor = self._conn.cursor()
 		try:
-			cursor.execute(query)
+			cursor.execute(query, values)
 			data = cursor.fetchall()
 			cursor.close()
 			return data
@@ -4,7 +4,8 @@ import re
 import datetime
 import binascii
 
-from utility.res.sqlite_dict import TABLE_INFO, INSERT_HELPER, CREATE_HELPER
+from utility import logger
+from utility.res.sqlite_dict import TABLE_INFO, INSERT_HELPER, CREATE_HELPER, INDEX_HELPER
 
 
 def mysql_to_sqlite(query):
@@ -21,6 +22,8 @@ def regexp(expr, item):
 
 
 class Database:
+    BUSY_TIMEOUT = 600
+
     def __init__(self, case_id, evd_id, source_path, output_path):
         self._conn = None
         self.case_id = case_id
@@ -31,7 +34,8 @@ class Database:
     def open(self):
         try:
             path = f'{self.output_path}'+os.sep+f'{self.case_id}.db'
-            self._conn = sqlite3.connect(path)
+            # Worker processes share the database file, wait for their locks.
+            self._conn = sqlite3.connect(path, timeout=self.BUSY_TIMEOUT)
             self._conn.create_function('UNHEX', 1, lambda value: binascii.unhexlify(value))
             self._conn.create_function('regexp', 2, regexp)
             cursor = self._conn.cursor()
@@ -77,6 +81,8 @@ class Database:
         for table_name in TABLE_INFO.keys():
             if not self.check_table_exist(table_name):
                 self.execute_query(CREATE_HELPER[table_name])
+                for index_query in INDEX_HELPER.get(table_name, []):
+                    self.execute_query(index_query)
                 if table_name == 'case_info':
                     # column: case_id, case_name, administrator, create_date, description
                     query = "insert into case_info values (?, ?, ?, ?, ?)"
@@ -112,6 +118,51 @@ class Database:
             return -1
         self.commit()
 
+    def bulk_insert(self, table_name, values):
+        """Inserts rows into a table with one prepared statement in a single transaction.
+
+        If the transaction fails, the rows are inserted one by one and the rows that
+        fail are logged and skipped.
+
+        Args:
+            table_name (str): table name, the columns are ordered like insert_query_builder.
+            values (list[tuple]): rows to insert.
+        """
+        if not values:
+            return
+        query = self.insert_query_builder(table_name)
+        query += "values ({0:s})".format(", ".join(["?"] * len(TABLE_INFO[table_name])))
+        try:
+            with self._conn:
+                self._conn.executemany(query, values)
+        except Exception as exception:
+            logger.warning("Failed to insert {0:d} rows into {1:s}, inserting them one by one: {2!s}".format(
+                len(values), table_name, exception))
+            return self._insert_rows(table_name, query, values)
+
+    def _insert_rows(self, table_name, query, values):
+        """Inserts rows into a table one by one, skipping the rows that fail.
+
+        Args:
+            table_name (str): table name.
+            query (str): parameterised INSERT query.
+            values (list[tuple]): rows to insert.
+
+        Returns:
+            int: -1 if a row failed, None otherwise.
+        """
+        number_of_failed_rows = 0
+        for row in values:
+            try:
+                with self._conn:
+                    self._conn.execute(query, row)
+            except Exception as exception:
+                number_of_failed_rows += 1
+                logger.error("Failed to insert row into {0:s}: {1!s} {2!r}".format(table_name, exception, row))
+        if number_of_failed_rows:
+            logger.error("Skipped {0:d} of {1:d} rows of {2:s}".format(number_of_failed_rows, len(values), table_name))
+            return -1
+
     def insert_query_builder(self, table_name):
         query = ""
         if table_name in TABLE_INFO.keys():
@@ -138,11 +189,14 @@ class Database:
             print("db execution failed: %s" % e)
             return -1
 
-    def execute_query_mul(self, query):
+    def execute_query_mul(self, query, values=None):
         cursor = self._conn.cursor()
         query = mysql_to_sqlite(query)
         try:
-            cursor.execute(query)
+            if values:
+                cursor.execute(query.replace('%s', '?'), values)
+            else:
+                cursor.execute(query)
             data = cursor.fetchall()
             cursor.close()
             self.commit()
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""The NSRL Reference Data Set (RDS) index.
+
+The index file is a sorted array of unique binary SHA-1 hashes preceded by a
+small header. It is memory-mapped read-only, so opening it costs next to
+nothing, lookups are a binary search and the pages are shared by all processes
+that open the same file.
+"""
+
+import binascii
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+
+from utility import errors
+
+
+INDEX_SIGNATURE = b'CARPERDS'
+INDEX_FORMAT_VERSION = 1
+
+# signature, format version, number of records
+_HEADER = struct.Struct('<8sIQ')
+
+RECORD_SIZE = 20
+
+
+def _ReadHashes(nsrl_path):
+    """Reads the SHA-1 hashes of a NSRLFile.txt file.
+
+    Args:
+        nsrl_path (str): path of the NSRLFile.txt file.
+
+    Yields:
+        bytes: binary SHA-1 hash.
+    """
+    with open(nsrl_path, 'rb') as file_object:
+        for line in file_object:
+            sha1, _, _ = line.partition(b',')
+            sha1 = sha1.strip().strip(b'"')
+            if len(sha1) != RECORD_SIZE * 2:
+                continue
+            try:
+                yield binascii.unhexlify(sha1)
+            except binascii.Error:
+                # The header line, "SHA-1","MD5",...
+                continue
+
+
+def _WriteRun(hashes, temporary_path):
+    """Writes a sorted run of unique hashes to a temporary file.
+
+    Args:
+        hashes (list[bytes]): binary SHA-1 hashes.
+        temporary_path (str): path of the temporary directory.
+
+    Returns:
+        str: path of the run file.
+    """
+    file_descriptor, run_path = tempfile.mkstemp(suffix='.run', dir=temporary_path)
+    with os.fdopen(file_descriptor, 'wb') as file_object:
+        file_object.write(b''.join(sorted(set(hashes))))
+    return run_path
+
+
+def _ReadRun(run_path):
+    """Reads the hashes of a run file.
+
+    Args:
+        run_path (str): path of the run file.
+
+    Yields:
+        bytes: binary SHA-1 hash.
+    """
+    with open(run_path, 'rb') as file_object:
+        while True:
+            data = file_object.read(RECORD_SIZE * 65536)
+            if not data:
+                break
+            for offset in range(0, len(data), RECORD_SIZE):
+                yield data[offset:offset + RECORD_SIZE]
+
+
+def BuildIndex(nsrl_path, index_path, run_size=10000000):
+    """Builds a RDS index from a NSRLFile.txt file.
+
+    The hashes are sorted in runs of run_size hashes that are merged into the
+    index, so memory use is bounded by the run size.
+
+    Args:
+        nsrl_path (str): path of the NSRLFile.txt file.
+        index_path (str): path of the index file to create.
+        run_size (Optional[int]): number of hashes sorted in memory at once.
+
+    Returns:
+        int: number of unique hashes in the index.
+    """
+    temporary_path = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(index_path)))
+    run_paths = []
+    try:
+        hashes = []
+        for sha1 in _ReadHashes(nsrl_path):
+            hashes.append(sha1)
+            if len(hashes) >= run_size:
+                run_paths.append(_WriteRun(hashes, temporary_path))
+                hashes = []
+        if hashes or not run_paths:
+            run_paths.append(_WriteRun(hashes, temporary_path))
+        hashes = None
+
+        number_of_records = 0
+        with open(index_path, 'wb') as file_object:
+            file_object.write(_HEADER.pack(INDEX_SIGNATURE, INDEX_FORMAT_VERSION, 0))
+
+            previous_sha1 = None
+            for sha1 in heapq.merge(*[_ReadRun(run_path) for run_path in run_paths]):
+                if sha1 == previous_sha1:
+                    continue
+                file_object.write(sha1)
+                previous_sha1 = sha1
+                number_of_records += 1
+
+            file_object.seek(0, os.SEEK_SET)
+            file_object.write(_HEADER.pack(INDEX_SIGNATURE, INDEX_FORMAT_VERSION, number_of_records))
+
+    finally:
+        for run_path in run_paths:
+            os.remove(run_path)
+        os.rmdir(temporary_path)
+
+    return number_of_records
+
+
+class RDSIndex(object):
+    """Memory-mapped RDS index.
+
+    Supports the "in" operator with hexadecimal or binary SHA-1 hashes. The
+    index can be passed to worker processes, which map the file again.
+    """
+
+    def __init__(self, path):
+        """Initializes a RDS index.
+
+        Args:
+            path (str): path of the index file.
+
+        Raises:
+            BadConfigOption: if the index file is not a RDS index.
+        """
+        super(RDSIndex, self).__init__()
+        self._path = path
+        self._file_object = None
+        self._mmap = None
+        self._number_of_records = 0
+        self._Open()
+
+    def __contains__(self, sha1):
+        if isinstance(sha1, str):
+            if len(sha1) != RECORD_SIZE * 2:
+                return False
+            try:
+                sha1 = binascii.unhexlify(sha1)
+            except binascii.Error:
+                return False
+
+        low = 0
+        high = self._number_of_records
+        while low < high:
+            middle = (low + high) // 2
+            offset = _HEADER.size + middle * RECORD_SIZE
+            record = self._mmap[offset:offset + RECORD_SIZE]
+            if record < sha1:
+                low = middle + 1
+            elif record > sha1:
+                high = middle
+            else:
+                return True
+        return False
+
+    def __len__(self):
+        return self._number_of_records
+
+    def __getstate__(self):
+        return {'path': self._path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    def _Open(self):
+        """Maps the index file.
+
+        Raises:
+            BadConfigOption: if the index file is not a RDS index.
+        """
+        self._file_object = open(self._path, 'rb')
+        self._mmap = mmap.mmap(self._file_object.fileno(), 0, access=mmap.ACCESS_READ)
+
+        signature, format_version, number_of_records = _HEADER.unpack_from(self._mmap, 0)
+        if signature != INDEX_SIGNATURE or format_version != INDEX_FORMAT_VERSION:
+            self.Close()
+            raise errors.BadConfigOption('Unsupported RDS index file: {0:s}'.format(self._path))
+
+        if len(self._mmap) < _HEADER.size + number_of_records * RECORD_SIZE:
+            self.Close()
+            raise errors.BadConfigOption('Truncated RDS index file: {0:s}'.format(self._path))
+
+        self._number_of_records = number_of_records
+
+    def Close(self):
+        """Unmaps the index file."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file_object is not None:
+            self._file_object.close()
+            self._file_object = None
+        self._number_of_records = 0
@@ -82,7 +82,8 @@ TABLE_INFO = {
         "bookmark": "BOOLEAN",
         "ads": "INTEGER",
         "sig_type": "TEXT",
-        "rds_existed": "TEXT"
+        "rds_existed": "TEXT",
+        "normalized_path": "TEXT"
     }
 }
 
@@ -185,5 +186,16 @@ CREATE_HELPER = {
                  "bookmark BOOLEAN, "
                  "sig_type TEXT, "
                  "rds_existed TEXT, "
+                 "normalized_path TEXT, "
                  "FOREIGN KEY(par_id) REFERENCES partition_info(par_id));"
+}
+
+# Secondary indexes, created together with their table. Connectors locate their
+# artifacts with ModuleConnector.LocateFiles, which uses these.
+INDEX_HELPER = {
+    "file_info": [
+        "CREATE INDEX idx_file_info_path ON file_info (par_id, parent_path, name);",
+        "CREATE INDEX idx_file_info_extension ON file_info (par_id, extension);",
+        "CREATE INDEX idx_file_info_normalized_path ON file_info (par_id, normalized_path);"
+    ]
 }
\ No newline at end of file